@@ -12,6 +12,8 @@ from sverchok.ui import color_def, bgl_callback_nodeview, bgl_callback_3dview
 from sverchok.utils import app_handler_ops
 from sverchok.utils.logging import debug
 from sverchok.utils import dummy_nodes
+from sverchok.utils.blender_mesh import update_mesh_cache, clear_mesh_cache
+from sverchok.utils.mesh_draw_buffers import clear_draw_buffers_cache
 
 _state = {'frame': None}
 
@@ -86,6 +88,10 @@ def sv_handler_undo_post(scene):
     if links_changed or not (undo_handler_node_count['sv_groups'] == num_to_test_against):
         print('looks like a node was removed, cleaning')
         sv_clean(scene)
+        clear_mesh_cache()
+        # undo could remove a monad tree
+        from sverchok.core.monad import prune_monad_plans
+        prune_monad_plans()
         for ng in sverchok_trees():
             ng.nodes_dict.load_nodes(ng)
             ng.has_changed = True
@@ -147,6 +153,19 @@ def sv_main_handler(scene):
     pre_running = False
 
 
+@persistent
+def sv_mesh_cache_handler(scene, depsgraph=None):
+    """
+    On depsgraph update and frame change (post):
+    forget cached mesh data of objects whose geometry was changed.
+    """
+    if depsgraph is None:
+        # Older Blender versions do not pass depsgraph to handlers
+        clear_mesh_cache()
+    else:
+        update_mesh_cache(depsgraph)
+
+
 @persistent
 def sv_clean(scene):
     """
@@ -160,7 +179,12 @@ def sv_clean(scene):
 
 @persistent
 def sv_pre_load(scene):
+    from sverchok.core.monad import clear_monad_plans
+
     clear_system_cache()
+    clear_mesh_cache()
+    clear_draw_buffers_cache()
+    clear_monad_plans()
     sv_clean(scene)
     set_first_run(True)
 
@@ -237,7 +261,9 @@ handler_dict = {
     'undo_post': sv_handler_undo_post,
     'load_pre': sv_pre_load,
     'load_post': sv_post_load,
-    'depsgraph_update_pre': sv_main_handler
+    'depsgraph_update_pre': sv_main_handler,
+    'depsgraph_update_post': sv_mesh_cache_handler,
+    'frame_change_post': sv_mesh_cache_handler
 }
 
 
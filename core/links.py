@@ -162,6 +162,17 @@ class SvLinks:
         self.input_sockets_cache[tree_id] = self.input_sockets_new[tree_id]
         self.inputted_nodes_cache[tree_id] = self.inputted_nodes_new[tree_id]
 
+    def get_links_changes(self, node_tree):
+        """returns lists of added and removed links since last store_links_cache call"""
+        tree_id = node_tree.tree_id
+        new_sv_links = self.sv_links_new[tree_id]
+        before_sv_links = self.sv_links_cache[tree_id]
+        new_set = set(new_sv_links)
+        before_set = set(before_sv_links)
+        added = [link for link in new_sv_links if link not in before_set]
+        removed = [link for link in before_sv_links if link not in new_set]
+        return added, removed
+
     def get_nodes(self, node_tree):
         tree_id = node_tree.tree_id
         new_sv_links = self.sv_links_new[tree_id]
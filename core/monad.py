@@ -29,7 +29,7 @@ from sverchok.utils import get_node_class_reference, sv_IO_monad_helpers
 from sverchok.utils.logging import info, error
 from sverchok.node_tree import SverchCustomTreeNode, SvNodeTreeCommon
 from sverchok.data_structure import get_other_socket, updateNode, match_long_repeat
-from sverchok.core.update_system import make_tree_from_nodes, do_update
+from sverchok.core.update_system import do_update, get_dependency_graph
 from sverchok.core.monad_properties import SvIntPropertySettingsGroup, SvFloatPropertySettingsGroup, ensure_unique
 from sverchok.core.events import CurrentEvents, BlenderEventsTypes
 from sverchok.utils.handle_blender_data import get_sv_trees
@@ -87,6 +87,8 @@ def monad_make_unique(node):
     # generate a new copy of monad group node. using ( copy? ) 
     monad_group = bpy.data.node_groups[node.monad.name]
     new_monad_group = monad_group.copy()
+    # the copy should not share socket data, dependency graph and plan with the original
+    new_monad_group.tree_id_memory = ""
     new_cls_name = make_new_classname(new_monad_group) 
 
     # the new tree dict will contain information about 1 node only, and 
@@ -389,6 +391,8 @@ class SverchGroupTree(NodeTree, SvNodeTreeCommon):
 
     def update(self):
         CurrentEvents.new_event(BlenderEventsTypes.monad_tree_update, self)
+        # nodes or links of the monad were changed, so its execution plan is to be rebuilt
+        get_dependency_graph(self).invalidate()
         affected_trees = {instance.id_data for instance in self.instances}
         for tree in affected_trees:
             tree.update()
@@ -508,6 +512,77 @@ class SverchGroupTree(NodeTree, SvNodeTreeCommon):
 
 
 
+class SvMonadPlan:
+    """
+    Compiled execution plan of a monad: topologically sorted list of nodes
+    to be processed and indexes of linked sockets of the monad's input and output nodes.
+
+    Plans refer to nodes and sockets by names and indexes only, so they can be kept
+    between updates; a plan is valid until nodes or links of the monad tree
+    are changed (see SvDependencyGraph.version).
+    """
+    def __init__(self, monad, endpoints):
+        graph = get_dependency_graph(monad)
+        self.update_list = graph.upstream_list(monad, endpoints)
+        self.graph = graph
+        self.version = graph.version
+        # copies of a tree share tree_id, so the plan also checks the tree name
+        self.monad_name = monad.name
+        self.endpoints = endpoints
+        self.in_node_name = monad.input_node.name
+        self.out_node_name = monad.output_node.name
+        self.linked_inputs = [idx for idx, socket in enumerate(monad.input_node.outputs) if socket.is_linked]
+        self.linked_outputs = [idx for idx, socket in enumerate(monad.output_node.inputs) if socket.is_linked]
+        # whether all items of vectorized monad can be passed through the tree at once
+        nodes = monad.nodes
+        self.is_batchable = all(getattr(nodes[name], 'is_batchable', False) or nodes[name].bl_idname == 'NodeReroute'
+                                for name in self.update_list)
+
+    def is_valid(self, monad, graph, endpoints):
+        return (self.monad_name == monad.name and self.graph is graph
+                and self.version == graph.version and self.endpoints == endpoints)
+
+    def run(self, monad, sockets_data_in):
+        """
+        Pass data to the monad's input node and process the monad tree once.
+        sockets_data_in: data for input sockets of the monad node, by index.
+        """
+        nodes = monad.nodes
+        in_sockets = nodes[self.in_node_name].outputs
+        n = len(sockets_data_in)
+        for idx in self.linked_inputs:
+            if idx < n:
+                in_sockets[idx].sv_set(sockets_data_in[idx])
+
+        do_update(self.update_list, nodes)
+
+    def get_outputs(self, monad, indexes):
+        """Data of the monad's output node inputs with specified indexes"""
+        out_sockets = monad.nodes[self.out_node_name].inputs
+        return [out_sockets[idx].sv_get(deepcopy=False) for idx in indexes]
+
+# monad tree_id -> SvMonadPlan
+monad_plans = {}
+
+# cls_bl_idname -> name of monad tree
+monad_tree_names = {}
+
+def clear_monad_plans():
+    """Forget all plans and tree names, e.g. when another file is loaded"""
+    monad_plans.clear()
+    monad_tree_names.clear()
+
+def prune_monad_plans():
+    """Forget plans and tree names of monad trees which do not exist anymore"""
+    monads = [ng for ng in bpy.data.node_groups if ng.bl_idname == 'SverchGroupTreeType']
+    tree_ids = {ng.tree_id for ng in monads}
+    for tree_id in [tree_id for tree_id in monad_plans if tree_id not in tree_ids]:
+        del monad_plans[tree_id]
+    names = {ng.name for ng in monads}
+    for cls_bl_idname in [cls for cls, name in monad_tree_names.items() if name not in names]:
+        del monad_tree_names[cls_bl_idname]
+
+
 def split_list(data, size=1):
     size = max(1, int(size))
     return (data[i:i+size] for i in range(0, len(data), size))
@@ -545,6 +620,11 @@ class SvGroupNodeExp:
         name="Split", description="Split inputs into lenght 1",
         default=False, update=updateNode)
 
+    batch: BoolProperty(
+        name="Batch",
+        description="Process all items in one pass, if all nodes of the monad support this; otherwise items are processed one by one",
+        default=True, update=updateNode)
+
     loop_me: BoolProperty(default=False, update=updateNode)
     loops_max: IntProperty(default=5, description='maximum')
     loops: IntProperty(
@@ -559,9 +639,15 @@ class SvGroupNodeExp:
 
     @property
     def monad(self):
+        # names of trees are remembered instead of the trees,
+        # as references to Blender data can get invalid after undo
+        tree = bpy.data.node_groups.get(monad_tree_names.get(self.bl_idname, ''))
+        if tree is not None and tree.bl_idname == 'SverchGroupTreeType' and self.bl_idname == tree.cls_bl_idname:
+            return tree
         for tree in bpy.data.node_groups:
             if tree.bl_idname == 'SverchGroupTreeType' and self.bl_idname == tree.cls_bl_idname:
-               return tree
+                monad_tree_names[self.bl_idname] = tree.name
+                return tree
         return None # or raise LookupError or something, anyway big FAIL
 
     def sv_init(self, context):
@@ -595,6 +681,8 @@ class SvGroupNodeExp:
         cA.prop(self, "vectorize", toggle=True)
         cB.active = self.vectorize
         cB.prop(self, "split", toggle=True)
+        if self.vectorize:
+            layout.prop(self, "batch", toggle=True)
         
         c2 = layout.column()
         row = c2.row(align=True)
@@ -629,10 +717,28 @@ class SvGroupNodeExp:
                 endpoint_nodes.append(n.name)
         return endpoint_nodes
 
+    def get_plan(self, monad):
+        """
+        Execution plan of the monad; it is built once and reused
+        until nodes or links of the monad tree are changed.
+        """
+        graph = get_dependency_graph(monad)
+        graph.ensure_valid(monad)
+        endpoints = tuple(self.get_nodes_to_process(monad.output_node.name))
+        plan = monad_plans.get(monad.tree_id)
+        if plan is None:
+            # a new monad, or the file was reloaded; a good moment to drop plans of removed monads
+            prune_monad_plans()
+        if plan is None or not plan.is_valid(monad, graph, endpoints):
+            plan = SvMonadPlan(monad, endpoints)
+            monad_plans[monad.tree_id] = plan
+        return plan
+
     def process(self):
         if not any(s.is_linked for s in self.outputs):
             return
-        if not self.monad:
+        monad = self.monad
+        if not monad:
             return
         if self.vectorize:
             self.process_vectorize()
@@ -641,33 +747,23 @@ class SvGroupNodeExp:
             self.process_looped(self.loops)
             return
 
-        monad = self.monad
-        in_node = monad.input_node
-        out_node = monad.output_node
         monad['current_index'] = 0
         monad['current_total'] = 0
 
-        for index, socket in enumerate(self.inputs):
-            data = socket.sv_get(deepcopy=False)
-            in_node.outputs[index].sv_set(data)
+        sockets_data_in = [socket.sv_get(deepcopy=False) for socket in self.inputs]
+        plan = self.get_plan(monad)
+        plan.run(monad, sockets_data_in)
 
-        node_names = self.get_nodes_to_process(out_node.name)
-        ul = make_tree_from_nodes(node_names, monad, down=False)
-
-        do_update(ul, monad.nodes)
         # set output sockets correctly
-        for index, socket in enumerate(self.outputs):
-            if socket.is_linked:
-                data = out_node.inputs[index].sv_get(deepcopy=False)
-                socket.sv_set(data)
+        linked = [index for index, socket in enumerate(self.outputs) if socket.is_linked]
+        for index, data in zip(linked, plan.get_outputs(monad, linked)):
+            self.outputs[index].sv_set(data)
 
     def process_vectorize(self):
         monad = self.monad
-        in_node = monad.input_node
-        out_node = monad.output_node
-
-        node_names = self.get_nodes_to_process(out_node.name)
-        ul = make_tree_from_nodes(node_names, monad, down=False)
+        plan = self.get_plan(monad)
+        in_sockets = monad.input_node.outputs
+        out_sockets = monad.output_node.inputs
 
         data_out = [[] for s in self.outputs]
 
@@ -681,44 +777,80 @@ class SvGroupNodeExp:
         monad["current_total"] = len(data_in[0])
 
 
-        for master_idx, data in enumerate(zip(*data_in)):
-            for idx, d in enumerate(data):
-                socket = in_node.outputs[idx]
-                if socket.is_linked:
-                    socket.sv_set([d])
+        nodes = monad.nodes
+        linked_inputs = [idx for idx in plan.linked_inputs if idx < len(data_in)]
+        linked_outputs = [idx for idx in plan.linked_outputs if idx < len(data_out)]
+        items = list(zip(*data_in))
+        start_idx = 0
+        if self.batch and plan.is_batchable and len(items) > 1 and linked_outputs:
+            start_idx = self.process_batch(plan, nodes, data_in, data_out, linked_inputs, linked_outputs)
+
+        for master_idx in range(start_idx, len(items)):
+            data = items[master_idx]
+            for idx in linked_inputs:
+                in_sockets[idx].sv_set([data[idx]])
             monad["current_index"] = master_idx
-            do_update(ul, monad.nodes)
-            for idx, s in enumerate(out_node.inputs[:-1]):
-                data_out[idx].extend(s.sv_get(deepcopy=False))
+            do_update(plan.update_list, nodes)
+            for idx in linked_outputs:
+                data_out[idx].extend(out_sockets[idx].sv_get(deepcopy=False))
 
         for idx, socket in enumerate(self.outputs):
             if socket.is_linked:
                 socket.sv_set(data_out[idx])
 
 
-    # ----------- loop (iterate 2)
+    def process_batch(self, plan, nodes, data_in, data_out, linked_inputs, linked_outputs):
+        """
+        Process items of vectorized monad in one pass.
+        The first item is processed separately, to check that the monad makes
+        exactly one object per item; other items are then passed to the monad
+        all together, and the result is accepted if it has one object per item.
+        Returns the index of the first item which is still to be processed
+        one by one (1 if batch processing failed, or number of items).
+        """
+        monad = self.monad
+        in_sockets = nodes[plan.in_node_name].outputs
+        out_sockets = nodes[plan.out_node_name].inputs
+        n_items = len(data_in[0])
+
+        for idx in linked_inputs:
+            in_sockets[idx].sv_set(list(data_in[idx][:1]))
+        monad["current_index"] = 0
+        do_update(plan.update_list, nodes)
+        first = [out_sockets[idx].sv_get(deepcopy=False) for idx in linked_outputs]
+        for idx, data in zip(linked_outputs, first):
+            data_out[idx].extend(data)
+        if any(len(data) != 1 for data in first):
+            return 1
+
+        for idx in linked_inputs:
+            in_sockets[idx].sv_set(list(data_in[idx][1:]))
+        monad["current_index"] = 1
+        do_update(plan.update_list, nodes)
+        try:
+            rest = [out_sockets[idx].sv_get(deepcopy=False) for idx in linked_outputs]
+        except Exception:
+            return 1
+        if any(len(data) != n_items - 1 for data in rest):
+            return 1
+        for idx, data in zip(linked_outputs, rest):
+            data_out[idx].extend(data)
+        return n_items
 
-    def do_process(self, sockets_data_in):
+    # ----------- loop (iterate 2)
 
-        monad = self.monad
-        in_node = monad.input_node
-        out_node = monad.output_node
+    def do_process(self, sockets_data_in, monad=None, plan=None):
 
-        for index, data in enumerate(sockets_data_in):
-            in_node.outputs[index].sv_set(data)        
+        if monad is None:
+            monad = self.monad
+        if plan is None:
+            plan = self.get_plan(monad)
 
-        node_names = self.get_nodes_to_process(out_node.name)
-        ul = make_tree_from_nodes(node_names, monad, down=False)
-        do_update(ul, monad.nodes)
+        plan.run(monad, sockets_data_in)
 
         # set output sockets correctly
-        socket_data_out = []
-        for index, socket in enumerate(self.outputs):
-            if socket.is_linked:
-                data = out_node.inputs[index].sv_get(deepcopy=False)
-                socket_data_out.append(data)
-
-        return socket_data_out
+        linked = [index for index, socket in enumerate(self.outputs) if socket.is_linked]
+        return plan.get_outputs(monad, linked)
 
 
     def apply_output(self, socket_data):
@@ -733,15 +865,15 @@ class SvGroupNodeExp:
         monad['current_total'] = iterations_remaining
         monad['current_index'] = 0
 
-        in_node = monad.input_node
-        out_node = monad.output_node
+        # the plan does not change between iterations
+        plan = self.get_plan(monad)
 
         for iteration in range(iterations_remaining):
             # if 'Monad Info' in monad.nodes:
             #     info_node = monad.nodes['Monad Info']
             #     info_node.outputs[0].sv_set([[iteration]])
             monad["current_index"] = iteration
-            sockets_in = self.do_process(sockets_in)
+            sockets_in = self.do_process(sockets_in, monad, plan)
         self.apply_output(sockets_in)
 
 
@@ -0,0 +1,241 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Statistics of node processing, gathered across many updates.
+
+When enabled in preferences, the update system stores a record for each
+processed node: wall time, sizes of input and output data and, optionally,
+memory allocated during processing (measured with tracemalloc).
+Records are kept in a ring buffer, so only the latest records are available.
+
+Usage from Blender's python console:
+
+>>> from sverchok.core.node_stats import node_stats
+>>> for item in node_stats.top_nodes(5): print(item)
+>>> node_stats.export_chrome_trace("/tmp/trace.json")  # open in chrome://tracing
+>>> node_stats.export_csv("/tmp/nodes.csv")
+"""
+
+import collections
+import csv
+import json
+import threading
+import tracemalloc
+
+from sverchok.core.socket_data import socket_data_cache, sentinel
+from sverchok.core.process_cache import estimate_data_size
+
+# global switches, see update_node_stats_settings
+node_stats_enabled = False
+node_stats_trace_memory = False
+# whether tracemalloc was started by us and so should be stopped by us
+_tracemalloc_started = False
+
+def update_node_stats_settings(self, context):
+    global node_stats_enabled
+    global node_stats_trace_memory
+    global _tracemalloc_started
+    node_stats_enabled = self.node_stats_enabled
+    node_stats_trace_memory = self.node_stats_enabled and self.node_stats_trace_memory
+    node_stats.resize(self.node_stats_size)
+    if node_stats_trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracemalloc_started = True
+    elif not node_stats_trace_memory and _tracemalloc_started:
+        tracemalloc.stop()
+        _tracemalloc_started = False
+
+
+NodeRecord = collections.namedtuple('NodeRecord',
+        ['update', 'tree_name', 'node_name', 'bl_idname', 'start', 'duration', 'thread',
+         'input_size', 'output_size', 'memory'])
+NodeRecord.__doc__ = """
+Statistics of one call of node's process().
+update: number of the update during which the node was processed;
+start, duration: wall time in seconds (time.perf_counter);
+input_size, output_size: approximate size of socket data in bytes;
+memory: peak memory allocated during processing, in bytes
+(or memory allocated and not released, with Python < 3.9),
+None if memory is not traced.
+"""
+
+NodeSummary = collections.namedtuple('NodeSummary',
+        ['tree_name', 'node_name', 'bl_idname', 'calls', 'total', 'mean', 'max',
+         'input_size', 'output_size', 'memory'])
+
+
+class SvNodeStats:
+    """Ring buffer of NodeRecord items"""
+    def __init__(self, size=10000):
+        self.records = collections.deque(maxlen=size)
+        self.update_count = 0
+        self.lock = threading.Lock()
+
+    def resize(self, size):
+        if size != self.records.maxlen:
+            with self.lock:
+                self.records = collections.deque(self.records, maxlen=size)
+
+    def new_update(self):
+        """Number for records of the next update"""
+        with self.lock:
+            self.update_count += 1
+            return self.update_count
+
+    def add(self, record):
+        with self.lock:
+            self.records.append(record)
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+            self.update_count = 0
+
+    def get_records(self, tree_name=None):
+        with self.lock:
+            records = list(self.records)
+        if tree_name is not None:
+            records = [record for record in records if record.tree_name == tree_name]
+        return records
+
+    def top_nodes(self, count=10, sort='total', tree_name=None):
+        """
+        Nodes which took most of time.
+        sort: one of 'total', 'mean', 'max', 'calls', 'memory'.
+        Returns a list of NodeSummary items; sizes are mean values, memory is the maximum value.
+        """
+        grouped = collections.OrderedDict()
+        for record in self.get_records(tree_name):
+            grouped.setdefault((record.tree_name, record.node_name), []).append(record)
+
+        summaries = []
+        for (tree, name), records in grouped.items():
+            calls = len(records)
+            durations = [record.duration for record in records]
+            memory = [record.memory for record in records if record.memory is not None]
+            summaries.append(NodeSummary(
+                    tree_name = tree,
+                    node_name = name,
+                    bl_idname = records[-1].bl_idname,
+                    calls = calls,
+                    total = sum(durations),
+                    mean = sum(durations) / calls,
+                    max = max(durations),
+                    input_size = sum(record.input_size for record in records) // calls,
+                    output_size = sum(record.output_size for record in records) // calls,
+                    memory = max(memory) if memory else None))
+
+        key = lambda summary: getattr(summary, sort) or 0
+        summaries.sort(key=key, reverse=True)
+        return summaries[:count]
+
+    def to_chrome_trace(self, tree_name=None):
+        """Records in Chrome trace event format, which can be loaded in chrome://tracing or Perfetto"""
+        records = self.get_records(tree_name)
+        threads = dict()
+        events = []
+        for record in records:
+            tid = threads.setdefault(record.thread, len(threads))
+            events.append(dict(
+                    name = record.node_name,
+                    cat = record.tree_name,
+                    ph = 'X',
+                    ts = record.start * 1e6,
+                    dur = record.duration * 1e6,
+                    pid = 0,
+                    tid = tid,
+                    args = dict(
+                        update = record.update,
+                        bl_idname = record.bl_idname,
+                        input_size = record.input_size,
+                        output_size = record.output_size,
+                        memory = record.memory)))
+        return dict(traceEvents = events, displayTimeUnit = 'ms')
+
+    def export_chrome_trace(self, path, tree_name=None):
+        with open(path, 'w') as output:
+            json.dump(self.to_chrome_trace(tree_name), output)
+
+    def export_csv(self, path, tree_name=None):
+        with open(path, 'w', newline='') as output:
+            writer = csv.writer(output)
+            writer.writerow(NodeRecord._fields)
+            writer.writerows(self.get_records(tree_name))
+
+
+node_stats = SvNodeStats()
+
+def clear_node_stats():
+    node_stats.clear()
+
+
+def sockets_data_size(sockets):
+    size = 0
+    for socket in sockets:
+        if not socket.is_linked:
+            continue
+        if socket.is_output:
+            source = socket
+        else:
+            source = socket.other
+            if source is None or not hasattr(source, 'socket_id'):
+                continue
+        data = socket_data_cache.get(source.id_data.tree_id, {}).get(source.socket_id, sentinel)
+        if data is not sentinel:
+            size += estimate_data_size(data)
+    return size
+
+
+def start_memory_trace():
+    """
+    Call before processing of a node. Returns the value to be passed to record_node.
+    """
+    if not (node_stats_trace_memory and tracemalloc.is_tracing()):
+        return None
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def record_node(update, node, start, duration, memory_start=None, thread=None):
+    """
+    Store statistics of processed node.
+    Memory is only measured for nodes processed in the main thread,
+    as tracemalloc counts allocations of all threads.
+    """
+    memory = None
+    if memory_start is not None and tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak'):
+            memory = peak - memory_start
+        else:
+            memory = max(0, current - memory_start)
+    if thread is None:
+        thread = threading.get_ident()
+    node_stats.add(NodeRecord(
+            update = update,
+            tree_name = node.id_data.name,
+            node_name = node.name,
+            bl_idname = node.bl_idname,
+            start = start,
+            duration = duration,
+            thread = thread,
+            input_size = sockets_data_size(node.inputs),
+            output_size = sockets_data_size(node.outputs),
+            memory = memory))
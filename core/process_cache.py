@@ -0,0 +1,241 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Memoization of node processing results.
+
+Nodes which declare is_memoizable = True are supposed to produce outputs
+depending only on their properties and on data of their input sockets.
+For such nodes the update system looks up a key made of node properties
+and fingerprints of input data; if the key is found, stored outputs are
+written into socket data cache and process() is not called.
+
+Cached results are kept in LRU order; least recently used results are
+dropped when total size of cached data exceeds the budget set in
+preferences.
+"""
+
+import collections
+import sys
+import threading
+
+import numpy as np
+
+from sverchok.core.socket_data import (
+    socket_data_cache, sentinel, data_fingerprint, SvUnhashableData, SvSetSocket)
+from sverchok.utils.handle_blender_data import BPYNode
+from sverchok.utils.logging import debug
+
+# global switch and memory budget in bytes, see update_process_cache_settings
+process_cache_enabled = True
+process_cache_budget = 256 * 1024 * 1024
+
+def update_process_cache_settings(self, context):
+    global process_cache_enabled
+    global process_cache_budget
+    process_cache_enabled = self.process_cache_enabled
+    process_cache_budget = self.process_cache_size * 1024 * 1024
+    process_cache.evict(process_cache_budget)
+
+
+class IdentityKey:
+    """
+    Key part for data which can not be fingerprinted (curves, fields, ...).
+    Such data is equal only to itself; the key keeps a reference
+    to the data so its id can not be reused while the key is alive.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __hash__(self):
+        return id(self.data)
+
+    def __eq__(self, other):
+        return isinstance(other, IdentityKey) and other.data is self.data
+
+
+def input_fingerprint(data):
+    try:
+        return data_fingerprint(data)
+    except SvUnhashableData:
+        return IdentityKey(data)
+
+
+def estimate_data_size(data):
+    """
+    Approximate size of socket data in bytes.
+    Lists are supposed to be homogeneous, so only the first item is measured.
+    """
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, (list, tuple)):
+        size = sys.getsizeof(data)
+        if data:
+            size += len(data) * estimate_data_size(data[0])
+        return size
+    return sys.getsizeof(data)
+
+
+def _property_value(prop):
+    if prop.type == 'COLLECTION':
+        return repr(prop.value)
+    return prop.value
+
+
+def node_cache_key(node):
+    """
+    Key of current state of the node: its properties, fingerprints of input data,
+    set of linked outputs (nodes usually skip calculation of unlinked outputs)
+    and draft mode flag of the tree (nodes supporting draft mode use other
+    properties in it).
+    """
+    properties = tuple((prop.name, _property_value(prop)) for prop in BPYNode(node).properties if prop.is_valid)
+    inputs = []
+    for socket in node.inputs:
+        other = socket.other if socket.is_linked else None
+        if other is not None and hasattr(other, 'socket_id'):
+            data = socket_data_cache.get(other.id_data.tree_id, {}).get(other.socket_id, sentinel)
+            if data is sentinel:
+                return None
+        else:
+            data = socket.sv_get(default=None, deepcopy=False)
+        inputs.append((socket.identifier, input_fingerprint(data)))
+    linked_outputs = tuple(socket.identifier for socket in node.outputs if socket.is_linked)
+    draft = getattr(node.id_data, 'sv_draft', False)
+    return (node.id_data.tree_id, node.node_id, draft, properties, tuple(inputs), linked_outputs)
+
+
+class SvProcessCache:
+    """LRU storage of node outputs"""
+    def __init__(self):
+        self.items = collections.OrderedDict()  # key -> (outputs, size)
+        self.total_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self.items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, outputs, budget):
+        size = sum(estimate_data_size(data) for data in outputs.values())
+        if size > budget:
+            return
+        with self.lock:
+            old = self.items.pop(key, None)
+            if old is not None:
+                self.total_size -= old[1]
+            self.items[key] = (outputs, size)
+            self.total_size += size
+        self.evict(budget)
+
+    def evict(self, budget):
+        with self.lock:
+            while self.items and self.total_size > budget:
+                _, (_, size) = self.items.popitem(last=False)
+                self.total_size -= size
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.total_size = 0
+            self.hits = 0
+            self.misses = 0
+
+
+process_cache = SvProcessCache()
+
+def clear_process_cache():
+    process_cache.clear()
+
+
+def _restore_outputs(node, key):
+    outputs = process_cache.get(key) if key is not None else None
+    if outputs is None:
+        return False
+    for socket in node.outputs:
+        data = outputs.get(socket.identifier, sentinel)
+        if data is not sentinel:
+            SvSetSocket(socket, data)
+    debug("Node %s: outputs are restored from cache", node.name)
+    return True
+
+def _store_outputs(node, key):
+    if key is None:
+        return
+    tree_data = socket_data_cache.get(node.id_data.tree_id, {})
+    outputs = dict()
+    for socket in node.outputs:
+        data = tree_data.get(socket.socket_id, sentinel)
+        if data is not sentinel:
+            outputs[socket.identifier] = data
+    process_cache.put(key, outputs, process_cache_budget)
+
+def _is_cached(node):
+    return process_cache_enabled and getattr(node, 'is_memoizable', False)
+
+def process_node(node):
+    """
+    Call process() of the node or restore its outputs from the cache
+    if the node is memoizable and was already processed with the same properties and inputs.
+    """
+    if not _is_cached(node):
+        node.process()
+        return
+
+    key = node_cache_key(node)
+    if _restore_outputs(node, key):
+        return
+    node.process()
+    _store_outputs(node, key)
+
+
+def prepare_node_threaded(node):
+    """
+    Main thread part of processing of a thread-safe node in parallel update.
+    Returns None if outputs of the node are restored from the cache or
+    there is nothing to calculate; otherwise returns a pair
+    (function to be called in a worker thread, cache key).
+    """
+    key = None
+    if _is_cached(node):
+        key = node_cache_key(node)
+        if _restore_outputs(node, key):
+            return None
+    calculate = node.prepare_threaded()
+    if calculate is None:
+        return None
+    return calculate, key
+
+def finish_node_threaded(node, outputs, key):
+    """
+    Write outputs calculated in a worker thread into sockets of the node
+    and store them in the cache; called in the main thread.
+    """
+    for name, data in outputs.items():
+        node.outputs[name].sv_set(data)
+    _store_outputs(node, key)
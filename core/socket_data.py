@@ -16,6 +16,12 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import hashlib
+import struct
+from itertools import chain
+
+import numpy as np
+
 from sverchok import data_structure
 from sverchok.utils.logging import warning, info, debug
 
@@ -43,6 +49,213 @@ def sv_deep_copy(lst):
     return lst
 
 
+#####################################
+# copy on write                     #
+#####################################
+
+# How SvGetSocket provides data to nodes which can mutate it:
+# 'DEEPCOPY' - make deep copy of the data at once,
+# 'COPY_ON_WRITE' - return SvCowList views, nested lists are copied only when accessed.
+socket_data_mode = 'DEEPCOPY'
+
+# debug mode: check that nodes do not change data of their input sockets
+check_socket_data_writes = False
+
+def update_socket_data_settings(self, context):
+    global socket_data_mode
+    global check_socket_data_writes
+    socket_data_mode = self.socket_data_mode
+    check_socket_data_writes = self.check_socket_data_writes
+
+
+def read_only_array(array):
+    """return a view of numpy array which can not be written into"""
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def _has_mutable_items(lst):
+    # the same heuristic as in sv_deep_copy: data is supposed to be homogeneous
+    first = lst[0]
+    if isinstance(first, (list, np.ndarray)):
+        return True
+    return isinstance(first, tuple) and len(first) > 0 and isinstance(first[0], (list, tuple, np.ndarray))
+
+
+def sv_cow_copy(data):
+    """
+    Copy-on-write counterpart of sv_deep_copy.
+    Lists of immutable items (numbers, strings, tuples of numbers) are just shallow copied;
+    lists which contain mutable items are wrapped into SvCowList, which copies
+    nested items only at the moment when they are accessed.
+    Numpy arrays are returned as read only views.
+    """
+    if isinstance(data, (list, tuple)):
+        if data and _has_mutable_items(data):
+            return SvCowList(data)
+        return data[:]
+    if isinstance(data, np.ndarray):
+        return read_only_array(data)
+    return data
+
+
+class SvCowList(list):
+    """
+    Copy-on-write view of nested list data.
+    The list itself is a shallow copy of the original list, so it can be
+    changed freely (append, sort, item assignment...). Nested items of the
+    original list are shared until they are accessed: at the first access
+    an item is replaced by its own copy-on-write copy.
+    Nested numpy arrays are returned as read only views.
+    """
+    __slots__ = ()
+
+    def _own(self, index):
+        item = list.__getitem__(self, index)
+        if isinstance(item, (list, tuple, np.ndarray)) and not isinstance(item, SvCowList):
+            copied = sv_cow_copy(item)
+            if copied is not item:
+                list.__setitem__(self, index, copied)
+            return copied
+        return item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SvCowList(list.__getitem__(self, index))
+        return self._own(index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._own(i)
+
+    def __reversed__(self):
+        for i in range(len(self) - 1, -1, -1):
+            yield self._own(i)
+
+    def pop(self, index=-1):
+        item = self._own(index)
+        list.pop(self, index)
+        return item
+
+    def copy(self):
+        return SvCowList(self)
+
+    def __add__(self, other):
+        result = SvCowList(self)
+        result.extend(other)
+        return result
+
+    def __mul__(self, count):
+        return SvCowList(list.__mul__(self, count))
+
+    __rmul__ = __mul__
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+
+class SvUnhashableData(TypeError):
+    """Raised when socket data can not be fingerprinted"""
+    pass
+
+
+def _update_fingerprint(digest, data):
+    """
+    Feed data into hashlib digest. Every item is written with a type tag
+    and its length or shape, so that different data structures
+    can not produce the same stream of bytes.
+    """
+    if isinstance(data, (list, tuple)):
+        if data and isinstance(data[0], (int, float, list, tuple, np.number)) and not isinstance(data[0], bool):
+            # Fast path for lists of numbers, vertices, matrices and so on
+            try:
+                array = np.array(data)
+            except (ValueError, TypeError, OverflowError):
+                array = None
+            if array is not None and array.dtype.kind in 'biuf':
+                digest.update(b'L')
+                _update_fingerprint(digest, array)
+                return
+            if array is None and isinstance(data[0], (list, tuple)):
+                # Lists of different length, like faces
+                try:
+                    lengths = np.array([len(item) for item in data])
+                    flat = np.array(list(chain.from_iterable(data)))
+                except (ValueError, TypeError, OverflowError):
+                    flat = None
+                if flat is not None and flat.ndim == 1 and flat.dtype.kind in 'biuf':
+                    digest.update(b'R')
+                    _update_fingerprint(digest, lengths)
+                    _update_fingerprint(digest, flat)
+                    return
+        digest.update(b'[%d]' % len(data))
+        for item in data:
+            _update_fingerprint(digest, item)
+    elif isinstance(data, np.ndarray):
+        digest.update(b'A%s%r' % (data.dtype.str.encode(), data.shape))
+        if data.dtype == object:
+            for item in data.flat:
+                _update_fingerprint(digest, item)
+        else:
+            digest.update(np.ascontiguousarray(data).view(np.uint8))
+    elif isinstance(data, np.number):
+        _update_fingerprint(digest, np.asarray(data))
+    elif isinstance(data, bool):
+        digest.update(b'b1' if data else b'b0')
+    elif isinstance(data, int):
+        text = str(data).encode()
+        digest.update(b'i%d:%s' % (len(text), text))
+    elif isinstance(data, float):
+        digest.update(b'f' + struct.pack('<d', data))
+    elif isinstance(data, str):
+        text = data.encode('utf-8', 'surrogatepass')
+        digest.update(b's%d:%s' % (len(text), text))
+    elif data is None:
+        digest.update(b'n')
+    elif type(data).__module__ == 'mathutils' and hasattr(data, '__len__'):
+        digest.update(b'M%s:' % type(data).__name__.encode())
+        _update_fingerprint(digest, [tuple(item) if hasattr(item, '__len__') else item for item in data])
+    else:
+        raise SvUnhashableData(f"Can not fingerprint data of type {type(data).__name__}")
+
+def data_fingerprint(data):
+    """
+    Return a hashable fingerprint of socket data: blake2b digest of the
+    data contents, including types, lengths, dtypes and shapes.
+    Two data structures with equal fingerprints are considered equal.
+    Only plain data is supported: numbers, strings, nested lists / tuples,
+    numpy arrays and mathutils-like sequences (Vector, Matrix, Quaternion, ...).
+    For anything else (curves, fields, Blender objects) SvUnhashableData is raised,
+    because such objects can be changed in place without being replaced.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _update_fingerprint(digest, data)
+    return digest.digest()
+
+
+def get_output_fingerprint(node):
+    """
+    Fingerprint of all data that the node has written into its linked output sockets.
+    Returns None if any of outputs contains data that can not be fingerprinted.
+    """
+    global socket_data_cache
+    tree_data = socket_data_cache.get(node.id_data.tree_id, {})
+    result = []
+    try:
+        for socket in node.outputs:
+            if not socket.is_linked or not hasattr(socket, 'socket_id'):
+                continue
+            data = tree_data.get(socket.socket_id, sentinel)
+            if data is sentinel:
+                result.append(None)
+            else:
+                result.append(data_fingerprint(data))
+    except SvUnhashableData:
+        return None
+    return tuple(result)
+
+
 # Build string for showing in socket label
 def SvGetSocketInfo(socket):
     """returns string to show in socket label"""
@@ -94,6 +307,12 @@ def SvSetSocket(socket, out):
     if s_ng not in socket_data_cache:
         socket_data_cache[s_ng] = {}
     socket_data_cache[s_ng][s_id] = out
+    if check_socket_data_writes:
+        freeze_arrays(out)
+        try:
+            socket_data_fingerprints.setdefault(s_ng, {})[s_id] = data_fingerprint(out)
+        except SvUnhashableData:
+            socket_data_fingerprints.setdefault(s_ng, {}).pop(s_id, None)
 
 
 def SvGetSocket(socket, deepcopy=True):
@@ -111,10 +330,12 @@ def SvGetSocket(socket, deepcopy=True):
             raise LookupError
         if s_id in socket_data_cache[s_ng]:
             out = socket_data_cache[s_ng][s_id]
-            if deepcopy:
-                return sv_deep_copy(out)
-            else:
+            if not deepcopy:
                 return out
+            elif socket_data_mode == 'COPY_ON_WRITE':
+                return sv_cow_copy(out)
+            else:
+                return sv_deep_copy(out)
         else:
             if data_structure.DEBUG_MODE:
                 debug(f"cache miss: {socket.node.name} -> {socket.name} from: {other.node.name} -> {other.name}")
@@ -122,6 +343,47 @@ def SvGetSocket(socket, deepcopy=True):
     # not linked
     raise SvNoDataError(socket)
 
+# fingerprints of data at the moment when it was written, used if check_socket_data_writes is on
+socket_data_fingerprints = {}
+
+def freeze_arrays(data):
+    """mark all numpy arrays in the data structure as read only"""
+    if isinstance(data, np.ndarray):
+        data.flags.writeable = False
+    elif isinstance(data, (list, tuple)) and data and _has_mutable_items(data):
+        for item in data:
+            freeze_arrays(item)
+
+
+class SvSharedDataChangedError(Exception):
+    pass
+
+
+def check_input_data_unchanged(node):
+    """
+    Raise SvSharedDataChangedError if the node has changed data of its input sockets,
+    i.e. data which is shared with the node upstream and other nodes.
+    Does nothing unless check_socket_data_writes is on.
+    """
+    if not check_socket_data_writes:
+        return
+    for socket in node.inputs:
+        if not socket.is_linked:
+            continue
+        other = socket.other
+        if other is None or not hasattr(other, 'socket_id'):
+            continue
+        s_ng = other.id_data.tree_id
+        expected = socket_data_fingerprints.get(s_ng, {}).get(other.socket_id)
+        data = socket_data_cache.get(s_ng, {}).get(other.socket_id, sentinel)
+        if expected is None or data is sentinel:
+            continue
+        if data_fingerprint(data) != expected:
+            raise SvSharedDataChangedError(
+                f"Node {node.name} has changed data of input socket {socket.name}; "
+                f"use deepcopy=True to get own copy of the data")
+
+
 class SvNoDataError(LookupError):
     def __init__(self, socket=None, node=None, msg=None):
         
@@ -179,6 +441,7 @@ def reset_socket_cache(ng):
     """
     global socket_data_cache
     socket_data_cache[ng.tree_id] = {}
+    socket_data_fingerprints.pop(ng.tree_id, None)
 
 def clear_all_socket_cache():
     """
@@ -186,3 +449,4 @@ def clear_all_socket_cache():
     """
     global socket_data_cache
     socket_data_cache.clear()
+    socket_data_fingerprints.clear()
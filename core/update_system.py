@@ -17,19 +17,28 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import collections
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from itertools import chain
 
 import bpy
 from mathutils import Vector
 
 from sverchok import data_structure
-from sverchok.core.socket_data import SvNoDataError, reset_socket_cache
+from sverchok.core.socket_data import (
+    SvNoDataError, reset_socket_cache, get_output_fingerprint,
+    check_input_data_unchanged, update_socket_data_settings)
 from sverchok.utils.logging import debug, info, warning, error, exception
 from sverchok.utils.profile import profile
 from sverchok.utils.exception_drawing_with_bgl import clear_exception_drawing_with_bgl, start_exception_drawing_with_bgl
 from sverchok.core.socket_data import clear_all_socket_cache
 from sverchok.core.node_id_dict import clear_nodes_id_dict
+from sverchok.core.process_cache import (
+    process_node, prepare_node_threaded, finish_node_threaded,
+    clear_process_cache, update_process_cache_settings)
+from sverchok.core import node_stats
 from sverchok.core.links import clear_link_memory
 import sverchok
 
@@ -54,6 +63,9 @@ def is_first_run():
 def clear_system_cache():
     print("cleaning Sverchok cache")
     clear_all_socket_cache()
+    clear_dependency_graphs()
+    clear_process_cache()
+    node_stats.clear_node_stats()
     clear_nodes_id_dict()
     clear_link_memory()
 
@@ -65,8 +77,6 @@ def update_error_colors(self, context):
 
 # cache node group update trees
 update_cache = {}
-# cache for partial update lists
-partial_update_cache = {}
 
 
 def make_dep_dict(node_tree, down=False):
@@ -252,6 +262,173 @@ def make_tree_from_nodes(node_names, tree, down=True):
         return make_update_list(ng, out_set)
 
 
+class SvDependencyGraph:
+    """
+    Persistent dependency graph of one node tree.
+
+    It is built once from the tree and after that it is kept up to date
+    by link add / remove events (see SvLinks.get_links_changes).
+    Each change of the graph increments its version and drops cached update lists.
+
+    The graph also keeps output fingerprints of nodes. A node without
+    fingerprint is dirty, i.e. it has to be processed on next update
+    whether its inputs have changed or not.
+    """
+    def __init__(self):
+        self.up = collections.defaultdict(set)
+        self.down = collections.defaultdict(set)
+        self.node_names = frozenset()
+        self.tree_name = None
+        self.version = 0
+        self.is_valid = False
+        self.fingerprints = dict()
+        self.update_lists = dict()  # frozenset of source names -> update list
+        self.upstream_lists = dict()  # frozenset of target names -> update list
+
+    def _changed(self):
+        self.version += 1
+        self.update_lists.clear()
+        self.upstream_lists.clear()
+
+    def invalidate(self):
+        self.is_valid = False
+        self._changed()
+
+    def rebuild(self, ng):
+        self.up = make_dep_dict(ng)
+        self.down = make_dep_dict(ng, down=True)
+        self.node_names = frozenset(ng.nodes.keys())
+        self.tree_name = ng.name
+        self.fingerprints = {name: fp for name, fp in self.fingerprints.items() if name in self.node_names}
+        self.is_valid = True
+        self._changed()
+
+    def ensure_valid(self, ng):
+        """
+        Rebuild the graph if it was invalidated or nodes were added, removed or renamed;
+        also if it was built for another tree, as copies of a tree share tree_id
+        """
+        if not self.is_valid or self.tree_name != ng.name or self.node_names != set(ng.nodes.keys()):
+            self.rebuild(ng)
+
+    def add_link(self, from_name, to_name):
+        self.down[from_name].add(to_name)
+        self.up[to_name].add(from_name)
+        self._changed()
+
+    def remove_link(self, from_name, to_name):
+        self.down[from_name].discard(to_name)
+        self.up[to_name].discard(from_name)
+        self._changed()
+
+    def apply_link_changes(self, ng, added, removed):
+        """
+        Update the graph according to lists of added and removed SvLink's.
+        Falls back to full rebuild if the change can not be applied locally,
+        for example when reroutes or wifi nodes are involved.
+        """
+        if not self.is_valid:
+            return
+        nodes_by_id = ng.nodes_dict.get(ng)
+        changes = []
+        for links, is_added in ((added, True), (removed, False)):
+            for link in links:
+                from_node = nodes_by_id.get(link.from_node_id)
+                to_node = nodes_by_id.get(link.to_node_id)
+                if from_node is None or to_node is None:
+                    self.invalidate()
+                    return
+                changes.append((from_node, to_node, is_added))
+
+        special_nodes = {'WifiInNode', 'WifiOutNode', 'NodeReroute'}
+        nodes = ng.nodes
+        for from_node, to_node, is_added in changes:
+            neighbours = chain([from_node, to_node], self.down[from_node.name], self.up[to_node.name])
+            for node in neighbours:
+                if not isinstance(node, str):
+                    node = node.name
+                if node not in nodes or nodes[node].bl_idname in special_nodes:
+                    # the SvLink could be made through reroutes, it's easier to rebuild everything
+                    self.invalidate()
+                    return
+            direct = any(link.from_node == from_node and not link.is_hidden
+                         for socket in to_node.inputs for link in socket.links)
+            if is_added and direct:
+                self.add_link(from_node.name, to_node.name)
+            elif is_added:
+                self.invalidate()
+                return
+            elif not direct:
+                # otherwise there is still another link between these nodes
+                self.remove_link(from_node.name, to_node.name)
+
+    def update_list(self, ng, node_names):
+        """
+        Topologically sorted list of given nodes and all nodes downstream of them.
+        Lists are cached until the next change of the graph.
+        """
+        self.ensure_valid(ng)
+        return self._closure_list(ng, node_names, self.down, self.update_lists)
+
+    def upstream_list(self, ng, node_names):
+        """
+        Topologically sorted list of given nodes and all nodes upstream of them,
+        i.e. of nodes which are to be processed to get inputs of the given nodes.
+        Lists are cached until the next change of the graph.
+        """
+        self.ensure_valid(ng)
+        return self._closure_list(ng, node_names, self.up, self.upstream_lists)
+
+    def _closure_list(self, ng, node_names, links, cache):
+        key = frozenset(node_names)
+        update_list = cache.get(key)
+        if update_list is None:
+            out_set = set(node_names)
+            out_stack = collections.deque(node_names)
+            while out_stack:
+                for name in links[out_stack.pop()]:
+                    if name not in out_set:
+                        out_set.add(name)
+                        out_stack.append(name)
+            if len(out_set) == 1:
+                update_list = list(out_set)
+            else:
+                update_list = make_update_list(ng, out_set, self.up)
+            cache[key] = update_list
+        return update_list
+
+    def is_dirty(self, name):
+        return self.fingerprints.get(name) is None
+
+    def mark_dirty(self, names):
+        for name in names:
+            self.fingerprints.pop(name, None)
+
+    def set_fingerprint(self, name, fingerprint):
+        """Store new output fingerprint of the node, return True if outputs have changed"""
+        previous = self.fingerprints.get(name)
+        self.fingerprints[name] = fingerprint
+        return fingerprint is None or previous != fingerprint
+
+
+# tree_id -> SvDependencyGraph
+dependency_graphs = {}
+
+def get_dependency_graph(ng):
+    graph = dependency_graphs.get(ng.tree_id)
+    if graph is None:
+        graph = SvDependencyGraph()
+        dependency_graphs[ng.tree_id] = graph
+    return graph
+
+def update_dependency_graph(ng, added, removed):
+    """Apply link events of the tree to its dependency graph"""
+    get_dependency_graph(ng).apply_link_changes(ng, added, removed)
+
+def clear_dependency_graphs():
+    dependency_graphs.clear()
+
+
 # to make update tree based on node types and node names bases
 # no used yet
 # should add a check do find animated or driven nodes.
@@ -358,10 +535,25 @@ def reset_error_nodes(ng):
         del ng["error nodes"]
 
 
+def report_node_error(ng, node_name, err, error_text):
+    update_error_nodes(ng, node_name, err)
+    #traceback.print_tb(err.__traceback__)
+    exception("Node %s had exception: %s", node_name, err)
+
+    if hasattr(ng, "sv_show_error_in_tree"):
+        # not yet supported in monad trees..
+        if ng.sv_show_error_in_tree:
+            start_exception_drawing_with_bgl(ng, node_name, error_text, err)
+
+
 @profile(section="UPDATE")
-def do_update_general(node_list, nodes, procesed_nodes=set()):
+def do_update_general(node_list, nodes, procesed_nodes=set(), sources=None):
     """
-    General update function for node set
+    General update function for node set.
+    If sources (names of nodes which initiated the update) are given,
+    the propagation stops at nodes whose outputs have not changed:
+    a node is skipped if it is not dirty and none of its upstream nodes
+    produced new data during this update.
     """
     global graphs
     timings = []
@@ -371,20 +563,38 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
     total_time = 0
     done_nodes = set(procesed_nodes)
 
+    ng = nodes.id_data
+    dep_graph = get_dependency_graph(ng)
+    if sources is not None:
+        changed_nodes = set(sources)
+    else:
+        # outputs of these nodes are not tracked during this update
+        dep_graph.mark_dirty(node_list)
+        changed_nodes = None
+
+    stats_update = node_stats.node_stats.new_update() if node_stats.node_stats_enabled else None
+
     # this is a no-op if no bgl being drawn.
     clear_exception_drawing_with_bgl(nodes)
 
     for node_name in node_list:
         if node_name in done_nodes:
             continue
+        if changed_nodes is not None and node_name not in changed_nodes:
+            if not dep_graph.is_dirty(node_name) and changed_nodes.isdisjoint(dep_graph.up[node_name]):
+                continue
         try:
             node = nodes[node_name]
+            memory_start = node_stats.start_memory_trace() if stats_update else None
             start = time.perf_counter()
             if hasattr(node, "process"):
-                node.process()
+                process_node(node)
+            check_input_data_unchanged(node)
 
             delta = time.perf_counter() - start
             total_time += delta
+            if stats_update:
+                node_stats.record_node(stats_update, node, start, delta, memory_start)
 
             if data_structure.DEBUG_MODE:
                 debug("Processed  %s in: %.4f", node_name, delta)
@@ -396,18 +606,13 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
             # reroute nodes can be in node variable
             [s.update_objects_number() for s in chain(node.inputs, node.outputs) if hasattr(s, 'update_objects_number')]
 
+            if changed_nodes is not None:
+                if dep_graph.set_fingerprint(node_name, get_output_fingerprint(node)):
+                    changed_nodes.add(node_name)
+
         except Exception as err:
-            ng = nodes.id_data
-            update_error_nodes(ng, node_name, err)
-            #traceback.print_tb(err.__traceback__)
-            exception("Node %s had exception: %s", node_name, err)
-            
-            if hasattr(ng, "sv_show_error_in_tree"):
-                # not yet supported in monad trees..
-                if ng.sv_show_error_in_tree:
-                    error_text = traceback.format_exc()
-                    start_exception_drawing_with_bgl(ng, node_name, error_text, err)
-            
+            dep_graph.mark_dirty([node_name])
+            report_node_error(ng, node_name, err, traceback.format_exc())
             return None
 
     graphs.append(graph)
@@ -417,11 +622,166 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
     return timings
 
 
-def do_update(node_list, nodes):
+def process_node_timed(node):
+    """
+    Call process() of the node.
+    Returns start time, duration, exception with its formatted traceback (or None)
+    and identifier of the thread.
+    """
+    thread = threading.get_ident()
+    start = time.perf_counter()
+    try:
+        if hasattr(node, "process"):
+            process_node(node)
+        return start, time.perf_counter() - start, None, None, thread
+    except Exception as err:
+        return start, time.perf_counter() - start, err, traceback.format_exc(), thread
+
+def calculate_timed(calculate):
+    """
+    Call function returned by node's prepare_threaded().
+    This is called from worker threads, so it does not touch bpy data.
+    Returns the same as process_node_timed, and the calculated outputs.
+    """
+    thread = threading.get_ident()
+    start = time.perf_counter()
+    try:
+        outputs = calculate()
+        return (start, time.perf_counter() - start, None, None, thread), outputs
+    except Exception as err:
+        return (start, time.perf_counter() - start, err, traceback.format_exc(), thread), None
+
+
+@profile(section="UPDATE")
+def do_update_parallel(node_lists, nodes, sources=None):
+    """
+    Update function processing several update lists of the tree at once.
+    A node is started as soon as all nodes it depends on are processed.
+    Calculations of nodes which declare is_thread_safe are done in a pool
+    of threads; sockets and properties of such nodes are accessed only in
+    the main thread, see SverchCustomTreeNode.prepare_threaded. All other
+    nodes are processed in the main thread.
+    Nodes downstream of a failed node are not processed.
+    See do_update_general for meaning of sources.
+    """
+    global graphs
+    graph = []
+    gather = graph.append
+
+    ng = nodes.id_data
+    dep_graph = get_dependency_graph(ng)
+    dep_graph.ensure_valid(ng)
+
+    all_names = list(chain.from_iterable(node_lists))
+    names_set = set(all_names)
+    waiting = {name: {dep for dep in dep_graph.up[name] if dep in names_set} for name in all_names}
+    dependants = collections.defaultdict(list)
+    for name, deps in waiting.items():
+        for dep in deps:
+            dependants[dep].append(name)
+
+    if sources is not None:
+        changed_nodes = set(sources)
+    else:
+        dep_graph.mark_dirty(all_names)
+        changed_nodes = None
+
+    stats_update = node_stats.node_stats.new_update() if node_stats.node_stats_enabled else None
+
+    clear_exception_drawing_with_bgl(nodes)
+
+    ready = collections.deque(name for name in all_names if not waiting[name])
+    running = dict()  # future -> (node name, cache key)
+    errors = []
+
+    def finish(node_name, result, memory_start=None):
+        start, delta, err, error_text, thread = result
+        node = nodes[node_name]
+        if err is None:
+            try:
+                check_input_data_unchanged(node)
+            except Exception as check_err:
+                err, error_text = check_err, traceback.format_exc()
+        if err is not None:
+            dep_graph.mark_dirty([node_name])
+            errors.append((node_name, err, error_text))
+            return
+        if data_structure.DEBUG_MODE:
+            debug("Processed  %s in: %.4f", node_name, delta)
+        gather({"name" : node_name, "bl_idname": node.bl_idname, "start": start, "duration": delta})
+        if stats_update:
+            node_stats.record_node(stats_update, node, start, delta, memory_start, thread)
+        [s.update_objects_number() for s in chain(node.inputs, node.outputs) if hasattr(s, 'update_objects_number')]
+        if changed_nodes is not None:
+            if dep_graph.set_fingerprint(node_name, get_output_fingerprint(node)):
+                changed_nodes.add(node_name)
+        release(node_name)
+
+    def release(node_name):
+        for name in dependants[node_name]:
+            waiting[name].discard(node_name)
+            if not waiting[name]:
+                ready.append(name)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        while ready or running:
+            main_thread_nodes = []
+            while ready:
+                node_name = ready.popleft()
+                if changed_nodes is not None and node_name not in changed_nodes:
+                    if not dep_graph.is_dirty(node_name) and changed_nodes.isdisjoint(dep_graph.up[node_name]):
+                        release(node_name)
+                        continue
+                node = nodes[node_name]
+                if getattr(node, 'is_thread_safe', False):
+                    start = time.perf_counter()
+                    try:
+                        job = prepare_node_threaded(node)
+                    except Exception as err:
+                        finish(node_name, (start, time.perf_counter() - start, err, traceback.format_exc(), threading.get_ident()))
+                        continue
+                    if job is None:
+                        finish(node_name, (start, time.perf_counter() - start, None, None, threading.get_ident()))
+                        continue
+                    calculate, key = job
+                    running[executor.submit(calculate_timed, calculate)] = (node_name, key)
+                else:
+                    main_thread_nodes.append(node_name)
+
+            for node_name in main_thread_nodes:
+                # memory is not traced while worker threads are running
+                memory_start = node_stats.start_memory_trace() if stats_update and not running else None
+                finish(node_name, process_node_timed(nodes[node_name]), memory_start)
+
+            if running and not ready:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_name, key = running.pop(future)
+                    result, outputs = future.result()
+                    if result[2] is None:
+                        try:
+                            finish_node_threaded(nodes[node_name], outputs, key)
+                        except Exception as err:
+                            result = result[:2] + (err, traceback.format_exc()) + result[4:]
+                    finish(node_name, result)
+
+    for node_name, err, error_text in errors:
+        report_node_error(ng, node_name, err, error_text)
+
+    graphs.append(graph)
+    if data_structure.DEBUG_MODE:
+        debug("Node set updated in: %.4f seconds", sum(record["duration"] for record in graph))
+
+    return None if errors else [record["duration"] for record in graph]
+
+
+def do_update(node_list, nodes, sources=None):
     if data_structure.HEAT_MAP:
         do_update_heat_map(node_list, nodes)
+    elif getattr(nodes.id_data, 'sv_parallel', False):
+        do_update_parallel([node_list], nodes, sources)
     else:
-        do_update_general(node_list, nodes)
+        do_update_general(node_list, nodes, sources=sources)
 
 def build_update_list(ng=None):
     """
@@ -430,7 +790,6 @@ def build_update_list(ng=None):
     are processced
     """
     global update_cache
-    global partial_update_cache
     global graphs
     graphs = []
     if not ng:
@@ -441,7 +800,6 @@ def build_update_list(ng=None):
         deps = make_dep_dict(ng)
         out = [make_update_list(ng, s, deps) for s in node_sets]
         update_cache[ng.name] = out
-        partial_update_cache[ng.name] = {}
         # reset_socket_cache(ng)
 
 
@@ -463,6 +821,16 @@ def process_to_node(node):
     do_update(update_list, ng.nodes)
 
 
+def get_sources(ng, node_names):
+    """
+    Names of nodes which should start incremental update of the tree,
+    or None if the tree does not use incremental updates
+    """
+    if getattr(ng, 'sv_skip_unchanged', False):
+        return node_names
+    return None
+
+
 def process_from_nodes(nodes):
 
     if not nodes:
@@ -476,9 +844,9 @@ def process_from_nodes(nodes):
             print("Something not very important happend in Blender memory", node, type(node))
 
     ng = nodes[0].id_data
-    update_list = make_tree_from_nodes(node_names, ng)
+    update_list = get_dependency_graph(ng).update_list(ng, node_names)
     reset_error_some_nodes(ng, update_list)
-    do_update(update_list, ng.nodes)
+    do_update(update_list, ng.nodes, get_sources(ng, node_names))
 
 
 def process_from_node(node):
@@ -486,7 +854,6 @@ def process_from_node(node):
     Process downstream from a given node
     """
     global update_cache
-    global partial_update_cache
     global graphs
     graphs = []
     ng = node.id_data
@@ -496,17 +863,11 @@ def process_from_node(node):
         reload_sverchok()
         return
     if update_cache.get(ng.name):
-        p_u_c = partial_update_cache.get(ng.name)
-        update_list = None
-        if p_u_c:
-            update_list = p_u_c.get(node.name)
-        if not update_list:
-            update_list = make_tree_from_nodes([node.name], ng)
-            partial_update_cache[ng.name][node.name] = update_list
+        update_list = get_dependency_graph(ng).update_list(ng, [node.name])
         nodes = ng.nodes
         if not ng.sv_process:
             return
-        do_update(update_list, nodes)
+        do_update(update_list, nodes, get_sources(ng, [node.name]))
     else:
         process_tree(ng)
 
@@ -517,7 +878,6 @@ def sverchok_trees():
 
 def process_tree(ng=None):
     global update_cache
-    global partial_update_cache
     global graphs
     graphs = []
 
@@ -533,8 +893,11 @@ def process_tree(ng=None):
         if not update_list:
             build_update_list(ng)
             update_list = update_cache.get(ng.name)
-        for l in update_list:
-            do_update(l, ng.nodes)
+        if ng.sv_parallel and not data_structure.HEAT_MAP:
+            do_update_parallel(update_list, ng.nodes)
+        else:
+            for l in update_list:
+                do_update(l, ng.nodes)
     else:
         pass
 
@@ -550,13 +913,18 @@ def get_update_lists(ng):
     See the function with the same name in node_tree.py
     """
     global update_cache
-    global partial_update_cache
     if not ng.name in update_cache:
         build_update_list(ng)
-    return (update_cache.get(ng.name), partial_update_cache.get(ng.name))
+    return (update_cache.get(ng.name), get_dependency_graph(ng).update_lists)
 
 def register():
     addon_name = sverchok.__name__
     addon = bpy.context.preferences.addons.get(addon_name)
     if addon:
         update_error_colors(addon.preferences, [])
+        update_socket_data_settings(addon.preferences, [])
+        update_process_cache_settings(addon.preferences, [])
+        node_stats.update_node_stats_settings(addon.preferences, [])
+        # imported here, as field modules import a lot of geometry utilities
+        from sverchok.utils.field.compiler import update_field_settings
+        update_field_settings(addon.preferences, [])
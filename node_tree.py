@@ -33,6 +33,7 @@ from sverchok.core.update_system import (
     build_update_list,
     process_from_node, process_from_nodes,
     process_tree,
+    update_dependency_graph,
     get_original_node_color,
     is_first_run,)
 from sverchok.core.links import (
@@ -100,6 +101,7 @@ class SvNodeTreeCommon(object):
         self.sv_links.create_new_links(self)
         if self.sv_links.links_have_changed(self):
             self.has_changed = True
+            update_dependency_graph(self, *self.sv_links.get_links_changes(self))
             build_update_list(self)
             process_from_nodes(self.sv_links.get_nodes(self))
             self.sv_links.store_links_cache(self)
@@ -206,6 +208,20 @@ class SverchCustomTree(NodeTree, SvNodeTreeCommon):
         default="None", update=lambda s, c: process_tree(s), options=set()
     )
 
+    # incremental update: nodes downstream of a node which produced the same data are not processed
+    sv_skip_unchanged: BoolProperty(
+        name="Skip unchanged",
+        description="Do not process nodes whose input data have not changed since previous update",
+        default=False,
+        options=set())
+
+    # nodes which declare is_thread_safe will be processed in several threads
+    sv_parallel: BoolProperty(
+        name="Parallel",
+        description="Process independent parts of the tree simultaneously (only nodes supporting multithreading)",
+        default=False,
+        options=set())
+
     # this mode will replace properties of some nodes so they could have lesser values for draft mode
     sv_draft: BoolProperty(
         name="Draft",
@@ -474,6 +490,19 @@ class SverchCustomTreeNode(UpdateNodes, NodeUtils):
     """Base class for all nodes"""
     _docstring = None  # A cache for docstring property
 
+    # True if the node implements prepare_threaded(), so that its calculations
+    # can be done outside of the main thread in parallel update mode
+    is_thread_safe = False
+
+    # True if outputs of the node depend only on its properties and input data,
+    # so results of process() can be cached (see core/process_cache.py)
+    is_memoizable = False
+
+    # True if the node processes objects of its inputs independently of each other,
+    # making exactly one output object for each (matched) input object;
+    # vectorized monads consisting of such nodes process all items at once
+    is_batchable = False
+
     @classproperty
     def docstring(cls):
         """
@@ -501,6 +530,30 @@ class SverchCustomTreeNode(UpdateNodes, NodeUtils):
             self.use_custom_color = True
             self.color = color
 
+    def prepare_threaded(self):
+        """
+        Used instead of process() for nodes with is_thread_safe = True
+        when the tree is updated in parallel mode. It is called in the
+        main thread and should read input sockets and node properties.
+        It returns a function without arguments, which is called in a
+        worker thread and returns a dictionary of output socket names
+        to data; the update system writes that data into output sockets
+        in the main thread. The function must not access bpy data,
+        including the node itself. None means nothing to calculate,
+        which is also the default for nodes that can't be parallelized.
+        """
+        return None
+
+    def process_prepared(self):
+        """
+        Process the node in the main thread with prepare_threaded;
+        process() of nodes which implement prepare_threaded can just call this
+        """
+        calculate = self.prepare_threaded()
+        if calculate is not None:
+            for name, data in calculate().items():
+                self.outputs[name].sv_set(data)
+
     def rclick_menu(self, context, layout):
         """
         Override this method to add specific items into
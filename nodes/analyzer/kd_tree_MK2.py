@@ -21,7 +21,7 @@ import mathutils
 from bpy.props import FloatProperty, EnumProperty, IntProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode, match_long_repeat as mlr)
-from sverchok.utils.sv_KDT_utils import kdt_closest_verts_range, kdt_closest_verts_find_n
+from sverchok.utils.sv_KDT_utils import kdt_find_range, kdt_find_n
 
 class SvKDTreeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     '''
@@ -40,8 +40,8 @@ class SvKDTreeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     ]
 
     func_dict = {
-        'find_n': kdt_closest_verts_find_n,
-        'find_range': kdt_closest_verts_range
+        'find_n': kdt_find_n,
+        'find_range': kdt_find_range
         }
 
     number : IntProperty(
@@ -85,19 +85,22 @@ class SvKDTreeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         if not (any(s.is_linked for s in so) and si[0].is_linked):
             return
         V1, V2, N, R = mlr([i.sv_get() for i in si])
-        out = []
         Co, ind, dist = so
         find_n = self.mode == "find_n"
         func = self.func_dict[self.mode]
+        co_out, ind_out, dist_out = [], [], []
         for v, v2, k in zip(V1, V2, (N if find_n else R)):
-            func(v, v2, k, out)
+            coords, indices, distances = func(v, v2, k)
+            co_out.extend(coords)
+            ind_out.extend(indices)
+            dist_out.extend(distances)
 
         if Co.is_linked:
-            Co.sv_set([[i[0][:] for i in i2] for i2 in out])
+            Co.sv_set(co_out)
         if ind.is_linked:
-            ind.sv_set([[i[1] for i in i2] for i2 in out])
+            ind.sv_set(ind_out)
         if dist.is_linked:
-            dist.sv_set([[i[2] for i in i2] for i2 in out])
+            dist.sv_set(dist_out)
 
 
 def register():
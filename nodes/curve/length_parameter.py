@@ -117,8 +117,7 @@ class SvCurveLengthParameterNode(DraftMode, bpy.types.Node, SverchCustomTreeNode
                 mode = self.mode
                 if self.id_data.sv_draft:
                     mode = 'LIN'
-                solver = SvCurveLengthSolver(curve)
-                solver.prepare(mode, resolution)
+                solver = SvCurveLengthSolver.for_curve(curve, mode, resolution)
 
                 if self.eval_mode == 'AUTO':
                     total_length = solver.get_total_length()
@@ -11,7 +11,7 @@ from sverchok.utils.logging import info, exception
 from sverchok.utils.curve import SvCurve
 from sverchok.utils.dummy_nodes import add_dummy
 from sverchok.dependencies import scipy
-from sverchok.utils.manifolds import ortho_project_curve
+from sverchok.utils.manifolds import ortho_project_curve, ortho_project_curve_array
 
 if scipy is None:
     add_dummy('SvExOrthoProjectCurveNode', "Ortho Project on Curve", 'scipy')
@@ -67,6 +67,12 @@ else:
             t_out = []
             for curves, src_points_i in zip_long_repeat(curves_s, src_point_s):
                 for curve, src_points in zip_long_repeat(curves, src_points_i):
+                    if self.nearest:
+                        new_t, new_points = ortho_project_curve_array(src_points, curve, init_samples = self.samples)
+                        points_out.append(np.array(new_points).tolist())
+                        t_out.append(new_t)
+                        continue
+
                     new_points = []
                     new_t = []
                     for src_point in src_points:
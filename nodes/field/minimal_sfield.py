@@ -27,6 +27,8 @@ else:
         bl_idname = 'SvExMinimalScalarFieldNode'
         bl_label = 'RBF Scalar Field'
         bl_icon = 'OUTLINER_OB_EMPTY'
+        is_thread_safe = True
+        is_memoizable = True
 
         function : EnumProperty(
                 name = "Function",
@@ -56,39 +58,45 @@ else:
         def draw_buttons(self, context, layout):
             layout.prop(self, "function")
 
-        def process(self):
+        def prepare_threaded(self):
 
             if not any(socket.is_linked for socket in self.outputs):
-                return
+                return None
 
             vertices_s = self.inputs['Vertices'].sv_get()
             values_s = self.inputs['Values'].sv_get()
             epsilon_s = self.inputs['Epsilon'].sv_get()
             smooth_s = self.inputs['Smooth'].sv_get()
+            function = self.function
+
+            def calculate():
+                fields_out = []
+                for vertices, values, epsilon, smooth in zip_long_repeat(vertices_s, values_s, epsilon_s, smooth_s):
+                    if isinstance(epsilon, (list, int)):
+                        epsilon = epsilon[0]
+                    if isinstance(smooth, (list, int)):
+                        smooth = smooth[0]
+
+                    XYZ_from = np.array(vertices)
+                    xs_from = XYZ_from[:,0]
+                    ys_from = XYZ_from[:,1]
+                    zs_from = XYZ_from[:,2]
+
+                    values = np.array(values)
 
-            fields_out = []
-            for vertices, values, epsilon, smooth in zip_long_repeat(vertices_s, values_s, epsilon_s, smooth_s):
-                if isinstance(epsilon, (list, int)):
-                    epsilon = epsilon[0]
-                if isinstance(smooth, (list, int)):
-                    smooth = smooth[0]
-
-                XYZ_from = np.array(vertices)
-                xs_from = XYZ_from[:,0]
-                ys_from = XYZ_from[:,1]
-                zs_from = XYZ_from[:,2]
-                
-                values = np.array(values)
-
-                rbf = Rbf(xs_from, ys_from, zs_from, values,
-                        function = self.function,
-                        smooth = smooth,
-                        epsilon = epsilon, mode='1-D')
-
-                field = SvRbfScalarField(rbf)
-                fields_out.append(field)
-
-            self.outputs['Field'].sv_set(fields_out)
+                    rbf = Rbf(xs_from, ys_from, zs_from, values,
+                            function = function,
+                            smooth = smooth,
+                            epsilon = epsilon, mode='1-D')
+
+                    field = SvRbfScalarField(rbf)
+                    fields_out.append(field)
+                return {'Field': fields_out}
+
+            return calculate
+
+        def process(self):
+            self.process_prepared()
 
 def register():
     if scipy is not None:
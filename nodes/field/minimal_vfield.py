@@ -27,6 +27,8 @@ else:
         bl_idname = 'SvExMinimalVectorFieldNode'
         bl_label = 'RBF Vector Field'
         bl_icon = 'OUTLINER_OB_EMPTY'
+        is_thread_safe = True
+        is_memoizable = True
 
         function : EnumProperty(
                 name = "Function",
@@ -69,41 +71,48 @@ else:
             layout.prop(self, "field_type", text='')
             layout.prop(self, "function")
 
-        def process(self):
+        def prepare_threaded(self):
 
             if not any(socket.is_linked for socket in self.outputs):
-                return
+                return None
 
             vertices_from_s = self.inputs['VerticesFrom'].sv_get()
             vertices_to_s = self.inputs['VerticesTo'].sv_get()
             epsilon_s = self.inputs['Epsilon'].sv_get()
             smooth_s = self.inputs['Smooth'].sv_get()
+            function = self.function
+            relative = self.field_type == 'R'
+
+            def calculate():
+                fields_out = []
+                for vertices_from, vertices_to, epsilon, smooth in zip_long_repeat(vertices_from_s, vertices_to_s, epsilon_s, smooth_s):
+                    if isinstance(epsilon, (list, int)):
+                        epsilon = epsilon[0]
+                    if isinstance(smooth, (list, int)):
+                        smooth = smooth[0]
+
+                    XYZ_from = np.array(vertices_from)
+                    xs_from = XYZ_from[:,0]
+                    ys_from = XYZ_from[:,1]
+                    zs_from = XYZ_from[:,2]
+
+                    XYZ_to = np.array(vertices_to)
+                    if relative:
+                        XYZ_to = XYZ_from + XYZ_to
 
-            fields_out = []
-            for vertices_from, vertices_to, epsilon, smooth in zip_long_repeat(vertices_from_s, vertices_to_s, epsilon_s, smooth_s):
-                if isinstance(epsilon, (list, int)):
-                    epsilon = epsilon[0]
-                if isinstance(smooth, (list, int)):
-                    smooth = smooth[0]
-
-                XYZ_from = np.array(vertices_from)
-                xs_from = XYZ_from[:,0]
-                ys_from = XYZ_from[:,1]
-                zs_from = XYZ_from[:,2]
-                
-                XYZ_to = np.array(vertices_to)
-                if self.field_type == 'R':
-                    XYZ_to = XYZ_from + XYZ_to
-
-                rbf = Rbf(xs_from, ys_from, zs_from, XYZ_to,
-                        function = self.function,
-                        smooth = smooth,
-                        epsilon = epsilon, mode='N-D')
-
-                field = SvRbfVectorField(rbf, relative = self.field_type == 'R')
-                fields_out.append(field)
-
-            self.outputs['Field'].sv_set(fields_out)
+                    rbf = Rbf(xs_from, ys_from, zs_from, XYZ_to,
+                            function = function,
+                            smooth = smooth,
+                            epsilon = epsilon, mode='N-D')
+
+                    field = SvRbfVectorField(rbf, relative = relative)
+                    fields_out.append(field)
+                return {'Field': fields_out}
+
+            return calculate
+
+        def process(self):
+            self.process_prepared()
 
 def register():
     if scipy is not None:
@@ -8,6 +8,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, repeat_last_for_length, match_long_repeat, ensure_nesting_level
 from sverchok.utils.logging import info, exception
 from sverchok.utils.field.vector import SvVectorField
+from sverchok.utils.field.compiler import compile_field
 
 class SvVectorFieldApplyNode(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -72,6 +73,7 @@ class SvVectorFieldApplyNode(bpy.types.Node, SverchCustomTreeNode):
                     new_verts = [vertex]
                 else:
                     coeffs = repeat_last_for_length(coeffs, len(vertices))
+                    field = compile_field(field)
                     vertices = np.array(vertices)
                     for i in range(iterations):
                         xs = vertices[:,0]
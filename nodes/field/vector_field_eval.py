@@ -7,6 +7,7 @@ from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty, St
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, zip_long_repeat, fullList, match_long_repeat
 from sverchok.utils.logging import info, exception
+from sverchok.utils.field.compiler import compile_field
 
 class SvVectorFieldEvaluateNode(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -45,7 +46,7 @@ class SvVectorFieldEvaluateNode(bpy.types.Node, SverchCustomTreeNode):
                 xs = XYZ[:,0]
                 ys = XYZ[:,1]
                 zs = XYZ[:,2]
-                new_xs, new_ys, new_zs = field.evaluate_grid(xs, ys, zs)
+                new_xs, new_ys, new_zs = compile_field(field).evaluate_grid(xs, ys, zs)
                 new_vectors = np.dstack((new_xs[:], new_ys[:], new_zs[:]))
                 new_values = new_vectors[0].tolist()
 
@@ -19,11 +19,12 @@
 from math import sin, cos, pi, sqrt, pow
 from functools import reduce
 
+import numpy as np
+
 import bpy
 from bpy.props import FloatProperty, EnumProperty, BoolProperty, IntProperty
 import bmesh
 from mathutils import Vector, Matrix
-from mathutils.geometry import barycentric_transform
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode, throttle_and_update_node,
@@ -47,6 +48,10 @@ sqrt_3_6 = sqrt_3/6
 sqrt_3_3 = sqrt_3/3
 sqrt_3_2 = sqrt_3/2
 
+# Approximate number of donor vertices to be mapped by one batch of numpy operations;
+# limits the size of temporary arrays.
+BATCH_SIZE = 1000000
+
 class OutputData(object):
     def __init__(self):
         self.verts_out = []
@@ -89,6 +94,55 @@ class DonorData(object):
         self.faces_i = []
         self.face_data_i = []
 
+    def copy(self):
+        r = DonorData()
+        r.min_x = self.min_x
+        r.max_x = self.max_x
+        r.min_y = self.min_y
+        r.max_y = self.max_y
+        r.tri_vert_1 = self.tri_vert_1
+        r.tri_vert_2 = self.tri_vert_2
+        r.tri_vert_3 = self.tri_vert_3
+        r.verts_v = self.verts_v
+        r.faces_i = self.faces_i
+        r.face_data_i = self.face_data_i
+        return r
+
+    def key(self):
+        """
+        Donor data is not changed in place, but replaced by other objects,
+        so identity of these objects defines the state of the donor.
+        """
+        return (id(self.verts_v), id(self.faces_i), id(self.face_data_i), id(self.tri_vert_1))
+
+class FaceBatch(object):
+    """
+    Recipient faces, which are mapped in the same mode with the same donor object.
+    Donor vertices are mapped onto all these faces at once with numpy,
+    see SvAdaptivePolygonsNodeMk2._process_batch().
+    """
+    def __init__(self, map_mode, donor):
+        self.map_mode = map_mode
+        self.donor = donor.copy()
+        self.vertices_co = []
+        self.vertices_normal = []
+        self.normals = []
+        self.zcoefs = []
+        self.zoffsets = []
+        self.wcoefs = []
+        # indexes of output.verts_out items to be filled
+        self.out_idxs = []
+
+    def add(self, output, recpt_face_data, vert_idxs, zcoef, zoffset, wcoef):
+        self.vertices_co.append([recpt_face_data.vertices_co[i] for i in vert_idxs])
+        self.vertices_normal.append([recpt_face_data.vertices_normal[i] for i in vert_idxs])
+        self.normals.append(recpt_face_data.normal)
+        self.zcoefs.append(zcoef)
+        self.zoffsets.append(zoffset)
+        self.wcoefs.append(wcoef)
+        self.out_idxs.append(len(output.verts_out))
+        output.verts_out.append(None)
+
 class SvAdaptivePolygonsNodeMk2(bpy.types.Node, SverchCustomTreeNode):
     """
     Triggers: Adaptive Polygons Tessellate Tissue
@@ -414,72 +468,100 @@ class SvAdaptivePolygonsNodeMk2(bpy.types.Node, SverchCustomTreeNode):
 
         return p1, p2, p3
 
-    def interpolate_quad_2d(self, dst_vert_1, dst_vert_2, dst_vert_3, dst_vert_4, v, x_coef, y_coef):
-        """
-        Map the provided `v` vertex, considering only two of it's coordinates,
-        from the [-1/2; 1/2] x [-1/2; 1/2] square to the face defined by
-        four `dst_vert_n` vertices.
-        """
-        X, Y = self.get_other_axes()
-        v12 = dst_vert_1 + (dst_vert_2-dst_vert_1)*v[X]*x_coef + ((dst_vert_2-dst_vert_1)/2)
-        v43 = dst_vert_4 + (dst_vert_3-dst_vert_4)*v[X]*x_coef + ((dst_vert_3-dst_vert_4)/2)
-        return v12 + (v43-v12)*v[Y]*y_coef + ((v43-v12)/2)
-
-    def interpolate_quad_3d(self, dst_vert_1, dst_vert_2, dst_vert_3, dst_vert_4, dst_normal_1, dst_normal_2, dst_normal_3, dst_normal_4, face_normal, v, x_coef, y_coef, z_coef, z_offset):
+    def map_normals(self, normals_interpolated, face_normals):
         """
-        Map the provided `v` vertex from the source
-        [-1/2; 1/2] x [-1/2; 1/2] x [-1/2; 1/2] cube
-        to the space defined by `dst_vert_n` vertices.
+        Calculate normals at mapped donor vertices according to normal_mode.
+        normals_interpolated: interpolated recipient vertex normals, of shape (n_faces, n_verts, 3);
+        face_normals: recipient face normals, of shape (n_faces, 3).
         """
-        loc = self.interpolate_quad_2d(dst_vert_1, dst_vert_2, dst_vert_3, dst_vert_4, v, x_coef, y_coef)
         if self.normal_mode == 'MAP':
             if self.normal_interp_mode == 'SMOOTH':
-                normal = self.interpolate_quad_2d(dst_normal_1, dst_normal_2, dst_normal_3, dst_normal_4, v, x_coef, y_coef)
-                normal.normalize()
+                lengths = np.linalg.norm(normals_interpolated, axis=2, keepdims=True)
+                return np.divide(normals_interpolated, lengths, out=normals_interpolated, where=lengths > 0)
             else:
-                normal = self.interpolate_quad_2d(dst_vert_1 + dst_normal_1, dst_vert_2 + dst_normal_2,
-                                             dst_vert_3 + dst_normal_3, dst_vert_4 + dst_normal_4,
-                                             v, x_coef, y_coef)
-                normal = normal - loc
+                # interpolating (vertex + normal) and subtracting the interpolated vertex
+                # is the same as interpolating normals.
+                return normals_interpolated
         else:
-            #normal = (dst_vert_1.normal + dst_vert_2.normal + dst_vert_3.normal + dst_vert_4.normal) * 0.25
-            normal = face_normal
-        Z = self.normal_axis_idx()
-        return loc + normal*(v[Z]*z_coef + z_offset)
+            return face_normals[:, np.newaxis, :]
 
-    def interpolate_tri_2d(self, dst_vert_1, dst_vert_2, dst_vert_3, src_vert_1, src_vert_2, src_vert_3, v):
+    def interpolate_quad_2d(self, dst_verts, xs, ys):
+        """
+        Map points, given by coordinates in the [0; 1] x [0; 1] square,
+        to faces defined by four vertices.
+        dst_verts: array of shape (n_faces, 4, 3);
+        xs, ys: arrays of shape (n_faces, n_verts).
+        Returns an array of shape (n_faces, n_verts, 3).
+        """
+        xs = xs[:, :, np.newaxis]
+        ys = ys[:, :, np.newaxis]
+        dst_vert_1, dst_vert_2, dst_vert_3, dst_vert_4 = [dst_verts[:, np.newaxis, i] for i in range(4)]
+        v12 = dst_vert_1 + (dst_vert_2-dst_vert_1)*xs
+        v43 = dst_vert_4 + (dst_vert_3-dst_vert_4)*xs
+        return v12 + (v43-v12)*ys
+
+    def interpolate_quad_3d(self, dst_verts, dst_normals, face_normals, verts, x_coefs, y_coefs, z_coefs, z_offsets):
         """
-        Map the provided `v` vertex, considering only two of it's coordinates,
-        from the source triangle (defined by `src_vert_n` vertices) to the face defined by
-        three `dst_vert_n` vertices.
+        Map the provided donor vertices from the source
+        [-1/2; 1/2] x [-1/2; 1/2] x [-1/2; 1/2] cube
+        to the space defined by each of recipient faces.
+        dst_verts, dst_normals: arrays of shape (n_faces, 4, 3);
+        face_normals: array of shape (n_faces, 3);
+        verts: array of shape (n_verts, 3);
+        coefficients: arrays of shape (n_faces,).
+        Returns an array of shape (n_faces, n_verts, 3).
         """
         X, Y = self.get_other_axes()
-        v = self.from2d(v[X], v[Y])
-        return barycentric_transform(v, src_vert_1, src_vert_2, src_vert_3,
-                                        dst_vert_1, dst_vert_2, dst_vert_3)
-
-    def interpolate_tri_3d(self, dst_vert_1, dst_vert_2, dst_vert_3, dst_normal_1, dst_normal_2, dst_normal_3, src_vert_1, src_vert_2, src_vert_3, face_normal, v, z_coef, z_offset):
+        Z = self.normal_axis_idx()
+        xs = verts[np.newaxis, :, X] * x_coefs[:, np.newaxis] + 0.5
+        ys = verts[np.newaxis, :, Y] * y_coefs[:, np.newaxis] + 0.5
+        loc = self.interpolate_quad_2d(dst_verts, xs, ys)
+        normal = self.map_normals(self.interpolate_quad_2d(dst_normals, xs, ys), face_normals)
+        zs = verts[np.newaxis, :, Z] * z_coefs[:, np.newaxis] + z_offsets[:, np.newaxis]
+        return loc + normal * zs[:, :, np.newaxis]
+
+    def barycentric_weights(self, src_verts, verts, scales):
         """
-        Map the provided `v` vertex from the source triangle
-        to the space defined by `dst_vert_n` vertices.
+        Barycentric coordinates of donor vertices, considering only two of their coordinates,
+        in respect to the source triangle defined by `src_verts` and scaled by `scales`.
+        src_verts: array of shape (3, 3); verts: array of shape (n_verts, 3);
+        scales: array of shape (n_faces,).
+        Returns an array of shape (n_faces, n_verts, 3).
+        """
+        X, Y = self.get_other_axes()
+        # Coordinates in respect to the triangle scaled by 1/w
+        # are the same as coordinates of vertices scaled by w.
+        xs = verts[np.newaxis, :, X] * scales[:, np.newaxis]
+        ys = verts[np.newaxis, :, Y] * scales[:, np.newaxis]
+        weights = []
+        for i1, i2 in [(1, 2), (2, 0), (0, 1)]:
+            x1, y1 = src_verts[i1, X], src_verts[i1, Y]
+            x2, y2 = src_verts[i2, X], src_verts[i2, Y]
+            weights.append((x1 - x2) * (y2 - ys) + (y1 - y2) * (xs - x2))
+        weights = np.stack(weights, axis=-1)
+        total = weights.sum(axis=-1, keepdims=True)
+        good = (total != 0)[:, :, 0]
+        weights[good] /= total[good]
+        weights[~good] = 1.0 / 3.0
+        return weights
+
+    def interpolate_tri_3d(self, dst_verts, dst_normals, src_verts, face_normals, verts, w_coefs, z_coefs, z_offsets):
+        """
+        Map the provided donor vertices from the source triangle,
+        scaled by 1 / w_coefs, to the space defined by each of recipient faces.
+        dst_verts, dst_normals: arrays of shape (n_faces, 3, 3);
+        src_verts: array of shape (3, 3);
+        face_normals: array of shape (n_faces, 3);
+        verts: array of shape (n_verts, 3);
+        coefficients: arrays of shape (n_faces,).
+        Returns an array of shape (n_faces, n_verts, 3).
         """
-        v_at_triangle = self.interpolate_tri_2d(dst_vert_1, dst_vert_2, dst_vert_3,
-                                            src_vert_1, src_vert_2, src_vert_3, v)
-        if self.normal_mode == 'MAP':
-            if self.normal_interp_mode == 'SMOOTH':
-                normal = self.interpolate_tri_2d(dst_normal_1, dst_normal_2, dst_normal_3,
-                                             src_vert_1, src_vert_2, src_vert_3, v)
-                normal.normalize()
-            else:
-                normal = self.interpolate_tri_2d(dst_vert_1 + dst_normal_1, dst_vert_2 + dst_normal_2,
-                                            dst_vert_3 + dst_normal_3,
-                                            src_vert_1, src_vert_2, src_vert_3, v)
-                normal = normal - v_at_triangle
-        else:
-            #normal = (dst_vert_1.normal + dst_vert_2.normal + dst_vert_3.normal) * 0.333333333
-            normal = face_normal
         Z = self.normal_axis_idx()
-        return v_at_triangle + normal * (v[Z] * z_coef + z_offset)
+        weights = self.barycentric_weights(src_verts, verts, w_coefs)
+        v_at_triangle = np.einsum('fvi,fij->fvj', weights, dst_verts)
+        normal = self.map_normals(np.einsum('fvi,fij->fvj', weights, dst_normals), face_normals)
+        zs = verts[np.newaxis, :, Z] * z_coefs[:, np.newaxis] + z_offsets[:, np.newaxis]
+        return v_at_triangle + normal * zs[:, :, np.newaxis]
 
     def get_other_axes(self):
         if self.normal_axis == 'X':
@@ -523,7 +605,57 @@ class SvAdaptivePolygonsNodeMk2(bpy.types.Node, SverchCustomTreeNode):
         prod = reduce(lambda x,y: x*y, scales, 1.0)
         return pow(prod, 1.0/n)
 
-    def _process_face(self, map_mode, output, recpt_face_data, donor, zcoef, zoffset, angle, wcoef, facerot):
+    def _get_batch(self, batches, map_mode, donor):
+        key = (map_mode,) + donor.key()
+        batch = batches.get(key)
+        if batch is None:
+            batch = batches[key] = FaceBatch(map_mode, donor)
+        return batch
+
+    def _process_batch(self, batch, output):
+        """
+        Map donor vertices onto all faces of the batch
+        and put results to prepared places in output.verts_out.
+        """
+        X, Y = self.get_other_axes()
+        donor = batch.donor
+        verts = np.array([tuple(v) for v in donor.verts_v], dtype=np.float64)
+        if len(verts) == 0:
+            for out_idx in batch.out_idxs:
+                output.verts_out[out_idx] = []
+            return
+
+        if batch.map_mode == 'QUAD' and self.xy_mode == 'BOUNDS':
+            # Map X, Y coordinates of donor vertices from their bounding square
+            # to [-1/2; 1/2] square. Leave Z coordinate as it was.
+            verts[:, X] = self.map_bounds(donor.min_x, donor.max_x, verts[:, X])
+            verts[:, Y] = self.map_bounds(donor.min_y, donor.max_y, verts[:, Y])
+
+        dst_verts = np.array([[tuple(v) for v in face] for face in batch.vertices_co], dtype=np.float64)
+        dst_normals = np.array([[tuple(n) for n in face] for face in batch.vertices_normal], dtype=np.float64)
+        face_normals = np.array([tuple(n) for n in batch.normals], dtype=np.float64)
+        zcoefs = np.array(batch.zcoefs, dtype=np.float64)
+        zoffsets = np.array(batch.zoffsets, dtype=np.float64)
+        wcoefs = np.array(batch.wcoefs, dtype=np.float64)
+        if batch.map_mode == 'TRI':
+            src_verts = np.array([tuple(donor.tri_vert_1), tuple(donor.tri_vert_2), tuple(donor.tri_vert_3)])
+
+        n_faces = len(batch.out_idxs)
+        step = max(1, BATCH_SIZE // len(verts))
+        for start in range(0, n_faces, step):
+            chunk = slice(start, start + step)
+            if batch.map_mode == 'TRI':
+                new_verts = self.interpolate_tri_3d(dst_verts[chunk], dst_normals[chunk],
+                                    src_verts, face_normals[chunk], verts,
+                                    wcoefs[chunk], zcoefs[chunk], zoffsets[chunk])
+            else:
+                new_verts = self.interpolate_quad_3d(dst_verts[chunk], dst_normals[chunk],
+                                    face_normals[chunk], verts,
+                                    wcoefs[chunk], wcoefs[chunk], zcoefs[chunk], zoffsets[chunk])
+            for out_idx, face_verts in zip(batch.out_idxs[chunk], new_verts.tolist()):
+                output.verts_out[out_idx] = [tuple(v) for v in face_verts]
+
+    def _process_face(self, map_mode, output, recpt_face_data, donor, zcoef, zoffset, angle, wcoef, facerot, batches):
 
         X, Y = self.get_other_axes()
         Z = self.normal_axis_idx()
@@ -553,22 +685,10 @@ class SvAdaptivePolygonsNodeMk2(bpy.types.Node, SverchCustomTreeNode):
                                      recpt_face_data.vertices_co[i2]],
                                     [donor.tri_vert_1/wcoef, donor.tri_vert_2/wcoef, donor.tri_vert_3/wcoef]
                                 ) * zcoef
-            new_verts = []
-            for v in donor.verts_v:
-                new_verts.append(self.interpolate_tri_3d(
-                                    recpt_face_data.vertices_co[i0],
-                                    recpt_face_data.vertices_co[i1],
-                                    recpt_face_data.vertices_co[i2],
-                                    recpt_face_data.vertices_normal[i0],
-                                    recpt_face_data.vertices_normal[i1],
-                                    recpt_face_data.vertices_normal[i2],
-                                    donor.tri_vert_1/wcoef, donor.tri_vert_2/wcoef, donor.tri_vert_3/wcoef,
-                                    recpt_face_data.normal,
-                                    v, zcoef, zoffset))
-            output.verts_out.append(new_verts)
+            self._get_batch(batches, map_mode, donor).add(output, recpt_face_data, [i0, i1, i2], zcoef, zoffset, wcoef)
             output.faces_out.append(donor.faces_i)
             output.face_data_out.append(donor.face_data_i)
-            output.vert_recpt_idx_out.append([recpt_face_data.index for i in new_verts])
+            output.vert_recpt_idx_out.append([recpt_face_data.index for i in donor.verts_v])
             output.face_recpt_idx_out.append([recpt_face_data.index for i in donor.faces_i])
 
         elif map_mode == 'QUAD':
@@ -599,41 +719,11 @@ class SvAdaptivePolygonsNodeMk2(bpy.types.Node, SverchCustomTreeNode):
                                 [corner1, corner2, corner3, corner4]
                             ) * zcoef
 
-            new_verts = []
-            #self.info("Donor: %s", len(donor.verts_v))
-            for v in donor.verts_v:
-                if self.xy_mode == 'BOUNDS':
-                    # Map the `v` vertex's X, Y coordinates
-                    # from it's bounding square to
-                    # [-1/2; 1/2] square.
-                    # Leave Z coordinate as it was.
-                    x = self.map_bounds(donor.min_x, donor.max_x, v[X])
-                    y = self.map_bounds(donor.min_y, donor.max_y, v[Y])
-                    z = v[Z]
-
-                    v = Vector((0, 0, 0))
-                    v[X] = x
-                    v[Y] = y
-                    v[Z] = z
-
-                new_verts.append(self.interpolate_quad_3d(
-                                    recpt_face_data.vertices_co[i0],
-                                    recpt_face_data.vertices_co[i1],
-                                    recpt_face_data.vertices_co[i2],
-                                    recpt_face_data.vertices_co[i3],
-                                    recpt_face_data.vertices_normal[i0],
-                                    recpt_face_data.vertices_normal[i1],
-                                    recpt_face_data.vertices_normal[i2],
-                                    recpt_face_data.vertices_normal[i3],
-                                    recpt_face_data.normal,
-                                    v,
-                                    wcoef, wcoef,
-                                    zcoef, zoffset))
-
-            output.verts_out.append(new_verts)
+            self._get_batch(batches, map_mode, donor).add(output, recpt_face_data, [i0, i1, i2, i3], zcoef, zoffset, wcoef)
+
             output.faces_out.append(donor.faces_i)
             output.face_data_out.append(donor.face_data_i)
-            output.vert_recpt_idx_out.append([recpt_face_data.index for i in new_verts])
+            output.vert_recpt_idx_out.append([recpt_face_data.index for i in donor.verts_v])
             output.face_recpt_idx_out.append([recpt_face_data.index for i in donor.faces_i])
 
         elif map_mode == 'FRAME':
@@ -671,7 +761,7 @@ class SvAdaptivePolygonsNodeMk2(bpy.types.Node, SverchCustomTreeNode):
                     sub_recpt.vertices_co = tri_face
                     sub_recpt.vertices_normal = tri_normal
                     sub_recpt.vertices_idxs = [0, 1, 2]
-                    self._process_face(sub_map_mode, output, sub_recpt, donor, zcoef, zoffset, angle, wcoef, facerot)
+                    self._process_face(sub_map_mode, output, sub_recpt, donor, zcoef, zoffset, angle, wcoef, facerot, batches)
             else:
                 inner_verts = [vert.lerp(recpt_face_data.center, recpt_face_data.frame_width)
                                     for vert in recpt_face_data.vertices_co]
@@ -703,7 +793,7 @@ class SvAdaptivePolygonsNodeMk2(bpy.types.Node, SverchCustomTreeNode):
                     sub_recpt.vertices_co = quad_face
                     sub_recpt.vertices_normal = quad_normal
                     sub_recpt.vertices_idxs = [0, 1, 2, 3]
-                    self._process_face(sub_map_mode, output, sub_recpt, donor, zcoef, zoffset, angle, wcoef, facerot)
+                    self._process_face(sub_map_mode, output, sub_recpt, donor, zcoef, zoffset, angle, wcoef, facerot, batches)
 
     def _process(self, verts_recpt, faces_recpt, verts_donor, faces_donor, face_data_donor, frame_widths, zcoefs, zoffsets, zrotations, wcoefs, facerots, mask):
         bm = bmesh_from_pydata(verts_recpt, [], faces_recpt, normal_update=True)
@@ -749,6 +839,8 @@ class SvAdaptivePolygonsNodeMk2(bpy.types.Node, SverchCustomTreeNode):
             z_size = diameter(donor_verts_o, Z)
 
         output = OutputData()
+        # Faces to be processed, grouped by map mode and donor object
+        batches = dict()
 
         prev_angle = None
         face_data = zip(faces_recpt, bm.faces, frame_widths, verts_donor, faces_donor, face_data_donor, zcoefs, zoffsets, zrotations, wcoefs, facerots, mask)
@@ -780,6 +872,7 @@ class SvAdaptivePolygonsNodeMk2(bpy.types.Node, SverchCustomTreeNode):
             # We have to recalculate rotated vertices only if
             # the rotation angle have changed.
             if prev_angle is None or angle != prev_angle or not single_donor:
+                donor = donor.copy()
                 donor.verts_v = self.rotate_z(donor_verts_o, angle)
 
                 if self.xy_mode == 'BOUNDS' or self.z_scale == 'AUTO' :
@@ -832,9 +925,14 @@ class SvAdaptivePolygonsNodeMk2(bpy.types.Node, SverchCustomTreeNode):
                 # Skip this recipient's face - do not produce any vertices/faces for it
                 continue
 
-            self._process_face(map_mode, output, recpt_face_data, donor, zcoef, zoffset, angle, wcoef, facerot)
+            self._process_face(map_mode, output, recpt_face_data, donor, zcoef, zoffset, angle, wcoef, facerot, batches)
             recpt_face_idx += 1
 
+        # Recipient vertices are referenced from bmesh, so
+        # batches must be processed before it is freed.
+        for batch in batches.values():
+            self._process_batch(batch, output)
+
         bm.free()
 
         return output
@@ -8,6 +8,9 @@
 import ast
 from math import *
 from collections import defaultdict
+from itertools import chain
+
+import numpy as np
 
 import bpy
 from bpy.props import BoolProperty, StringProperty, EnumProperty, FloatVectorProperty, IntProperty
@@ -15,9 +18,9 @@ import json
 import io
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import updateNode, match_long_repeat, zip_long_repeat, throttle_and_update_node
+from sverchok.data_structure import updateNode, match_long_repeat, zip_long_repeat, throttle_and_update_node, numpy_full_list
 from sverchok.utils import logging
-from sverchok.utils.modules.eval_formula import get_variables, safe_eval
+from sverchok.utils.modules.eval_formula import get_variables, safe_eval, safe_eval_vectorized
 
 class SvFormulaNodeMk4(bpy.types.Node, SverchCustomTreeNode):
     """
@@ -191,6 +194,41 @@ class SvFormulaNodeMk4(bpy.types.Node, SverchCustomTreeNode):
         return True
 
 
+    def process_object_vectorized(self, var_names, objects):
+        """
+        Evaluate all formulas for all values of one object at once, with numpy.
+        Returns None if it is not possible, then formulas are to be evaluated for each value separately.
+        """
+        if not all(isinstance(values, (list, tuple, np.ndarray)) and len(values) for values in objects):
+            return None
+        count = max(len(values) for values in objects)
+        variables = dict()
+        for name, values in zip(var_names, objects):
+            try:
+                values = np.asarray(values)
+            except ValueError:
+                # ragged nested lists
+                return None
+            if values.ndim != 1:
+                return None
+            variables[name] = numpy_full_list(values, count)
+
+        columns = []
+        for formula in self.formulas():
+            if formula:
+                value = safe_eval_vectorized(formula, variables)
+                if value is None:
+                    return None
+                try:
+                    columns.append(np.broadcast_to(value, (count,)).tolist())
+                except ValueError:
+                    return None
+
+        if self.separate:
+            return [list(vector) for vector in zip(*columns)]
+        else:
+            return list(chain.from_iterable(zip(*columns)))
+
     def process(self):
 
         if not self.outputs[0].is_linked:
@@ -211,6 +249,10 @@ class SvFormulaNodeMk4(bpy.types.Node, SverchCustomTreeNode):
             parameters = match_long_repeat(input_values)
 
             for objects in zip(*parameters):
+                object_results = self.process_object_vectorized(var_names, objects)
+                if object_results is not None:
+                    results.append(object_results)
+                    continue
                 object_results = []
                 for values in zip_long_repeat(*objects):
                     variables = dict(zip(var_names, values))
@@ -138,6 +138,7 @@ class SvScalarMathNodeMK4(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvScalarMathNodeMK4'
     bl_label = 'Scalar Math'
     sv_icon = 'SV_SCALAR_MATH'
+    is_batchable = True
 
     def mode_change(self, context):
         self.update_sockets()
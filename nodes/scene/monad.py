@@ -133,6 +133,7 @@ class SvGroupInputsNodeExp(Node, SvSocketAquisition, SverchCustomTreeNode):
     bl_idname = 'SvGroupInputsNodeExp'
     bl_label = 'Group Inputs Exp'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_batchable = True
 
     def sv_init(self, context):
         si = self.outputs.new
@@ -147,6 +148,7 @@ class SvGroupOutputsNodeExp(Node, SvSocketAquisition, SverchCustomTreeNode):
     bl_idname = 'SvGroupOutputsNodeExp'
     bl_label = 'Group Outputs Exp'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_batchable = True
 
     def sv_init(self, context):
         si = self.inputs.new
@@ -25,6 +25,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.utils.nodes_mixins.sv_animatable_nodes import SvAnimatableNode
 from sverchok.data_structure import updateNode
 from sverchok.utils.sv_bmesh_utils import pydata_from_bmesh
+from sverchok.utils.blender_mesh import read_object_mesh
 from sverchok.core.handlers import get_sv_depsgraph, set_sv_depsgraph_need
 from sverchok.utils.nodes_mixins.show_3d_properties import Show3DProperties
 
@@ -140,6 +141,11 @@ class SvObjectsNodeMK3(Show3DProperties, bpy.types.Node, SverchCustomTreeNode, S
         description='sorting inserted objects by names',
         default=True, update=updateNode)
 
+    output_numpy: BoolProperty(
+        name='Output NumPy',
+        description='Output NumPy arrays',
+        default=False, update=updateNode)
+
     object_names: bpy.props.CollectionProperty(type=SvOB3BDataCollection, options={'SKIP_SAVE'})
 
     active_obj_index: bpy.props.IntProperty()
@@ -225,8 +231,13 @@ class SvObjectsNodeMK3(Show3DProperties, bpy.types.Node, SverchCustomTreeNode, S
 
     def draw_buttons_ext(self, context, layout):
         layout.prop(self, 'draw_3dpanel', text="To Control panel")
+        layout.prop(self, 'output_numpy')
         self.draw_animatable_buttons(layout)
 
+    def rclick_menu(self, context, layout):
+        '''right click sv_menu items'''
+        layout.prop(self, "output_numpy", expand=False)
+
     def draw_buttons_3dpanel(self, layout):
         callback = 'node.ob3_callback'
         row = layout.row(align=True)
@@ -237,21 +248,9 @@ class SvObjectsNodeMK3(Show3DProperties, bpy.types.Node, SverchCustomTreeNode, S
         self.wrapper_tracked_ui_draw_op(colo, callback, text='Get').fn_name = 'get_objects_from_scene'
 
 
-    def get_verts_and_vertgroups(self, obj_data):
-        vers = []
-        vers_grouped = []
-        for k, v in enumerate(obj_data.vertices):
-            if self.vergroups and v.groups.values():
-                vers_grouped.append(k)
-            vers.append(list(v.co))
-        return vers, vers_grouped
-
     def get_materials_from_bmesh(self, bm):
         return [face.material_index for face in bm.faces[:]]
 
-    def get_materials_from_mesh(self, mesh):
-        return [face.material_index for face in mesh.polygons[:]]
-
     def sv_free(self):
         set_sv_depsgraph_need(False)
 
@@ -314,20 +313,13 @@ class SvObjectsNodeMK3(Show3DProperties, bpy.types.Node, SverchCustomTreeNode, S
                         """
 
                         if self.modifiers:
-
-                            obj = sv_depsgraph.objects[obj.name]
-                            obj_data = obj.to_mesh(preserve_all_data_layers=True, depsgraph=sv_depsgraph)
+                            mesh_data = read_object_mesh(obj, sv_depsgraph, self.vergroups)
                         else:
-                            obj_data = obj.to_mesh()
-
-                        if obj_data.polygons:
-                            pols = [list(p.vertices) for p in obj_data.polygons]
-                        vers, vers_grouped = self.get_verts_and_vertgroups(obj_data)
-                        materials = self.get_materials_from_mesh(obj_data)
-                        edgs = obj_data.edge_keys
-
-                        obj.to_mesh_clear()
+                            mesh_data = read_object_mesh(obj, vertex_groups=self.vergroups)
 
+                        vers, edgs, pols, materials = mesh_data.get_pydata(self.output_numpy)
+                        if self.vergroups:
+                            vers_grouped = mesh_data.grouped.tolist()
 
                 except Exception as err:
                     print('failure in process between frozen area', self.name, err)
@@ -339,7 +331,7 @@ class SvObjectsNodeMK3(Show3DProperties, bpy.types.Node, SverchCustomTreeNode, S
             materials_out.append(materials)
             vers_out_grouped.append(vers_grouped)
 
-        if vers_out and vers_out[0]:
+        if vers_out and len(vers_out[0]):
             outputs['Vertices'].sv_set(vers_out)
             outputs['Edges'].sv_set(edgs_out)
             outputs['Polygons'].sv_set(pols_out)
@@ -23,6 +23,8 @@ class SvLloyd2dNode(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Lloyd 2D'
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_VORONOI'
+    is_thread_safe = True
+    is_memoizable = True
 
     clip: FloatProperty(
         name='clip', description='Clipping Distance',
@@ -61,10 +63,10 @@ class SvLloyd2dNode(bpy.types.Node, SverchCustomTreeNode):
         self.draw_buttons(context, layout)
         layout.prop(self, "clip", text="Clipping")
 
-    def process(self):
+    def prepare_threaded(self):
 
         if not self.outputs['Vertices'].is_linked:
-            return
+            return None
 
         verts_in = self.inputs['Vertices'].sv_get()
         iterations_in = self.inputs['Iterations'].sv_get()
@@ -77,20 +79,27 @@ class SvLloyd2dNode(bpy.types.Node, SverchCustomTreeNode):
             weights_in = ensure_nesting_level(weights_in, 2, data_types=(SvScalarField,))
 
         nested_output = input_level > 3
+        bound_mode = self.bound_mode
+        clip = self.clip
+
+        def calculate():
+            verts_out = []
+            for params in zip_long_repeat(verts_in, iterations_in, weights_in):
+                new_verts = []
+                for verts, iterations, weights in zip_long_repeat(*params):
+                    iter_verts = lloyd2d(bound_mode, verts, iterations,
+                                    clip = clip, weight_field = weights)
+                    new_verts.append(iter_verts)
+                if nested_output:
+                    verts_out.append(new_verts)
+                else:
+                    verts_out.extend(new_verts)
+            return {'Vertices': verts_out}
+
+        return calculate
 
-        verts_out = []
-        for params in zip_long_repeat(verts_in, iterations_in, weights_in):
-            new_verts = []
-            for verts, iterations, weights in zip_long_repeat(*params):
-                iter_verts = lloyd2d(self.bound_mode, verts, iterations,
-                                clip = self.clip, weight_field = weights)
-                new_verts.append(iter_verts)
-            if nested_output:
-                verts_out.append(new_verts)
-            else:
-                verts_out.extend(new_verts)
-
-        self.outputs['Vertices'].sv_set(verts_out)
+    def process(self):
+        self.process_prepared()
 
 def register():
     bpy.utils.register_class(SvLloyd2dNode)
@@ -11,7 +11,7 @@ from bpy.props import FloatProperty, StringProperty, BoolProperty, EnumProperty,
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, ensure_nesting_level, zip_long_repeat, throttle_and_update_node, get_data_nesting_level
 from sverchok.utils.field.scalar import SvScalarField
-from sverchok.utils.voronoi3d import Bounds, lloyd3d_bounded
+from sverchok.utils.voronoi3d import Bounds, lloyd3d_bounded, lloyd3d_approximate
 from sverchok.utils.dummy_nodes import add_dummy
 from sverchok.dependencies import scipy
 
@@ -27,6 +27,7 @@ class SvLloyd3dNode(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Lloyd 3D'
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_VORONOI'
+    is_memoizable = True
 
     iterations : IntProperty(
         name = "Iterations",
@@ -53,6 +54,25 @@ class SvLloyd3dNode(bpy.types.Node, SverchCustomTreeNode):
         default = 'BOX',
         update = updateNode)
 
+    algorithms = [
+            ('EXACT', "Exact", "Calculate centers of exact Voronoi cells", 0),
+            ('APPROXIMATE', "Approximate", "Calculate centers of cells approximately, by assigning random sample points to the nearest sites; much faster for many sites", 1)
+        ]
+
+    algorithm : EnumProperty(
+        name = "Algorithm",
+        description = "How to calculate centers of Voronoi cells",
+        items = algorithms,
+        default = 'EXACT',
+        update = updateNode)
+
+    samples : IntProperty(
+        name = "Samples",
+        description = "Number of random sample points per site, used by Approximate algorithm",
+        min = 1,
+        default = 50,
+        update = updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', "Sites").enable_input_link_menu = False
         self.inputs.new('SvStringsSocket', "Clipping").prop_name = 'clipping'
@@ -63,6 +83,9 @@ class SvLloyd3dNode(bpy.types.Node, SverchCustomTreeNode):
     def draw_buttons(self, context, layout):
         layout.label(text="Bounds mode:")
         layout.prop(self, "bounds_mode", text='')
+        layout.prop(self, "algorithm", text='')
+        if self.algorithm == 'APPROXIMATE':
+            layout.prop(self, "samples")
 
     def process(self):
 
@@ -88,7 +111,12 @@ class SvLloyd3dNode(bpy.types.Node, SverchCustomTreeNode):
             new_verts = []
             for sites, iterations, clipping, weights in zip_long_repeat(*params):
                 bounds = Bounds.new(self.bounds_mode, sites, clipping)
-                sites = lloyd3d_bounded(bounds, sites, iterations, weight_field = weights)
+                if self.algorithm == 'APPROXIMATE':
+                    sites = lloyd3d_approximate(bounds, sites, iterations,
+                                n_samples = self.samples * len(sites),
+                                weight_field = weights)
+                else:
+                    sites = lloyd3d_bounded(bounds, sites, iterations, weight_field = weights)
                 new_verts.append(sites)
             if nested_output:
                 verts_out.append(new_verts)
@@ -11,7 +11,7 @@ from bpy.props import FloatProperty, StringProperty, BoolProperty, EnumProperty,
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, ensure_nesting_level, zip_long_repeat, throttle_and_update_node, get_data_nesting_level
 from sverchok.utils.field.scalar import SvScalarField
-from sverchok.utils.voronoi3d import lloyd_on_mesh
+from sverchok.utils.voronoi3d import lloyd_on_mesh, lloyd_on_mesh_approximate
 from sverchok.utils.dummy_nodes import add_dummy
 from sverchok.dependencies import scipy
 
@@ -41,6 +41,25 @@ class SvLloydOnMeshNode(bpy.types.Node, SverchCustomTreeNode):
         min = 0.0,
         update=updateNode)
 
+    algorithms = [
+            ('EXACT', "Exact", "Calculate centers of exact Voronoi cells", 0),
+            ('APPROXIMATE', "Approximate", "Calculate centers of cells approximately, by assigning random sample points to the nearest sites; much faster for many sites", 1)
+        ]
+
+    algorithm : EnumProperty(
+        name = "Algorithm",
+        description = "How to calculate centers of Voronoi cells",
+        items = algorithms,
+        default = 'EXACT',
+        update = updateNode)
+
+    samples : IntProperty(
+        name = "Samples",
+        description = "Number of random sample points per site, used by Approximate algorithm",
+        min = 1,
+        default = 50,
+        update = updateNode)
+
     def sv_init(self, context):
         self.inputs.new('SvVerticesSocket', "Vertices")
         self.inputs.new('SvStringsSocket', "Faces")
@@ -50,6 +69,11 @@ class SvLloydOnMeshNode(bpy.types.Node, SverchCustomTreeNode):
         self.inputs.new('SvScalarFieldSocket', 'Weights').enable_input_link_menu = False
         self.outputs.new('SvVerticesSocket', "Sites")
 
+    def draw_buttons(self, context, layout):
+        layout.prop(self, "algorithm", text='')
+        if self.algorithm == 'APPROXIMATE':
+            layout.prop(self, "samples")
+
     def process(self):
 
         if not any(socket.is_linked for socket in self.outputs):
@@ -77,7 +101,12 @@ class SvLloydOnMeshNode(bpy.types.Node, SverchCustomTreeNode):
         for params in zip_long_repeat(verts_in, faces_in, sites_in, thickness_in, iterations_in, weights_in):
             new_verts = []
             for verts, faces, sites, thickness, iterations, weights in zip_long_repeat(*params):
-                sites = lloyd_on_mesh(verts, faces, sites, thickness, iterations, weight_field = weights)
+                if self.algorithm == 'APPROXIMATE':
+                    sites = lloyd_on_mesh_approximate(verts, faces, sites, iterations,
+                                n_samples = self.samples * len(sites),
+                                weight_field = weights)
+                else:
+                    sites = lloyd_on_mesh(verts, faces, sites, thickness, iterations, weight_field = weights)
                 new_verts.append(sites)
             if nested_output:
                 verts_out.append(new_verts)
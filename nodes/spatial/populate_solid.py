@@ -100,8 +100,20 @@ class SvPopulateSolidNode(bpy.types.Node, SverchCustomTreeNode):
         default=True,
         update=updateNode)
 
+    distribution_modes = [
+            ('RANDOM', "Random", "Generate specified number of random points", 0),
+            ('POISSON', "Poisson Disk", "Generate points until no more points can be placed at minimum distance from other points; Count is the maximum number of points", 1)
+        ]
+
+    distribution : EnumProperty(
+            name = "Distribution",
+            items = distribution_modes,
+            default = 'RANDOM',
+            update = updateNode)
+
     def draw_buttons(self, context, layout):
         layout.prop(self, "gen_mode", text='Mode')
+        layout.prop(self, "distribution")
         layout.prop(self, "proportional")
         if self.gen_mode == 'VOLUME':
             layout.prop(self, "in_surface")
@@ -133,7 +145,7 @@ class SvPopulateSolidNode(bpy.types.Node, SverchCustomTreeNode):
         box = solid.BoundBox
         bbox = ((box.XMin, box.YMin, box.ZMin), (box.XMax, box.YMax, box.ZMax))
         
-        return field_random_probe(field, bbox, count, threshold, self.proportional, field_min, field_max, min_r, seed, predicate=check)
+        return field_random_probe(field, bbox, count, threshold, self.proportional, field_min, field_max, min_r, seed, predicate=check, poisson = self.distribution == 'POISSON')
 
     def distribute_faces(self, faces, total_count):
         points_per_face = [0 for _ in range(len(faces))]
@@ -158,7 +170,7 @@ class SvPopulateSolidNode(bpy.types.Node, SverchCustomTreeNode):
 
             surface = SvSolidFaceSurface(face)
 
-            _, face_verts = populate_surface(surface, field, cnt, threshold, self.proportional, field_min, field_max, min_r, seed, predicate=check)
+            _, face_verts = populate_surface(surface, field, cnt, threshold, self.proportional, field_min, field_max, min_r, seed, predicate=check, poisson = self.distribution == 'POISSON')
             new_verts.extend(face_verts)
         return new_verts
 
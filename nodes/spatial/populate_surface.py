@@ -68,7 +68,19 @@ class SvPopulateSurfaceNode(bpy.types.Node, SverchCustomTreeNode):
             min = 0,
             update = updateNode)
 
+    distribution_modes = [
+            ('RANDOM', "Random", "Generate specified number of random points", 0),
+            ('POISSON', "Poisson Disk", "Generate points until no more points can be placed at minimum distance from other points; Count is the maximum number of points", 1)
+        ]
+
+    distribution : EnumProperty(
+            name = "Distribution",
+            items = distribution_modes,
+            default = 'RANDOM',
+            update = updateNode)
+
     def draw_buttons(self, context, layout):
+        layout.prop(self, "distribution")
         layout.prop(self, "proportional")
 
     def sv_init(self, context):
@@ -112,7 +124,7 @@ class SvPopulateSurfaceNode(bpy.types.Node, SverchCustomTreeNode):
         for surfaces, fields, counts, thresholds, field_mins, field_maxs, min_rs, seeds in parameters:
             objects = zip_long_repeat(surfaces, fields, counts, thresholds, field_mins, field_maxs, min_rs, seeds)
             for surface, field, count, threshold, field_min, field_max, min_r, seed in objects:
-                new_uv, new_verts = populate_surface(surface, field, count, threshold, self.proportional, field_min, field_max, min_r, seed)
+                new_uv, new_verts = populate_surface(surface, field, count, threshold, self.proportional, field_min, field_max, min_r, seed, poisson = self.distribution == 'POISSON')
                 verts_out.append(new_verts)
                 uv_out.append(new_uv)
 
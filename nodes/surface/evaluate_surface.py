@@ -182,9 +182,6 @@ class SvEvalSurfaceNode(bpy.types.Node, SverchCustomTreeNode):
         v_max = surface.get_v_max()
         us = np.linspace(u_min, u_max, num=samples_u)
         vs = np.linspace(v_min, v_max, num=samples_v)
-        us, vs = np.meshgrid(us, vs)
-        us = us.flatten()
-        vs = vs.flatten()
         return us, vs
 
     def make_edges_xy(self, samples_u, samples_v):
@@ -236,7 +233,8 @@ class SvEvalSurfaceNode(bpy.types.Node, SverchCustomTreeNode):
             for surface, target_us, target_vs, target_verts, samples_u, samples_v in objects:
 
                 if self.eval_mode == 'GRID':
-                    target_us, target_vs = self.make_grid_input(surface, samples_u, samples_v)
+                    grid_us, grid_vs = self.make_grid_input(surface, samples_u, samples_v)
+                    new_verts = surface.evaluate_uv_grid(grid_us, grid_vs).reshape((-1, 3))
                     new_edges = self.make_edges_xy(samples_u, samples_v)
                     new_faces = self.make_faces_xy(samples_u, samples_v)
                 else:
@@ -248,9 +246,9 @@ class SvEvalSurfaceNode(bpy.types.Node, SverchCustomTreeNode):
                         target_us, target_vs = self._clamp(surface, target_us, target_vs)
                     elif self.clamp_mode == 'WRAP':
                         target_us, target_vs = self._wrap(surface, target_us, target_vs)
+                    new_verts = surface.evaluate_array(target_us, target_vs)
                     new_edges = []
                     new_faces = []
-                new_verts = surface.evaluate_array(target_us, target_vs)
 
                 new_verts = self.build_output(surface, new_verts)
                 new_verts = new_verts.tolist()
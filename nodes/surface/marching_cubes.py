@@ -9,6 +9,7 @@ from sverchok.core.sockets import setup_new_node_location
 from sverchok.data_structure import updateNode, throttle_and_update_node, match_long_repeat
 from sverchok.utils.logging import info, exception
 from sverchok.utils.marching_cubes import isosurface_np
+from sverchok.utils.field.compiler import compile_field
 from sverchok.dependencies import mcubes, skimage
 from sverchok.utils.nodes_mixins.draft_mode import DraftMode
 
@@ -26,6 +27,7 @@ class SvExMarchingCubesNode(DraftMode, bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Marching Cubes'
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_EX_MCUBES'
+    is_memoizable = True
 
     iso_value : FloatProperty(
             name = "Value",
@@ -228,7 +230,7 @@ class SvExMarchingCubesNode(DraftMode, bpy.types.Node, SverchCustomTreeNode):
                 y_range = np.linspace(b1[1], b2[1], num=samples_y)
                 z_range = np.linspace(b1[2], b2[2], num=samples_z)
                 xs, ys, zs = np.meshgrid(x_range, y_range, z_range, indexing='ij')
-                func_values = field.evaluate_grid(xs.flatten(), ys.flatten(), zs.flatten())
+                func_values = compile_field(field).evaluate_grid(xs.flatten(), ys.flatten(), zs.flatten())
                 func_values = func_values.reshape((samples_x, samples_y, samples_z))
 
             if self.implementation == 'mcubes':
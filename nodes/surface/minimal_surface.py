@@ -28,6 +28,7 @@ else:
         bl_label = 'Minimal Surface'
         bl_icon = 'OUTLINER_OB_EMPTY'
         sv_icon = 'SV_EX_MINSURFACE'
+        is_memoizable = True
 
         @throttle_and_update_node
         def update_sockets(self, context):
@@ -11,7 +11,7 @@ from sverchok.utils.logging import info, exception
 from sverchok.utils.surface import SvSurface
 from sverchok.utils.dummy_nodes import add_dummy
 from sverchok.dependencies import scipy
-from sverchok.utils.manifolds import ortho_project_surface
+from sverchok.utils.manifolds import ortho_project_surface_array
 
 if scipy is None:
     add_dummy('SvExOrthoProjectSurfaceNode', "Ortho Project on Surface", 'scipy')
@@ -57,13 +57,8 @@ else:
             uv_out = []
             for surfaces, src_points_i in zip_long_repeat(surfaces_s, src_point_s):
                 for surface, src_points in zip_long_repeat(surfaces, src_points_i):
-                    new_points = []
-                    new_uv = []
-                    for src_point in src_points:
-                        src_point = np.array(src_point)
-                        u, v, point = ortho_project_surface(src_point, surface, init_samples=self.samples)
-                        new_uv.append((u, v, 0))
-                        new_points.append(point)
+                    us, vs, new_points = ortho_project_surface_array(src_points, surface, init_samples=self.samples)
+                    new_uv = [(u, v, 0) for u, v in zip(us, vs)]
                     points_out.append(new_points)
                     uv_out.append(new_uv)
 
@@ -30,6 +30,7 @@ class MatrixApplyNode(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Matrix Apply (verts)'
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_MATRIX_APPLY'
+    is_batchable = True
 
     output_numpy: BoolProperty(
         name='Output NumPy',
@@ -57,6 +57,7 @@ class SvScaleNodeMk3(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Scale'
     bl_icon = 'ORIENTATION_VIEW'
     sv_icon = 'SV_MOVE'
+    is_batchable = True
 
 
     centers: FloatVectorProperty(
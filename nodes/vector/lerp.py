@@ -38,6 +38,7 @@ class SvVectorLerp(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Vector Lerp'
     bl_icon = 'OUTLINER_OB_EMPTY'
     sv_icon = 'SV_EVALUATE'
+    is_batchable = True
 
     factor_: FloatProperty(
         name='factor', description='Step length',
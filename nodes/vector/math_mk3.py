@@ -97,6 +97,7 @@ class SvVectorMathNodeMK3(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Vector Math'
     bl_icon = 'THREE_DOTS'
     sv_icon = 'SV_VECTOR_MATH'
+    is_batchable = True
 
     @throttle_and_update_node
     def mode_change(self, context):
@@ -65,6 +65,7 @@ class GenVectorsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'GenVectorsNode'
     bl_label = 'Vector in'
     sv_icon = 'SV_VECTOR_IN'
+    is_batchable = True
 
     x_: FloatProperty(name='X', description='X', default=0.0, precision=3, update=updateNode)
     y_: FloatProperty(name='Y', description='Y', default=0.0, precision=3, update=updateNode)
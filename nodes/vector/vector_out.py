@@ -36,6 +36,7 @@ class VectorsOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'VectorsOutNode'
     bl_label = 'Vector out'
     sv_icon = 'SV_VECTOR_OUT'
+    is_batchable = True
     output_numpy: BoolProperty(
         name='Output NumPy',
         description='Output NumPy arrays',
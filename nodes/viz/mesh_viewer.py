@@ -7,6 +7,8 @@
 
 from itertools import cycle
 
+import numpy as np
+
 import bpy
 from bpy.props import BoolProperty
 from mathutils import Matrix
@@ -177,7 +179,7 @@ class SvMeshViewer(Show3DProperties, SvViewerNode, SverchCustomTreeNode, bpy.typ
                 me_data.mesh.materials.clear()
                 me_data.mesh.materials.append(self.material)
             if mat_indexes:
-                mat_i = [mi for _, mi in zip(me_data.mesh.polygons, cycle(mat_i))]
+                mat_i = np.resize(np.asarray(mat_i, dtype=np.int32), len(me_data.mesh.polygons))
                 me_data.mesh.polygons.foreach_set('material_index', mat_i)
             me_data.set_smooth(self.is_smooth_mesh)
 
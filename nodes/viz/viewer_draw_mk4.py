@@ -17,9 +17,11 @@
 # ##### END GPL LICENSE BLOCK #####
 
 from itertools import cycle
+
+import numpy as np
+
 from mathutils import Vector, Matrix
-from mathutils.geometry import tessellate_polygon as tessellate, normal
-from mathutils.noise import random, seed_set
+from mathutils.noise import seed_set
 import bpy
 from bpy.props import StringProperty, FloatProperty, IntProperty, EnumProperty, BoolProperty, FloatVectorProperty
 
@@ -27,8 +29,6 @@ import bgl
 import gpu
 from gpu_extras.batch import batch_for_shader
 import sverchok
-from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
-from sverchok.utils.sv_mesh_utils import polygons_to_edges
 from sverchok.core.socket_data import SvGetSocketInfo
 from sverchok.data_structure import updateNode, node_id, match_long_repeat, enum_item_5
 from sverchok.node_tree import SverchCustomTreeNode
@@ -36,6 +36,8 @@ from sverchok.ui.bgl_callback_3dview import callback_disable, callback_enable
 from sverchok.utils.sv_batch_primitives import MatrixDraw28
 from sverchok.utils.sv_shader_sources import dashed_vertex_shader, dashed_fragment_shader
 from sverchok.utils.geom import multiply_vectors_deep
+from sverchok.utils.mesh_draw_buffers import (
+        fill_points_colors, get_object_buffers, concatenate_buffers, clear_draw_buffers_cache)
 
 
 socket_dict = {
@@ -69,54 +71,6 @@ default_fragment_shader = '''
     }
 '''
 
-def ensure_triangles(coords, indices, handle_concave_quads):
-    """
-    this fully tesselates the incoming topology into tris,
-    not optimized for meshes that don't contain ngons
-    """
-    new_indices = []
-    face_index = []
-    concat = new_indices.append
-    concat2 = new_indices.extend
-    for idf, idxset in enumerate(indices):
-        num_verts = len(idxset)
-        if num_verts == 3:
-            concat(tuple(idxset))
-            face_index.append(idf)
-        elif num_verts == 4 and not handle_concave_quads:
-            # a b c d  ->  [a, b, c], [a, c, d]
-            concat2([(idxset[0], idxset[1], idxset[2]), (idxset[0], idxset[2], idxset[3])])
-            face_index.extend([idf, idf])
-        else:
-            subcoords = [Vector(coords[idx]) for idx in idxset]
-            for pol in tessellate([subcoords]):
-                concat([idxset[i] for i in pol])
-                face_index.append(idf)
-    return new_indices, face_index
-
-
-def fill_points_colors(vectors_color, data, color_per_point, random_colors):
-    points_color = []
-    if color_per_point:
-        for cols, sub_data in zip(cycle(vectors_color), data):
-            if random_colors:
-                for  n in sub_data:
-                    points_color.append([random(), random(), random(), 1])
-            else:
-                for col, n in zip(cycle(cols), sub_data):
-                    points_color.append(col)
-
-    else:
-        for nums, col in zip(data, cycle(vectors_color[0])):
-            if random_colors:
-                r_color = [random(), random(), random(), 1]
-                for n in nums:
-                    points_color.append(r_color)
-            else:
-                for n in nums:
-                    points_color.append(col)
-
-    return points_color
 
 def draw_matrix(context, args):
     """ this takes one or more matrices packed into an iterable """
@@ -172,7 +126,7 @@ def view_3d_geom(context, args):
             shader.uniform_float("u_resolution", config.u_resolution)
             shader.uniform_float("u_dashSize", config.u_dash_size)
             shader.uniform_float("u_gapSize", config.u_gap_size)
-            shader.uniform_float("m_color", geom.e_vertex_colors[0])
+            shader.uniform_float("m_color", tuple(geom.e_vertex_colors[0]))
             batch.draw(shader)
         else:
             e_batch = batch_for_shader(config.e_shader, 'LINES', {"pos": geom.e_vertices, "color": geom.e_vertex_colors}, indices=geom.e_indices)
@@ -192,155 +146,6 @@ def view_3d_geom(context, args):
     bgl.glEnable(bgl.GL_BLEND)
 
 
-def splitted_polygons_geom(polygon_indices, original_idx, v_path, cols, idx_offset):
-    '''geometry of the splitted polygons (splitted to assign colors)'''
-    total_p_verts = 0
-    p_vertices, vertex_colors, indices = [], [], []
-
-    for pol, idx in zip(polygon_indices, original_idx):
-        p_vertices.extend([v_path[c] for c in pol])
-        vertex_colors.extend([cols[idx % len(cols)] for c in pol])
-        indices.append([c + idx_offset + total_p_verts for c in range(len(pol))])
-        total_p_verts += len(pol)
-
-    return p_vertices, vertex_colors, indices, total_p_verts
-
-
-def splitted_facet_polygons_geom(polygon_indices, original_idx, v_path, cols, idx_offset, normals, light):
-    '''geometry of the splitted polygons (splitted to assign colors* normals)'''
-    total_p_verts = 0
-    p_vertices, vertex_colors, indices = [], [], []
-
-    for pol, idx in zip(polygon_indices, original_idx):
-        p_vertices.extend([v_path[c] for c in pol])
-        factor = (normals[idx].dot(light))*0.5+0.5
-        colors = []
-
-        for c in pol:
-            col = cols[idx % len(cols)]
-            colors.append([col[0]*factor, col[1]*factor, col[2]*factor, col[3]])
-
-        vertex_colors.extend(colors)
-        indices.append([c + idx_offset + total_p_verts for c in range(len(pol))])
-        total_p_verts += len(pol)
-
-    return p_vertices, vertex_colors, indices, total_p_verts
-
-
-def splitted_facet_polygons_geom_v_cols(polygon_indices, original_idx, v_path, cols, idx_offset, normals, light):
-    '''geometry of the splitted polygons (splitted to assign vertex_colors * face_normals)'''
-
-    total_p_verts = 0
-    p_vertices, vertex_colors, indices = [], [], []
-
-    for pol, idx in zip(polygon_indices, original_idx):
-        p_vertices.extend([v_path[c] for c in pol])
-        factor = (normals[idx].dot(light)) * 0.5 + 0.5
-        colors = []
-
-        for c in pol:
-            col = cols[c % len(cols)]
-            colors.append([col[0] * factor, col[1] * factor, col[2] * factor, col[3]])
-
-        vertex_colors.extend(colors)
-        indices.append([c + idx_offset + total_p_verts for c in range(len(pol))])
-        total_p_verts += len(pol)
-
-    return p_vertices, vertex_colors, indices, total_p_verts
-
-
-def splitted_smooth_polygons_geom(polygon_indices, original_idx, v_path, cols, idx_offset, normals, light):
-    '''geometry of the splitted polygons (splitted to assign face_colors * vertex_normals)'''
-
-    total_p_verts = 0
-    p_vertices, vertex_colors, indices = [], [], []
-
-    for pol, idx in zip(polygon_indices, original_idx):
-        p_vertices.extend([v_path[c] for c in pol])
-        colors = []
-
-        for c in pol:
-            factor = (normals[c].dot(light)) * 0.5 + 0.5
-            col = cols[idx % len(cols)]
-            colors.append([col[0] * factor, col[1] * factor, col[2] * factor, col[3]])
-
-        vertex_colors.extend(colors)
-        indices.append([c + idx_offset + total_p_verts for c in range(len(pol))])
-        total_p_verts += len(pol)
-
-    return p_vertices, vertex_colors, indices, total_p_verts
-
-
-def get_vertex_normals(vecs, polygons):
-    mesh = bmesh_from_pydata(vecs, [], polygons, normal_update=True)
-    return [Vector(vert.normal) for vert in mesh.verts]
-
-
-def polygons_geom(config, vecs, polygons, p_vertices, p_vertex_colors, p_indices, v_path, p_cols, idx_p_offset, points_colors):
-    '''generates polygons geometry'''
-
-    if (config.color_per_polygon and not config.polygon_use_vertex_color) or config.shade_mode == 'facet':
-
-        polygon_indices, original_idx = ensure_triangles(vecs, polygons, config.handle_concave_quads)
-
-        if config.shade_mode == 'facet':
-            normals = [normal(*[Vector(vecs[c]) for c in p]) for p in polygons]
-
-            if config.polygon_use_vertex_color:
-                p_v, v_c, idx, total_p_verts = splitted_facet_polygons_geom_v_cols(polygon_indices, original_idx, v_path, points_colors, idx_p_offset[0], normals, config.vector_light)
-            else:
-                p_v, v_c, idx, total_p_verts = splitted_facet_polygons_geom(polygon_indices, original_idx, v_path, p_cols, idx_p_offset[0], normals, config.vector_light)
-
-        elif config.shade_mode == 'smooth':
-            normals = get_vertex_normals(vecs, polygons)
-            p_v, v_c, idx, total_p_verts = splitted_smooth_polygons_geom(polygon_indices, original_idx, v_path, p_cols, idx_p_offset[0], normals, config.vector_light)
-
-        else:
-            p_v, v_c, idx, total_p_verts = splitted_polygons_geom(polygon_indices, original_idx, v_path, p_cols, idx_p_offset[0])
-
-        p_vertices.extend(p_v)
-        p_vertex_colors.extend(v_c)
-        p_indices.extend(idx)
-    else:
-        polygon_indices, original_idx = ensure_triangles(vecs, polygons, config.handle_concave_quads)
-        p_vertices.extend(v_path)
-
-        if config.shade_mode == 'smooth':
-            normals = get_vertex_normals(v_path, polygons)
-            colors = []
-            if config.polygon_use_vertex_color:
-                for normal_v, col in zip(normals, points_colors):
-
-                    factor = normal_v.dot(config.vector_light)*0.5+0.5
-                    colors.append([col[0]*factor, col[1]*factor, col[2]*factor, col[3]])
-            else:
-                col = p_cols
-                for normal_v in normals:
-                    factor = normal_v.dot(config.vector_light)*0.5+0.5
-                    colors.append([col[0]*factor, col[1]*factor, col[2]*factor, col[3]])
-            p_vertex_colors.extend(colors)
-        else:
-            p_vertex_colors.extend([p_cols for v in v_path])
-        p_indices.extend([[c + idx_p_offset[0] for c in p] for p in polygon_indices])
-        total_p_verts = len(vecs)
-    idx_p_offset[0] += total_p_verts
-
-
-def edges_geom(config, edges, e_col, v_path, e_vertices, e_vertex_colors, e_indices, idx_e_offset):
-    '''generates edges geometry'''
-    if config.color_per_edge and not config.edges_use_vertex_color:
-        for (idx0, idx1), col in zip(edges, cycle(e_col)):
-            e_vertices.extend([v_path[idx0], v_path[idx1]])
-            e_vertex_colors.extend([col, col])
-            e_indices.append([len(e_vertices)-2, len(e_vertices)-1])
-
-    else:
-        e_vertices.extend(v_path)
-        e_vertex_colors.extend([e_col for v in v_path])
-        e_indices.extend([[c + idx_e_offset[0] for c in e] for e in edges])
-        idx_e_offset[0] += len(v_path)
-
-
 def generate_mesh_geom(config, vecs_in):
     '''generates drawing from mesh data'''
     geom = lambda: None
@@ -348,10 +153,7 @@ def generate_mesh_geom(config, vecs_in):
     if config.color_per_polygon:
         pol_color = config.poly_color
     else:
-        if config.shade_mode == 'facet':
-            pol_color = [[c] for c in config.poly_color[0]]
-        else:
-            pol_color = config.poly_color[0]
+        pol_color = config.poly_color[0]
 
     if config.color_per_edge:
         edge_color = config.edge_color
@@ -360,54 +162,38 @@ def generate_mesh_geom(config, vecs_in):
     edges_s = config.edges
     polygons_s = config.polygons
 
-    v_vertices = []
-    e_vertices, e_vertex_colors, e_indices = [], [], []
-    p_vertices, p_vertex_colors, p_indices = [], [], []
-
-    idx_p_offset = [0]
-    idx_e_offset = [0]
-
     if config.matrix[0]:
         vecs_in, mats_in = match_long_repeat([vecs_in, config.matrix])
-        use_matrix = True
     else:
-        mats_in = cycle(config.matrix)
-        use_matrix = False
+        mats_in = cycle([None])
 
+    counts = [len(vecs) for vecs in vecs_in]
     if config.draw_verts or (config.draw_edges and config.edges_use_vertex_color) or (config.draw_polys and config.polygon_use_vertex_color):
-        points_color = fill_points_colors(config.vector_color, vecs_in, config.color_per_point, config.random_colors)
+        points_color = fill_points_colors(config.vector_color, counts, config.color_per_point, config.random_colors)
+        offsets = np.cumsum(counts) - counts
+        objects_color = [points_color[offset : offset + count] for offset, count in zip(offsets, counts)]
     else:
-        points_color = []
+        points_color = np.zeros((0, 4), dtype=np.float32)
+        objects_color = cycle([None])
 
-    for vecs, mat, polygons, edges, p_cols, e_col in zip(vecs_in, mats_in, cycle(polygons_s), cycle(edges_s), cycle(pol_color), cycle(edge_color)):
-        if use_matrix:
-            v_path = [(mat @ Vector(v))[:] for v in vecs]
-        else:
-            v_path = vecs
-        v_vertices.extend(v_path)
-        if config.draw_edges:
-            edges_geom(config, edges, e_col, v_path, e_vertices, e_vertex_colors, e_indices, idx_e_offset)
-        if config.draw_polys:
-            polygons_geom(config, vecs, polygons, p_vertices, p_vertex_colors, p_indices, v_path, p_cols, idx_p_offset, points_color)
+    n_id = node_id(config.node)
+    buffers = concatenate_buffers([
+        get_object_buffers(config, vecs, edges, polygons, mat, cols, p_cols, e_col, slot=(n_id, idx))
+        for idx, (vecs, mat, polygons, edges, cols, p_cols, e_col)
+        in enumerate(zip(vecs_in, mats_in, cycle(polygons_s), cycle(edges_s), objects_color, cycle(pol_color), cycle(edge_color)))])
 
     if config.draw_verts:
 
         config.v_shader = gpu.shader.from_builtin('3D_SMOOTH_COLOR')
-        geom.v_vertices, geom.points_color = v_vertices, points_color
+        geom.v_vertices, geom.points_color = buffers['v_vertices'], points_color
 
     if config.draw_edges:
-        if config.edges_use_vertex_color and e_vertices:
-            e_vertex_colors = points_color
-
         config.e_shader = gpu.shader.from_builtin('3D_SMOOTH_COLOR')
-        geom.e_vertices, geom.e_vertex_colors, geom.e_indices = e_vertices, e_vertex_colors, e_indices
-
+        geom.e_vertices, geom.e_vertex_colors, geom.e_indices = buffers['e_vertices'], buffers['e_colors'], buffers['e_indices']
 
     if config.draw_polys and config.shade_mode != 'fragment':
-        if config.polygon_use_vertex_color and config.shade_mode not in ['facet', 'smooth']:
-            p_vertex_colors = points_color
         config.p_shader = gpu.shader.from_builtin('3D_SMOOTH_COLOR')
-        geom.p_vertices, geom.p_vertex_colors, geom.p_indices = p_vertices, p_vertex_colors, p_indices
+        geom.p_vertices, geom.p_vertex_colors, geom.p_indices = buffers['p_vertices'], buffers['p_colors'], buffers['p_indices']
 
     elif config.shade_mode == 'fragment' and config.draw_polys:
 
@@ -425,7 +211,7 @@ def generate_mesh_geom(config, vecs_in):
             config.p_shader = gpu.types.GPUShader(config.node.custom_vertex_shader, config.node.custom_fragment_shader)
         else:
             config.p_shader = gpu.types.GPUShader(default_vertex_shader, default_fragment_shader)
-        geom.p_vertices, geom.p_vertex_colors, geom.p_indices = p_vertices, p_vertex_colors, p_indices
+        geom.p_vertices, geom.p_vertex_colors, geom.p_indices = buffers['p_vertices'], buffers['p_colors'], buffers['p_indices']
 
     return geom
 
@@ -808,7 +594,8 @@ class SvViewerDrawMk4(bpy.types.Node, SverchCustomTreeNode):
             config.polygons = polygons
             config.matrix = matrix
             if not inputs['Edges'].is_linked and self.display_edges:
-                config.edges = polygons_to_edges(polygons, unique_edges=True)
+                # edges of polygons
+                config.edges = [None]
 
             geom = generate_mesh_geom(config, vecs)
 
@@ -832,6 +619,7 @@ class SvViewerDrawMk4(bpy.types.Node, SverchCustomTreeNode):
 
     def sv_free(self):
         callback_disable(node_id(self))
+        clear_draw_buffers_cache(node_id(self))
 
     def show_viewport(self, is_show: bool):
         """It should be called by node tree to show/hide objects"""
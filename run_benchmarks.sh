@@ -0,0 +1,16 @@
+#!/bin/bash
+
+# Run benchmarks from tests/*_benchmarks.py files.
+# If your blender is not available as just "blender" command, then you need
+# to specify path to blender when running this script, e.g.
+#
+# $ BLENDER=~/soft/blender-2.90/blender ./run_benchmarks.sh --save baseline.json
+# $ ./run_benchmarks.sh --compare baseline.json --threshold 0.2
+# $ ./run_benchmarks.sh nurbs
+#
+
+set -e
+
+BLENDER=${BLENDER:-blender}
+
+$BLENDER -b --addons sverchok --python utils/benchmark.py --python-exit-code 1 -- $@
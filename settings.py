@@ -7,7 +7,8 @@ from bpy.props import BoolProperty, FloatVectorProperty, EnumProperty, IntProper
 from sverchok.dependencies import sv_dependencies, pip, ensurepip, draw_message, get_icon
 from sverchok import data_structure
 from sverchok.core import handlers
-from sverchok.core import update_system
+from sverchok.core import update_system, node_stats
+from sverchok.utils.field import compiler as field_compiler
 from sverchok.utils import logging
 from sverchok.utils.sv_gist_tools import TOKEN_HELP_URL
 from sverchok.ui import color_def
@@ -193,6 +194,61 @@ class SverchokPreferences(AddonPreferences):
         size=3, min=0.0, max=1.0,
         default=(1, 1, 1), subtype='COLOR')
 
+    socket_data_modes = [
+        ("DEEPCOPY", "Deep copy", "Nodes get deep copy of input data", 0),
+        ("COPY_ON_WRITE", "Copy on write",
+            "Nodes get views of input data, nested lists are copied only when accessed, numpy arrays are read only", 1)
+    ]
+
+    socket_data_mode: EnumProperty(
+        name="Socket data",
+        description="How input data is passed to nodes which can modify it",
+        items=socket_data_modes,
+        default="DEEPCOPY",
+        update=update_system.update_socket_data_settings)
+
+    check_socket_data_writes: BoolProperty(
+        name="Check input data writes",
+        description="Report nodes which modify data of their input sockets (slow)",
+        default=False,
+        update=update_system.update_socket_data_settings)
+
+    process_cache_enabled: BoolProperty(
+        name="Cache node results",
+        description="Reuse results of nodes which support it when their properties and inputs did not change",
+        default=True,
+        update=update_system.update_process_cache_settings)
+
+    process_cache_size: IntProperty(
+        name="Cache size, MB",
+        description="Memory budget for cached node results",
+        default=256, min=0,
+        update=update_system.update_process_cache_settings)
+
+    node_stats_enabled: BoolProperty(
+        name="Record node statistics",
+        description="Keep time and data size of processed nodes across updates, for export and analysis",
+        default=False,
+        update=node_stats.update_node_stats_settings)
+
+    node_stats_trace_memory: BoolProperty(
+        name="Trace memory",
+        description="Record memory allocated by nodes, using tracemalloc (slow)",
+        default=False,
+        update=node_stats.update_node_stats_settings)
+
+    node_stats_size: IntProperty(
+        name="Records",
+        description="Number of latest node records to keep",
+        default=10000, min=1,
+        update=node_stats.update_node_stats_settings)
+
+    field_chunk_size: IntProperty(
+        name="Field chunk size",
+        description="Number of points for which fields are evaluated at once; smaller values use less memory",
+        default=65536, min=1024,
+        update=field_compiler.update_field_settings)
+
     # Profiling settings
     profiling_sections = [
         ("NONE", "Disable", "Disable profiling", 0),
@@ -445,6 +501,16 @@ class SverchokPreferences(AddonPreferences):
         col2box.prop(self, "show_debug")
         col2box.prop(self, "heat_map")
         col2box.prop(self, "developer_mode")
+        col2box.prop(self, "socket_data_mode")
+        col2box.prop(self, "check_socket_data_writes")
+        col2box.prop(self, "process_cache_enabled")
+        if self.process_cache_enabled:
+            col2box.prop(self, "process_cache_size")
+        col2box.prop(self, "node_stats_enabled")
+        if self.node_stats_enabled:
+            col2box.prop(self, "node_stats_trace_memory")
+            col2box.prop(self, "node_stats_size")
+        col2box.prop(self, "field_chunk_size")
 
         log_box = col2.box()
         log_box.label(text="Logging:")
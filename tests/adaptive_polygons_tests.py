@@ -0,0 +1,90 @@
+
+from math import pi
+
+from sverchok.utils.testing import *
+
+# Recipient mesh: two triangles, two quads and a pentagon, not planar
+RECIPIENT_VERTS = [
+        (0, 0, 0), (1, 0, 0.2), (2, 0, 0), (0, 1, 0.1), (1, 1, 0.5), (2, 1, 0.1),
+        (0, 2, 0), (1, 2, 0.2), (2, 2, 0), (3, 1.5, 0.3), (3, 0.5, -0.2)
+    ]
+RECIPIENT_FACES = [[0, 1, 4, 3], [1, 2, 5, 4], [3, 4, 7], [3, 7, 6], [4, 5, 9, 8, 7], [2, 10, 5]]
+
+# Donor objects of different sizes: a box and a pyramid
+BOX_VERTS = [
+        (-0.5, -0.5, 0), (0.5, -0.5, 0), (0.5, 0.5, 0), (-0.5, 0.5, 0),
+        (-0.5, -0.5, 1), (0.5, -0.5, 1), (0.5, 0.5, 1), (-0.5, 0.5, 1)
+    ]
+BOX_FACES = [[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]]
+PYRAMID_VERTS = [(-1, -1, 0), (1, -1, 0.1), (1, 1, 0), (-1, 1, -0.1), (0.2, 0, 2)]
+PYRAMID_FACES = [[0, 3, 2, 1], [0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]]
+
+N_FACES = len(RECIPIENT_FACES)
+
+# name -> (node properties, per-face parameters)
+CASES = {
+    'default': (dict(), dict()),
+    'frame': (dict(frame_mode='ALWAYS'), dict(frame_widths=[0.3, 0.5, 0.2, 0.7, 0.4, 0.6])),
+    'fan': (dict(frame_mode='NGONS'), dict(frame_widths=[1.0] * N_FACES)),
+    'frame_quads': (dict(frame_mode='NGONQUAD', xy_mode='PLAIN', z_scale='CONST'),
+                    dict(frame_widths=[0.25] * N_FACES, zcoefs=[0.5] * N_FACES)),
+    'plain': (dict(xy_mode='PLAIN', normal_mode='FACE', use_shell_factor=True, ngon_mode='ASIS'),
+              dict(zoffsets=[0.1, 0.0, -0.1, 0.2, 0.0, 0.3])),
+    'quads_rect': (dict(map_mode='QUADS', tri_bound_mode='RECTANGULAR', normal_interp_mode='SMOOTH', z_scale='AUTO'),
+                   dict(wcoefs=[1.0, 0.8, 1.2, 1.0, 0.9, 1.5])),
+    'rotations': (dict(normal_axis='Y', mask_mode='ASIS', ngon_mode='SKIP'),
+                  dict(zrotations=[0, pi/4, pi/2, pi/4, 0, pi/3], facerots=[0, 1, 2, 0, 3, 1],
+                       mask=[1, 1, 0, 1, 1, 1])),
+    'per_face': (dict(matching_mode='PERFACE'), dict(donors=[0, 1, 0, 1, 1, 0])),
+    'per_face_frame': (dict(matching_mode='PERFACE', frame_mode='ALWAYS'),
+                       dict(donors=[1, 0, 1, 0, 1, 0], frame_widths=[0.4] * N_FACES)),
+}
+
+def case_inputs(params):
+    """
+    Arguments of SvAdaptivePolygonsNodeMk2._process for the case.
+    """
+    if 'donors' in params:
+        donors = [(BOX_VERTS, BOX_FACES), (PYRAMID_VERTS, PYRAMID_FACES)]
+        verts_donor = [donors[i][0] for i in params['donors']]
+        faces_donor = [donors[i][1] for i in params['donors']]
+        face_data_donor = [[] for i in params['donors']]
+    else:
+        verts_donor, faces_donor, face_data_donor = BOX_VERTS, BOX_FACES, []
+    return (RECIPIENT_VERTS, RECIPIENT_FACES,
+            verts_donor, faces_donor, face_data_donor,
+            list(params.get('frame_widths', [0.5] * N_FACES)),
+            params.get('zcoefs', [1.0] * N_FACES),
+            params.get('zoffsets', [0.0] * N_FACES),
+            params.get('zrotations', [0.0] * N_FACES),
+            params.get('wcoefs', [1.0] * N_FACES),
+            params.get('facerots', [0] * N_FACES),
+            params.get('mask', [1] * N_FACES))
+
+def output_data(output):
+    verts = [[list(v[0:3]) for v in obj] for obj in output.verts_out]
+    faces = [[list(f) for f in obj] for obj in output.faces_out]
+    return dict(verts = verts, faces = faces,
+                vert_recpt_idx = output.vert_recpt_idx_out,
+                face_recpt_idx = output.face_recpt_idx_out)
+
+class AdaptivePolygonsTests(EmptyTreeTestCase):
+    """
+    Compare outputs with ones of the implementation which
+    mapped each donor vertex separately with mathutils.
+    """
+    def test_cases(self):
+        node = create_node("SvAdaptivePolygonsNodeMk2", self.tree.name)
+        defaults = {name: getattr(node, name) for props, _ in CASES.values() for name in props}
+        for case, (props, params) in CASES.items():
+            with self.subTest(case = case):
+                for name, value in defaults.items():
+                    setattr(node, name, value)
+                for name, value in props.items():
+                    setattr(node, name, value)
+                result = output_data(node._process(*case_inputs(params)))
+                expected = self.load_reference_sverchok_data(f"adaptive_polygons_{case}.txt")
+                self.assertEqual(result['faces'], expected['faces'])
+                self.assertEqual(result['vert_recpt_idx'], expected['vert_recpt_idx'])
+                self.assertEqual(result['face_recpt_idx'], expected['face_recpt_idx'])
+                self.assert_sverchok_data_equal(result['verts'], expected['verts'], precision=5)
@@ -0,0 +1,115 @@
+
+import bpy
+import bmesh
+import numpy as np
+from unittest.mock import patch
+
+from sverchok.utils.testing import *
+from sverchok.utils.blender_mesh import read_mesh, write_mesh, flatten_faces, topology_fingerprint
+
+class ReadMeshTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.verts = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (2, 0, 0)]
+        self.faces = [[0, 1, 2, 3], [1, 4, 2]]
+        self.mesh = bpy.data.meshes.new("sv_read_mesh_test")
+        self.mesh.from_pydata(self.verts, [], self.faces)
+        self.mesh.update()
+
+    def tearDown(self):
+        bpy.data.meshes.remove(self.mesh)
+        super().tearDown()
+
+    def test_read_lists(self):
+        verts, edges, faces, materials = read_mesh(self.mesh).get_pydata()
+        self.assert_sverchok_data_equal(verts, [list(v) for v in self.verts], precision=6)
+        self.assertEqual(sorted(map(tuple, edges)), sorted(self.mesh.edge_keys))
+        self.assertEqual(faces, [list(p.vertices) for p in self.mesh.polygons])
+        self.assertEqual(materials, [0, 0])
+
+    def test_read_numpy(self):
+        verts, edges, faces, materials = read_mesh(self.mesh).get_pydata(output_numpy=True)
+        self.assert_numpy_arrays_equal(verts, np.array(self.verts, dtype=np.float64), precision=6)
+        self.assertEqual(edges.shape, (len(self.mesh.edges), 2))
+        self.assertEqual(faces, self.faces)
+
+class WriteMeshTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.mesh = bpy.data.meshes.new("sv_write_mesh_test")
+
+    def tearDown(self):
+        bpy.data.meshes.remove(self.mesh)
+        super().tearDown()
+
+    def test_write_read(self):
+        verts = np.array([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (2, 0, 0), (3, 0, 0)])
+        faces = [[0, 1, 2, 3], [1, 4, 2]]
+        loop_vertex, loop_total = flatten_faces(faces)
+        write_mesh(self.mesh, verts, np.array([[4, 5]]), loop_vertex, loop_total)
+        new_verts, edges, new_faces, _ = read_mesh(self.mesh).get_pydata()
+        self.assert_sverchok_data_equal(new_verts, verts.tolist(), precision=6)
+        self.assertEqual(new_faces, faces)
+        # edges of faces are added to given ones
+        self.assertEqual(len(edges), 7)
+        self.assertIn([4, 5], edges)
+
+    def test_fingerprint(self):
+        edges = np.zeros((0, 2), dtype=np.int32)
+        faces = flatten_faces([[0, 1, 2], [0, 2, 3]])
+        same = flatten_faces(np.array([[0, 1, 2], [0, 2, 3]]))
+        other = flatten_faces([[0, 1, 3], [1, 2, 3]])
+        self.assertEqual(topology_fingerprint(4, edges, *faces), topology_fingerprint(4, edges, *same))
+        self.assertNotEqual(topology_fingerprint(4, edges, *faces), topology_fingerprint(4, edges, *other))
+
+class MeshDataTests(EmptyTreeTestCase):
+    """Decision whether topology of a viewer's mesh has to be rewritten"""
+    def setUp(self):
+        super().setUp()
+        self.node = create_node("SvMeshViewer", self.tree.name)
+        self.data = self.node.mesh_data.add()
+        self.verts = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (2, 0, 0)]
+        self.faces = [[0, 1, 2, 3], [1, 4, 2]]
+
+    def tearDown(self):
+        self.data.remove_data()
+        super().tearDown()
+
+    def regenerate(self, verts, faces):
+        """Returns True if the topology was written"""
+        from sverchok.utils.nodes_mixins import generating_objects
+        with patch.object(generating_objects, 'write_mesh', wraps=generating_objects.write_mesh) as write:
+            self.data.regenerate_mesh("sv_mesh_data_test", verts, faces=faces)
+        return write.called
+
+    def test_same_topology(self):
+        self.assertTrue(self.regenerate(self.verts, self.faces))
+        moved = [(x, y, 1) for x, y, z in self.verts]
+        self.assertFalse(self.regenerate(moved, self.faces))
+        self.assertEqual(self.data.mesh.vertices[0].co[2], 1)
+
+    def test_changed_faces(self):
+        self.regenerate(self.verts, self.faces)
+        self.assertTrue(self.regenerate(self.verts, [[0, 1, 2], [0, 2, 3], [1, 4, 2]]))
+        self.assertEqual(len(self.data.mesh.polygons), 3)
+
+    def test_edited_mesh(self):
+        self.regenerate(self.verts, self.faces)
+        # the user deletes a face, vertices are kept
+        bm = bmesh.new()
+        bm.from_mesh(self.data.mesh)
+        bm.faces.ensure_lookup_table()
+        bmesh.ops.delete(bm, geom=[bm.faces[0]], context='FACES_ONLY')
+        bm.to_mesh(self.data.mesh)
+        bm.free()
+        self.assertEqual(len(self.data.mesh.vertices), len(self.verts))
+        self.assertTrue(self.regenerate(self.verts, self.faces))
+        self.assertEqual(len(self.data.mesh.polygons), 2)
+
+    def test_validated_mesh(self):
+        # Blender adds edges of faces and removes the repeated face,
+        # this is not a reason to rewrite the mesh next time
+        faces = self.faces + [[0, 1, 2, 3]]
+        self.assertTrue(self.regenerate(self.verts, faces))
+        self.assertEqual(len(self.data.mesh.polygons), 2)
+        self.assertFalse(self.regenerate(self.verts, faces))
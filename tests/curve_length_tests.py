@@ -0,0 +1,37 @@
+from math import pi
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.curve.primitives import SvLine, SvCircle
+from sverchok.utils.curve.algorithms import SvCurveLengthSolver
+
+class CurveLengthSolverTests(SverchokTestCase):
+    def make_circle(self):
+        return SvCircle(center=np.zeros(3), normal=np.array([0.0, 0.0, 1.0]), vectorx=np.array([1.0, 0.0, 0.0]))
+
+    def test_line(self):
+        line = SvLine(np.zeros(3), np.array([2.0, 0.0, 0.0]))
+        solver = SvCurveLengthSolver.for_curve(line, 'LIN', 10)
+        self.assertAlmostEqual(solver.get_total_length(), 2.0)
+        ts = solver.solve(np.array([0.0, 0.5, 1.0, 2.0]))
+        self.assert_numpy_arrays_equal(ts, np.array([0.0, 0.25, 0.5, 1.0]), precision=8)
+        ts = solver.solve_relative(np.array([0.0, 0.5, 1.0]))
+        self.assert_numpy_arrays_equal(ts, np.array([0.0, 0.5, 1.0]), precision=8)
+
+    def test_cache(self):
+        circle = self.make_circle()
+        solver = SvCurveLengthSolver.for_curve(circle, 'SPL', 20)
+        self.assertIs(SvCurveLengthSolver.for_curve(circle, 'SPL', 20), solver)
+        self.assertIsNot(SvCurveLengthSolver.for_curve(circle, 'SPL', 30), solver)
+        circle.u_bounds = (0.0, pi)
+        half = SvCurveLengthSolver.for_curve(circle, 'SPL', 20)
+        self.assertIsNot(half, solver)
+        self.assertAlmostEqual(half.get_total_length(), pi, places=2)
+
+    def test_tolerance(self):
+        circle = self.make_circle()
+        rough = SvCurveLengthSolver.for_curve(circle, 'SPL', 5)
+        precise = SvCurveLengthSolver.for_curve(circle, 'SPL', 5, tolerance=1e-6)
+        self.assertTrue(abs(precise.get_total_length() - 2*pi) < abs(rough.get_total_length() - 2*pi))
+        self.assertAlmostEqual(precise.get_total_length(), 2*pi, places=4)
+
@@ -0,0 +1,46 @@
+
+import ast
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.modules.eval_formula import safe_eval, safe_eval_vectorized, VectorizationChecker
+
+class VectorizedFormulaTests(SverchokTestCase):
+    def test_same_as_scalar(self):
+        xs = [0.5, 1.0, 2.0, 3.5]
+        ys = [1, 2, 3, 4]
+        for formula in ["x + y", "sin(x)*2 + y/3", "x**2 - 1", "atan2(x, y)", "floor(x) + ceil(y/2)"]:
+            with self.subTest(formula = formula):
+                expected = [safe_eval(formula, dict(x=x, y=y)) for x, y in zip(xs, ys)]
+                result = safe_eval_vectorized(formula, dict(x=np.array(xs), y=np.array(ys)))
+                self.assertIsNotNone(result)
+                self.assertEqual(type(result.tolist()[0]), type(expected[0]))
+                self.assert_numpy_arrays_equal(result, np.array(expected), precision=8)
+
+    def test_comparison(self):
+        xs = [0.5, 1.0, 2.0, 3.5]
+        ys = [1, 2, 1, 4]
+        expected = [safe_eval("x > y", dict(x=x, y=y)) for x, y in zip(xs, ys)]
+        result = safe_eval_vectorized("x > y", dict(x=np.array(xs), y=np.array(ys)))
+        self.assertIsNotNone(result)
+        self.assertEqual(result.tolist(), expected)
+
+    def test_numeric_literals(self):
+        formula = "x * 2 + 0.5"
+        checker = VectorizationChecker()
+        checker.visit(ast.parse(formula, mode='eval'))
+        self.assertTrue(checker.is_vectorizable)
+        result = safe_eval_vectorized(formula, dict(x=np.array([1.0, 2.0])))
+        self.assertIsInstance(result, np.ndarray)
+        self.assert_numpy_arrays_equal(result, np.array([2.5, 4.5]), precision=8)
+
+    def test_not_vectorizable(self):
+        x = np.array([1.0, 2.0])
+        for formula in ["x if x > 1 else 0", "Vector((x, x, x))", "log(x, 2)", "[x]", "0 < x < 2", "x + True", "x + 'a'"]:
+            with self.subTest(formula = formula):
+                self.assertIsNone(safe_eval_vectorized(formula, dict(x=x)))
+
+    def test_fallback_on_errors(self):
+        self.assertIsNone(safe_eval_vectorized("1/x", dict(x=np.array([1.0, 0.0]))))
+        self.assertIsNone(safe_eval_vectorized("sqrt(x)", dict(x=np.array([1.0, -1.0]))))
+        self.assertIsNone(safe_eval_vectorized("x**2", dict(x=np.array([1, 2]))))
@@ -0,0 +1,54 @@
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.field.scalar import (
+        SvCoordinateScalarField, SvScalarFieldPointDistance, SvScalarFieldBinOp,
+        SvNegatedScalarField, SvAbsScalarField, SvScalarFieldVectorizedFunction,
+        SvVectorFieldNorm
+    )
+from sverchok.utils.field.vector import (
+        SvComposedVectorField, SvVectorFieldsLerp, SvConstantVectorField,
+        SvVectorFieldCrossProduct, SvVectorFieldMultipliedByScalar
+    )
+from sverchok.utils.field.compiler import compile_field
+
+class FieldCompilerTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.xs, self.ys, self.zs = np.random.RandomState(0).rand(3, 1000)
+        x = SvCoordinateScalarField('X')
+        y = SvCoordinateScalarField('Y')
+        z = SvCoordinateScalarField('Z')
+        distance = SvScalarFieldPointDistance(np.array([0.5, 0.5, 0.5]))
+        self.scalar = SvScalarFieldBinOp(
+                        SvNegatedScalarField(SvAbsScalarField(SvScalarFieldBinOp(distance, x, np.subtract))),
+                        SvScalarFieldVectorizedFunction(y, np.sin),
+                        np.multiply)
+        vector = SvComposedVectorField('XYZ', self.scalar, y, SvNegatedScalarField(z))
+        lerp = SvVectorFieldsLerp(vector, SvConstantVectorField([1.0, 2.0, 3.0]), z)
+        self.vector = SvVectorFieldCrossProduct(lerp, SvVectorFieldMultipliedByScalar(vector, x))
+
+    def test_scalar(self):
+        expected = self.scalar.evaluate_grid(self.xs, self.ys, self.zs)
+        for chunk_size in [100, 333, 10000]:
+            values = compile_field(self.scalar, chunk_size).evaluate_grid(self.xs, self.ys, self.zs)
+            self.assert_numpy_arrays_equal(values, expected, precision=10)
+
+    def test_vector(self):
+        expected = self.vector.evaluate_grid(self.xs, self.ys, self.zs)
+        values = compile_field(self.vector, 128).evaluate_grid(self.xs, self.ys, self.zs)
+        for v, e in zip(values, expected):
+            self.assert_numpy_arrays_equal(v, e, precision=10)
+
+    def test_norm(self):
+        field = SvVectorFieldNorm(self.vector)
+        expected = field.evaluate_grid(self.xs, self.ys, self.zs)
+        values = compile_field(field, 100).evaluate_grid(self.xs, self.ys, self.zs)
+        self.assert_numpy_arrays_equal(values, expected, precision=10)
+
+    def test_inputs_not_modified(self):
+        xs = self.xs.copy()
+        field = SvNegatedScalarField(SvCoordinateScalarField('X'))
+        compile_field(field, 100).evaluate_grid(self.xs, self.ys, self.zs)
+        self.assert_numpy_arrays_equal(self.xs, xs)
+
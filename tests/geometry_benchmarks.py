@@ -0,0 +1,98 @@
+
+import numpy as np
+
+from sverchok.utils.benchmark import benchmark
+from sverchok.data_structure import match_long_repeat, fullList, repeat_last_for_length
+from sverchok.utils.geom import CubicSpline
+from sverchok.utils.curve import knotvector as sv_knotvector
+from sverchok.utils.curve.nurbs import SvNativeNurbsCurve
+from sverchok.utils.surface.nurbs import SvNativeNurbsSurface
+from sverchok.utils.voronoi import voronoi_bounded
+from sverchok.utils.marching_cubes import isosurface_np
+from sverchok.utils.intersect_edges import intersect_edges_2d
+from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata, pydata_from_bmesh
+
+def random_points(count, seed=0):
+    return np.random.RandomState(seed).rand(count, 3)
+
+def grid_mesh(size):
+    xs, ys = np.meshgrid(np.arange(size + 1), np.arange(size + 1), indexing='ij')
+    verts = np.stack((xs.flatten(), ys.flatten(), np.zeros(xs.size)), axis=-1).tolist()
+    faces = [[i*(size+1) + j, (i+1)*(size+1) + j, (i+1)*(size+1) + j+1, i*(size+1) + j+1]
+                for i in range(size) for j in range(size)]
+    return verts, faces
+
+@benchmark(sizes=[100, 10000])
+def nurbs_curve_evaluate(size):
+    degree = 3
+    control_points = random_points(50)
+    knotvector = sv_knotvector.generate(degree, len(control_points))
+    curve = SvNativeNurbsCurve(degree, knotvector, control_points)
+    ts = np.linspace(0.0, 1.0, num=size)
+    return lambda: curve.evaluate_array(ts)
+
+@benchmark(sizes=[100, 10000])
+def nurbs_curve_derivatives(size):
+    degree = 3
+    control_points = random_points(50)
+    knotvector = sv_knotvector.generate(degree, len(control_points))
+    curve = SvNativeNurbsCurve(degree, knotvector, control_points)
+    ts = np.linspace(0.0, 1.0, num=size)
+    return lambda: curve.derivatives_array(2, ts)
+
+@benchmark(sizes=[10, 50])
+def nurbs_surface_evaluate(size):
+    degree = 3
+    n = 20
+    xs, ys = np.meshgrid(np.linspace(0, 1, n), np.linspace(0, 1, n), indexing='ij')
+    control_points = np.stack((xs, ys, np.random.RandomState(0).rand(n, n)), axis=-1)
+    knotvector = sv_knotvector.generate(degree, n)
+    weights = np.ones((n, n))
+    surface = SvNativeNurbsSurface(degree, degree, knotvector, knotvector, control_points, weights)
+    us, vs = np.meshgrid(np.linspace(0, 1, size), np.linspace(0, 1, size), indexing='ij')
+    us, vs = us.flatten(), vs.flatten()
+    return lambda: surface.evaluate_array(us, vs)
+
+@benchmark(sizes=[100, 1000])
+def cubic_spline_eval(size):
+    vertices = [tuple(v) for v in random_points(size)]
+    spline = CubicSpline(vertices, metric='DISTANCE')
+    ts = np.linspace(0.0, 1.0, num=10000)
+    return lambda: spline.eval(ts)
+
+@benchmark(sizes=[100, 1000])
+def voronoi_2d_bounded(size):
+    sites = [(x, y, 0.0) for x, y, z in random_points(size).tolist()]
+    return lambda: voronoi_bounded(sites, bound_mode='BOX', clip=1.0, make_faces=True)
+
+@benchmark(sizes=[10, 20])
+def isosurface(size):
+    xs, ys, zs = np.meshgrid(*[np.linspace(-1, 1, size)]*3, indexing='ij')
+    data = xs**2 + ys**2 + zs**2
+    return lambda: isosurface_np(data, 0.5)
+
+@benchmark(sizes=[100, 300])
+def intersect_edges_2d_random(size):
+    verts = random_points(2 * size)
+    verts[:, 2] = 0.0
+    verts = verts.tolist()
+    edges = [(2*i, 2*i + 1) for i in range(size)]
+    return lambda: intersect_edges_2d(verts, edges, 1e-5)
+
+@benchmark(sizes=[30, 100])
+def bmesh_round_trip(size):
+    verts, faces = grid_mesh(size)
+    def run():
+        bm = bmesh_from_pydata(verts, [], faces, normal_update=True)
+        pydata_from_bmesh(bm)
+        bm.free()
+    return run
+
+@benchmark(sizes=[1000, 100000])
+def list_matching(size):
+    lists = [list(range(size)), [1, 2, 3], list(range(size // 2))]
+    def run():
+        match_long_repeat(lists)
+        fullList(list(range(10)), size)
+        repeat_last_for_length([1, 2, 3], size)
+    return run
@@ -1,5 +1,9 @@
+
+import numpy as np
+
 from sverchok.core.update_system import process_tree
 from sverchok.utils.testing import *
+from sverchok.utils.intersect_edges import edge_pairs_broad_phase, intersect_edges_2d
 
 
 class IntersectEdgesTest2(ReferenceTreeTestCase):
@@ -18,3 +22,26 @@ class IntersectEdgesTest2(ReferenceTreeTestCase):
         self.assert_sverchok_data_equals_file(result_verts, "intersecting_planes_result_verts.txt", precision=8)
         #self.store_reference_sverchok_data("intersecting_planes_result_faces.txt", result_edges)
         self.assert_sverchok_data_equals_file(result_edges, "intersecting_planes_result_faces.txt", precision=8)
+
+class IntersectEdges2DTest(SverchokTestCase):
+    def test_broad_phase(self):
+        rng = np.random.RandomState(0)
+        verts = rng.rand(200, 2)
+        edges = rng.randint(0, 200, size=(100, 2))
+        pairs = edge_pairs_broad_phase(verts, edges)
+
+        mins = np.minimum(verts[edges[:,0]], verts[edges[:,1]])
+        maxs = np.maximum(verts[edges[:,0]], verts[edges[:,1]])
+        expected = [(i, j) for i in range(100) for j in range(i+1, 100)
+                        if np.all(mins[i] <= maxs[j]) and np.all(mins[j] <= maxs[i])
+                            and not set(edges[i]) & set(edges[j])]
+        self.assertEqual([tuple(pair) for pair in pairs.tolist()], expected)
+
+    def test_cross(self):
+        verts = [(0, 0, 0), (2, 2, 0), (0, 2, 0), (2, 0, 0), (1, -1, 0), (1, 3, 0)]
+        edges = [(0, 1), (2, 3), (4, 5)]
+        verts_out, edges_out = intersect_edges_2d(verts, edges, 1e-5)
+        # all three edges pass through (1, 1), which is to be created only once
+        self.assertEqual(len(verts_out), 7)
+        self.assert_sverchok_data_equal(verts_out[6], (1, 1, 0), precision=6)
+        self.assertEqual(len(edges_out), 6)
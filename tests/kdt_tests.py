@@ -0,0 +1,55 @@
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.dependencies import scipy
+from sverchok.utils.sv_KDT_utils import SvKDTree, get_kdtree, kdt_find_n, kdt_find_range
+
+class KDTreeTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        random = np.random.RandomState(0)
+        self.verts = random.rand(300, 3)
+        self.points = random.rand(50, 3)
+        self.distances = np.linalg.norm(self.points[:, np.newaxis] - self.verts[np.newaxis], axis=2)
+
+    def check_query(self, tree, precision):
+        distances, idxs = tree.query(self.points, k=3)
+        expected_idxs = np.argsort(self.distances, axis=1)[:, :3]
+        self.assert_numpy_arrays_equal(idxs, expected_idxs)
+        self.assert_numpy_arrays_equal(distances, np.take_along_axis(self.distances, expected_idxs, axis=1), precision=precision)
+
+    def check_ball(self, tree):
+        for point_distances, (idxs, distances) in zip(self.distances, tree.query_ball_point(self.points, 0.2)):
+            expected = np.where(point_distances <= 0.2)[0]
+            self.assertEqual(set(idxs.tolist()), set(expected.tolist()))
+            self.assertTrue(np.all(np.diff(distances) >= 0))
+
+    def test_query_mathutils(self):
+        # mathutils.kdtree stores coordinates as float32
+        self.check_query(SvKDTree(self.verts, use_scipy=False), precision=5)
+
+    def test_ball_mathutils(self):
+        self.check_ball(SvKDTree(self.verts, use_scipy=False))
+
+    @requires(scipy)
+    def test_query_scipy(self):
+        self.check_query(SvKDTree(self.verts), precision=8)
+
+    @requires(scipy)
+    def test_ball_scipy(self):
+        self.check_ball(SvKDTree(self.verts))
+
+    def test_shared_tree(self):
+        tree = get_kdtree(self.verts.tolist())
+        self.assertIs(get_kdtree(self.verts), tree)
+
+    def test_find_n_limit(self):
+        coords, idxs, distances = kdt_find_n(self.verts[:2].tolist(), self.points[:3].tolist(), [1, 5])
+        self.assertEqual([len(row) for row in idxs], [1, 2, 2])
+        self.assertEqual(len(coords[1][0]), 3)
+
+    def test_find_range(self):
+        coords, idxs, distances = kdt_find_range(self.verts.tolist(), self.points.tolist(), [0.2])
+        for row, point_distances in zip(idxs, self.distances):
+            self.assertEqual(sorted(row), np.where(point_distances <= 0.2)[0].tolist())
@@ -0,0 +1,44 @@
+from math import pi
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.curve.core import SvCurveSegment
+from sverchok.utils.curve.primitives import SvCircle
+from sverchok.utils.surface.primitives import SvPlane
+from sverchok.utils.manifolds import nearest_point_on_curve, nearest_point_on_surface
+
+class NearestPointTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.points = np.random.RandomState(0).rand(200, 3) * 4 - 2
+
+    def test_circle(self):
+        circle = SvCircle(center=np.zeros(3), normal=np.array([0.0, 0.0, 1.0]), vectorx=np.array([1.0, 0.0, 0.0]))
+        ts, points = nearest_point_on_curve(self.points, circle)
+        expected = self.points.copy()
+        expected[:,2] = 0
+        expected /= np.linalg.norm(expected, axis=1)[:, np.newaxis]
+        self.assert_numpy_arrays_equal(points, expected, precision=6)
+        self.assertTrue(np.all((ts >= 0) & (ts <= 2*pi)))
+
+    def test_curve_segment(self):
+        circle = SvCircle(center=np.zeros(3), normal=np.array([0.0, 0.0, 1.0]), vectorx=np.array([1.0, 0.0, 0.0]))
+        segment = SvCurveSegment(circle, 0.0, pi)
+        src_points = self.points.copy()
+        src_points[:,1] = np.abs(src_points[:,1]) + 0.1
+        ts, points = nearest_point_on_curve(src_points, segment)
+        expected = src_points.copy()
+        expected[:,2] = 0
+        expected /= np.linalg.norm(expected, axis=1)[:, np.newaxis]
+        self.assert_numpy_arrays_equal(points, expected, precision=6)
+        self.assertTrue(np.all((ts >= 0) & (ts <= pi)))
+
+    def test_plane(self):
+        plane = SvPlane(np.zeros(3), np.array([1.0, 0.0, 0.0]), np.array([0.0, 1.0, 0.0]))
+        us, vs, points = nearest_point_on_surface(self.points, plane)
+        expected_us = np.clip(self.points[:,0], 0.0, 1.0)
+        expected_vs = np.clip(self.points[:,1], 0.0, 1.0)
+        self.assert_numpy_arrays_equal(us, expected_us, precision=8)
+        self.assert_numpy_arrays_equal(vs, expected_vs, precision=8)
+        self.assert_numpy_arrays_equal(points[:,2], np.zeros(len(points)), precision=8)
+
@@ -0,0 +1,31 @@
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.marching_cubes import isosurface_np
+
+class MarchingCubesTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        xs, ys, zs = np.meshgrid(*[np.arange(11)]*3, indexing='ij')
+        self.data = (xs - 5.0)**2 + (ys - 5.0)**2 + (zs - 5.0)**2
+
+    def test_sphere(self):
+        verts, faces = isosurface_np(self.data, 16.0)
+        self.assertTrue(len(faces) > 0)
+        radiuses = np.linalg.norm(verts - 5.0, axis=1)
+        self.assertTrue(np.all(np.abs(radiuses - 4.0) < 0.5))
+        # every vertex is shared by several triangles
+        used = np.bincount(np.array(faces).flatten(), minlength=len(verts))
+        self.assertTrue(np.all(used >= 2))
+
+    def test_slabs(self):
+        verts1, faces1 = isosurface_np(self.data, 16.0)
+        verts2, faces2 = isosurface_np(self.data, 16.0, slab_size=3)
+        self.assert_numpy_arrays_equal(verts1, verts2, precision=8)
+        self.assertEqual(faces1, faces2)
+
+    def test_empty(self):
+        verts, faces = isosurface_np(self.data, -1.0)
+        self.assertEqual(verts.shape, (0, 3))
+        self.assertEqual(faces, [])
@@ -0,0 +1,104 @@
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.blender_mesh import flatten_faces
+from sverchok.utils import mesh_draw_buffers
+from sverchok.utils.mesh_draw_buffers import (
+        triangulate, face_normals, vertex_normals, faces_to_edges, object_buffers, get_object_buffers,
+        concatenate_buffers, clear_draw_buffers_cache)
+
+def draw_config(**kwargs):
+    config = SimpleNamespace(draw_edges=True, draw_polys=True, shade_mode='flat',
+                color_per_edge=False, color_per_polygon=False,
+                edges_use_vertex_color=False, polygon_use_vertex_color=False,
+                handle_concave_quads=False, vector_light=(0.0, 0.0, 1.0))
+    config.__dict__.update(kwargs)
+    return config
+
+def triangles_area(verts, tris):
+    a, b, c = verts[tris[:, 0]], verts[tris[:, 1]], verts[tris[:, 2]]
+    return 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1).sum()
+
+class MeshDrawBuffersTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        # L-shaped concave hexagon, square and triangle
+        self.verts = np.array([(0, 0, 0), (2, 0, 0), (2, 1, 0), (1, 1, 0), (1, 2, 0), (0, 2, 0),
+                               (3, 0, 0), (4, 0, 0), (4, 1, 0), (3, 1, 0)], dtype=np.float64)
+        self.faces = [[0, 1, 2, 3, 4, 5], [6, 7, 8, 9], [6, 7, 9]]
+
+    def test_triangulate(self):
+        loop_vertex, loop_total = flatten_faces(self.faces)
+        tris, face_idx = triangulate(self.verts, loop_vertex, loop_total)
+        self.assertEqual(face_idx.tolist(), [0, 0, 0, 0, 1, 1, 2])
+        self.assertAlmostEqual(triangles_area(self.verts, tris[face_idx == 0]), 3.0)
+        self.assertAlmostEqual(triangles_area(self.verts, tris[face_idx == 1]), 1.0)
+
+    def test_normals(self):
+        loop_vertex, loop_total = flatten_faces(self.faces)
+        expected = np.array([[0, 0, 1]] * 3, dtype=np.float64)
+        self.assert_numpy_arrays_equal(face_normals(self.verts, loop_vertex, loop_total), expected, precision=8)
+        normals = vertex_normals(self.verts, loop_vertex, loop_total)
+        self.assert_numpy_arrays_equal(normals[:6], np.array([[0, 0, 1]] * 6, dtype=np.float64), precision=8)
+
+    def test_face_colors(self):
+        config = draw_config(color_per_polygon=True)
+        colors = [(1, 0, 0, 1), (0, 1, 0, 1)]
+        buffers = object_buffers(config, self.verts, None, self.faces, poly_colors=colors, edge_colors=[(1, 1, 1, 1)])
+        self.assertEqual(buffers['p_vertices'].shape, (21, 3))
+        self.assert_numpy_arrays_equal(buffers['p_colors'][-3:], np.array([colors[0]] * 3, dtype=np.float32))
+        # edges of faces are used if edges are not given
+        self.assertEqual(len(buffers['e_indices']), 6 + 4 + 1)
+
+    def test_concatenate(self):
+        config = draw_config()
+        first = object_buffers(config, self.verts, [(0, 1)], self.faces, poly_colors=[(1, 0, 0, 1)], edge_colors=[(1, 1, 1, 1)])
+        second = object_buffers(config, self.verts, [(0, 1)], self.faces, poly_colors=[(1, 0, 0, 1)], edge_colors=[(1, 1, 1, 1)])
+        joined = concatenate_buffers([first, second])
+        self.assertEqual(joined['p_vertices'].dtype, np.float32)
+        self.assertEqual(joined['e_indices'].tolist(), [[0, 1], [10, 11]])
+        self.assert_numpy_arrays_equal(joined['p_indices'][len(first['p_indices']):], first['p_indices'] + 10)
+
+    def test_faces_to_edges(self):
+        loop_vertex, loop_total = flatten_faces(self.faces)
+        edges = faces_to_edges(loop_vertex, loop_total)
+        expected = sorted({tuple(sorted((face[i - 1], face[i]))) for face in self.faces for i in range(len(face))})
+        self.assertEqual(edges.tolist(), [list(edge) for edge in expected])
+
+    def test_cache(self):
+        config = draw_config()
+        args = (None, self.faces, None, None, [(1, 0, 0, 1)], [(1, 1, 1, 1)])
+        try:
+            first = get_object_buffers(config, self.verts.tolist(), *args, slot=('node', 0))
+            second = get_object_buffers(config, self.verts, *args, slot=('node', 0))
+            self.assertIs(first, second)
+            other = get_object_buffers(config, self.verts, *args, slot=('node', 1))
+            self.assertIsNot(first, other)
+            # the entry of the slot is replaced when input data is changed
+            moved = get_object_buffers(config, self.verts + 1, *args, slot=('node', 0))
+            self.assertIsNot(first, moved)
+            self.assertIsNot(get_object_buffers(config, self.verts, *args, slot=('node', 0)), first)
+            clear_draw_buffers_cache('node')
+            self.assertIsNot(get_object_buffers(config, self.verts, *args, slot=('node', 1)), other)
+        finally:
+            clear_draw_buffers_cache()
+
+    def test_cache_size(self):
+        config = draw_config()
+        args = (None, self.faces, None, None, [(1, 0, 0, 1)], [(1, 1, 1, 1)])
+        size = mesh_draw_buffers._buffers_size(object_buffers(config, self.verts, *args))
+        cache_bytes = mesh_draw_buffers.draw_buffers_cache_bytes
+        mesh_draw_buffers.draw_buffers_cache_bytes = 2 * size
+        try:
+            first = get_object_buffers(config, self.verts, *args, slot=('node', 0))
+            get_object_buffers(config, self.verts, *args, slot=('node', 1))
+            get_object_buffers(config, self.verts, *args, slot=('node', 2))
+            self.assertEqual(mesh_draw_buffers._buffers_cache_size, 2 * size)
+            # the least recently used entry was dropped
+            self.assertIsNot(get_object_buffers(config, self.verts, *args, slot=('node', 0)), first)
+        finally:
+            mesh_draw_buffers.draw_buffers_cache_bytes = cache_bytes
+            clear_draw_buffers_cache()
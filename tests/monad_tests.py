@@ -0,0 +1,112 @@
+
+import bpy
+
+from sverchok.utils.testing import *
+from sverchok.utils.sv_json_import import JSONImporter
+from sverchok.core.socket_data import get_output_socket_data
+from sverchok.core.monad import monad_plans, monad_tree_names, clear_monad_plans, prune_monad_plans
+
+class MonadTestCase(EmptyTreeTestCase):
+    """
+    Base class for tests which need a monad.
+    At setup, the tree with the monad is imported from `reference_file_name`
+    into self.tree; the monad node is self.node.
+    By default the monad contains Plane and Inset Special nodes.
+    """
+    reference_file_name = "monad_1.json"
+
+    def setUp(self):
+        super().setUp()
+        importer = JSONImporter.init_from_path(self.get_reference_file_path(self.reference_file_name))
+        importer.import_into_tree(self.tree, print_log=False)
+        if importer.has_fails:
+            raise ImportError(importer.fail_massage)
+        self.node = get_node("Monad", self.tree.name)
+        self.monad = self.node.monad
+        self.monad_name = self.monad.name
+
+    def tearDown(self):
+        super().tearDown()
+        if self.monad_name in bpy.data.node_groups:
+            bpy.data.node_groups.remove(bpy.data.node_groups[self.monad_name])
+
+class MonadPlanTests(MonadTestCase):
+    def test_plan_reused(self):
+        plan = self.node.get_plan(self.monad)
+        self.assertIs(self.node.get_plan(self.monad), plan)
+        self.assertIs(monad_plans[self.monad.tree_id], plan)
+
+    def test_plan_invalidated_on_edit(self):
+        plan = self.node.get_plan(self.monad)
+        self.assertEqual(plan.linked_outputs, [0, 1])
+        inset = self.monad.nodes["Inset Special"]
+        self.monad.links.remove(inset.outputs[1].links[0])
+        new_plan = self.node.get_plan(self.monad)
+        self.assertIsNot(new_plan, plan)
+        self.assertEqual(new_plan.linked_outputs, [0])
+
+    def test_plan_of_copy(self):
+        # a copy of the tree has the same tree_id
+        copy = self.monad.copy()
+        try:
+            self.assertEqual(copy.tree_id, self.monad.tree_id)
+            self.assertEqual(self.node.get_plan(self.monad).linked_outputs, [0, 1])
+            inset = copy.nodes["Inset Special"]
+            copy.links.remove(inset.outputs[1].links[0])
+            self.assertEqual(self.node.get_plan(copy).linked_outputs, [0])
+            self.assertEqual(self.node.get_plan(self.monad).linked_outputs, [0, 1])
+        finally:
+            bpy.data.node_groups.remove(copy)
+
+    def test_prune_removed_monad(self):
+        self.node.get_plan(self.monad)
+        tree_id = self.monad.tree_id
+        self.assertIn(tree_id, monad_plans)
+        bpy.data.node_groups.remove(self.monad)
+        prune_monad_plans()
+        self.assertNotIn(tree_id, monad_plans)
+        self.assertNotIn(self.monad_name, monad_tree_names.values())
+
+    def test_clear(self):
+        self.node.get_plan(self.monad)
+        clear_monad_plans()
+        self.assertEqual(monad_plans, {})
+        self.assertEqual(monad_tree_names, {})
+
+class MonadBatchTests(MonadTestCase):
+    """
+    Vectorized monad which adds its two inputs; all items should
+    be processed in one pass, with the same result as one by one.
+    """
+    reference_file_name = "monad_add.json"
+
+    def process(self, x, y, batch):
+        self.node.batch = batch
+        get_node("X", self.tree.name).outputs[0].sv_set(x)
+        get_node("Y", self.tree.name).outputs[0].sv_set(y)
+        self.node.process()
+        return get_output_socket_data(self.node, "Out")
+
+    def test_batchable(self):
+        self.assertTrue(self.node.vectorize)
+        self.assertTrue(self.node.get_plan(self.monad).is_batchable)
+
+    def test_same_result(self):
+        cases = [
+            ([[1, 2], [3, 4], [5, 6]], [[10, 20], [30, 40], [50, 60]]),
+            # different numbers of objects
+            ([[1, 2], [3], [4, 5, 6]], [[10], [20, 30]]),
+            ([[1]], [[10], [20], [30]]),
+            # different lengths of objects
+            ([[1, 2, 3], [4]], [[10], [20, 30, 40]]),
+        ]
+        for x, y in cases:
+            with self.subTest(x = x, y = y):
+                expected = self.process(x, y, batch=False)
+                result = self.process(x, y, batch=True)
+                self.assertEqual(result, expected)
+                self.assertEqual(len(result), max(len(x), len(y)))
+
+    def test_values(self):
+        result = self.process([[1, 2], [3], [4, 5, 6]], [[10], [20, 30]], batch=True)
+        self.assert_sverchok_data_equal(result, [[11, 12], [23, 33], [24, 35, 36]])
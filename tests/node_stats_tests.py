@@ -0,0 +1,40 @@
+
+from sverchok.utils.testing import *
+from sverchok.core.node_stats import SvNodeStats, NodeRecord
+
+def make_record(update, name, start, duration, memory=None):
+    return NodeRecord(update=update, tree_name="Tree", node_name=name, bl_idname="SvTestNode",
+                      start=start, duration=duration, thread=1,
+                      input_size=100, output_size=200, memory=memory)
+
+class NodeStatsTests(SverchokTestCase):
+    def test_ring_buffer(self):
+        stats = SvNodeStats(size=3)
+        for i in range(5):
+            stats.add(make_record(i, "Node", i, 0.1))
+        self.assertEqual([record.update for record in stats.get_records()], [2, 3, 4])
+        stats.resize(2)
+        self.assertEqual([record.update for record in stats.get_records()], [3, 4])
+
+    def test_top_nodes(self):
+        stats = SvNodeStats()
+        stats.add(make_record(1, "Fast", 0.0, 0.1))
+        stats.add(make_record(1, "Slow", 0.1, 0.5, memory=1000))
+        stats.add(make_record(2, "Fast", 1.0, 0.3))
+        top = stats.top_nodes(1)
+        self.assertEqual(top[0].node_name, "Slow")
+        fast = stats.top_nodes(1, sort='calls')[0]
+        self.assertEqual(fast.node_name, "Fast")
+        self.assertEqual(fast.calls, 2)
+        self.assertAlmostEqual(fast.total, 0.4)
+        self.assertAlmostEqual(fast.max, 0.3)
+        self.assertIsNone(fast.memory)
+
+    def test_chrome_trace(self):
+        stats = SvNodeStats()
+        stats.add(make_record(1, "Node", 2.0, 0.5))
+        events = stats.to_chrome_trace()["traceEvents"]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["ph"], "X")
+        self.assertAlmostEqual(events[0]["ts"], 2e6)
+        self.assertAlmostEqual(events[0]["dur"], 5e5)
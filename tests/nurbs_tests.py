@@ -61,6 +61,20 @@ class NurbsCurveTests(SverchokTestCase):
 
         self.assert_numpy_arrays_equal(expected, d2s, precision=8)
 
+    def test_span_derivatives(self):
+        "Test span-local basis functions against all basis functions"
+        knotvector = [0, 0, 0, 0, 0.3, 0.5, 0.5, 1, 1, 1, 1]
+        n = len(knotvector) - self.degree - 1
+        ts = np.linspace(-0.5, 1.5, num=41)
+        functions = SvNurbsBasisFunctions(knotvector)
+        indexes, values = functions.span_derivatives(self.degree, ts, 2)
+        for k in range(3):
+            expected = np.array([functions.derivative(i, self.degree, k)(ts) for i in range(n)]).T
+            dense = np.zeros((len(ts), n))
+            for r in range(self.degree+1):
+                np.add.at(dense, (np.arange(len(ts)), indexes[:,r]), values[k][:,r])
+            self.assert_numpy_arrays_equal(dense, expected, precision=8)
+
     #@unittest.skip
     @requires(geomdl)
     def test_curve_eval(self):
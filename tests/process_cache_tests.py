@@ -0,0 +1,67 @@
+
+from sverchok.utils.testing import *
+from sverchok.core.process_cache import SvProcessCache, node_cache_key
+
+class ProcessCacheTests(SverchokTestCase):
+    def test_hit_and_miss(self):
+        cache = SvProcessCache()
+        self.assertIsNone(cache.get('key'))
+        cache.put('key', {'Out': [[1, 2, 3]]}, budget=10**6)
+        self.assertEqual(cache.get('key'), {'Out': [[1, 2, 3]]})
+        self.assertIsNone(cache.get('other'))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_replace(self):
+        cache = SvProcessCache()
+        cache.put('key', {'Out': [[1]]}, budget=10**6)
+        size = cache.total_size
+        cache.put('key', {'Out': [[2]]}, budget=10**6)
+        self.assertEqual(cache.get('key'), {'Out': [[2]]})
+        self.assertEqual(cache.total_size, size)
+
+    def test_evict_least_recently_used(self):
+        cache = SvProcessCache()
+        data = {'Out': [list(range(100))]}
+        cache.put('first', data, budget=10**6)
+        cache.put('second', data, budget=10**6)
+        cache.get('first')
+        cache.evict(cache.total_size - 1)
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNone(cache.get('second'))
+
+    def test_too_large(self):
+        cache = SvProcessCache()
+        cache.put('key', {'Out': [list(range(100))]}, budget=10)
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.total_size, 0)
+
+    def test_clear(self):
+        cache = SvProcessCache()
+        cache.put('key', {'Out': [[1]]}, budget=10**6)
+        cache.clear()
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.total_size, 0)
+
+class NodeCacheKeyTests(EmptyTreeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.node = create_node("SvScalarMathNodeMK4", self.tree.name)
+
+    def test_same_state(self):
+        self.assertEqual(node_cache_key(self.node), node_cache_key(self.node))
+
+    def test_property_changed(self):
+        key = node_cache_key(self.node)
+        self.node.y_ = 2.0
+        self.assertNotEqual(node_cache_key(self.node), key)
+        self.node.y_ = 1.0
+        self.assertEqual(node_cache_key(self.node), key)
+
+    def test_draft_mode_changed(self):
+        self.tree.sv_draft = False
+        key = node_cache_key(self.node)
+        self.tree.sv_draft = True
+        try:
+            self.assertNotEqual(node_cache_key(self.node), key)
+        finally:
+            self.tree.sv_draft = False
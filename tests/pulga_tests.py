@@ -0,0 +1,30 @@
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.pulga_physics_modular_core import grid_pairs, PulgaNeighbours
+
+def brute_force_pairs(verts, distance):
+    i, j = np.triu_indices(len(verts), 1)
+    mask = np.linalg.norm(verts[i] - verts[j], axis=1) < distance
+    return set(zip(i[mask].tolist(), j[mask].tolist()))
+
+class NeighboursTests(SverchokTestCase):
+    def test_grid_pairs(self):
+        verts = np.random.RandomState(1).rand(500, 3) * [1.0, 2.0, 0.5] - 3.0
+        pairs = grid_pairs(verts, 0.1)
+        self.assertEqual(set(map(tuple, pairs.tolist())), brute_force_pairs(verts, 0.1))
+        self.assertEqual(len(pairs), len(set(map(tuple, pairs.tolist()))))
+
+    def test_grid_pairs_empty(self):
+        self.assertEqual(grid_pairs(np.zeros((1, 3)), 1.0).shape, (0, 2))
+
+    def test_verlet_list_moving_points(self):
+        random = np.random.RandomState(2)
+        verts = random.rand(300, 3)
+        neighbours = PulgaNeighbours()
+        for i in range(10):
+            verts = verts + random.normal(scale=0.003, size=verts.shape)
+            neighbours.update(verts, 0.1)
+            pairs = neighbours.query_pairs(0.1)
+            self.assertEqual(set(map(tuple, pairs.tolist())), brute_force_pairs(verts, 0.1))
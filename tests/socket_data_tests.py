@@ -0,0 +1,31 @@
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.core.socket_data import sv_cow_copy, SvCowList
+
+class CopyOnWriteTests(SverchokTestCase):
+    def test_nested_lists_not_changed(self):
+        original = [[[0, 1, 2], [2, 3, 4]], [[5, 6, 7]]]
+        data = sv_cow_copy(original)
+        data[0][0].append(9)
+        data[1].append([1])
+        for obj in data:
+            for face in obj:
+                face[0] = -1
+        self.assertEqual(original, [[[0, 1, 2], [2, 3, 4]], [[5, 6, 7]]])
+        self.assertEqual(data, [[[-1, 1, 2, 9], [-1, 3, 4]], [[-1, 6, 7], [-1]]])
+
+    def test_not_accessed_items_shared(self):
+        original = [[[0, 1, 2]], [[5, 6, 7]]]
+        data = sv_cow_copy(original)
+        self.assertIsInstance(data, SvCowList)
+        self.assertIs(list.__getitem__(data, 1), original[1])
+        self.assertIsNot(data[1], original[1])
+
+    def test_arrays_read_only(self):
+        original = [np.zeros((3, 3))]
+        data = sv_cow_copy(original)
+        with self.assertRaises(ValueError):
+            data[0][0, 0] = 1.0
+        self.assertTrue(original[0].flags.writeable)
@@ -0,0 +1,28 @@
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.spatial_hash import SpatialHash
+
+class SpatialHashTests(SverchokTestCase):
+    def test_nearest_distances(self):
+        rng = np.random.RandomState(0)
+        stored = rng.rand(300, 3)
+        points = rng.rand(50, 3)
+        index = SpatialHash(0.1)
+        index.extend(stored[:100])
+        for point in stored[100:]:
+            index.add(point)
+        self.assertEqual(len(index), 300)
+
+        distances = index.nearest_distances(points)
+        expected = np.linalg.norm(points[:, np.newaxis] - stored[np.newaxis], axis=2).min(axis=1)
+        close = expected <= 0.1
+        self.assert_numpy_arrays_equal(distances[close], expected[close], precision=8)
+        self.assertTrue(np.all(distances[~close] > 0.1))
+
+    def test_is_far(self):
+        index = SpatialHash(1.0, dimensions=2)
+        index.add((0.0, 0.0))
+        mask = index.is_far([(0.5, 0.0), (1.0, 0.0), (5.0, 5.0)], 1.0)
+        self.assertEqual(mask.tolist(), [False, True, True])
@@ -0,0 +1,68 @@
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.geom import CubicSpline
+from sverchok.utils.curve.primitives import SvLine
+from sverchok.utils.curve.splines import SvSplineCurve
+from sverchok.utils.surface.core import detect_uv_grid, SvSwapSurface
+from sverchok.utils.surface.primitives import SvPlane
+from sverchok.utils.surface.algorithms import SvInterpolatingSurface
+
+def make_u_spline(vertices):
+    return SvSplineCurve(CubicSpline(vertices, metric='DISTANCE'))
+
+class UVGridTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.grid_us = np.linspace(0, 1, 7)
+        self.grid_vs = np.linspace(0, 1, 5)
+        us, vs = np.meshgrid(self.grid_us, self.grid_vs)
+        self.us, self.vs = us.flatten(), vs.flatten()
+
+    def make_surface(self):
+        lines = [SvLine(np.array([0.0, i, np.sin(i)]), np.array([1.0, 0.0, 0.2*i])) for i in range(5)]
+        return SvInterpolatingSurface((0.0, 1.0), (0.0, 1.0), make_u_spline, lines)
+
+    def test_detect_grid(self):
+        grid_us, grid_vs = detect_uv_grid(self.us, self.vs)
+        self.assert_numpy_arrays_equal(grid_us, self.grid_us)
+        self.assert_numpy_arrays_equal(grid_vs, self.grid_vs)
+
+    def test_detect_not_grid(self):
+        us = self.us.copy()
+        us[-1] = 0.5
+        self.assertIsNone(detect_uv_grid(us, self.vs))
+        self.assertIsNone(detect_uv_grid(self.us[:-1], self.vs[:-1]))
+
+    def test_detect_not_finite(self):
+        vs = self.vs.copy()
+        vs[0] = np.nan
+        self.assertIsNone(detect_uv_grid(self.us, vs))
+        us = self.us.copy()
+        us[3] = np.inf
+        self.assertIsNone(detect_uv_grid(us, self.vs))
+
+    def test_default_grid(self):
+        plane = SvPlane(np.zeros(3), np.array([1.0, 0.0, 0.0]), np.array([0.0, 2.0, 0.0]))
+        expected = plane.evaluate_array(self.us, self.vs)
+        points = plane.evaluate_uv_grid(self.grid_us, self.grid_vs)
+        self.assert_numpy_arrays_equal(points.reshape((-1, 3)), expected, precision=8)
+
+        swapped = SvSwapSurface(plane).evaluate_uv_grid(self.grid_vs, self.grid_us)
+        self.assert_numpy_arrays_equal(swapped.transpose((1, 0, 2)), points, precision=8)
+
+    def test_interpolating_grid(self):
+        surface = self.make_surface()
+        points = surface.evaluate_array(self.us, self.vs)
+        # same points, but not ordered as a grid
+        permutation = np.random.RandomState(0).permutation(len(self.us))
+        shuffled = self.make_surface().evaluate_array(self.us[permutation], self.vs[permutation])
+        self.assert_numpy_arrays_equal(shuffled, points[permutation], precision=8)
+
+    def test_interpolating_normals(self):
+        surface = self.make_surface()
+        normals = surface.normal_array(self.us, self.vs)
+        grid_normals = surface.normal_uv_grid(self.grid_us, self.grid_vs)
+        self.assert_numpy_arrays_equal(grid_normals.reshape((-1, 3)), normals, precision=8)
+        self.assert_numpy_arrays_equal(np.linalg.norm(normals, axis=1), np.ones(len(normals)), precision=8)
+
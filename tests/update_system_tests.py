@@ -4,7 +4,8 @@ import unittest
 
 from sverchok.utils.testing import *
 from sverchok.utils.logging import debug, info
-from sverchok.core.update_system import make_dep_dict, make_update_list
+from sverchok.core.update_system import make_dep_dict, make_update_list, SvDependencyGraph
+from sverchok.core.socket_data import data_fingerprint, SvUnhashableData
 #from sverchok.tests.mocks import *
 
 class UpdateSystemTests(ReferenceTreeTestCase):
@@ -36,3 +37,64 @@ class UpdateSystemTests(ReferenceTreeTestCase):
                 dep_idx = result.index(dep)
                 self.assertTrue(dep_idx < node_idx)
 
+
+    def test_dependency_graph_update_list(self):
+        tree = get_node_tree()
+        graph = SvDependencyGraph()
+        result = graph.update_list(tree, ['Bevel.001'])
+        self.assertEqual(set(result), {'Bevel.001', 'Move', 'VD Experimental.001'})
+        self.assertEqual(result[0], 'Bevel.001')
+        self.assertTrue(result.index('Move') < result.index('VD Experimental.001'))
+        version = graph.version
+        self.assertIs(graph.update_list(tree, ['Bevel.001']), result)
+        self.assertEqual(graph.version, version)
+
+    def test_dependency_graph_links(self):
+        tree = get_node_tree()
+        graph = SvDependencyGraph()
+        graph.rebuild(tree)
+        version = graph.version
+        graph.remove_link('Bevel.001', 'Move')
+        self.assertEqual(graph.version, version + 1)
+        self.assertEqual(graph.update_list(tree, ['Bevel.001']), ['Bevel.001', 'VD Experimental.001'])
+
+    def test_dependency_graph_upstream_list(self):
+        tree = get_node_tree()
+        graph = SvDependencyGraph()
+        result = graph.upstream_list(tree, ['VD Experimental.001'])
+        self.assertEqual(set(result), {'VD Experimental.001', 'Move', 'Vector in', 'Bevel.001', 'Extrude Separate Faces', 'Box'})
+        self.assertEqual(result[-1], 'VD Experimental.001')
+        for node, deps in make_dep_dict(tree).items():
+            if node in result:
+                for dep in deps:
+                    self.assertTrue(result.index(dep) < result.index(node))
+        self.assertIs(graph.upstream_list(tree, ['VD Experimental.001']), result)
+        graph.remove_link('Vector in', 'Move')
+        self.assertNotIn('Vector in', graph.upstream_list(tree, ['VD Experimental.001']))
+
+class FingerprintTests(SverchokTestCase):
+    def test_equal_data(self):
+        data1 = [[(1.0, 2.0, 3.0), (4.0, 5.0, 6.0)]]
+        data2 = [[(1.0, 2.0, 3.0), (4.0, 5.0, 6.0)]]
+        self.assertEqual(data_fingerprint(data1), data_fingerprint(data2))
+
+    def test_different_data(self):
+        data1 = [[(1.0, 2.0, 3.0), (4.0, 5.0, 6.0)]]
+        data2 = [[(1.0, 2.0, 3.0), (4.0, 5.0, 7.0)]]
+        self.assertNotEqual(data_fingerprint(data1), data_fingerprint(data2))
+
+    def test_hash_collisions(self):
+        # hash(-1.0) == hash(-2.0) in CPython
+        self.assertNotEqual(data_fingerprint([-1.0, 0.0]), data_fingerprint([-2.0, 0.0]))
+        self.assertNotEqual(data_fingerprint([[[0, 1], [2]]]), data_fingerprint([[[0], [1, 2]]]))
+        self.assertNotEqual(data_fingerprint(["ab", "c"]), data_fingerprint(["a", "bc"]))
+
+    def test_numpy(self):
+        import numpy as np
+        arr = np.arange(12, dtype=np.float64).reshape((4, 3))
+        self.assertEqual(data_fingerprint([arr]), data_fingerprint([arr.copy()]))
+        self.assertNotEqual(data_fingerprint([arr]), data_fingerprint([arr.reshape((3, 4))]))
+
+    def test_unhashable(self):
+        with self.assertRaises(SvUnhashableData):
+            data_fingerprint([object()])
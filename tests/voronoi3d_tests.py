@@ -0,0 +1,48 @@
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.dependencies import scipy
+from sverchok.utils.voronoi3d import Bounds, lloyd3d_bounded, lloyd3d_approximate
+
+@requires(scipy)
+class Lloyd3dTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sites = np.random.RandomState(0).rand(200, 3)
+
+    def nearest_distances(self, points):
+        points = np.array(points)
+        distances = np.linalg.norm(points[:, np.newaxis] - points[np.newaxis], axis=2)
+        np.fill_diagonal(distances, np.inf)
+        return distances.min(axis=1)
+
+    def check_relaxed(self, bounds, points):
+        points = np.array(points)
+        self.assertEqual(points.shape, self.sites.shape)
+        self.assertTrue(np.all(bounds.contains_array(points + 0.0)))
+        # relaxed points are distributed more evenly than random ones
+        before = self.nearest_distances(self.sites)
+        after = self.nearest_distances(points)
+        self.assertTrue(after.min() > before.min())
+        self.assertTrue(after.std() / after.mean() < before.std() / before.mean())
+
+    def test_box_exact(self):
+        bounds = Bounds.new('BOX', self.sites, 0.1)
+        points = lloyd3d_bounded(bounds, self.sites.tolist(), 5)
+        self.check_relaxed(bounds, points)
+        # all sites are moved, including ones near the boundary
+        self.assertTrue(np.all(np.linalg.norm(np.array(points) - self.sites, axis=1) > 0))
+
+    def test_sphere_exact(self):
+        bounds = Bounds.new('SPHERE', self.sites, 0.0)
+        self.check_relaxed(bounds, lloyd3d_bounded(bounds, self.sites.tolist(), 5))
+
+    def test_box_approximate(self):
+        bounds = Bounds.new('BOX', self.sites, 0.0)
+        self.check_relaxed(bounds, lloyd3d_approximate(bounds, self.sites, 5))
+
+    def test_invert_box(self):
+        bounds = Bounds.new('BOX', [(0, 0, 0), (2, 2, 2)], 0.0)
+        inverted = bounds.invert_array(np.array([[0.5, 1.0, 1.0], [1.0, 1.0, 1.75]]))
+        self.assert_numpy_arrays_equal(inverted, np.array([[-0.5, 1.0, 1.0], [1.0, 1.0, 2.25]]), precision=8)
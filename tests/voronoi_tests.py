@@ -0,0 +1,46 @@
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.dependencies import scipy
+from sverchok.utils.voronoi import voronoi_bounded_scipy, lloyd2d_scipy, delaunay_triangles_scipy
+
+def polygon_area(verts):
+    xs, ys = verts[:,0], verts[:,1]
+    return 0.5 * np.sum(xs * np.roll(ys, -1) - np.roll(xs, -1) * ys)
+
+@requires(scipy)
+class VoronoiScipyTests(SverchokTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sites = [(x, y, 0) for x, y in np.random.RandomState(0).rand(100, 2).tolist()]
+
+    def test_box_cells(self):
+        verts, edges, faces = voronoi_bounded_scipy(self.sites, bound_mode='BOX', clip=0.5,
+                                    make_faces=True, ordered_faces=True, max_sides=100)
+        verts = np.array(verts)
+        self.assertEqual(len(faces), len(self.sites))
+        areas = [polygon_area(verts[face]) for face in faces]
+        self.assertTrue(all(area > 0 for area in areas))
+
+        sites = np.array(self.sites)
+        box_area = np.prod(sites[:,:2].max(axis=0) - sites[:,:2].min(axis=0) + 1.0)
+        self.assertAlmostEqual(sum(areas), box_area, places=8)
+
+        face_edges = set(tuple(sorted((face[i], face[i-1]))) for face in faces for i in range(len(face)))
+        self.assertEqual(face_edges, set(edges))
+
+    def test_lloyd_box(self):
+        points = np.array(lloyd2d_scipy('BOX', self.sites, 5))
+        sites = np.array(self.sites)
+        self.assertEqual(points.shape, sites.shape)
+        self.assertTrue(np.all(points[:,:2] >= sites[:,:2].min(axis=0) - 1e-8))
+        self.assertTrue(np.all(points[:,:2] <= sites[:,:2].max(axis=0) + 1e-8))
+
+    def test_delaunay(self):
+        points = [(0, 0), (1, 0), (0, 1), (1, 1.1)]
+        triangles = delaunay_triangles_scipy(points)
+        self.assertEqual(len(triangles), 2)
+        for triangle in triangles:
+            # clockwise, as in computeDelaunayTriangulation without scipy
+            self.assertTrue(polygon_area(np.array([points[i] for i in triangle])) < 0)
@@ -81,6 +81,8 @@ class SV_PT_ActiveTreePanel(SverchokPanels, bpy.types.Panel):
         col.use_property_split = True
         row = col.row(align=True)
         row.prop(ng, "sv_subtree_evaluation_order", text="Eval order", expand=True)
+        col.prop(ng, "sv_skip_unchanged")
+        col.prop(ng, "sv_parallel")
         col.prop(ng, "sv_show_error_in_tree", text="Show error")
         if ng.sv_show_error_in_tree:
             col.prop(ng, "sv_show_error_details")
@@ -121,6 +123,11 @@ class SV_PT_ProfilingPanel(SverchokPanels, bpy.types.Panel):
         col_save.operator("node.sverchok_profile_save", text="Save data", icon="FILE_TICK")
         col_save.operator("node.sverchok_profile_reset", text="Reset data", icon="X")
 
+        col_stats = col.column()
+        col_stats.prop(addon.preferences, 'node_stats_enabled')
+        col_stats.operator("node.sverchok_node_stats_export", text="Export node statistics", icon="FILE_TICK")
+        col_stats.operator("node.sverchok_node_stats_reset", text="Reset node statistics", icon="X")
+
 
 class SV_PT_SverchokUtilsPanel(SverchokPanels, bpy.types.Panel):
     bl_idname = "SV_PT_SverchokUtilsPanel"
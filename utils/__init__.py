@@ -133,7 +133,7 @@ utils_modules = [
     "avl_tree", "sv_nodeview_draw_helper", "sv_font_xml_parser", "exception_drawing_with_bgl",
     "wfc_algorithm", "handling_nodes", "handle_blender_data", "nodes_mixins.generating_objects",
     "nodes_mixins.show_3d_properties", "modules_inspection", "sv_json_export", "sv_json_import",
-    "meshes", "tree_walk", "mesh_functions",
+    "meshes", "tree_walk", "mesh_functions", "blender_mesh", "mesh_draw_buffers",
     # UI text editor ui
     "text_editor_submenu", "text_editor_plugins",
     # UI operators and tools
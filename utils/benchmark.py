@@ -0,0 +1,220 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Benchmarks of Sverchok utilities.
+
+Benchmarks are defined in tests/*_benchmarks.py files with @benchmark decorator.
+They are run in the same way as tests, from command line:
+
+    $ ./run_benchmarks.sh --save baseline.json
+    $ ./run_benchmarks.sh --compare baseline.json --threshold 0.2
+
+or from Blender's python console:
+
+>>> from sverchok.utils.benchmark import run_benchmarks, compare_results, load_results
+>>> results = run_benchmarks(name_filter="nurbs")
+>>> compare_results(results, load_results("/path/to/baseline.json"))
+
+Results are stored in JSON files; a compare run reports benchmarks which
+became slower than the baseline by more than the threshold, and exits
+with non-zero code if there are such.
+"""
+
+import argparse
+import collections
+import fnmatch
+import importlib.util
+import json
+import platform
+import sys
+import time
+from os.path import dirname, join, basename, splitext
+from glob import glob
+
+import numpy as np
+
+Benchmark = collections.namedtuple('Benchmark', ['name', 'setup', 'sizes'])
+
+# All benchmarks registered by @benchmark decorator
+benchmarks = []
+
+def benchmark(function=None, sizes=(None,), name=None):
+    """
+    Decorator registering a benchmark.
+    Decorated function is called once for each of data sizes; it should
+    prepare input data and return a callable without arguments,
+    which is to be timed. Preparation of data is not timed.
+
+        @benchmark(sizes=[100, 10000])
+        def cubic_spline_eval(size):
+            spline = CubicSpline(vertices, metric='DISTANCE')
+            ts = np.linspace(0, 1, size)
+            return lambda: spline.eval(ts)
+    """
+    def decorator(func):
+        benchmarks.append(Benchmark(name or func.__name__, func, list(sizes)))
+        return func
+
+    if callable(function):
+        return decorator(function)
+    else:
+        return decorator
+
+def result_key(name, size):
+    if size is None:
+        return name
+    return f"{name}[{size}]"
+
+def measure(func, repeat=5, min_time=0.05):
+    """
+    Best time of one call of func, in seconds.
+    Number of calls in one measurement is increased until it takes
+    at least min_time; best of `repeat` measurements is taken.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for i in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed / loops
+    for r in range(repeat - 1):
+        start = time.perf_counter()
+        for i in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+def get_benchmarks_path():
+    """
+    Benchmarks are stored together with tests.
+    """
+    return join(dirname(dirname(__file__)), "tests")
+
+def load_benchmark_modules(pattern="*_benchmarks.py"):
+    for path in sorted(glob(join(get_benchmarks_path(), pattern))):
+        module_name = "sverchok_benchmarks." + splitext(basename(path))[0]
+        if module_name in sys.modules:
+            continue
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+
+def get_environment():
+    environment = dict(
+            python = platform.python_version(),
+            numpy = np.__version__,
+            platform = platform.platform(),
+            processor = platform.processor())
+    bpy = sys.modules.get('bpy')
+    if bpy is not None:
+        environment['blender'] = bpy.app.version_string
+    return environment
+
+def run_benchmarks(name_filter=None, repeat=5, pattern="*_benchmarks.py", log=print):
+    """
+    Run all registered benchmarks, whose names contain name_filter
+    (it can contain shell-style wildcards).
+    A benchmark which raises an exception is reported and skipped,
+    so that the rest of benchmarks still run.
+    Returns dictionary to be saved with save_results; names of failed
+    benchmarks are listed under 'errors' key.
+    """
+    load_benchmark_modules(pattern)
+    results = dict()
+    errors = dict()
+    for item in benchmarks:
+        if name_filter and not fnmatch.fnmatch(item.name, f"*{name_filter}*"):
+            continue
+        for size in item.sizes:
+            key = result_key(item.name, size)
+            try:
+                func = item.setup(size) if size is not None else item.setup()
+                results[key] = measure(func, repeat=repeat)
+            except Exception as e:
+                errors[key] = f"{type(e).__name__}: {e}"
+                if log is not None:
+                    log(f"{key}: FAILED: {errors[key]}")
+                continue
+            if log is not None:
+                log(f"{key}: {results[key]*1000:.3f} ms")
+    return dict(environment = get_environment(), results = results, errors = errors)
+
+def save_results(results, path):
+    with open(path, 'w') as output:
+        json.dump(results, output, indent=2, sort_keys=True)
+
+def load_results(path):
+    with open(path) as source:
+        return json.load(source)
+
+Comparison = collections.namedtuple('Comparison', ['key', 'baseline', 'current', 'ratio', 'is_regression'])
+
+def compare_results(results, baseline, threshold=0.2):
+    """
+    Compare current results with baseline ones.
+    A benchmark is a regression if it became slower by more than threshold
+    (0.2 means 20%). Benchmarks missing in either of results are not compared.
+    Returns list of Comparison items.
+    """
+    current = results['results']
+    previous = baseline['results']
+    comparisons = []
+    for key in sorted(current):
+        if key not in previous:
+            continue
+        ratio = current[key] / previous[key] if previous[key] > 0 else float('inf')
+        comparisons.append(Comparison(key, previous[key], current[key], ratio, ratio > 1.0 + threshold))
+    return comparisons
+
+def format_comparison(comparisons):
+    lines = []
+    for item in comparisons:
+        mark = "REGRESSION" if item.is_regression else ""
+        lines.append(f"{item.key:40} {item.baseline*1000:10.3f} ms {item.current*1000:10.3f} ms {item.ratio:6.2f}x {mark}")
+    return "\n".join(lines)
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="run_benchmarks.sh", description="Run Sverchok benchmarks")
+    parser.add_argument('filter', nargs='?', help="Run only benchmarks with names containing this")
+    parser.add_argument('--save', metavar='FILE', help="Save results as JSON")
+    parser.add_argument('--compare', metavar='FILE', help="Compare results with baseline JSON")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Relative slowdown to be considered as regression (default: 0.2)")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of measurements for each benchmark")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(name_filter=args.filter, repeat=args.repeat)
+    code = 0
+    if args.save:
+        save_results(results, args.save)
+    if args.compare:
+        comparisons = compare_results(results, load_results(args.compare), args.threshold)
+        print(format_comparison(comparisons))
+        if any(item.is_regression for item in comparisons):
+            code = 1
+    if results['errors']:
+        print("Failed benchmarks: " + ", ".join(sorted(results['errors'])))
+        code = 1
+    return code
+
+if __name__ == "__main__":
+    argv = sys.argv
+    argv = argv[argv.index("--")+1:] if "--" in argv else []
+    # Benchmark modules register themselves in sverchok.utils.benchmark,
+    # not in this __main__ module.
+    from sverchok.utils import benchmark as sv_benchmark
+    code = sv_benchmark.main(argv)
+    if code != 0:
+        # We have to raise an exception for Blender to exit with specified exit code.
+        raise Exception("Some benchmarks failed or became slower")
+    sys.exit(0)
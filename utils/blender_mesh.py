@@ -0,0 +1,236 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Bulk access to Blender mesh data.
+
+Mesh attributes are read with foreach_get into preallocated NumPy buffers
+and written with foreach_set from flat NumPy arrays, which is much faster
+than iterating over mesh elements from Python.
+"""
+
+import hashlib
+import threading
+from itertools import chain
+from collections import OrderedDict
+
+import numpy as np
+
+# Maximum number of meshes kept in the cache of read_object_mesh
+mesh_cache_size = 64
+
+
+class MeshData(object):
+    """
+    Mesh data read from a Blender mesh:
+
+    * verts: np.array of shape (n, 3), float64;
+    * edges: np.array of shape (m, 2), int64, with sorted vertex indices
+      (as in Mesh.edge_keys);
+    * loop_vertex: np.array of vertex indices of all face corners,
+      faces are stored one after another;
+    * loop_total: np.array of numbers of corners of faces;
+    * material_idx: np.array of material indices of faces;
+    * grouped: np.array of indices of vertices which belong to any
+      vertex group, or None if it was not requested.
+    """
+    def __init__(self, verts, edges, loop_vertex, loop_total, material_idx, grouped=None):
+        self.verts = verts
+        self.edges = edges
+        self.loop_vertex = loop_vertex
+        self.loop_total = loop_total
+        self.material_idx = material_idx
+        self.grouped = grouped
+
+    def faces(self, output_numpy=False):
+        """
+        Faces as list of lists of vertex indices. If output_numpy is True
+        and all faces have the same number of corners, np.array of shape
+        (n, corners) is returned instead.
+        """
+        totals = self.loop_total
+        if len(totals) == 0:
+            return []
+        if output_numpy and np.all(totals == totals[0]):
+            return self.loop_vertex.reshape((-1, totals[0])).copy()
+        flat = self.loop_vertex.tolist()
+        ends = np.cumsum(totals).tolist()
+        starts = [0] + ends[:-1]
+        return [flat[s:e] for s, e in zip(starts, ends)]
+
+    def get_pydata(self, output_numpy=False):
+        """
+        Returns vertices, edges, faces and material indices. Arrays are
+        copied, so that the caller can modify them without affecting
+        cached data.
+        """
+        faces = self.faces(output_numpy)
+        if output_numpy:
+            return self.verts.copy(), self.edges.copy(), faces, self.material_idx.copy()
+        else:
+            return self.verts.tolist(), self.edges.tolist(), faces, self.material_idx.tolist()
+
+
+def read_mesh(mesh, vertex_groups=False):
+    """
+    Read bpy.types.Mesh into MeshData with foreach_get.
+    """
+    n_verts = len(mesh.vertices)
+    co = np.empty(n_verts * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    edges = np.sort(edges.reshape((-1, 2)), axis=1)
+
+    n_polys = len(mesh.polygons)
+    loop_start = np.empty(n_polys, dtype=np.int32)
+    loop_total = np.empty(n_polys, dtype=np.int32)
+    material_idx = np.empty(n_polys, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    mesh.polygons.foreach_get("material_index", material_idx)
+
+    vertex_index = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", vertex_index)
+    # Loops of faces are usually stored in order of faces,
+    # but this is not guaranteed.
+    offsets = np.cumsum(loop_total) - loop_total
+    if not np.array_equal(loop_start, offsets):
+        gather = np.arange(loop_total.sum()) + np.repeat(loop_start - offsets, loop_total)
+        vertex_index = vertex_index[gather]
+
+    grouped = None
+    if vertex_groups:
+        # Vertex group assignments are not available via foreach_get
+        grouped = np.array([i for i, v in enumerate(mesh.vertices) if len(v.groups)], dtype=np.int64)
+
+    return MeshData(co.reshape((-1, 3)).astype(np.float64),
+                    edges.astype(np.int64),
+                    vertex_index.astype(np.int64),
+                    loop_total.astype(np.int64),
+                    material_idx.astype(np.int64),
+                    grouped)
+
+
+_mesh_cache = OrderedDict()
+_mesh_cache_lock = threading.Lock()
+
+def read_object_mesh(obj, depsgraph=None, vertex_groups=False):
+    """
+    Read mesh of object into MeshData. If depsgraph is provided, the
+    evaluated mesh (with modifiers applied) is read.
+
+    Results are cached per object; cached data is dropped by
+    invalidate_mesh_cache when Blender reports that geometry of the object
+    or its mesh was updated, so unchanged objects are not re-read on each
+    update of the tree.
+    """
+    use_modifiers = depsgraph is not None
+    key = (obj.name, use_modifiers)
+    data_name = obj.data.name
+    with _mesh_cache_lock:
+        item = _mesh_cache.get(key)
+        if item is not None:
+            cached_name, data = item
+            if cached_name == data_name and (not vertex_groups or data.grouped is not None):
+                _mesh_cache.move_to_end(key)
+                return data
+
+    if use_modifiers:
+        obj = depsgraph.objects[obj.name]
+        mesh = obj.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
+    else:
+        mesh = obj.to_mesh()
+    try:
+        data = read_mesh(mesh, vertex_groups)
+    finally:
+        obj.to_mesh_clear()
+
+    with _mesh_cache_lock:
+        _mesh_cache[key] = (data_name, data)
+        while len(_mesh_cache) > mesh_cache_size:
+            _mesh_cache.popitem(last=False)
+    return data
+
+def invalidate_mesh_cache(names):
+    """
+    Drop cached data of objects with specified names,
+    and of objects which use meshes with specified names.
+    """
+    names = set(names)
+    with _mesh_cache_lock:
+        for key in [key for key, (data_name, _) in _mesh_cache.items() if key[0] in names or data_name in names]:
+            del _mesh_cache[key]
+
+def clear_mesh_cache():
+    with _mesh_cache_lock:
+        _mesh_cache.clear()
+
+def update_mesh_cache(depsgraph):
+    """
+    Drop cached data of objects whose geometry was updated,
+    according to depsgraph.updates.
+    """
+    names = [update.id.name for update in depsgraph.updates if update.is_updated_geometry]
+    if names:
+        invalidate_mesh_cache(names)
+
+
+def flatten_faces(faces):
+    """
+    Convert faces (list of lists of vertex indices, or np.array of shape
+    (n, corners)) into flat arrays of loop vertex indices and of numbers
+    of corners of faces.
+    """
+    if isinstance(faces, np.ndarray) and faces.ndim == 2:
+        loop_vertex = faces.astype(np.int32).ravel()
+        loop_total = np.full(len(faces), faces.shape[1], dtype=np.int32)
+        return loop_vertex, loop_total
+    loop_total = np.fromiter(map(len, faces), dtype=np.int32, count=len(faces))
+    loop_vertex = np.fromiter(chain.from_iterable(faces), dtype=np.int32, count=int(loop_total.sum()))
+    return loop_vertex, loop_total
+
+def topology_fingerprint(n_verts, edges, loop_vertex, loop_total):
+    """
+    Cheap identifier of mesh topology: numbers of elements and a hash of
+    edge and face index buffers. Meshes with equal fingerprints differ
+    only in positions of vertices.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for array in (edges, loop_total, loop_vertex):
+        digest.update(np.ascontiguousarray(array, dtype=np.int32).view(np.uint8))
+    return f"{n_verts}:{len(edges)}:{len(loop_total)}:{len(loop_vertex)}:{digest.hexdigest()}"
+
+def write_mesh(mesh, verts, edges, loop_vertex, loop_total):
+    """
+    Replace geometry of bpy.types.Mesh with given vertices (np.array of
+    shape (n, 3)), edges (np.array of shape (m, 2)) and faces given as
+    flat arrays (see flatten_faces). Edges of faces are added if they are
+    missing in the edges array.
+    """
+    n_verts = len(verts)
+    for indices in (edges, loop_vertex):
+        if len(indices) and (np.max(indices) >= n_verts or np.min(indices) < 0):
+            raise IndexError("Vertex index out of range")
+    mesh.clear_geometry()
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(verts, dtype=np.float32).ravel())
+    if len(edges):
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", np.ascontiguousarray(edges, dtype=np.int32).ravel())
+    if len(loop_total):
+        loop_start = np.cumsum(loop_total, dtype=np.int32) - loop_total
+        mesh.loops.add(len(loop_vertex))
+        mesh.loops.foreach_set("vertex_index", loop_vertex)
+        mesh.polygons.add(len(loop_total))
+        mesh.polygons.foreach_set("loop_start", loop_start)
+        mesh.polygons.foreach_set("loop_total", loop_total)
+    mesh.update(calc_edges=len(loop_total) > 0)
+    # Sverchok data can contain degenerated or repeated elements,
+    # which Blender does not expect in a mesh
+    mesh.validate(clean_customdata=False)
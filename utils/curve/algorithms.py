@@ -33,10 +33,52 @@ def make_euclidian_ts(pts):
     return tknots
 
 class SvCurveLengthSolver(object):
+    """
+    Solver of the inverse problem for curve length: find values of curve's T
+    parameter, at which the length of the curve from its beginning is equal
+    to the given values.
+
+    Use SvCurveLengthSolver.for_curve() to get a prepared solver, which is
+    cached on the curve object; so nodes which need the same length table of
+    the same curve share one solver instead of building it each time.
+    """
+
+    # Maximum number of solvers cached on one curve object
+    max_cached_solvers = 8
+    # Maximum number of refinements of the length table with tolerance
+    max_refine_iterations = 10
+
     def __init__(self, curve):
         self.curve = curve
         self._spline = None
 
+    @staticmethod
+    def for_curve(curve, mode='SPL', resolution=50, tolerance=None):
+        """
+        Get a solver for the curve, prepared with specified parameters.
+        Solvers are memoized on the curve object by parameters and curve's
+        T bounds, so this returns the same solver for the same curve,
+        until curve's T bounds change.
+        """
+        key = (mode, resolution, tolerance, tuple(curve.get_u_bounds()))
+        solvers = getattr(curve, '_length_solvers', None)
+        if solvers is not None:
+            solver = solvers.get(key)
+            if solver is not None:
+                return solver
+        solver = SvCurveLengthSolver(curve)
+        solver.prepare(mode, resolution, tolerance)
+        if solvers is None:
+            solvers = dict()
+            try:
+                curve._length_solvers = solvers
+            except AttributeError:
+                return solver
+        solvers[key] = solver
+        while len(solvers) > SvCurveLengthSolver.max_cached_solvers:
+            del solvers[next(iter(solvers))]
+        return solver
+
     def calc_length_segments(self, tknots):
         vectors = self.curve.evaluate_array(tknots)
         dvs = vectors[1:] - vectors[:-1]
@@ -48,9 +90,35 @@ class SvCurveLengthSolver(object):
             raise Exception("You have to call solver.prepare() first")
         return self._length_params[-1]
 
-    def prepare(self, mode, resolution=50):
+    def _refine_tknots(self, tknots, tolerance):
+        """
+        Subdivide segments, for which the length of the chord differs from
+        the length of the two half-chords by more than tolerance (relative).
+        """
+        for i in range(self.max_refine_iterations):
+            mids = (tknots[1:] + tknots[:-1]) / 2.0
+            points = self.curve.evaluate_array(tknots)
+            mid_points = self.curve.evaluate_array(mids)
+            chords = np.linalg.norm(points[1:] - points[:-1], axis=1)
+            halves = np.linalg.norm(mid_points - points[:-1], axis=1) + np.linalg.norm(points[1:] - mid_points, axis=1)
+            bad = (halves - chords) > tolerance * halves
+            if not bad.any():
+                break
+            tknots = np.sort(np.concatenate((tknots, mids[bad])))
+        return tknots
+
+    def prepare(self, mode, resolution=50, tolerance=None):
+        """
+        Build the table of curve lengths.
+        * mode: 'LIN' or 'SPL' - interpolation of the table.
+        * resolution: initial number of samples.
+        * tolerance: if specified, the table is refined adaptively, until
+          the relative error of length of each segment is less than tolerance.
+        """
         t_min, t_max = self.curve.get_u_bounds()
         tknots = np.linspace(t_min, t_max, num=resolution)
+        if tolerance is not None:
+            tknots = self._refine_tknots(tknots, tolerance)
         lengths = self.calc_length_segments(tknots)
         self._length_params = np.cumsum(np.insert(lengths, 0, 0))
         self._spline = self._make_spline(mode, tknots)
@@ -67,11 +135,22 @@ class SvCurveLengthSolver(object):
         return spline
 
     def solve(self, input_lengths):
+        """
+        input: np.array of shape (n,) - lengths from the beginning of the curve.
+        output: np.array of shape (n,) - corresponding values of T parameter.
+        """
         if self._spline is None:
             raise Exception("You have to call solver.prepare() first")
         spline_verts = self._spline.eval(input_lengths)
         return spline_verts[:,1]
 
+    def solve_relative(self, factors):
+        """
+        Same as solve(), but lengths are given as fractions (0 to 1) of
+        the total length of the curve.
+        """
+        return self.solve(np.asarray(factors) * self.get_total_length())
+
 class SvNormalTrack(object):
     def __init__(self, curve, resolution):
         self.curve = curve
@@ -418,8 +497,7 @@ class SvOffsetCurve(SvCurve):
         if algorithm in {FRENET, ZERO, TRACK_NORMAL}:
             self.calculator = DifferentialRotationCalculator(curve, algorithm, resolution)
         if offset_curve_type == SvOffsetCurve.BY_LENGTH:
-            self.len_solver = SvCurveLengthSolver(curve)
-            self.len_solver.prepare('SPL', resolution)
+            self.len_solver = SvCurveLengthSolver.for_curve(curve, 'SPL', resolution)
         self.tangent_delta = 0.001
 
     def get_u_bounds(self):
@@ -535,8 +613,7 @@ class SvCurveOffsetOnSurface(SvCurve):
         self.z_axis = axis
         self.tangent_delta = 0.001
         if offset_curve_type == SvCurveOffsetOnSurface.BY_LENGTH:
-            self.len_solver = SvCurveLengthSolver(curve)
-            self.len_solver.prepare('SPL', len_resolution)
+            self.len_solver = SvCurveLengthSolver.for_curve(curve, 'SPL', len_resolution)
 
     def get_u_bounds(self):
         return self.curve.get_u_bounds()
@@ -682,8 +759,7 @@ class SvLengthRebuiltCurve(SvCurve):
         else:
             self.tangent_delta = 0.001
         self.mode = mode
-        self.solver = SvCurveLengthSolver(curve)
-        self.solver.prepare(self.mode, resolution)
+        self.solver = SvCurveLengthSolver.for_curve(curve, self.mode, resolution)
         self.u_bounds = (0.0, self.solver.get_total_length())
         self.__description__ = "{} rebuilt".format(curve)
 
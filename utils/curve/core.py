@@ -611,10 +611,10 @@ class SvReparametrizeCurve(SvCurve):
         ts = m + ts*(M-m)
         return self.curve.third_derivative_array(ts)
 
-    def derivatives_array(self, ts):
+    def derivatives_array(self, n, ts):
         m, M = self.curve.get_u_bounds()
         ts = m + ts*(M-m)
-        return self.curve.derivatives_array(ts)
+        return self.curve.derivatives_array(n, ts)
 
 class SvCurveSegment(SvCurve):
     def __init__(self, curve, u_min, u_max, rescale=False):
@@ -678,11 +678,11 @@ class SvCurveSegment(SvCurve):
             ts = (M - m)*ts + m
         return self.curve.third_derivative_array(ts)
 
-    def derivatives_array(self, ts):
+    def derivatives_array(self, n, ts):
         if self.rescale:
             m,M = self.target_u_bounds
             ts = (M - m)*ts + m
-        return self.curve.derivatives_array(ts)
+        return self.curve.derivatives_array(n, ts)
 
 class SvLambdaCurve(SvCurve):
     __description__ = "Formula"
@@ -700,31 +700,29 @@ class SvNativeNurbsCurve(SvNurbsCurve):
         else:
             return numerator / denominator
 
-    def fraction(self, deriv_order, ts):
-        n = len(ts)
-        p = self.degree
-        k = len(self.control_points)
-        ns = np.array([self.basis.derivative(i, p, deriv_order)(ts) for i in range(k)]) # (k, n)
-        coeffs = ns * self.weights[np.newaxis].T # (k, n)
-        coeffs_t = coeffs[np.newaxis].T # (n, k, 1)
-        numerator = (coeffs_t * self.control_points) # (n, k, 3)
-        numerator = numerator.sum(axis=1) # (n, 3)
-        denominator = coeffs.sum(axis=0) # (n,)
+    def fractions(self, deriv_order, ts):
+        """
+        Numerators and denominators of the curve and its derivatives
+        up to deriv_order (inclusive), as a list of (numerator, denominator) pairs.
+        Only p+1 basis functions, which are not zero at each parameter, are evaluated.
+        """
+        indexes, ns = self.basis.span_derivatives(self.degree, ts, deriv_order) # (n, p+1), (d+1, n, p+1)
+        weights = self.weights[indexes] # (n, p+1)
+        control_points = self.control_points[indexes] # (n, p+1, 3)
+        result = []
+        for k in range(deriv_order+1):
+            coeffs = ns[k] * weights # (n, p+1)
+            numerator = (coeffs[:,:,np.newaxis] * control_points).sum(axis=1) # (n, 3)
+            denominator = coeffs.sum(axis=1) # (n,)
+            result.append((numerator, denominator[np.newaxis].T))
+        return result
 
-        return numerator, denominator[np.newaxis].T
+    def fraction(self, deriv_order, ts):
+        return self.fractions(deriv_order, ts)[deriv_order]
 
     def fraction_single(self, deriv_order, t):
-        p = self.degree
-        k = len(self.control_points)
-        ts = np.array([t])
-        ns = np.array([self.basis.derivative(i, p, deriv_order)(ts)[0] for i in range(k)]) # (k,)
-        coeffs = ns * self.weights # (k, )
-        coeffs_t = coeffs[np.newaxis].T
-        numerator = (coeffs_t * self.control_points) # (k, 3)
-        numerator = numerator.sum(axis=0) # (3,)
-        denominator = coeffs.sum(axis=0) # ()
-
-        return numerator, denominator
+        numerator, denominator = self.fraction(deriv_order, np.array([t]))
+        return numerator[0], denominator[0,0]
 
     def evaluate_array(self, ts):
         numerator, denominator = self.fraction(0, ts)
@@ -744,11 +742,7 @@ class SvNativeNurbsCurve(SvNurbsCurve):
         # numerator' = curve' * denominator + curve * denominator'
         # ergo:
         # curve' = (numerator' - curve*denominator') / denominator
-        numerator, denominator = self.fraction(0, ts)
-        curve = numerator / denominator
-        numerator1, denominator1 = self.fraction(1, ts)
-        curve1 = (numerator1 - curve*denominator1) / denominator
-        return curve1
+        return self.derivatives_array(1, ts)[0]
 
     def second_derivative(self, t):
         return self.second_derivative_array(np.array([t]))[0]
@@ -756,42 +750,28 @@ class SvNativeNurbsCurve(SvNurbsCurve):
     def second_derivative_array(self, ts):
         # numerator'' = (curve * denominator)'' =
         #  = curve'' * denominator + 2 * curve' * denominator' + curve * denominator''
-        numerator, denominator = self.fraction(0, ts)
-        curve = numerator / denominator
-        numerator1, denominator1 = self.fraction(1, ts)
-        curve1 = (numerator1 - curve*denominator1) / denominator
-        numerator2, denominator2 = self.fraction(2, ts)
-        curve2 = (numerator2 - 2*curve1*denominator1 - curve*denominator2) / denominator
-        return curve2
+        return self.derivatives_array(2, ts)[1]
 
     def third_derivative_array(self, ts):
         # numerator''' = (curve * denominator)''' = 
         #  = curve''' * denominator + 3 * curve'' * denominator' + 3 * curve' * denominator'' + denominator'''
-        numerator, denominator = self.fraction(0, ts)
-        curve = numerator / denominator
-        numerator1, denominator1 = self.fraction(1, ts)
-        curve1 = (numerator1 - curve*denominator1) / denominator
-        numerator2, denominator2 = self.fraction(2, ts)
-        curve2 = (numerator2 - 2*curve1*denominator1 - curve*denominator2) / denominator
-        numerator3, denominator3 = self.fraction(3, ts)
-
-        curve3 = (numerator3 - 3*curve2*denominator1 - 3*curve1*denominator2 - curve*denominator3) / denominator
-        return curve3
+        return self.derivatives_array(3, ts)[2]
 
     def derivatives_array(self, n, ts):
         result = []
+        fractions = self.fractions(min(n, 3), ts)
+        numerator, denominator = fractions[0]
+        curve = numerator / denominator
         if n >= 1:
-            numerator, denominator = self.fraction(0, ts)
-            curve = numerator / denominator
-            numerator1, denominator1 = self.fraction(1, ts)
+            numerator1, denominator1 = fractions[1]
             curve1 = (numerator1 - curve*denominator1) / denominator
             result.append(curve1)
         if n >= 2:
-            numerator2, denominator2 = self.fraction(2, ts)
+            numerator2, denominator2 = fractions[2]
             curve2 = (numerator2 - 2*curve1*denominator1 - curve*denominator2) / denominator
             result.append(curve2)
         if n >= 3:
-            numerator3, denominator3 = self.fraction(3, ts)
+            numerator3, denominator3 = fractions[3]
             curve3 = (numerator3 - 3*curve2*denominator1 - 3*curve1*denominator2 - curve*denominator3) / denominator
             result.append(curve3)
         return result
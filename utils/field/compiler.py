@@ -0,0 +1,349 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Compilation of composed fields into flat evaluation plans.
+
+Fields built by field math nodes are trees of objects (SvScalarFieldBinOp,
+SvNegatedScalarField, SvVectorScalarFieldComposition and so on), and their
+evaluate_grid() materializes arrays of full size at each level of the tree.
+compile_field() flattens such a tree into a list of steps; sub-fields which
+are used several times are evaluated once. The compiled field evaluates the
+plan chunk by chunk, so temporary arrays are never larger than the chunk,
+and writes results into preallocated output arrays.
+
+Fields which the compiler does not know are evaluated by their own
+evaluate_grid() method, chunk by chunk as well.
+
+>>> compiled = compile_field(field)
+>>> values = compiled.evaluate_grid(xs, ys, zs)
+"""
+
+import collections
+import numpy as np
+
+from sverchok.utils.field.scalar import (
+        SvScalarField, SvScalarFieldBinOp, SvScalarFieldVectorizedFunction,
+        SvNegatedScalarField, SvAbsScalarField, SvScalarFieldLambda,
+        SvVectorScalarFieldComposition, SvVectorFieldNorm,
+        SvVectorFieldsScalarProduct, SvVectorFieldDecomposed
+    )
+from sverchok.utils.field.vector import (
+        SvVectorField, SvVectorFieldBinOp, SvVectorFieldMultipliedByScalar,
+        SvVectorFieldsLerp, SvAbsoluteVectorField, SvRelativeVectorField,
+        SvComposedVectorField, SvVectorFieldComposition, SvVectorFieldCrossProduct,
+        SvVectorFieldLambda, SvAverageVectorField
+    )
+
+# number of points evaluated at once, see update_field_settings
+field_chunk_size = 65536
+
+def update_field_settings(self, context):
+    global field_chunk_size
+    field_chunk_size = self.field_chunk_size
+
+# One step of the plan.
+# func: called with values of args registers; returns value of new register;
+#       values are arrays for scalar fields and tuples of 3 arrays for vector fields.
+# inplace: func is a numpy ufunc, which can write into its only argument;
+# fresh: func always returns newly allocated arrays.
+FieldStep = collections.namedtuple('FieldStep', ['func', 'args', 'inplace', 'fresh'])
+
+class SvFieldPlan(object):
+    """
+    Flat evaluation plan of a field. Register 0 holds coordinates of points
+    (tuple of xs, ys, zs); each step stores its result in a new register.
+    """
+    def __init__(self, field):
+        self.steps = []
+        self._memo = dict()
+        # keep compiled fields alive, so that their ids are not reused
+        self._fields = []
+        self.output = self.add(field, 0)
+        self.last_use = self._calc_last_use()
+
+    def step(self, func, *args, inplace=False, fresh=False):
+        self.steps.append(FieldStep(func, args, inplace, fresh))
+        return len(self.steps)
+
+    def add(self, field, coords):
+        """
+        Add steps evaluating field at points from coords register.
+        Returns register of the result.
+        """
+        key = (id(field), coords)
+        register = self._memo.get(key)
+        if register is not None:
+            return register
+        self._fields.append(field)
+        rule = _compile_rules.get(type(field))
+        if rule is not None:
+            register = rule(self, field, coords)
+        if register is None:
+            register = self.step(lambda points, field=field: field.evaluate_grid(*points), coords)
+        self._memo[key] = register
+        return register
+
+    def _calc_last_use(self):
+        last_use = dict()
+        for i, step in enumerate(self.steps):
+            for arg in step.args:
+                last_use[arg] = i + 1
+        last_use[self.output] = len(self.steps) + 1
+        return last_use
+
+    def _can_overwrite(self, i, step):
+        if not step.inplace:
+            return False
+        arg = step.args[0]
+        if arg == 0 or not self.steps[arg-1].fresh:
+            return False
+        return self.last_use[arg] == i
+
+    def execute(self, xs, ys, zs):
+        """Evaluate the plan for one chunk of points."""
+        values = [None] * (len(self.steps) + 1)
+        values[0] = (xs, ys, zs)
+        for i, step in enumerate(self.steps, start=1):
+            args = [values[arg] for arg in step.args]
+            if self._can_overwrite(i, step):
+                values[i] = step.func(args[0], out=args[0])
+            else:
+                values[i] = step.func(*args)
+            # free temporary arrays as soon as they are not needed
+            for arg in step.args:
+                if arg != 0 and self.last_use[arg] == i:
+                    values[arg] = None
+        return values[self.output]
+
+def _to_output(values, n, shape):
+    values = np.asarray(values)
+    if values.shape != (n,):
+        values = np.array(np.broadcast_to(values, (n,)))
+    return values.reshape(shape)
+
+def _evaluate_chunked(plan, xs, ys, zs, chunk_size, is_vector):
+    xs, ys, zs = np.broadcast_arrays(np.asarray(xs), np.asarray(ys), np.asarray(zs))
+    shape = xs.shape
+    xs, ys, zs = xs.ravel(), ys.ravel(), zs.ravel()
+    n = len(xs)
+    if chunk_size is None:
+        chunk_size = field_chunk_size
+    if n <= chunk_size:
+        result = plan.execute(xs, ys, zs)
+        if is_vector:
+            return tuple(_to_output(r, n, shape) for r in result)
+        return _to_output(result, n, shape)
+
+    outputs = None
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        result = plan.execute(xs[start:end], ys[start:end], zs[start:end])
+        if not is_vector:
+            result = (result,)
+        if outputs is None:
+            outputs = [np.empty(n, dtype=np.result_type(r, np.float64)) for r in result]
+        for output, r in zip(outputs, result):
+            output[start:end] = r
+    outputs = [output.reshape(shape) for output in outputs]
+    if is_vector:
+        return tuple(outputs)
+    return outputs[0]
+
+class SvCompiledScalarField(SvScalarField):
+    def __init__(self, field, chunk_size=None):
+        self.field = field
+        self.chunk_size = chunk_size
+        self.plan = SvFieldPlan(field)
+        self.__description__ = "Compiled({})".format(field)
+
+    def evaluate(self, x, y, z):
+        return self.field.evaluate(x, y, z)
+
+    def evaluate_grid(self, xs, ys, zs):
+        return _evaluate_chunked(self.plan, xs, ys, zs, self.chunk_size, is_vector=False)
+
+class SvCompiledVectorField(SvVectorField):
+    def __init__(self, field, chunk_size=None):
+        self.field = field
+        self.chunk_size = chunk_size
+        self.plan = SvFieldPlan(field)
+        self.__description__ = "Compiled({})".format(field)
+
+    def evaluate(self, x, y, z):
+        return self.field.evaluate(x, y, z)
+
+    def evaluate_grid(self, xs, ys, zs):
+        return _evaluate_chunked(self.plan, xs, ys, zs, self.chunk_size, is_vector=True)
+
+def compile_field(field, chunk_size=None):
+    """
+    Compile scalar or vector field.
+    chunk_size: number of points evaluated at once; None means use the value
+    from add-on preferences.
+    Returns a field of the same kind, which gives the same values.
+    """
+    if isinstance(field, (SvCompiledScalarField, SvCompiledVectorField)):
+        return field
+    if isinstance(field, SvScalarField):
+        return SvCompiledScalarField(field, chunk_size)
+    elif isinstance(field, SvVectorField):
+        return SvCompiledVectorField(field, chunk_size)
+    else:
+        raise TypeError("Not a field: {}".format(field))
+
+##################
+#                #
+#  Compile rules #
+#                #
+##################
+
+# Each rule adds steps for a field of specific type and returns the register
+# of the result, or None if the field is to be evaluated as a whole.
+# Steps must give the same values as evaluate_grid() of the field.
+
+def _stack(vectors):
+    return np.stack(vectors)
+
+def _scalar_binop(plan, field, coords):
+    r1 = plan.add(field.field1, coords)
+    r2 = plan.add(field.field2, coords)
+    return plan.step(field.function, r1, r2)
+
+def _scalar_function(plan, field, coords):
+    return plan.step(field.function, plan.add(field.field, coords))
+
+def _negate(plan, field, coords):
+    return plan.step(np.negative, plan.add(field.field, coords), inplace=True, fresh=True)
+
+def _abs(plan, field, coords):
+    return plan.step(np.abs, plan.add(field.field, coords), inplace=True, fresh=True)
+
+def _scalar_lambda(plan, field, coords):
+    function = field.function_numpy
+    if function is None:
+        return None
+    if field.in_field is None:
+        return plan.step(lambda points: function(*points, np.zeros(points[0].shape[0])), coords)
+    values = plan.add(field.in_field, coords)
+    return plan.step(lambda points, vs: function(*points, vs), coords, values)
+
+def _vector_scalar_composition(plan, field, coords):
+    return plan.add(field.sfield, plan.add(field.vfield, coords))
+
+def _norm(plan, field, coords):
+    def norm(vectors):
+        return np.linalg.norm(_stack(vectors).T, axis=1)
+    return plan.step(norm, plan.add(field.field, coords), fresh=True)
+
+def _scalar_product(plan, field, coords):
+    def dot(v1, v2):
+        return v1[0]*v2[0] + v1[1]*v2[1] + v1[2]*v2[2]
+    r1 = plan.add(field.field1, coords)
+    r2 = plan.add(field.field2, coords)
+    return plan.step(dot, r1, r2, fresh=True)
+
+def _decomposed(plan, field, coords):
+    if field.coords != 'XYZ':
+        return None
+    axis = field.axis
+    return plan.step(lambda vectors: vectors[axis], plan.add(field.vfield, coords))
+
+def _vector_binop(plan, field, coords):
+    function = field.function
+    def binop(v1, v2):
+        R = function(np.array(v1), np.array(v2))
+        return R[0], R[1], R[2]
+    r1 = plan.add(field.field1, coords)
+    r2 = plan.add(field.field2, coords)
+    return plan.step(binop, r1, r2)
+
+def _multiplied_by_scalar(plan, field, coords):
+    def product(scalars, vectors):
+        R = scalars * _stack(vectors)
+        return R[0], R[1], R[2]
+    rs = plan.add(field.scalar_field, coords)
+    rv = plan.add(field.vector_field, coords)
+    return plan.step(product, rs, rv, fresh=True)
+
+def _lerp(plan, field, coords):
+    def lerp(scalars, vectors1, vectors2):
+        R = (1 - scalars) * _stack(vectors1) + scalars * _stack(vectors2)
+        return R[0], R[1], R[2]
+    rs = plan.add(field.scalar_field, coords)
+    r1 = plan.add(field.vfield1, coords)
+    r2 = plan.add(field.vfield2, coords)
+    return plan.step(lerp, rs, r1, r2, fresh=True)
+
+def _absolute(plan, field, coords):
+    def absolute(points, vectors):
+        return vectors[0] + points[0], vectors[1] + points[1], vectors[2] + points[2]
+    return plan.step(absolute, coords, plan.add(field.field, coords), fresh=True)
+
+def _relative(plan, field, coords):
+    def relative(points, vectors):
+        return vectors[0] - points[0], vectors[1] - points[1], vectors[2] - points[2]
+    return plan.step(relative, coords, plan.add(field.field, coords), fresh=True)
+
+def _composed(plan, field, coords):
+    if field.coords != 'XYZ':
+        return None
+    r1 = plan.add(field.sfield1, coords)
+    r2 = plan.add(field.sfield2, coords)
+    r3 = plan.add(field.sfield3, coords)
+    return plan.step(lambda v1, v2, v3: (v1, v2, v3), r1, r2, r3)
+
+def _vector_composition(plan, field, coords):
+    return plan.add(field.field2, plan.add(field.field1, coords))
+
+def _cross(plan, field, coords):
+    def cross(vectors1, vectors2):
+        R = np.cross(_stack(vectors1).T, _stack(vectors2).T).T
+        return R[0], R[1], R[2]
+    r1 = plan.add(field.field1, coords)
+    r2 = plan.add(field.field2, coords)
+    return plan.step(cross, r1, r2, fresh=True)
+
+def _vector_lambda(plan, field, coords):
+    function = field.function_numpy
+    if function is None:
+        return None
+    if field.in_field is None:
+        return plan.step(lambda points: function(*points, np.zeros(points[0].shape[0])), coords)
+    values = plan.add(field.in_field, coords)
+    return plan.step(lambda points, vectors: function(*points, _stack(vectors).T), coords, values)
+
+def _average(plan, field, coords):
+    def average(*fields_vectors):
+        data = np.array([_stack(vectors).T for vectors in fields_vectors])
+        mean = np.mean(data, axis=0).T
+        return mean[0], mean[1], mean[2]
+    registers = [plan.add(f, coords) for f in field.fields]
+    return plan.step(average, *registers, fresh=True)
+
+_compile_rules = {
+        SvScalarFieldBinOp: _scalar_binop,
+        SvScalarFieldVectorizedFunction: _scalar_function,
+        SvNegatedScalarField: _negate,
+        SvAbsScalarField: _abs,
+        SvScalarFieldLambda: _scalar_lambda,
+        SvVectorScalarFieldComposition: _vector_scalar_composition,
+        SvVectorFieldNorm: _norm,
+        SvVectorFieldsScalarProduct: _scalar_product,
+        SvVectorFieldDecomposed: _decomposed,
+        SvVectorFieldBinOp: _vector_binop,
+        SvVectorFieldMultipliedByScalar: _multiplied_by_scalar,
+        SvVectorFieldsLerp: _lerp,
+        SvAbsoluteVectorField: _absolute,
+        SvRelativeVectorField: _relative,
+        SvComposedVectorField: _composed,
+        SvVectorFieldComposition: _vector_composition,
+        SvVectorFieldCrossProduct: _cross,
+        SvVectorFieldLambda: _vector_lambda,
+        SvAverageVectorField: _average,
+    }
+
@@ -8,25 +8,18 @@
 import random
 import numpy as np
 
-from mathutils.kdtree import KDTree
-
 from sverchok.utils.field.scalar import SvScalarField
-from sverchok.utils.logging import error
+from sverchok.utils.spatial_hash import SpatialHash
+from sverchok.utils.field.compiler import compile_field
+from sverchok.utils.logging import error, info
 
 BATCH_SIZE = 50
 MAX_ITERATIONS = 1000
+# In Poisson disk mode, stop after this number of batches
+# in a row did not give any new points.
+POISSON_MAX_FAILS = 10
 
-def _check_all(v_new, vs_old, min_r):
-    kdt = KDTree(len(vs_old))
-    for i, v in enumerate(vs_old):
-        kdt.insert(v, i)
-    kdt.balance()
-    nearest, idx, dist = kdt.find(v_new)
-    if dist is None:
-        return True
-    return (dist >= min_r)
-
-def field_random_probe(field, bbox, count, threshold=0, proportional=False, field_min=None, field_max=None, min_r=0, seed=0, predicate=None):
+def field_random_probe(field, bbox, count, threshold=0, proportional=False, field_min=None, field_max=None, min_r=0, seed=0, predicate=None, poisson=False):
     """
     Generate random points within bounding box, with distribution controlled (optionally) by a scalar field.
 
@@ -46,10 +39,15 @@ def field_random_probe(field, bbox, count, threshold=0, proportional=False, fiel
     * min_r: minimum distance between generated points. Set to zero to disable this check.
     * seed: random generator seed value.
     * predicate: additional predicate to check if generated point is valid. Optional.
+    * poisson: if True, generate Poisson disk (blue noise) distribution: keep
+      generating points until no more points can be placed at `min_r` distance
+      from other points. `count` is the maximum number of points in this case.
 
     outputs:
         list of vertices.
     """
+    if field is not None:
+        field = compile_field(field)
     if seed == 0:
         seed = 12345
     random.seed(seed)
@@ -61,6 +59,9 @@ def field_random_probe(field, bbox, count, threshold=0, proportional=False, fiel
     done = 0
     new_verts = []
     iterations = 0
+    fails = 0
+    if min_r != 0:
+        index = SpatialHash(min_r)
     while done < count:
         iterations += 1
         if iterations > MAX_ITERATIONS:
@@ -103,15 +104,28 @@ def field_random_probe(field, bbox, count, threshold=0, proportional=False, fiel
             good_verts = candidates
         else:
             good_verts = []
-            for candidate in candidates:
-                if _check_all(candidate, new_verts + good_verts, min_r):
-                    good_verts.append(candidate)
+            if candidates:
+                is_far = index.is_far(candidates, min_r)
+            for i, candidate in enumerate(candidates):
+                if not is_far[i]:
+                    continue
+                if good_verts and np.linalg.norm(np.array(good_verts) - candidate, axis=1).min() < min_r:
+                    continue
+                good_verts.append(candidate)
 
         if predicate is not None:
             good_verts = [vert for vert in good_verts if predicate(vert)]
 
         new_verts.extend(good_verts)
         done += len(good_verts)
+        if min_r != 0:
+            index.extend(good_verts)
+
+        if poisson and min_r != 0:
+            fails = 0 if good_verts else fails + 1
+            if fails >= POISSON_MAX_FAILS:
+                info("Poisson disk sampling: %s points generated, no more space", done)
+                break
 
     return new_verts
 
@@ -9,11 +9,11 @@ import numpy as np
 from math import copysign, sqrt, sin, cos, atan2, acos, pi
 
 from mathutils import Matrix, Vector
-from mathutils import kdtree
 from mathutils import bvhtree
 
 from sverchok.utils.math import from_cylindrical, from_spherical, to_cylindrical, to_spherical
 from sverchok.utils.geom import LineEquation, CircleEquation3D
+from sverchok.utils.sv_KDT_utils import get_kdtree
 
 ##################
 #                #
@@ -350,18 +350,25 @@ class SvKdtScalarField(SvScalarField):
 
     def __init__(self, vertices=None, kdt=None, falloff=None):
         self.falloff = falloff
+        # kdt is mathutils KDTree; vertices are put into shared SvKDTree
+        self.kdt = None
+        self.tree = None
         if kdt is not None:
             self.kdt = kdt
         elif vertices is not None:
-            self.kdt = kdtree.KDTree(len(vertices))
-            for i, v in enumerate(vertices):
-                self.kdt.insert(v, i)
-            self.kdt.balance()
+            self.tree = get_kdtree(vertices)
         else:
             raise Exception("Either kdt or vertices must be provided")
 
+    def _distances(self, points):
+        if self.tree is not None:
+            distances, idxs = self.tree.query(points)
+            return distances[:,0]
+        else:
+            return np.array([self.kdt.find(v)[2] for v in points.tolist()])
+
     def evaluate(self, x, y, z):
-        nearest, i, distance = self.kdt.find((x, y, z))
+        distance = self._distances(np.array([[x, y, z]]))[0]
         if self.falloff is not None:
             value = self.falloff(np.array([distance]))[0]
             return value
@@ -369,12 +376,8 @@ class SvKdtScalarField(SvScalarField):
             return distance
 
     def evaluate_grid(self, xs, ys, zs):
-        def find(v):
-            nearest, i, distance = self.kdt.find(v)
-            return distance
-
         points = np.stack((xs, ys, zs)).T
-        norms = np.vectorize(find, signature='(3)->()')(points)
+        norms = self._distances(points)
         if self.falloff is not None:
             result = self.falloff(norms)
             return result
@@ -493,19 +496,23 @@ class SvBvhAttractorScalarField(SvScalarField):
         return sign * distance
 
     def evaluate_grid(self, xs, ys, zs):
-        def find(v):
-            nearest, normal, idx, distance = self.bvh.find_nearest(v)
-            if nearest is None:
-                raise Exception("No nearest point on mesh found for vertex %s" % v)
-            if self.signed:
-                sign = (v - nearest).dot(normal)
-                sign = copysign(1, sign)
-            else:
-                sign = 1
-            return sign * distance
-
         points = np.stack((xs, ys, zs)).T
-        norms = np.vectorize(find, signature='(3)->()')(points)
+        # BVH queries are only available one point at a time;
+        # collect their results and compute signs for all points at once.
+        find_nearest = self.bvh.find_nearest
+        nearest = np.empty((len(points), 3))
+        normals = np.empty((len(points), 3))
+        norms = np.empty(len(points))
+        for i, v in enumerate(points.tolist()):
+            co, normal, idx, distance = find_nearest(v)
+            if co is None:
+                raise Exception("No nearest point on mesh found for vertex %s" % v)
+            nearest[i] = co
+            normals[i] = normal
+            norms[i] = distance
+        if self.signed:
+            signs = np.where(np.einsum('ij,ij->i', points - nearest, normals) < 0, -1.0, 1.0)
+            norms *= signs
         if self.falloff is not None:
             result = self.falloff(norms)
             return result
@@ -813,20 +820,15 @@ class SvVoronoiScalarField(SvScalarField):
     __description__ = "Voronoi"
 
     def __init__(self, vertices):
-        self.kdt = kdtree.KDTree(len(vertices))
-        for i, v in enumerate(vertices):
-            self.kdt.insert(v, i)
-        self.kdt.balance()
+        self.tree = get_kdtree(vertices)
+        if len(self.tree) < 2:
+            raise Exception("At least two vertices are required for Voronoi field")
 
     def evaluate(self, x, y, z):
-        vs = self.kdt.find_n((x,y,z), 2)
-        if len(vs) != 2:
-            raise Exception("Unexpected kdt result at (%s,%s,%s): %s" % (x, y, z, vs))
-        t1, t2 = vs
-        distance1 = t1[2]
-        distance2 = t2[2]
-        return abs(distance1 - distance2)
+        return self.evaluate_grid(np.array([x]), np.array([y]), np.array([z]))[0]
 
     def evaluate_grid(self, xs, ys, zs):
-        return np.vectorize(self.evaluate, signature='(),(),()->()')(xs,ys,zs)
+        points = np.stack((xs, ys, zs), axis=-1).reshape((-1, 3))
+        distances, idxs = self.tree.query(points, k=2)
+        return abs(distances[:,0] - distances[:,1]).reshape(np.shape(xs))
 
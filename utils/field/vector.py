@@ -10,11 +10,11 @@ import numpy as np
 
 from mathutils import Vector
 from mathutils import bvhtree
-from mathutils import kdtree
 from mathutils import noise
 from sverchok.utils.curve import SvCurveLengthSolver, SvNormalTrack, MathutilsRotationCalculator
 from sverchok.utils.geom import LineEquation, CircleEquation3D
 from sverchok.utils.math import from_cylindrical, from_spherical
+from sverchok.utils.sv_KDT_utils import get_kdtree
 
 
 ##################
@@ -285,20 +285,28 @@ class SvKdtVectorField(SvVectorField):
     def __init__(self, vertices=None, kdt=None, falloff=None, negate=False):
         self.falloff = falloff
         self.negate = negate
+        # kdt is mathutils KDTree; vertices are put into shared SvKDTree
+        self.kdt = None
+        self.tree = None
         if kdt is not None:
             self.kdt = kdt
         elif vertices is not None:
-            self.kdt = kdtree.KDTree(len(vertices))
-            for i, v in enumerate(vertices):
-                self.kdt.insert(v, i)
-            self.kdt.balance()
+            self.tree = get_kdtree(vertices)
         else:
             raise Exception("Either kdt or vertices must be provided")
         self.__description__ = "KDT Attractor"
 
+    def _nearest(self, points):
+        if self.tree is not None:
+            distances, idxs = self.tree.query(points)
+            return self.tree.points[idxs[:,0]]
+        else:
+            return np.array([self.kdt.find(v)[0] for v in points.tolist()])
+
     def evaluate(self, x, y, z):
-        nearest, i, distance = self.kdt.find((x, y, z))
-        vector = np.array(nearest) - np.array([x, y, z])
+        nearest = self._nearest(np.array([[x, y, z]]))[0]
+        vector = nearest - np.array([x, y, z])
+        distance = np.linalg.norm(vector)
         if self.falloff is not None:
             value = self.falloff(np.array([distance]))[0]
             if self.negate:
@@ -312,19 +320,12 @@ class SvKdtVectorField(SvVectorField):
                 return vector
 
     def evaluate_grid(self, xs, ys, zs):
-        def find(v):
-            nearest, i, distance = self.kdt.find(v)
-            dv = np.array(nearest) - np.array(v)
-            if self.negate:
-                return - dv
-            else:
-                return dv
-
         points = np.stack((xs, ys, zs)).T
-        vectors = np.vectorize(find, signature='(3)->(3)')(points)
+        vectors = self._nearest(points) - points
+        if self.negate:
+            vectors = - vectors
         if self.falloff is not None:
             norms = np.linalg.norm(vectors, axis=1, keepdims=True)
-            lens = self.falloff(norms)
             nonzero = (norms > 0)[:,0]
             lens = self.falloff(norms)
             vectors[nonzero] = vectors[nonzero] / norms[nonzero]
@@ -820,8 +821,7 @@ class SvBendAlongCurveField(SvVectorField):
         elif algorithm == SvBendAlongCurveField.TRACK_NORMAL:
             self.normal_tracker = SvNormalTrack(curve, resolution)
         if length_mode == 'L':
-            self.length_solver = SvCurveLengthSolver(curve)
-            self.length_solver.prepare('SPL', resolution)
+            self.length_solver = SvCurveLengthSolver.for_curve(curve, 'SPL', resolution)
         self.__description__ = "Bend along {}".format(curve)
 
     def get_matrix(self, tangent, scale):
@@ -1011,27 +1011,26 @@ class SvBendAlongSurfaceField(SvVectorField):
 class SvVoronoiVectorField(SvVectorField):
 
     def __init__(self, vertices):
-        self.kdt = kdtree.KDTree(len(vertices))
-        for i, v in enumerate(vertices):
-            self.kdt.insert(v, i)
-        self.kdt.balance()
+        self.tree = get_kdtree(vertices)
+        if len(self.tree) < 2:
+            raise Exception("At least two vertices are required for Voronoi field")
         self.__description__ = "Voronoi"
 
     def evaluate(self, x, y, z):
-        v = Vector((x,y,z))
-        vs = self.kdt.find_n(v, 2)
-        if len(vs) != 2:
-            raise Exception("Unexpected kdt result at (%s,%s,%s): %s" % (x, y, z, vs))
-        t1, t2 = vs
-        d1 = t1[2]
-        d2 = t2[2]
-        delta = abs(d1 - d2)
-        v1 = (t1[0] - v).normalized()
-        return delta * np.array(v1)
+        rxs, rys, rzs = self.evaluate_grid(np.array([x]), np.array([y]), np.array([z]))
+        return np.array([rxs[0], rys[0], rzs[0]])
 
     def evaluate_grid(self, xs, ys, zs):
-        points = np.vectorize(self.evaluate, signature='(),(),()->(3)')(xs,ys,zs).T
-        return points[0], points[1], points[2]
+        shape = np.shape(xs)
+        points = np.stack((xs, ys, zs), axis=-1).reshape((-1, 3))
+        distances, idxs = self.tree.query(points, k=2)
+        delta = abs(distances[:,0] - distances[:,1])
+        vectors = self.tree.points[idxs[:,0]] - points
+        norms = np.linalg.norm(vectors, axis=1)
+        nonzero = norms > 0
+        vectors[nonzero] /= norms[nonzero][:,np.newaxis]
+        R = (delta[:,np.newaxis] * vectors).T
+        return R[0].reshape(shape), R[1].reshape(shape), R[2].reshape(shape)
 
 class SvScalarFieldCurveMap(SvVectorField):
     def __init__(self, scalar_field, curve, mode):
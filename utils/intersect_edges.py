@@ -18,6 +18,9 @@
 
 import itertools
 from collections import defaultdict
+from math import floor
+
+import numpy as np
 
 import bmesh
 from mathutils import Vector
@@ -32,6 +35,117 @@ from sverchok.utils.cad_module_class import CAD_ops
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
 from sverchok.utils.geom_2d.intersections import intersect_sv_edges
 
+def edge_pairs_broad_phase(verts, edges, margin=0.0, budget=16):
+    """
+    Find pairs of edges which can intersect: their bounding boxes, extended
+    by margin (a number or an array with a value per edge), overlap, and they
+    do not share a vertex. Works for 2D and 3D vertices.
+    Edges are bucketed into cells of a uniform grid, so only edges from
+    the same cells are compared. Cell size is increased until the number of
+    (edge, cell) entries does not exceed budget entries per edge.
+    Returns np.array of shape (n, 2) with pairs (i, j), i < j,
+    sorted lexicographically.
+    """
+    verts = np.asarray(verts, dtype=np.float64)
+    edges = np.asarray(edges, dtype=np.int64).reshape((-1, 2))
+    n = len(edges)
+    if n < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+    ends = verts[edges]
+    margin = np.broadcast_to(np.asarray(margin, dtype=np.float64), (n,))[:, np.newaxis]
+    mins = ends.min(axis=1) - margin
+    maxs = ends.max(axis=1) + margin
+
+    origin = mins.min(axis=0)
+    span = (maxs.max(axis=0) - origin).max()
+    cell_size = max((maxs - mins).max(axis=1).mean(), span / n)
+    if cell_size <= 0:
+        cell_size = 1.0
+    while True:
+        lo = np.floor((mins - origin) / cell_size).astype(np.int64)
+        hi = np.floor((maxs - origin) / cell_size).astype(np.int64)
+        sizes = hi - lo + 1
+        counts = np.prod(sizes, axis=1)
+        total = counts.sum()
+        if total <= budget * n:
+            break
+        cell_size *= 2
+
+    # all (edge, cell) entries
+    edge_idxs = np.repeat(np.arange(n), counts)
+    local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    cells = lo[edge_idxs]
+    entry_sizes = sizes[edge_idxs]
+    for axis in range(cells.shape[1]):
+        cells[:, axis] += local % entry_sizes[:, axis]
+        local //= entry_sizes[:, axis]
+    keys = np.ravel_multi_index(cells.T, cells.max(axis=0) + 1)
+
+    order = np.argsort(keys, kind='stable')
+    keys, edge_idxs = keys[order], edge_idxs[order]
+
+    # all pairs of entries within each cell
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    group_sizes = np.diff(np.append(starts, total))
+    positions = np.arange(total)
+    in_group = positions - np.repeat(starts, group_sizes)
+    repeats = np.repeat(group_sizes, group_sizes) - 1 - in_group
+    first = np.repeat(positions, repeats)
+    second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+
+    a, b = edge_idxs[first], edge_idxs[second]
+    pair_keys = np.unique(np.minimum(a, b) * n + np.maximum(a, b))
+    i, j = pair_keys // n, pair_keys % n
+
+    good = np.all(mins[i] <= maxs[j], axis=1) & np.all(mins[j] <= maxs[i], axis=1)
+    ei, ej = edges[i], edges[j]
+    good &= (ei[:, 0] != ej[:, 0]) & (ei[:, 0] != ej[:, 1]) & (ei[:, 1] != ej[:, 0]) & (ei[:, 1] != ej[:, 1])
+    return np.stack((i[good], j[good]), axis=-1)
+
+class VertexSnapIndex(object):
+    """
+    Spatial hash of vertices with cells of epsilon size;
+    it is used to find an existing vertex within epsilon distance
+    from a new point, instead of looking through the whole list of vertices.
+    """
+    def __init__(self, epsilon, verts=None):
+        self.epsilon = epsilon
+        self.cells = defaultdict(list)
+        if verts is not None:
+            for index, co in enumerate(verts):
+                self.add(co, index)
+
+    def _cell(self, co):
+        if self.epsilon <= 0:
+            return tuple(co)
+        return tuple(floor(c / self.epsilon) for c in co)
+
+    def add(self, co, index):
+        self.cells[self._cell(co)].append((tuple(co), index))
+
+    def find(self, co):
+        """
+        Index of the nearest vertex within epsilon distance from co
+        (the first one added, if there are several at the same distance), or None.
+        """
+        cell = self._cell(co)
+        if self.epsilon <= 0:
+            items = self.cells.get(cell, [])
+            return items[0][1] if items else None
+
+        best, best_distance = None, None
+        for offset in itertools.product((-1, 0, 1), repeat=len(cell)):
+            items = self.cells.get(tuple(c + o for c, o in zip(cell, offset)))
+            if not items:
+                continue
+            for item_co, index in items:
+                distance = sum((a - b)**2 for a, b in zip(item_co, co))
+                if distance > self.epsilon ** 2:
+                    continue
+                if best is None or (distance, index) < (best_distance, best):
+                    best, best_distance = index, distance
+        return best
+
 def order_points(edge, point_list):
     ''' order these edges from distance to v1, then
     sandwich the sorted list with v1, v2 '''
@@ -40,25 +154,6 @@ def order_points(edge, point_list):
     point_list = sorted(point_list, key=dist)
     return [v1] + point_list + [v2]
 
-def remove_permutations_that_share_a_vertex(cm, bm, permutations):
-    ''' Get useful Permutations '''
-
-    final_permutations = []
-    for edges in permutations:
-        raw_vert_indices = cm.vertex_indices_from_edges_tuple(bm, edges)
-        if cm.duplicates(raw_vert_indices):
-            continue
-
-        # reaches this point if they do not share.
-        final_permutations.append(edges)
-
-    return final_permutations
-
-def get_valid_permutations(cm, bm, edge_indices):
-    raw_permutations = itertools.permutations(edge_indices, 2)
-    permutations = [r for r in raw_permutations if r[0] < r[1]]
-    return remove_permutations_that_share_a_vertex(cm, bm, permutations)
-
 def can_skip(cm, closest_points, vert_vectors):
     '''this checks if the intersection lies on both edges, returns True
     when criteria are not met, and thus this point can be skipped'''
@@ -73,12 +168,19 @@ def can_skip(cm, closest_points, vert_vectors):
     cpa, cpb = closest_points
     return (cpa-cpb).length > cm.VTX_PRECISION
 
+def get_candidate_permutations(cm, bm, edge_indices):
+    '''Pairs of edges which are close enough to intersect, see edge_pairs_broad_phase'''
+    verts = [v.co[:] for v in bm.verts]
+    edges = [[v.index for v in bm.edges[idx].verts] for idx in edge_indices]
+    pairs = edge_pairs_broad_phase(verts, edges, cm.VTX_PRECISION)
+    return [(edge_indices[i], edge_indices[j]) for i, j in pairs.tolist()]
+
 def get_intersection_dictionary(cm, bm, edge_indices):
 
     bm.verts.ensure_lookup_table()
     bm.edges.ensure_lookup_table()
 
-    permutations = get_valid_permutations(cm, bm, edge_indices)
+    permutations = get_candidate_permutations(cm, bm, edge_indices)
 
     k = defaultdict(list)
     d = defaultdict(list)
@@ -179,65 +281,74 @@ def intersect_edges_3d(verts_in, edges_in, s_epsilon):
 def edges_from_ed_inter(ed_inter):
     '''create edges from intersections library'''
     edges_out = []
+    edges_set = set()
     for e in ed_inter:
         # sort by first element of tuple (distances)
         e_s = sorted(e)
         e_s = [e for i,e in enumerate(e_s) if e[1]!= e_s[i-1][1]] 
         for i in range(1, len(e_s)):
-            # if e_s[i-1][1] != e_s[i][1]:
-            if(e_s[i-1][1], e_s[i][1])not in edges_out:
-                edges_out.append((e_s[i-1][1], e_s[i][1]))
+            edge = (e_s[i-1][1], e_s[i][1])
+            if edge not in edges_set:
+                edges_set.add(edge)
+                edges_out.append(edge)
     return edges_out
 
 def intersect_edges_2d(verts, edges, epsilon):
-    '''Iterate through edges  and expose them to intersect_line_line_2d'''
+    '''Find intersections of edges in XY plane with intersect_line_line_2d.
+    Only pairs of edges found by edge_pairs_broad_phase are checked;
+    intersection points within epsilon from already existing vertices are merged.'''
     verts_in = [Vector(v) for v in verts]
     ed_lengths = [(verts_in[e[1]] - verts_in[e[0]]).length for e in edges]
     verts_out = verts
-    edges_out = []
+    snap_index = VertexSnapIndex(epsilon, verts)
     ed_inter = [[] for e in edges]
     for e, d, i in zip(edges, ed_lengths, range(len(edges))):
         # if there is no intersections this will create a normal edge
         ed_inter[i].append([0.0, e[0]])
         ed_inter[i].append([d, e[1]])
+
+    if len(edges) > 1:
+        lengths = np.array(ed_lengths)
+        # intersect_line_line_2d allows a point to lie slightly outside of the edges
+        margin = epsilon + 1e-5 * lengths
+        pairs = edge_pairs_broad_phase(np.asarray(verts, dtype=np.float64)[:, :2], edges, margin)
+        # the same order of pairs as in the loop "for i ...: for j < i ..."
+        pairs = pairs[np.lexsort((pairs[:, 0], pairs[:, 1]))]
+        pairs = pairs[(lengths[pairs[:, 0]] != 0) & (lengths[pairs[:, 1]] != 0)]
+    else:
+        pairs = np.zeros((0, 2), dtype=np.int64)
+
+    for j, i in pairs.tolist():
+        e, d = edges[i], ed_lengths[i]
+        e2, d2 = edges[j], ed_lengths[j]
         v1 = verts_in[e[0]]
         v2 = verts_in[e[1]]
-        if d == 0:
-            continue
-
-        for e2, d2, j in zip(edges, ed_lengths, range(len(edges))):
-
-            if i <= j or d2 == 0:
-                continue
-            if (e2[0] in e) or (e2[1] in e):
-                continue
-
-            v3 = verts_in[e2[0]]
-            v4 = verts_in[e2[1]]
-            vx = intersect_line_line_2d(v1, v2, v3, v4)
-            if vx:
-                d_to_1 = (vx - v1.to_2d()).length
-                d_to_2 = (vx - v3.to_2d()).length
-
-                new_id = len(verts_out)
-                if ((vx.x, vx.y, v1.z)) in verts_out:
-                    new_id = verts_out.index((vx.x, vx.y, v1.z))
+        v3 = verts_in[e2[0]]
+        v4 = verts_in[e2[1]]
+        vx = intersect_line_line_2d(v1, v2, v3, v4)
+        if vx:
+            d_to_1 = (vx - v1.to_2d()).length
+            d_to_2 = (vx - v3.to_2d()).length
+
+            new_co = (vx.x, vx.y, v1.z)
+            new_id = snap_index.find(new_co)
+            if new_id is None:
+                if d_to_1 < epsilon:
+                    new_id = e[0]
+                elif d_to_1 > d - epsilon:
+                    new_id = e[1]
+                elif d_to_2 < epsilon:
+                    new_id = e2[0]
+                elif d_to_2 > d2 - epsilon:
+                    new_id = e2[1]
                 else:
-                    if d_to_1 < epsilon:
-                        new_id = e[0]
-                    elif d_to_1 > d - epsilon:
-                        new_id = e[1]
-                    elif d_to_2 < epsilon:
-                        new_id = e2[0]
-                    elif d_to_2 > d2 - epsilon:
-                        new_id = e2[1]
-                    if new_id == len(verts_out):
-                        verts_out.append((vx.x, vx.y, v1.z))
-                
-                # first item stores distance to origin, second the vertex id
-                ed_inter[i].append([d_to_1, new_id])
-                ed_inter[j].append([d_to_2, new_id])
+                    new_id = len(verts_out)
+                    verts_out.append(new_co)
+                    snap_index.add(new_co, new_id)
 
+            # first item stores distance to origin, second the vertex id
+            ed_inter[i].append([d_to_1, new_id])
+            ed_inter[j].append([d_to_2, new_id])
 
     edges_out = edges_from_ed_inter(ed_inter)
 
@@ -11,6 +11,7 @@ from sverchok.dependencies import scipy
 
 if scipy is not None:
     from scipy.optimize import root_scalar, root
+    from scipy.spatial import cKDTree
 
 SKIP = 'skip'
 FAIL = 'fail'
@@ -134,6 +135,244 @@ def ortho_project_surface(src_point, surface, init_samples=10, maxiter=30, toler
 
     return u, v, point
 
+def nearest_sample_idxs(src_points, sample_points, chunk_size=1000):
+    """
+    For each of src_points, find the index of the nearest of sample_points.
+    Uses scipy's cKDTree, if available.
+    """
+    if scipy is not None:
+        _, idxs = cKDTree(sample_points).query(src_points)
+        return idxs
+    idxs = []
+    for i in range(0, len(src_points), chunk_size):
+        chunk = src_points[i : i + chunk_size]
+        distances = np.linalg.norm(chunk[:, np.newaxis] - sample_points[np.newaxis], axis=2)
+        idxs.append(distances.argmin(axis=1))
+    return np.concatenate(idxs) if idxs else np.zeros((0,), dtype=np.int64)
+
+# Max. number of step halvings in one Newton iteration,
+# when the step does not decrease the distance.
+MAX_HALVINGS = 10
+
+def _line_search(evaluate, src_points, points, distances, params, steps):
+    """
+    Make steps params - steps; where distance to the source point becomes larger,
+    halve the step. Returns new parameters, points, distances and a mask of
+    points where the distance could not be decreased.
+    """
+    new_params = params - steps
+    new_points = evaluate(new_params)
+    new_distances = np.linalg.norm(new_points - src_points, axis=1)
+    worse = new_distances > distances
+    for i in range(MAX_HALVINGS):
+        if not worse.any():
+            break
+        steps[worse] /= 2.0
+        new_params[worse] = params[worse] - steps[worse]
+        new_points[worse] = evaluate(new_params[worse])
+        new_distances[worse] = np.linalg.norm(new_points[worse] - src_points[worse], axis=1)
+        worse = new_distances > distances
+    new_params[worse] = params[worse]
+    new_points[worse] = points[worse]
+    new_distances[worse] = distances[worse]
+    return new_params, new_points, new_distances, worse
+
+def nearest_point_on_curve(src_points, curve, samples=50, precise=True, maxiter=30, tolerance=1e-9):
+    """
+    Find the nearest points on the curve for many points at once.
+    Initial guesses are the nearest of `samples` points evenly distributed
+    in the curve's T domain; then the Newton method is used to minimize the
+    distance, for all points at once.
+
+    inputs:
+    * src_points: np.array of shape (n, 3)
+    * curve: SvCurve
+    * samples: number of points to calculate initial guesses
+    * precise: if False, return initial guesses
+    * maxiter: maximum number of Newton iterations
+    * tolerance: tolerance of T parameter, relative to the curve's T domain
+
+    outputs: tuple:
+    * T values: np.array of shape (n,)
+    * points on the curve: np.array of shape (n, 3)
+    """
+    src_points = np.asarray(src_points, dtype=np.float64).reshape((-1, 3))
+    t_min, t_max = curve.get_u_bounds()
+    init_ts = np.linspace(t_min, t_max, num=samples)
+    init_points = curve.evaluate_array(init_ts)
+    idxs = nearest_sample_idxs(src_points, init_points)
+    ts = init_ts[idxs]
+    points = init_points[idxs]
+    if not precise:
+        return ts, points
+
+    def evaluate(ts):
+        return curve.evaluate_array(np.clip(ts, t_min, t_max))
+
+    distances = np.linalg.norm(points - src_points, axis=1)
+    active = np.ones(len(ts), dtype=bool)
+    tolerance = tolerance * (t_max - t_min)
+    for i in range(maxiter):
+        idxs = np.flatnonzero(active)
+        if len(idxs) == 0:
+            break
+        t = ts[idxs]
+        dv = points[idxs] - src_points[idxs]
+        first = curve.tangent_array(t)
+        second = curve.second_derivative_array(t)
+        tangent_sq = (first * first).sum(axis=1)
+        value = (dv * first).sum(axis=1)
+        derivative = tangent_sq + (dv * second).sum(axis=1)
+        # far from the minimum, second derivative of the distance can be negative;
+        # use Gauss-Newton step in such places.
+        derivative = np.where(derivative > 0, derivative, tangent_sq)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            steps = np.where(derivative > 0, value / derivative, 0.0)
+        steps = t - np.clip(t - steps, t_min, t_max)
+
+        new_t, new_points, new_distances, failed = _line_search(evaluate, src_points[idxs], points[idxs], distances[idxs], t, steps)
+        ts[idxs] = np.clip(new_t, t_min, t_max)
+        points[idxs] = new_points
+        distances[idxs] = new_distances
+        done = failed | (np.abs(new_t - t) < tolerance)
+        active[idxs[done]] = False
+
+    return ts, points
+
+def nearest_point_on_surface(src_points, surface, samples=10, precise=True, maxiter=100, tolerance=1e-9):
+    """
+    Find the nearest points on the surface for many points at once.
+    Initial guesses are the nearest of samples x samples grid of points in
+    the surface's UV space; then Gauss-Newton method is used to minimize the
+    distance, for all points at once.
+
+    inputs:
+    * src_points: np.array of shape (n, 3)
+    * surface: SvSurface
+    * samples: number of samples along U and V to calculate initial guesses
+    * precise: if False, return initial guesses
+    * maxiter: maximum number of iterations
+    * tolerance: tolerance of U and V parameters, relative to the surface's domain
+
+    outputs: tuple:
+    * U values: np.array of shape (n,)
+    * V values: np.array of shape (n,)
+    * points on the surface: np.array of shape (n, 3)
+    """
+    src_points = np.asarray(src_points, dtype=np.float64).reshape((-1, 3))
+    u_min, u_max = surface.get_u_min(), surface.get_u_max()
+    v_min, v_max = surface.get_v_min(), surface.get_v_max()
+    init_us, init_vs = np.meshgrid(np.linspace(u_min, u_max, num=samples),
+                                   np.linspace(v_min, v_max, num=samples))
+    init_us, init_vs = init_us.flatten(), init_vs.flatten()
+    init_points = surface.evaluate_array(init_us, init_vs)
+    idxs = nearest_sample_idxs(src_points, init_points)
+    us, vs = init_us[idxs], init_vs[idxs]
+    points = init_points[idxs]
+    if not precise:
+        return us, vs, points
+
+    lower = np.array([u_min, v_min])
+    upper = np.array([u_max, v_max])
+
+    def evaluate(uvs):
+        uvs = np.clip(uvs, lower, upper)
+        return surface.evaluate_array(uvs[:,0], uvs[:,1])
+
+    uvs = np.stack((us, vs), axis=-1)
+    distances = np.linalg.norm(points - src_points, axis=1)
+    active = np.ones(len(uvs), dtype=bool)
+    tolerance = tolerance * max(u_max - u_min, v_max - v_min)
+    for i in range(maxiter):
+        idxs = np.flatnonzero(active)
+        if len(idxs) == 0:
+            break
+        uv = uvs[idxs]
+        data = surface.derivatives_data_array(uv[:,0], uv[:,1])
+        du, dv = data.du, data.dv
+        residual = points[idxs] - src_points[idxs]
+        a = (du * du).sum(axis=1)
+        b = (du * dv).sum(axis=1)
+        c = (dv * dv).sum(axis=1)
+        gu = (du * residual).sum(axis=1)
+        gv = (dv * residual).sum(axis=1)
+        # solve 2x2 system [[a, b], [b, c]] * step = [gu, gv]
+        det = a*c - b*b
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step_u = np.where(det > 0, (c*gu - b*gv) / det, 0.0)
+            step_v = np.where(det > 0, (a*gv - b*gu) / det, 0.0)
+        # on the boundary of the domain, where the distance decreases outside,
+        # fix one of parameters and minimize along the other one
+        fix_u = ((uv[:,0] <= u_min) & (gu > 0)) | ((uv[:,0] >= u_max) & (gu < 0))
+        fix_v = ((uv[:,1] <= v_min) & (gv > 0)) | ((uv[:,1] >= v_max) & (gv < 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step_u = np.where(fix_v, np.where(a > 0, gu / a, 0.0), step_u)
+            step_v = np.where(fix_u, np.where(c > 0, gv / c, 0.0), step_v)
+        step_u[fix_u] = 0
+        step_v[fix_v] = 0
+        steps = np.stack((step_u, step_v), axis=-1)
+        steps = uv - np.clip(uv - steps, lower, upper)
+
+        new_uv, new_points, new_distances, failed = _line_search(evaluate, src_points[idxs], points[idxs], distances[idxs], uv, steps)
+        uvs[idxs] = np.clip(new_uv, lower, upper)
+        points[idxs] = new_points
+        distances[idxs] = new_distances
+        done = failed | (np.abs(new_uv - uv).max(axis=1) < tolerance)
+        active[idxs[done]] = False
+
+    return uvs[:,0], uvs[:,1], points
+
+def _is_orthogonal(dv, tangents, tolerance=1e-4):
+    dv_len = np.linalg.norm(dv, axis=1)
+    tangent_len = np.linalg.norm(tangents, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos = np.abs((dv * tangents).sum(axis=1)) / (dv_len * tangent_len)
+    return (dv_len < 1e-9) | (cos < tolerance)
+
+def ortho_project_curve_array(src_points, curve, init_samples=10):
+    """
+    Find the nearest orthogonal projections of many points onto the curve.
+    All points are processed by nearest_point_on_curve at once; for points,
+    for which it found a point which is not an orthogonal projection (for
+    example, the end of the curve), ortho_project_curve is used.
+
+    outputs: tuple:
+    * T values: list
+    * points on the curve: list of np.arrays of shape (3,)
+    """
+    src_points = np.asarray(src_points, dtype=np.float64).reshape((-1, 3))
+    ts, points = nearest_point_on_curve(src_points, curve, samples=max(50, init_samples))
+    tangents = curve.tangent_array(ts)
+    good = _is_orthogonal(src_points - points, tangents)
+    ts, points = ts.tolist(), list(points)
+    for i in np.flatnonzero(~good):
+        result = ortho_project_curve(src_points[i], curve, init_samples=init_samples)
+        ts[i] = result.nearest_u
+        points[i] = result.nearest
+    return ts, points
+
+def ortho_project_surface_array(src_points, surface, init_samples=10):
+    """
+    Find orthogonal projections of many points onto the surface.
+    All points are processed by nearest_point_on_surface at once; for points,
+    for which it found a point which is not an orthogonal projection (for
+    example, at the boundary of the surface), ortho_project_surface is used.
+
+    outputs: tuple:
+    * U values: list
+    * V values: list
+    * points on the surface: list of np.arrays of shape (3,)
+    """
+    src_points = np.asarray(src_points, dtype=np.float64).reshape((-1, 3))
+    us, vs, points = nearest_point_on_surface(src_points, surface, samples=init_samples)
+    data = surface.derivatives_data_array(us, vs)
+    dv = src_points - points
+    good = _is_orthogonal(dv, data.du) & _is_orthogonal(dv, data.dv)
+    us, vs, points = us.tolist(), vs.tolist(), list(points)
+    for i in np.flatnonzero(~good):
+        us[i], vs[i], points[i] = ortho_project_surface(src_points[i], surface, init_samples=init_samples)
+    return us, vs, points
+
 class RaycastResult(object):
     def __init__(self):
         self.init_us = None
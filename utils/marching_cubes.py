@@ -457,32 +457,85 @@ def cornerloop(x,y,z):
         for cy,cx in zip((0,y,y,0),(0,0,x,x)):
              yield cx,cy,cz
 
-def isosurface_np(data, isolevel):
-    triangles = []
-    z_a = 0
-    z_plane_a = data[:,:,z_a]
+# Corners of a cube, as offsets from its first corner, in the order used by edgetable and tritable
+cube_corners = [(0,0,0), (0,1,0), (1,1,0), (1,0,0), (0,0,1), (0,1,1), (1,1,1), (1,0,1)]
+# Edges of a cube: offset of the edge's lower end from cube's first corner, and axis of the edge
+cube_edges = [((0,0,0),1), ((0,1,0),0), ((1,0,0),1), ((0,0,0),0),
+              ((0,0,1),1), ((0,1,1),0), ((1,0,1),1), ((0,0,1),0),
+              ((0,0,0),2), ((0,1,0),2), ((1,1,0),2), ((1,0,0),2)]
+
+edgetable_np = np.array(edgetable, dtype=np.int64)
+tritable_np = np.array(tritable, dtype=np.int64)
+
+def isosurface_np(data, isolevel, slab_size=32):
+    """
+    Marching cubes over a 3D array of values of shape (sx, sy, sz).
+    All cubes are processed at once with numpy, in slabs of slab_size
+    layers along Z axis to limit size of temporary arrays.
+    Each grid edge is identified by integer id, so vertices on edges which
+    are shared by adjacent cubes are created only once.
+
+    Returns an array of vertices (in grid index coordinates) of shape (n, 3)
+    and a list of triangles. Vertices and triangles go in the same order as if
+    cubes were processed one by one, X changing fastest.
+    """
+    data = np.asarray(data, dtype=np.float64)
     sx, sy, sz = data.shape
+    edge_ids = []
+    triangle_ids = []
+    for z_min in range(0, sz-1, slab_size):
+        z_max = min(z_min + slab_size, sz-1)
+        nz = z_max - z_min
+        below = data[:, :, z_min : z_max+1] < isolevel
+        cubeindex = np.zeros((sx-1, sy-1, nz), dtype=np.int64)
+        for bit, (dx, dy, dz) in enumerate(cube_corners):
+            cubeindex |= below[dx : dx+sx-1, dy : dy+sy-1, dz : dz+nz].astype(np.int64) << bit
+
+        # Only cubes crossed by the surface; np.nonzero returns them with X changing fastest.
+        zs, ys, xs = np.nonzero(edgetable_np[cubeindex.transpose((2,1,0))])
+        cubeindex = cubeindex[xs, ys, zs]
+        zs = zs + z_min
+
+        ids = np.empty((len(cubeindex), 12), dtype=np.int64)
+        for i, ((dx, dy, dz), axis) in enumerate(cube_edges):
+            point = ((xs + dx) * sy + (ys + dy)) * sz + (zs + dz)
+            ids[:, i] = point * 3 + axis
+        crossed = ((edgetable_np[cubeindex][:, np.newaxis] >> np.arange(12)) & 1).astype(bool)
+        edge_ids.append(ids[crossed])
+
+        triangles = tritable_np[cubeindex]
+        good = triangles != -1
+        cube_idxs = np.broadcast_to(np.arange(len(cubeindex))[:, np.newaxis], triangles.shape)
+        triangle_ids.append(ids[cube_idxs[good], triangles[good]])
+
+    if not edge_ids:
+        return np.zeros((0, 3)), []
+    edge_ids = np.concatenate(edge_ids)
+    triangle_ids = np.concatenate(triangle_ids)
+    if len(edge_ids) == 0:
+        return np.zeros((0, 3)), []
+
+    # Number vertices in order of first appearance of edges
+    unique_ids, first_idxs = np.unique(edge_ids, return_index=True)
+    order = np.argsort(first_idxs)
+    vertex_idxs = np.empty_like(order)
+    vertex_idxs[order] = np.arange(len(order))
+    triangles = vertex_idxs[np.searchsorted(unique_ids, triangle_ids)].reshape((-1, 3))
+
+    edges = unique_ids[order]
+    axes = edges % 3
+    points = edges // 3
+    p1 = np.stack((points // (sy * sz), (points // sz) % sy, points % sz), axis=-1)
+    p2 = p1 + np.eye(3, dtype=np.int64)[axes]
+    v1 = data[p1[:,0], p1[:,1], p1[:,2]]
+    v2 = data[p2[:,0], p2[:,1], p2[:,2]]
 
-    polygoniser = Polygoniser(isolevel)
-    for z in range(sz-1):
-        z2 = z+1
-        z_plane_b = data[:,:,z2]
-        for y in range(sy-1):
-            y2 = y+1
-            for x in range(sx-1):
-                x2 = x+1
-                cornervalues = [
-                    z_plane_a[x][y],
-                    z_plane_a[x][y+1],
-                    z_plane_a[x+1][y+1],
-                    z_plane_a[x+1][y],
-                    z_plane_b[x][y],
-                    z_plane_b[x][y+1],
-                    z_plane_b[x+1][y+1],
-                    z_plane_b[x+1][y],
-                ]
-                triangles.extend(polygoniser.polygonise(cornervalues, x,y,z, x2, y2, z2))
-        z_plane_a = z_plane_b
-
-    return np.array(polygoniser.vertices), triangles
+    # Same as vertexinterp()
+    at_p2 = (np.abs(isolevel - v1) >= 0.00001) & (np.abs(isolevel - v2) < 0.00001)
+    interpolate = (np.abs(isolevel - v1) >= 0.00001) & ~at_p2 & (np.abs(v1 - v2) >= 0.00001)
+    mu = np.zeros(len(edges))
+    mu[at_p2] = 1.0
+    mu[interpolate] = (isolevel - v1[interpolate]) / (v2[interpolate] - v1[interpolate])
+    vertices = p1 + mu[:, np.newaxis] * (p2 - p1)
 
+    return vertices, triangles.tolist()
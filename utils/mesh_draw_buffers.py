@@ -0,0 +1,378 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+"""
+Preparation of vertex, color and index buffers for drawing meshes
+in the 3D viewport (see Viewer Draw node).
+
+Everything here is done with NumPy on CPU side and does not require GPU,
+so the buffers can be built and tested without a viewport; only the
+final batch_for_shader call needs it.
+
+Buffers of each object drawn by a node are cached together with a
+fingerprint of its input data, so when one of many objects changes,
+only that object is rebuilt.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from mathutils.geometry import tessellate_polygon
+from mathutils.noise import random
+
+from sverchok.utils.blender_mesh import flatten_faces
+
+# Maximum total size of buffers kept in the cache, in bytes
+draw_buffers_cache_bytes = 512 * 2**20
+
+
+def face_starts(loop_total):
+    return np.cumsum(loop_total) - loop_total
+
+def face_normals(verts, loop_vertex, loop_total):
+    """
+    Normals of faces, calculated by Newell's method (as mathutils.geometry.normal does).
+    Faces are given as flat arrays (see sverchok.utils.blender_mesh.flatten_faces).
+    Returns np.array of shape (n_faces, 3); normals of degenerated faces are zero.
+    """
+    normals = np.zeros((len(loop_total), 3))
+    has_loops = loop_total > 0
+    if not np.any(has_loops):
+        return normals
+    starts = face_starts(loop_total)
+    next_loop = np.arange(1, len(loop_vertex) + 1)
+    next_loop[starts[has_loops] + loop_total[has_loops] - 1] = starts[has_loops]
+    crosses = np.cross(verts[loop_vertex], verts[loop_vertex[next_loop]])
+    normals[has_loops] = np.add.reduceat(crosses, starts[has_loops], axis=0)
+    lengths = np.linalg.norm(normals, axis=1)
+    nonzero = lengths > 0
+    normals[nonzero] /= lengths[nonzero, np.newaxis]
+    return normals
+
+def vertex_normals(verts, loop_vertex, loop_total, normals=None):
+    """
+    Normals of vertices: face normals weighted by corner angles, as BMesh
+    calculates them. Normals of loose vertices are directed from the origin.
+    """
+    if normals is None:
+        normals = face_normals(verts, loop_vertex, loop_total)
+    result = np.zeros((len(verts), 3))
+    if len(loop_vertex):
+        starts = face_starts(loop_total)
+        face_idx = np.repeat(np.arange(len(loop_total)), loop_total)
+        local = np.arange(len(loop_vertex)) - starts[face_idx]
+        totals = loop_total[face_idx]
+        prev_loop = starts[face_idx] + (local - 1) % totals
+        next_loop = starts[face_idx] + (local + 1) % totals
+        co = verts[loop_vertex]
+        to_prev = verts[loop_vertex[prev_loop]] - co
+        to_next = verts[loop_vertex[next_loop]] - co
+        lengths = np.linalg.norm(to_prev, axis=1) * np.linalg.norm(to_next, axis=1)
+        cos = np.einsum('ij,ij->i', to_prev, to_next) / np.where(lengths > 0, lengths, 1.0)
+        angles = np.where(lengths > 0, np.arccos(np.clip(cos, -1.0, 1.0)), 0.0)
+        weighted = normals[face_idx] * angles[:, np.newaxis]
+        for i in range(3):
+            result[:, i] = np.bincount(loop_vertex, weights=weighted[:, i], minlength=len(verts))
+    lengths = np.linalg.norm(result, axis=1)
+    loose = np.ones(len(verts), dtype=bool)
+    loose[loop_vertex] = False
+    result[loose] = verts[loose]
+    lengths[loose] = np.linalg.norm(verts[loose], axis=1)
+    nonzero = lengths > 0
+    result[nonzero] /= lengths[nonzero, np.newaxis]
+    return result
+
+def _convex_mask(corners_co):
+    """
+    For polygons of the same size (array of shape (n, size, 3)),
+    check if each of them is convex.
+    """
+    edges = np.roll(corners_co, -1, axis=1) - corners_co
+    turns = np.cross(edges, np.roll(edges, -1, axis=1))
+    normals = np.cross(corners_co, np.roll(corners_co, -1, axis=1)).sum(axis=1)
+    dots = np.einsum('fkj,fj->fk', turns, normals)
+    tolerance = 1e-9 * np.linalg.norm(turns, axis=2) * np.linalg.norm(normals, axis=1)[:, np.newaxis]
+    return np.all(dots >= -tolerance, axis=1)
+
+def triangulate(verts, loop_vertex, loop_total, handle_concave_quads=False):
+    """
+    Split faces into triangles. Faces are processed in groups of the same
+    size: triangles and quads are split into fans (quads are checked for
+    convexity only if handle_concave_quads is True); convex n-gons are split
+    into fans as well, and concave ones are tessellated one by one.
+
+    Returns np.array of triangles of shape (n, 3) and np.array of
+    indices of faces which triangles belong to; triangles are sorted by faces.
+    """
+    starts = face_starts(loop_total)
+    tris, face_idx = [], []
+    for size in np.unique(loop_total).tolist():
+        if size < 3:
+            continue
+        faces = np.flatnonzero(loop_total == size)
+        corners = loop_vertex[starts[faces, np.newaxis] + np.arange(size)]
+        if size == 3 or (size == 4 and not handle_concave_quads):
+            convex = np.ones(len(faces), dtype=bool)
+        else:
+            convex = _convex_mask(verts[corners])
+
+        fan = np.stack([np.zeros(size - 2, dtype=np.int64), np.arange(1, size - 1), np.arange(2, size)], axis=-1)
+        tris.append(corners[convex][:, fan].reshape((-1, 3)))
+        face_idx.append(np.repeat(faces[convex], size - 2))
+
+        for face, face_corners in zip(faces[~convex].tolist(), corners[~convex]):
+            face_tris = np.array(tessellate_polygon([verts[face_corners].tolist()]), dtype=np.int64).reshape((-1, 3))
+            tris.append(face_corners[face_tris])
+            face_idx.append(np.full(len(face_tris), face, dtype=np.int64))
+
+    if not tris:
+        return np.zeros((0, 3), dtype=np.int64), np.zeros(0, dtype=np.int64)
+    tris = np.concatenate(tris)
+    face_idx = np.concatenate(face_idx)
+    order = np.argsort(face_idx, kind='stable')
+    return tris[order], face_idx[order]
+
+def faces_to_edges(loop_vertex, loop_total):
+    """Unique edges of faces, given as flat arrays."""
+    if len(loop_vertex) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    starts = face_starts(loop_total)
+    next_loop = np.arange(1, len(loop_vertex) + 1)
+    has_loops = loop_total > 0
+    next_loop[starts[has_loops] + loop_total[has_loops] - 1] = starts[has_loops]
+    edges = np.sort(np.stack((loop_vertex, loop_vertex[next_loop]), axis=-1), axis=1).astype(np.int64)
+    # np.unique of 1D keys is much faster than np.unique(axis=0)
+    n_verts = int(edges.max()) + 1
+    keys = np.unique(edges[:, 0] * n_verts + edges[:, 1])
+    return np.stack(np.divmod(keys, n_verts), axis=-1)
+
+def _colors(colors):
+    return np.asarray(colors, dtype=np.float32).reshape((-1, 4))
+
+def _shade(colors, normals, light):
+    """Multiply RGB components of colors by light factor of normals."""
+    colors = colors.copy()
+    colors[..., :3] *= (normals @ light * 0.5 + 0.5)[..., np.newaxis]
+    return colors
+
+def fill_points_colors(vector_color, counts, color_per_point, random_colors):
+    """
+    Colors of vertices of all objects, np.array of shape (sum(counts), 4).
+    * vector_color: list of lists of colors. If color_per_point is True,
+      i'th list is cycled over vertices of i'th object, otherwise colors of
+      the first list are cycled over objects.
+    * counts: numbers of vertices of objects.
+    * random_colors: generate random color per vertex or per object (with
+      mathutils.noise.random, so it respects seed_set).
+    """
+    colors = []
+    for i, count in enumerate(counts):
+        if random_colors:
+            n = count if color_per_point else 1
+            object_colors = np.array([[random(), random(), random(), 1] for _ in range(n)], dtype=np.float32).reshape((-1, 4))
+        elif color_per_point:
+            object_colors = _colors(vector_color[i % len(vector_color)])
+        else:
+            object_colors = _colors(vector_color[0])[i % len(vector_color[0])][np.newaxis]
+        if count and len(object_colors):
+            colors.append(np.resize(object_colors, (count, 4)))
+    if not colors:
+        return np.zeros((0, 4), dtype=np.float32)
+    return np.concatenate(colors)
+
+def object_buffers(config, verts, edges, faces, matrix=None, points_color=None, poly_colors=None, edge_colors=None):
+    """
+    Build drawing buffers of one object. Indices in the result are local
+    to the object's own vertex buffers; concatenate_buffers shifts them.
+
+    * config: drawing settings of Viewer Draw node (draw_edges, draw_polys,
+      shade_mode, color_per_edge, color_per_polygon, edges_use_vertex_color,
+      polygon_use_vertex_color, handle_concave_quads, vector_light).
+    * verts, edges, faces: mesh data; if edges is None, edges of faces are used.
+    * matrix: optional 4x4 matrix to be applied to vertices.
+    * points_color: colors of vertices, np.array of shape (n, 4).
+    * poly_colors, edge_colors: colors cycled over polygons / edges; if
+      colors are per object, only the first of them is used.
+    """
+    loop_vertex, loop_total = flatten_faces(faces)
+    return _object_buffers(config, verts, edges, loop_vertex, loop_total, matrix, points_color, poly_colors, edge_colors)
+
+def _object_buffers(config, verts, edges, loop_vertex, loop_total, matrix, points_color, poly_colors, edge_colors):
+    verts = np.asarray(verts, dtype=np.float64).reshape((-1, 3))
+    if matrix is not None:
+        matrix = np.array(matrix, dtype=np.float64)
+        verts = verts @ matrix[:3, :3].T + matrix[:3, 3]
+    loop_vertex = loop_vertex.astype(np.int64)
+    n_verts = len(verts)
+    if points_color is None:
+        points_color = np.zeros((n_verts, 4), dtype=np.float32)
+
+    buffers = dict(v_vertices=verts.astype(np.float32))
+
+    if config.draw_edges:
+        if edges is None:
+            edges = faces_to_edges(loop_vertex, loop_total)
+        edges = np.asarray(edges, dtype=np.int64).reshape((-1, 2))
+        edge_colors = _colors(edge_colors)
+        if config.color_per_edge and not config.edges_use_vertex_color:
+            buffers['e_vertices'] = verts[edges].reshape((-1, 3))
+            buffers['e_colors'] = np.repeat(edge_colors[np.arange(len(edges)) % len(edge_colors)], 2, axis=0)
+            buffers['e_indices'] = np.arange(2 * len(edges)).reshape((-1, 2))
+        else:
+            buffers['e_vertices'] = verts
+            if config.edges_use_vertex_color:
+                buffers['e_colors'] = points_color
+            else:
+                buffers['e_colors'] = np.repeat(edge_colors[:1], n_verts, axis=0)
+            buffers['e_indices'] = edges
+
+    if config.draw_polys:
+        poly_colors = _colors(poly_colors)
+        light = np.array(config.vector_light, dtype=np.float32)
+        tris, face_idx = triangulate(verts, loop_vertex, loop_total, config.handle_concave_quads)
+        if (config.color_per_polygon and not config.polygon_use_vertex_color) or config.shade_mode == 'facet':
+            # each triangle has its own vertices, so they can have colors of the face
+            buffers['p_vertices'] = verts[tris].reshape((-1, 3))
+            buffers['p_indices'] = np.arange(3 * len(tris)).reshape((-1, 3))
+            if config.shade_mode == 'facet':
+                normals = face_normals(verts, loop_vertex, loop_total).astype(np.float32)
+                if config.polygon_use_vertex_color:
+                    colors = points_color[tris]
+                else:
+                    colors = np.repeat(poly_colors[face_idx % len(poly_colors)][:, np.newaxis], 3, axis=1)
+                colors = _shade(colors, normals[face_idx][:, np.newaxis], light)
+            elif config.shade_mode == 'smooth':
+                normals = vertex_normals(verts, loop_vertex, loop_total).astype(np.float32)
+                colors = np.repeat(poly_colors[face_idx % len(poly_colors)][:, np.newaxis], 3, axis=1)
+                colors = _shade(colors, normals[tris], light)
+            else:
+                colors = np.repeat(poly_colors[face_idx % len(poly_colors)], 3, axis=0)
+            buffers['p_colors'] = colors.reshape((-1, 4))
+        else:
+            buffers['p_vertices'] = verts
+            buffers['p_indices'] = tris
+            if config.polygon_use_vertex_color:
+                colors = points_color
+            else:
+                colors = np.repeat(poly_colors[:1], n_verts, axis=0)
+            if config.shade_mode == 'smooth':
+                normals = vertex_normals(verts, loop_vertex, loop_total).astype(np.float32)
+                colors = _shade(colors, normals, light)
+            buffers['p_colors'] = colors
+
+    return buffers
+
+
+def _fingerprint(config, arrays):
+    digest = hashlib.blake2b(digest_size=16)
+    settings = (config.draw_edges, config.draw_polys, config.shade_mode, config.color_per_edge,
+                config.color_per_polygon, config.edges_use_vertex_color, config.polygon_use_vertex_color,
+                config.handle_concave_quads, tuple(config.vector_light))
+    digest.update(repr(settings).encode())
+    for array in arrays:
+        if array is None:
+            digest.update(b'None')
+        else:
+            array = np.ascontiguousarray(array)
+            digest.update(repr((array.dtype.str, array.shape)).encode())
+            digest.update(array.view(np.uint8))
+    return digest.digest()
+
+def _buffers_size(buffers):
+    return sum(array.nbytes for array in buffers.values())
+
+# (node id, index of object) -> (fingerprint, buffers, size)
+_buffers_cache = OrderedDict()
+_buffers_cache_size = 0
+_buffers_cache_lock = threading.Lock()
+
+def get_object_buffers(config, verts, edges, faces, matrix=None, points_color=None, poly_colors=None, edge_colors=None,
+                       slot=None):
+    """
+    The same as object_buffers, but results are cached.
+    slot is a pair (node id, index of object). One entry is kept per slot,
+    it is reused while the fingerprint of input data is the same.
+    Without slot nothing is cached.
+    """
+    global _buffers_cache_size
+    loop_vertex, loop_total = flatten_faces(faces)
+    arrays = (np.asarray(verts, dtype=np.float64),
+              None if edges is None else np.asarray(edges, dtype=np.int64),
+              loop_vertex, loop_total,
+              None if matrix is None else np.array(matrix, dtype=np.float64),
+              points_color,
+              None if poly_colors is None else _colors(poly_colors),
+              None if edge_colors is None else _colors(edge_colors))
+    if slot is None:
+        return _object_buffers(config, arrays[0], edges, loop_vertex, loop_total, matrix, points_color, poly_colors, edge_colors)
+    fingerprint = _fingerprint(config, arrays)
+    with _buffers_cache_lock:
+        item = _buffers_cache.get(slot)
+        if item is not None and item[0] == fingerprint:
+            _buffers_cache.move_to_end(slot)
+            return item[1]
+    buffers = _object_buffers(config, arrays[0], edges, loop_vertex, loop_total, matrix, points_color, poly_colors, edge_colors)
+    size = _buffers_size(buffers)
+    with _buffers_cache_lock:
+        item = _buffers_cache.pop(slot, None)
+        if item is not None:
+            _buffers_cache_size -= item[2]
+        if size <= draw_buffers_cache_bytes:
+            _buffers_cache[slot] = (fingerprint, buffers, size)
+            _buffers_cache_size += size
+            while _buffers_cache_size > draw_buffers_cache_bytes:
+                _, (_, _, old_size) = _buffers_cache.popitem(last=False)
+                _buffers_cache_size -= old_size
+    return buffers
+
+def clear_draw_buffers_cache(node_id=None):
+    """Forget cached buffers of the node with given id, or of all nodes"""
+    global _buffers_cache_size
+    with _buffers_cache_lock:
+        if node_id is None:
+            _buffers_cache.clear()
+            _buffers_cache_size = 0
+            return
+        for slot in [slot for slot in _buffers_cache if slot[0] == node_id]:
+            _buffers_cache_size -= _buffers_cache.pop(slot)[2]
+
+def concatenate_buffers(buffers_list):
+    """
+    Join buffers of several objects into ones, which can be passed to
+    batch_for_shader: float32 vertices and colors, int32 indices.
+    Returns dictionary with the same keys as object_buffers.
+    """
+    result = dict()
+    keys = set()
+    for buffers in buffers_list:
+        keys.update(buffers.keys())
+
+    def join(key, dtype, shape):
+        arrays = [buffers[key] for buffers in buffers_list if key in buffers]
+        if not arrays:
+            return np.zeros(shape, dtype=dtype)
+        return np.ascontiguousarray(np.concatenate(arrays), dtype=dtype)
+
+    result['v_vertices'] = join('v_vertices', np.float32, (0, 3))
+    for prefix in ('e', 'p'):
+        if f'{prefix}_vertices' not in keys:
+            continue
+        counts = [len(buffers[f'{prefix}_vertices']) for buffers in buffers_list if f'{prefix}_vertices' in buffers]
+        offsets = np.cumsum(counts) - counts
+        size = 2 if prefix == 'e' else 3
+        indices = [buffers[f'{prefix}_indices'] + offset
+                   for buffers, offset in zip((b for b in buffers_list if f'{prefix}_vertices' in b), offsets)]
+        result[f'{prefix}_vertices'] = join(f'{prefix}_vertices', np.float32, (0, 3))
+        result[f'{prefix}_colors'] = join(f'{prefix}_colors', np.float32, (0, 4))
+        if indices:
+            result[f'{prefix}_indices'] = np.ascontiguousarray(np.concatenate(indices), dtype=np.int32)
+        else:
+            result[f'{prefix}_indices'] = np.zeros((0, size), dtype=np.int32)
+    return result
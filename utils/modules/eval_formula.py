@@ -17,6 +17,11 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import ast
+import sys
+from functools import lru_cache
+from math import erf, erfc, gamma, lgamma, factorial, e, pi
+
+import numpy as np
 
 from sverchok.utils.script_importhelper import safe_names
 from sverchok.utils import logging
@@ -119,6 +124,13 @@ def sv_compile(string):
         logging.exception(e)
         raise Exception("Invalid expression syntax: " + str(e))
 
+@lru_cache(maxsize=256)
+def sv_compile_cached(string):
+    """
+    The same as sv_compile, but each formula string is parsed and compiled only once.
+    """
+    return sv_compile(string)
+
 def safe_eval_compiled(compiled, variables, allowed_names = None):
     """
     Evaluate expression, allowing only functions known to be "safe"
@@ -142,14 +154,162 @@ def safe_eval(string, variables):
     Evaluate expression, allowing only functions known to be "safe"
     to be used.
     """
-    try:
-        env = dict()
-        env.update(safe_names)
-        env.update(variables)
-        env["__builtins__"] = {}
-        root = ast.parse(string, mode='eval')
-        return eval(compile(root, "<expression>", 'eval'), env)
-    except SyntaxError as e:
-        logging.exception(e)
-        raise Exception("Invalid expression syntax: " + str(e))
+    return safe_eval_compiled(sv_compile_cached(string), variables)
+
+def _elementwise(function):
+    return lambda a: np.array([function(x) for x in np.asarray(a).flat])
+
+def _to_int(function):
+    return lambda a: function(a).astype(np.int64)
+
+# Functions which can be applied to whole numpy arrays,
+# giving the same results as functions from safe_names applied to each element.
+# name -> (implementation, number of arguments)
+vectorized_functions = {
+        'acos': (np.arccos, 1), 'acosh': (np.arccosh, 1),
+        'asin': (np.arcsin, 1), 'asinh': (np.arcsinh, 1),
+        'atan': (np.arctan, 1), 'atanh': (np.arctanh, 1),
+        'atan2': (np.arctan2, 2),
+        'cos': (np.cos, 1), 'cosh': (np.cosh, 1),
+        'sin': (np.sin, 1), 'sinh': (np.sinh, 1),
+        'tan': (np.tan, 1), 'tanh': (np.tanh, 1),
+        'degrees': (np.degrees, 1), 'radians': (np.radians, 1),
+        'exp': (np.exp, 1), 'expm1': (np.expm1, 1),
+        'log': (np.log, 1), 'log10': (np.log10, 1), 'log1p': (np.log1p, 1), 'log2': (np.log2, 1),
+        'sqrt': (np.sqrt, 1), 'pow': (np.power, 2),
+        'fabs': (np.fabs, 1), 'abs': (np.abs, 1),
+        'ceil': (_to_int(np.ceil), 1), 'floor': (_to_int(np.floor), 1), 'trunc': (_to_int(np.trunc), 1),
+        'sign': (_to_int(np.sign), 1),
+        'copysign': (np.copysign, 2), 'fmod': (np.fmod, 2),
+        'hypot': (np.hypot, 2), 'ldexp': (np.ldexp, 2),
+        'isfinite': (np.isfinite, 1), 'isinf': (np.isinf, 1), 'isnan': (np.isnan, 1),
+        'erf': (_elementwise(erf), 1), 'erfc': (_elementwise(erfc), 1),
+        'gamma': (_elementwise(gamma), 1), 'lgamma': (_elementwise(lgamma), 1),
+        'factorial': (_elementwise(factorial), 1)
+    }
+
+vectorized_names = {name: function for name, (function, _) in vectorized_functions.items()}
+vectorized_names['e'] = e
+vectorized_names['pi'] = pi
+
+class VectorizationChecker(ast.NodeVisitor):
+    """
+    Visitor class to check if the expression consists only of elementwise operations,
+    i.e. it can be evaluated over numpy arrays giving the same result as evaluation
+    for each element separately.
+    Conditional expressions, boolean operators, chained comparisons, subscripts,
+    attributes, comprehensions etc are not considered vectorizable.
+    """
+    allowed_nodes = (
+            ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load, ast.Call,
+            ast.Compare,
+            ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+            ast.USub, ast.UAdd,
+            ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE
+        )
+    if sys.version_info < (3, 8):
+        # Python 3.7 (Blender 2.8x) parses literals into these node types
+        allowed_nodes += (ast.Num, ast.Str, ast.NameConstant)
+
+    def __init__(self):
+        self.is_vectorizable = True
+        self.uses_pow = False
 
+    def generic_visit(self, node):
+        if not isinstance(node, self.allowed_nodes):
+            self.is_vectorizable = False
+            return
+        super().generic_visit(node)
+
+    def visit_Constant(self, node):
+        if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+            self.is_vectorizable = False
+
+    def visit_Num(self, node):
+        if not isinstance(node.n, (int, float)):
+            self.is_vectorizable = False
+
+    def visit_Str(self, node):
+        self.is_vectorizable = False
+
+    def visit_NameConstant(self, node):
+        # True, False or None
+        self.is_vectorizable = False
+
+    def visit_Name(self, node):
+        if node.id in safe_names and node.id not in vectorized_names:
+            self.is_vectorizable = False
+
+    def visit_Compare(self, node):
+        if len(node.ops) != 1:
+            self.is_vectorizable = False
+            return
+        self.generic_visit(node)
+
+    def visit_BinOp(self, node):
+        if isinstance(node.op, ast.Pow):
+            self.uses_pow = True
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            self.is_vectorizable = False
+            return
+        function = vectorized_functions.get(node.func.id)
+        if function is None or function[1] != len(node.args):
+            self.is_vectorizable = False
+            return
+        if node.func.id == 'pow':
+            self.uses_pow = True
+        for arg in node.args:
+            self.visit(arg)
+
+@lru_cache(maxsize=256)
+def sv_compile_vectorized(string):
+    """
+    Compile formula for evaluation over whole numpy arrays.
+    Returns a tuple (compiled code, True if formula uses raising to power),
+    or None if the formula can not be evaluated in vectorized way.
+    """
+    string = string.strip()
+    if not string:
+        return None
+    root = ast.parse(string, mode='eval')
+    checker = VectorizationChecker()
+    checker.visit(root)
+    if not checker.is_vectorizable:
+        return None
+    return compile(root, "<expression>", 'eval'), checker.uses_pow
+
+def safe_eval_vectorized(string, variables):
+    """
+    Evaluate formula for all elements of one-dimensional numpy arrays at once.
+    variables: dictionary of variable name -> array; all arrays must have the same length.
+    Returns array of results (or a scalar, if the result does not depend on variables).
+    Returns None if the formula or the data do not allow vectorized evaluation,
+    or if the evaluation meets something which the scalar evaluation would
+    handle differently (division by zero, invalid values, integer powers) -
+    in such cases safe_eval should be used for each element.
+    """
+    compiled = sv_compile_vectorized(string)
+    if compiled is None:
+        return None
+    code, uses_pow = compiled
+    env = dict()
+    env.update(vectorized_names)
+    for name, values in variables.items():
+        if name not in code.co_names:
+            continue
+        values = np.asarray(values)
+        if values.ndim != 1 or values.dtype.kind not in 'biuf':
+            return None
+        if uses_pow and values.dtype.kind != 'f':
+            # python integers have arbitrary precision, numpy integers do not
+            return None
+        env[name] = values
+    env["__builtins__"] = {}
+    try:
+        with np.errstate(all='raise'):
+            return eval(code, env)
+    except (FloatingPointError, ArithmeticError, ValueError, TypeError):
+        return None
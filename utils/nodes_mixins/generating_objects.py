@@ -17,7 +17,7 @@ from mathutils import Matrix
 
 from sverchok.data_structure import updateNode, update_with_kwargs, numpy_full_list, repeat_last
 from sverchok.utils.handle_blender_data import correct_collection_length, delete_data_block
-from sverchok.utils.sv_bmesh_utils import empty_bmesh, add_mesh_to_bmesh
+from sverchok.utils.blender_mesh import flatten_faces, topology_fingerprint, write_mesh
 
 
 class SvObjectData(bpy.types.PropertyGroup):
@@ -170,13 +170,20 @@ class BlenderObjects:
 
 class SvMeshData(bpy.types.PropertyGroup):
     mesh: bpy.props.PointerProperty(type=bpy.types.Mesh, options={'SKIP_SAVE'})
+    # fingerprint of topology which was written to the mesh last time, see topology_fingerprint
+    topology: bpy.props.StringProperty(options={'SKIP_SAVE'})
+    # numbers of vertices, edges and faces of the mesh after the topology was written,
+    # Blender can add edges of faces and remove invalid elements
+    mesh_size: bpy.props.IntVectorProperty(size=3, options={'SKIP_SAVE'})
 
     def regenerate_mesh(self, mesh_name: str, verts, edges=None, faces=None, matrix: Matrix = None,
                         make_changes_test=True):
         """
         It takes vertices, edges and faces and updates mesh data block
-        If it assume that topology is unchanged only position of vertices will be changed
-        In this case it will be more efficient if vertices are given in np.array float32 format
+        If topology is unchanged only position of vertices will be changed
+        Mesh elements are written with foreach_set, so np.array input is the fastest one
+        Duplicated and degenerated faces are silently removed by Mesh.validate
+        (the former bmesh based version raised an error on them)
         Can apply matrix to mesh optionally
         """
         if edges is None:
@@ -187,16 +194,21 @@ class SvMeshData(bpy.types.PropertyGroup):
         if not self.mesh:
             # new mesh should be created
             self.mesh = bpy.data.meshes.new(name=mesh_name)
-        if not make_changes_test or self.is_topology_changed(verts, edges, faces):
-            with empty_bmesh(False) as bm:
-                add_mesh_to_bmesh(bm, verts, edges, faces, update_indexes=False, update_normals=False)
-                if matrix:
-                    bm.transform(matrix)
-                bm.to_mesh(self.mesh)
+
+        verts = np.asarray(verts, dtype=np.float32).reshape((-1, 3))
+        if matrix:
+            matrix = np.array(matrix, dtype=np.float32)
+            verts = verts @ matrix[:3, :3].T + matrix[:3, 3]
+        edges = np.asarray(edges, dtype=np.int32).reshape((-1, 2))
+        loop_vertex, loop_total = flatten_faces(faces)
+        topology = topology_fingerprint(len(verts), edges, loop_vertex, loop_total)
+
+        if not make_changes_test or self.is_topology_changed(topology):
+            write_mesh(self.mesh, verts, edges, loop_vertex, loop_total)
+            self.topology = topology
+            self.mesh_size = self.get_mesh_size()
         else:
             self.update_vertices(verts)
-            if matrix:
-                self.mesh.transform(matrix)
         self.mesh.update()
 
     def set_smooth(self, is_smooth_mesh):
@@ -207,29 +219,27 @@ class SvMeshData(bpy.types.PropertyGroup):
             is_smooth = np.zeros(len(self.mesh.polygons), dtype=bool)
         self.mesh.polygons.foreach_set('use_smooth', is_smooth)
 
-    def is_topology_changed(self, verts: list, edges: list, faces: list) -> bool:
+    def is_topology_changed(self, topology: str) -> bool:
         """
-        Simple and fast test but not 100% robust.
-        If number of vertices and faces are unchanged it assumes that topology is not changed
-        This test is useful if mesh just changed its location.
+        Compare fingerprint of new topology with one written to the mesh last time
+        Mesh could be edited by user, so numbers of its elements are checked as well
         It is much faster just set new coordinate for each vector then recreate whole object
         """
-        if not faces:
-            # edges can be take in account if mesh does not have polygons
-            # because Sverchok edges can exclude edges within polygons
-            return len(self.mesh.vertices) != len(verts) or len(self.mesh.edges) != len(edges)
-        else:
-            number_is_changed = len(self.mesh.vertices) != len(verts) or len(self.mesh.polygons) != len(faces)
-            # check several polygons indexes
-            are_polygons_changed = any([list(p.vertices) != f for _, p, f in zip(range(5), self.mesh.polygons, faces)])
-            return number_is_changed or are_polygons_changed
+        if topology != self.topology:
+            return True
+        n_verts = int(topology.split(':', 1)[0])
+        return len(self.mesh.vertices) != n_verts or self.get_mesh_size() != tuple(self.mesh_size)
+
+    def get_mesh_size(self) -> tuple:
+        """Numbers of vertices, edges and faces of the mesh"""
+        return len(self.mesh.vertices), len(self.mesh.edges), len(self.mesh.polygons)
 
     def update_vertices(self, verts: Union[list, np.ndarray]):
         """
         Just update position of mesh vertices, order and number of given vertices should be the same as mesh
         numpy array with float32 type will be 10 times faster than any other input data
         """
-        verts = np.array(verts, dtype=np.float32)  # todo will be this fast if it is already array float 32?
+        verts = np.asarray(verts, dtype=np.float32)
         self.mesh.vertices.foreach_set('co', np.ravel(verts))
 
     def remove_data(self):
@@ -117,6 +117,98 @@ class SvNurbsBasisFunctions(object):
         self.knotvector = np.array(knotvector)
         self._cache = dict()
 
+    def find_spans(self, ts):
+        """
+        Indexes of knot spans [u_i, u_{i+1}) containing parameter values.
+        The last point of the knotvector belongs to the last span of non-zero length.
+        Parameters out of the knotvector range get index -1.
+        """
+        u = self.knotvector
+        ts = np.asarray(ts)
+        spans = np.searchsorted(u, ts, side='right') - 1
+        last_span = np.searchsorted(u, u[-1], side='left') - 1
+        spans[ts == u[-1]] = last_span
+        spans[(ts < u[0]) | (ts > u[-1])] = -1
+        return spans
+
+    def span_derivatives(self, p, ts, n=0):
+        """
+        Evaluate only basis functions of degree p, which are not zero at given parameter values,
+        together with their derivatives up to order n.
+        See "The NURBS Book", 2nd edition, p.2.5, algorithms A2.2 and A2.3.
+
+        Returns:
+            * indexes of basis functions, numpy array of shape (m, p+1);
+            * values, numpy array of shape (n+1, m, p+1): values[k, i, r] is
+              k-th derivative of basis function indexes[i, r] at ts[i].
+        Functions which do not exist (for parameters out of bounds or at the
+        ends of not clamped knotvectors) are given zero values; their indexes
+        are clipped to valid range.
+        """
+        u = self.knotvector
+        ts = np.asarray(ts, dtype=np.float64)
+        m = len(ts)
+        n_functions = len(u) - p - 1
+        spans = self.find_spans(ts)
+        outside = spans < 0
+        # values out of bounds are zeroed below; use any span of non-zero length for them
+        spans = np.where(outside, np.searchsorted(u, u[-1], side='left') - 1, spans)
+
+        # Pad the knotvector so that knots u[span-p+1] ... u[span+p] exist for any span;
+        # padding knots affect only functions which do not exist.
+        padded = np.concatenate((np.full(p, u[0]), u, np.full(p, u[-1])))
+        spans_p = spans + p
+
+        left = np.empty((p+1, m))
+        right = np.empty((p+1, m))
+        ndu = np.empty((p+1, p+1, m))
+        ndu[0, 0] = 1.0
+        for j in range(1, p+1):
+            left[j] = ts - padded[spans_p + 1 - j]
+            right[j] = padded[spans_p + j] - ts
+            saved = 0.0
+            for r in range(j):
+                ndu[j, r] = right[r+1] + left[j-r]
+                temp = ndu[r, j-1] / ndu[j, r]
+                ndu[r, j] = saved + right[r+1] * temp
+                saved = left[j-r] * temp
+            ndu[j, j] = saved
+
+        values = np.zeros((n+1, p+1, m))
+        values[0] = ndu[:, p]
+        a = np.empty((2, p+1, m))
+        for r in range(p+1):
+            s1, s2 = 0, 1
+            a[0, 0] = 1.0
+            for k in range(1, min(n, p)+1):
+                d = np.zeros(m)
+                rk = r - k
+                pk = p - k
+                if r >= k:
+                    a[s2, 0] = a[s1, 0] / ndu[pk+1, rk]
+                    d = a[s2, 0] * ndu[rk, pk]
+                j1 = 1 if rk >= -1 else -rk
+                j2 = k-1 if r-1 <= pk else p-r
+                for j in range(j1, j2+1):
+                    a[s2, j] = (a[s1, j] - a[s1, j-1]) / ndu[pk+1, rk+j]
+                    d = d + a[s2, j] * ndu[rk+j, pk]
+                if r <= pk:
+                    a[s2, k] = -a[s1, k-1] / ndu[pk+1, r]
+                    d = d + a[s2, k] * ndu[r, pk]
+                values[k, r] = d
+                s1, s2 = s2, s1
+        factor = float(p)
+        for k in range(1, min(n, p)+1):
+            values[k] *= factor
+            factor *= (p - k)
+
+        indexes = (spans - p)[:, np.newaxis] + np.arange(p+1)[np.newaxis] # (m, p+1)
+        values = np.transpose(values, axes=(0, 2, 1)) # (n+1, m, p+1)
+        bad = (indexes < 0) | (indexes >= n_functions) | outside[:, np.newaxis]
+        values[:, bad] = 0.0
+        indexes = np.clip(indexes, 0, n_functions-1)
+        return indexes, values
+
     def function(self, i, p, reset_cache=True):
         if reset_cache:
             self._cache = dict()
@@ -251,7 +251,49 @@ class SvProfileReset(bpy.types.Operator):
         info("Profiling statistics data cleared.")
         return {'FINISHED'}
     
-classes = [SvProfilingToggle, SvProfileDump, SvProfileSave, SvProfileReset]
+class SvNodeStatsExport(bpy.types.Operator):
+    """Export recorded node statistics to file"""
+    bl_idname = "node.sverchok_node_stats_export"
+    bl_label = "Export node statistics"
+    bl_options = {'INTERNAL'}
+
+    formats = [
+            ("CHROME", "Chrome trace", "Trace event JSON, which can be opened in chrome://tracing or Perfetto", 0),
+            ("CSV", "CSV", "One row per processed node", 1)
+        ]
+
+    format: EnumProperty(name = "Format",
+            items = formats,
+            default = "CHROME")
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+
+    def execute(self, context):
+        from sverchok.core.node_stats import node_stats
+        if self.format == 'CHROME':
+            node_stats.export_chrome_trace(self.filepath)
+        else:
+            node_stats.export_csv(self.filepath)
+        info("Node statistics saved to %s.", self.filepath)
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+class SvNodeStatsReset(bpy.types.Operator):
+    """Reset recorded node statistics"""
+    bl_idname = "node.sverchok_node_stats_reset"
+    bl_label = "Reset node statistics"
+    bl_options = {'INTERNAL'}
+
+    def execute(self, context):
+        from sverchok.core.node_stats import clear_node_stats
+        clear_node_stats()
+        info("Node statistics cleared.")
+        return {'FINISHED'}
+
+classes = [SvProfilingToggle, SvProfileDump, SvProfileSave, SvProfileReset, SvNodeStatsExport, SvNodeStatsReset]
 
 def register():
     for class_name in classes:
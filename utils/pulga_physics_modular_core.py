@@ -29,7 +29,7 @@ def cross_indices3(n):
     '''create crossed indices'''
 
     nu = np.sum(np.arange(n, dtype=np.int64))
-    ind = np.zeros((nu, 2), dtype=np.int16)
+    ind = np.zeros((nu, 2), dtype=np.int64)
     c = 0
     for i in range(n-1):
         l = n-i-1
@@ -42,6 +42,108 @@ def cross_indices3(n):
     return ind
 
 
+# offsets of the cell itself and half of its neighbour cells,
+# so each pair of adjacent cells is visited only once
+HALF_NEIGHBOUR_OFFSETS = [(dx, dy, dz)
+                          for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                          if (dx, dy, dz) >= (0, 0, 0)]
+
+def grid_pairs(verts, distance):
+    '''
+    Indices (i < j) of all pairs of points closer than distance.
+    Points are bucketed into a uniform grid with cell size equal to distance,
+    only points of the same or adjacent cells are compared.
+    '''
+    v_len = len(verts)
+    if v_len < 2 or distance <= 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    cells = np.floor(verts / distance).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = np.argsort(keys, kind='stable')
+    cell_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+
+    result = []
+    for dx, dy, dz in HALF_NEIGHBOUR_OFFSETS:
+        same_cell = (dx, dy, dz) == (0, 0, 0)
+        other_keys = cell_keys + (dx * dims[1] + dy) * dims[2] + dz
+        other_cell = np.searchsorted(cell_keys, other_keys)
+        other_cell[other_cell == len(cell_keys)] = 0
+        found = cell_keys[other_cell] == other_keys
+        cell_a = np.flatnonzero(found)
+        cell_b = other_cell[found]
+        count_a = counts[cell_a]
+        count_b = counts[cell_b]
+        n_pairs = count_a * count_b
+        total = n_pairs.sum()
+        if total == 0:
+            continue
+        pair_cell = np.repeat(np.arange(len(cell_a)), n_pairs)
+        local = np.arange(total) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+        i = starts[cell_a][pair_cell] + local // count_b[pair_cell]
+        j = starts[cell_b][pair_cell] + local % count_b[pair_cell]
+        if same_cell:
+            upper = i < j
+            i, j = i[upper], j[upper]
+        i, j = order[i], order[j]
+        close = np.linalg.norm(verts[i] - verts[j], axis=1) < distance
+        result.append(np.stack((i[close], j[close]), axis=-1))
+
+    if not result:
+        return np.zeros((0, 2), dtype=np.int64)
+    pairs = np.concatenate(result)
+    pairs.sort(axis=1)
+    return pairs
+
+
+class PulgaNeighbours():
+    '''
+    Neighbour queries shared by all interaction forces (Verlet lists).
+    Candidate pairs are searched within cutoff + skin distance, with cKDTree if
+    SciPy is available or with a uniform grid otherwise, and they are reused
+    until particles have moved far enough to make some pair closer than cutoff
+    missing from the candidates.
+    '''
+    def __init__(self, skin_factor=0.3):
+        self.skin_factor = skin_factor
+        self.indexes = np.zeros((0, 2), dtype=np.int64)
+        self.dif_v = np.zeros((0, 3), dtype=np.float64)
+        self.dist = np.zeros(0, dtype=np.float64)
+        self.built_verts = None
+        self.built_cutoff = 0
+        self.skin = 0
+        self.rebuilt = False
+
+    def needs_rebuild(self, verts, cutoff):
+        if self.built_verts is None or len(verts) != len(self.built_verts):
+            return True
+        if cutoff > self.built_cutoff + self.skin:
+            return True
+        max_displacement = np.sqrt(np.max(np.sum((verts - self.built_verts)**2, axis=1)))
+        return 2 * max_displacement + max(0, cutoff - self.built_cutoff) > self.skin
+
+    def update(self, verts, cutoff):
+        '''recalculate candidate pairs if needed and distances for all candidates'''
+        self.rebuilt = self.needs_rebuild(verts, cutoff)
+        if self.rebuilt:
+            self.skin = cutoff * self.skin_factor
+            search_distance = cutoff + self.skin
+            if scipy is not None:
+                tree = scipy.spatial.cKDTree(verts)
+                self.indexes = tree.query_pairs(r=search_distance, output_type='ndarray').astype(np.int64)
+            else:
+                self.indexes = grid_pairs(verts, search_distance)
+            self.built_verts = verts.copy()
+            self.built_cutoff = cutoff
+        self.dif_v = verts[self.indexes[:, 0], :] - verts[self.indexes[:, 1], :]
+        self.dist = np.linalg.norm(self.dif_v, axis=1)
+
+    def query_pairs(self, distance):
+        '''indexes of pairs closer than distance (should not be greater than cutoff)'''
+        return self.indexes[self.dist < distance]
+
+
 def numpy_match_long_repeat(p):
     '''match list length by repeating last one'''
     q = []
@@ -631,7 +733,7 @@ class SvCollisionForce():
         self.needs = ['dif_v', 'dist', 'dist_cor', 'collide', 'normal_v']
         self.use_kdtree = use_kdtree
         if self.use_kdtree:
-            self.needs = ['kd_tree', 'max_radius', 'kd_collisions']
+            self.needs = ['neighbours', 'max_radius', 'kd_collisions']
             self.add = self.add_kdt
         else:
             self.needs = ['indexes', 'sum_rad', 'dif_v', 'dist', 'dist_cor', 'collide', 'normal_v']
@@ -698,7 +800,7 @@ class SvAttractionForce():
         self.max_distance = max_distance[0]
         self.stop_on_collide = stop_on_collide
         if self.use_kdtree:
-            self.needs = ['kd_tree']
+            self.needs = ['neighbours']
             self.add = self.add_kdt
         else:
             self.needs = ['indexes', 'sum_rad', 'mass_product', 'dif_v', 'dist', 'dist_cor', 'normal_v']
@@ -710,6 +812,7 @@ class SvAttractionForce():
         ps.aware = True
         for need in self.needs:
             ps.relations.needed[need] = True
+        ps.relations.neighbour_distance = max(ps.relations.neighbour_distance, float(np.amax(self.max_distance)))
         if self.uniform_magnitude:
             self.f_magnitude = self.magnitude
         else:
@@ -737,7 +840,7 @@ class SvAttractionForce():
 
     def add_kdt(self, ps):
         relations = ps.relations
-        indexes = relations.kd_tree.query_pairs(r=self.max_distance, output_type='ndarray')
+        indexes = relations.neighbours.query_pairs(self.max_distance)
         if len(indexes) > 0:
 
             id0 = indexes[:, 0]
@@ -780,7 +883,7 @@ class SvAlignForce():
         self.max_distance = np.array(max_distance[0])
         self.use_kdtree = use_kdtree
         if self.use_kdtree:
-            self.needs = ['kd_tree']
+            self.needs = ['neighbours']
             self.add = self.add_kdt
         else:
             self.needs = ['indexes', 'dif_v', 'dist', 'dist_cor']
@@ -792,6 +895,7 @@ class SvAlignForce():
         ps.aware = True
         for need in self.needs:
             ps.relations.needed[need] = True
+        ps.relations.neighbour_distance = max(ps.relations.neighbour_distance, float(np.amax(self.max_distance)))
         if self.uniform_strength:
             self.f_strength = self.strength
         else:
@@ -821,7 +925,7 @@ class SvAlignForce():
     def add_kdt(self, ps):
 
         relations = ps.relations
-        indexes = relations.kd_tree.query_pairs(r=self.max_distance, output_type='ndarray')
+        indexes = relations.neighbours.query_pairs(self.max_distance)
         if len(indexes) > 0:
             dif_v = ps.verts[indexes[:, 0], :] - ps.verts[indexes[:, 1], :]
             dist = np.linalg.norm(dif_v, axis=1)
@@ -860,7 +964,7 @@ class SvFitForce():
         self.size_changer = True
         self.use_kdtree = use_kdtree
         if self.use_kdtree:
-            self.needs = ['kd_tree', 'max_radius', 'kd_collisions']
+            self.needs = ['neighbours', 'max_radius', 'kd_collisions']
             self.add = self.add_kdt
         else:
             self.needs = ['indexes', 'sum_rad', 'dif_v', 'dist', 'collide']
@@ -868,7 +972,7 @@ class SvFitForce():
 
     def setup(self, ps):
         ps.aware = True
-        self.all_range = np.arange(ps.v_len, dtype=np.int16)
+        self.all_range = np.arange(ps.v_len, dtype=np.int64)
 
         for need in self.needs:
             ps.relations.needed[need] = True
@@ -1404,6 +1508,9 @@ class PulgaSystem():
         self.goal_pins = True
         self.relations = lambda: None
         self.relations.needed = {}
+        self.relations.neighbours = PulgaNeighbours()
+        # distance of interaction forces which do not depend on particles size
+        self.relations.neighbour_distance = 0
         for force in self.forces:
             if hasattr(force, 'pin_force'):
                 self.pinned = True
@@ -1423,30 +1530,33 @@ class PulgaSystem():
 
 
     def relations_setup(self):
-        if 'indexes' in self.relations.needed:
-            self.relations.indexes = cross_indices3(self.v_len)
-        if 'cross_matrix' in self.relations.needed:
+        needed = self.relations.needed
+        if 'indexes' in needed or 'kd_collisions' in needed:
+            needed['neighbours'] = True
+            needed['max_radius'] = True
+        if 'cross_matrix' in needed:
             self.relations.result = np.zeros((self.v_len, self.v_len, 3), dtype=np.float64)
-        if not self.size_change:
-            if 'sum_rad' in self.relations.needed:
-                self.relations.sum_rad = self.rads[self.relations.indexes[:, 0]] + self.rads[self.relations.indexes[:, 1]]
-            if 'mass_product' in self.relations.needed:
-                self.relations.mass_product = self.mass[self.relations.indexes[:, 0]] * self.mass[self.relations.indexes[:, 1]]
 
     def relations_update(self):
-        if 'max_radius' in self.relations.needed:
-            self.relations.max_radius = np.amax(self.rads)
-        if 'kd_tree' in self.relations.needed:
-            self.relations.kd_tree = scipy.spatial.cKDTree(self.verts)
+        relations = self.relations
+        if 'max_radius' in relations.needed:
+            relations.max_radius = np.amax(self.rads)
+        if 'neighbours' in relations.needed:
+            cutoff = relations.neighbour_distance
+            if 'max_radius' in relations.needed:
+                cutoff = max(cutoff, relations.max_radius * 2)
+            relations.neighbours.update(self.verts, cutoff)
         if 'kd_collisions' in self.relations.needed:
-            indexes = self.relations.kd_tree.query_pairs(r=self.relations.max_radius*2, output_type='ndarray')
+            indexes = relations.neighbours.query_pairs(self.relations.max_radius*2)
             self.relations.kd_indexes = indexes
             if len(indexes) > 0:
                 self.relations.kd_dif_v = self.verts[indexes[:, 0], :] - self.verts[indexes[:, 1], :]
                 self.relations.kd_sum_rad = self.rads[indexes[:, 0]] + self.rads[indexes[:, 1]]
                 self.relations.kd_dist = np.linalg.norm(self.relations.kd_dif_v, axis=1)
                 self.relations.kd_mask = self.relations.kd_dist < self.relations.kd_sum_rad
-        if self.size_change:
+        if 'indexes' in relations.needed:
+            relations.indexes = relations.neighbours.indexes
+        if self.size_change or relations.neighbours.rebuilt:
             if 'sum_rad' in self.relations.needed:
                 self.relations.sum_rad = self.rads[self.relations.indexes[:, 0]] + self.rads[self.relations.indexes[:, 1]]
             if 'mass_product' in self.relations.needed:
@@ -1454,9 +1564,9 @@ class PulgaSystem():
 
 
         if 'dif_v' in self.relations.needed:
-            self.relations.dif_v = self.verts[self.relations.indexes[:, 0], :] - self.verts[self.relations.indexes[:, 1], :]
+            self.relations.dif_v = relations.neighbours.dif_v
         if 'dist' in self.relations.needed:
-            self.relations.dist = np.linalg.norm(self.relations.dif_v, axis=1)
+            self.relations.dist = relations.neighbours.dist
         if 'collide' in self.relations.needed or 'attract_mask' in self.relations.needed:
             self.relations.mask = self.relations.sum_rad > self.relations.dist
             self.relations.index_inter = self.relations.indexes[self.relations.mask]
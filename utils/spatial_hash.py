@@ -0,0 +1,97 @@
+# This file is part of project Sverchok. It's copyrighted by the contributors
+# recorded in the version control history of the file, available from
+# its original location https://github.com/nortikin/sverchok/commit/master
+#
+# SPDX-License-Identifier: GPL3
+# License-Filename: LICENSE
+
+import itertools
+from collections import defaultdict
+
+import numpy as np
+
+class SpatialHash(object):
+    """
+    Dynamic spatial index of points: points are stored in cells of uniform
+    grid with specified cell size. Points can be added one by one or in
+    batches; the index is not rebuilt when new points are added.
+
+    Distances are only searched within one cell size, so the cell size
+    should be not less than the maximum distance to be checked
+    (for example, minimum distance between points).
+    """
+    def __init__(self, cell_size, dimensions=3):
+        if cell_size <= 0:
+            raise ValueError("Cell size must be positive")
+        self.cell_size = cell_size
+        self.dimensions = dimensions
+        self.cells = defaultdict(list)
+        self.points = np.empty((64, dimensions))
+        self.count = 0
+        self.offsets = list(itertools.product((-1, 0, 1), repeat=dimensions))
+
+    def __len__(self):
+        return self.count
+
+    def _cells(self, points):
+        return np.floor(points / self.cell_size).astype(np.int64)
+
+    def add(self, point):
+        self.extend([point])
+
+    def extend(self, points):
+        points = np.asarray(points, dtype=np.float64).reshape((-1, self.dimensions))
+        n = len(points)
+        if n == 0:
+            return
+        if self.count + n > len(self.points):
+            capacity = max(2 * len(self.points), self.count + n)
+            new_points = np.empty((capacity, self.dimensions))
+            new_points[:self.count] = self.points[:self.count]
+            self.points = new_points
+        self.points[self.count : self.count + n] = points
+        for i, cell in enumerate(map(tuple, self._cells(points).tolist())):
+            self.cells[cell].append(self.count + i)
+        self.count += n
+
+    def nearest_distances(self, points):
+        """
+        For each of points, calculate distance to the nearest stored point.
+        Only stored points from neighbouring cells are considered, so
+        points farther than cell size can be missed; for points which have
+        no neighbours, np.inf is returned.
+
+        inputs:
+        * points: np.array of shape (n, dimensions).
+
+        outputs: np.array of shape (n,).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, self.dimensions))
+        distances = np.full(len(points), np.inf)
+        if self.count == 0 or len(points) == 0:
+            return distances
+
+        point_idxs = []
+        stored_idxs = []
+        cells = self.cells
+        for i, cell in enumerate(self._cells(points).tolist()):
+            for offset in self.offsets:
+                items = cells.get(tuple(c + o for c, o in zip(cell, offset)))
+                if items:
+                    point_idxs.extend([i] * len(items))
+                    stored_idxs.extend(items)
+        if not point_idxs:
+            return distances
+
+        point_idxs = np.array(point_idxs)
+        pair_distances = np.linalg.norm(points[point_idxs] - self.points[stored_idxs], axis=1)
+        np.minimum.at(distances, point_idxs, pair_distances)
+        return distances
+
+    def is_far(self, points, min_r):
+        """
+        Mask of points which are at least min_r far from all stored points.
+        min_r must not be greater than cell size.
+        """
+        return self.nearest_distances(points) >= min_r
+
@@ -6,8 +6,9 @@
 # License-Filename: LICENSE
 
 import numpy as np
+import threading
 from math import pi, cos, sin
-from collections import defaultdict
+from collections import OrderedDict
 
 from mathutils import Matrix, Vector
 
@@ -26,7 +27,7 @@ from sverchok.utils.curve.algorithms import (
             MathutilsRotationCalculator, DifferentialRotationCalculator,
             reparametrize_curve
         )
-from sverchok.utils.surface.core import SvSurface
+from sverchok.utils.surface.core import SvSurface, detect_uv_grid
 from sverchok.utils.surface.nurbs import SvNurbsSurface
 from sverchok.utils.surface.data import *
 from sverchok.utils.logging import info, debug
@@ -34,6 +35,9 @@ from sverchok.utils.logging import info, debug
 class SvInterpolatingSurface(SvSurface):
     __description__ = "Interpolating"
 
+    # Maximum number of U splines kept in cache
+    u_splines_cache_size = 1024
+
     def __init__(self, u_bounds, v_bounds, u_spline_constructor, v_splines, reparametrize_v_splines=True):
         if reparametrize_v_splines:
             self.v_splines = [reparametrize_curve(spline) for spline in v_splines]
@@ -48,8 +52,9 @@ class SvInterpolatingSurface(SvSurface):
         self.v_bounds = v_bounds
 
         # Caches
-        # v -> Spline
-        self._u_splines = {}
+        # v -> Spline, least recently used items go first
+        self._u_splines = OrderedDict()
+        self._u_splines_lock = threading.Lock()
         # (u,v) -> vertex
         self._eval_cache = {}
         # (u,v) -> normal
@@ -69,13 +74,25 @@ class SvInterpolatingSurface(SvSurface):
 
     def get_u_spline(self, v, vertices):
         """Get a spline along U direction for specified value of V coordinate"""
-        spline = self._u_splines.get(v, None)
-        if spline is not None:
-            return spline
-        else:
-            spline = self.u_spline_constructor(vertices)
+        with self._u_splines_lock:
+            spline = self._u_splines.get(v, None)
+            if spline is not None:
+                self._u_splines.move_to_end(v)
+                return spline
+        spline = self.u_spline_constructor(vertices)
+        with self._u_splines_lock:
             self._u_splines[v] = spline
-            return spline
+            while len(self._u_splines) > self.u_splines_cache_size:
+                self._u_splines.popitem(last=False)
+        return spline
+
+    def _v_spline_points(self, vs):
+        """
+        Points of V splines at specified values of V.
+        Returns np.array of shape (len(vs), number of V splines, 3).
+        """
+        points = np.array([spline.evaluate_array(vs) for spline in self.v_splines])
+        return points.transpose((1, 0, 2))
 
     def _evaluate(self, u, v):
         spline_vertices = []
@@ -96,41 +113,38 @@ class SvInterpolatingSurface(SvSurface):
             self._eval_cache[(u,v)] = result
             return result
 
-#     def evaluate_array(self, us, vs):
-#         # FIXME: To be optimized!
-#         normals = [self._evaluate(u, v) for u,v in zip(us, vs)]
-#         return np.array(normals)
+    def evaluate_uv_grid(self, us, vs):
+        us = np.asarray(us)
+        vs = np.asarray(vs)
+        v_spline_points = self._v_spline_points(vs)
+        result = np.empty((len(vs), len(us), 3))
+        for v_idx, v in enumerate(vs.tolist()):
+            u_spline = self.get_u_spline(v, list(v_spline_points[v_idx]))
+            result[v_idx] = u_spline.evaluate_array(us)
+        return result
 
     def evaluate_array(self, us, vs):
+        grid = detect_uv_grid(us, vs)
+        if grid is not None:
+            return self.evaluate_uv_grid(*grid).reshape((-1, 3))
+
+        us = np.asarray(us)
         result = np.empty((len(us), 3))
-        v_to_u = defaultdict(list)
-        v_to_i = defaultdict(list)
-        for i, (u, v) in enumerate(zip(us, vs)):
-            v_to_u[v].append(u)
-            v_to_i[v].append(i)
-
-        # here we rely on fact that in Python 3.7+ dicts are ordered.
-        all_vs = np.array(list(v_to_u.keys()))
-        v_spline_points = np.array([spline.evaluate_array(all_vs) for spline in self.v_splines])
-
-        for v_idx, (v, us_by_v) in enumerate(v_to_u.items()):
-            is_by_v = v_to_i[v]
-            spline_vertices = []
-            for spline_idx, spline in enumerate(self.v_splines):
-                point = v_spline_points[spline_idx,v_idx]
-                #point = spline.evaluate(v)
-                spline_vertices.append(point)
-            u_spline = self.get_u_spline(v, spline_vertices)
-            points = u_spline.evaluate_array(np.array(us_by_v))
-            idxs = np.array(is_by_v)[np.newaxis].T
-            np.put_along_axis(result, idxs, points, axis=0)
+        all_vs, v_idxs = np.unique(vs, return_inverse=True)
+        v_spline_points = self._v_spline_points(all_vs)
+        # indexes of points grouped by V value
+        order = np.argsort(v_idxs, kind='stable')
+        group_bounds = np.searchsorted(v_idxs[order], np.arange(len(all_vs) + 1))
+        for v_idx, v in enumerate(all_vs.tolist()):
+            idxs = order[group_bounds[v_idx] : group_bounds[v_idx+1]]
+            u_spline = self.get_u_spline(v, list(v_spline_points[v_idx]))
+            result[idxs] = u_spline.evaluate_array(us[idxs])
         return result
 
     def _normal(self, u, v):
         h = 0.001
         point = self.evaluate(u, v)
-        # we know this exists because it was filled in evaluate()
-        u_spline = self._u_splines[v]
+        u_spline = self.get_u_spline(v, [spline.evaluate(v) for spline in self.v_splines])
         u_tangent = u_spline.tangent(u)
         point_v = self.evaluate(u, v+h)
         dv = (point_v - point)/h
@@ -149,65 +163,25 @@ class SvInterpolatingSurface(SvSurface):
             self._normal_cache[(u,v)] = result
             return result
 
-#     def normal_array(self, us, vs):
-#         # FIXME: To be optimized!
-#         normals = [self._normal(u, v) for u,v in zip(us, vs)]
-#         return np.array(normals)
-
     def normal_array(self, us, vs):
+        # Points near the upper bounds are shifted back, so that
+        # finite differences are calculated within the surface.
+        # If (us, vs) is a grid, shifted parameters are still a grid,
+        # so evaluate_array calls below use evaluate_uv_grid.
         h = 0.001
-        result = np.empty((len(us), 3))
-        v_to_u = defaultdict(list)
-        v_to_i = defaultdict(list)
-        for i, (u, v) in enumerate(zip(us, vs)):
-            v_to_u[v].append(u)
-            v_to_i[v].append(i)
-        for v, us_by_v in v_to_u.items():
-            us_by_v = np.array(us_by_v)
-            is_by_v = v_to_i[v]
-            spline_vertices = []
-            spline_vertices_h = []
-            for v_spline in self.v_splines:
-                v_min, v_max = v_spline.get_u_bounds()
-                vx = (v_max - v_min) * v + v_min
-                if vx +h <= v_max:
-                    point = v_spline.evaluate(vx)
-                    point_h = v_spline.evaluate(vx + h)
-                else:
-                    point = v_spline.evaluate(vx - h)
-                    point_h = v_spline.evaluate(vx)
-                spline_vertices.append(point)
-                spline_vertices_h.append(point_h)
-            if v+h <= v_max:
-                u_spline = self.get_u_spline(v, spline_vertices)
-                u_spline_h = self.get_u_spline(v+h, spline_vertices_h)
-            else:
-                u_spline = self.get_u_spline(v-h, spline_vertices)
-                u_spline_h = self.get_u_spline(v, spline_vertices_h)
-            u_min, u_max = 0.0, 1.0
-
-            good_us = us_by_v + h < u_max
-            bad_us = np.logical_not(good_us)
-
-            good_points = np.broadcast_to(good_us[np.newaxis].T, (len(us_by_v), 3)).flatten()
-            bad_points = np.logical_not(good_points)
-            points = np.empty((len(us_by_v), 3))
-            points[good_us] = u_spline.evaluate_array(us_by_v[good_us])
-            points[bad_us] = u_spline.evaluate_array(us_by_v[bad_us] - h)
-            points_u_h = np.empty((len(us_by_v), 3))
-            points_u_h[good_us] = u_spline.evaluate_array(us_by_v[good_us] + h)
-            points_u_h[bad_us] = u_spline.evaluate_array(us_by_v[bad_us])
-            points_v_h = u_spline_h.evaluate_array(us_by_v)
-
-            dvs = (points_v_h - points) / h
-            dus = (points_u_h - points) / h
-            normals = np.cross(dus, dvs)
-            norms = np.linalg.norm(normals, axis=1, keepdims=True)
-            normals = normals / norms
-
-            idxs = np.array(is_by_v)[np.newaxis].T
-            np.put_along_axis(result, idxs, normals, axis=0)
-        return result
+        us = np.asarray(us)
+        vs = np.asarray(vs)
+        u_max = 1.0
+        v_max = self.v_splines[-1].get_u_bounds()[1]
+        us = np.where(us + h < u_max, us, us - h)
+        vs = np.where(vs + h <= v_max, vs, vs - h)
+
+        points = self.evaluate_array(us, vs)
+        dus = (self.evaluate_array(us + h, vs) - points) / h
+        dvs = (self.evaluate_array(us, vs + h) - points) / h
+        normals = np.cross(dus, dvs)
+        norms = np.linalg.norm(normals, axis=1, keepdims=True)
+        return normals / norms
 
 PROJECT = 'project'
 COPROJECT = 'coproject'
@@ -266,20 +240,28 @@ class SvDeformedByFieldSurface(SvSurface):
             vec = vec - projection
         return p + self.coefficient * vec
 
-    def evaluate_array(self, us, vs):
-        ps = self.surface.evaluate_array(us, vs)
+    def _deform(self, ps, get_normals):
         xs, ys, zs = ps[:,0], ps[:,1], ps[:,2]
         vxs, vys, vzs = self.field.evaluate_grid(xs, ys, zs)
         vecs = np.stack((vxs, vys, vzs)).T
         if self.by_normal == PROJECT:
-            normals = self.surface.normal_array(us, vs)
+            normals = get_normals()
             vecs = _dot(vecs, normals) * normals / _dot(normals, normals)
         elif self.by_normal == COPROJECT:
-            normals = self.surface.normal_array(us, vs)
+            normals = get_normals()
             projections = _dot(vecs, normals) * normals / _dot(normals, normals)
             vecs = vecs - projections
         return ps + self.coefficient * vecs
 
+    def evaluate_array(self, us, vs):
+        ps = self.surface.evaluate_array(us, vs)
+        return self._deform(ps, lambda: self.surface.normal_array(us, vs))
+
+    def evaluate_uv_grid(self, us, vs):
+        ps = self.surface.evaluate_uv_grid(us, vs).reshape((-1, 3))
+        normals = lambda: self.surface.normal_uv_grid(us, vs).reshape((-1, 3))
+        return self._deform(ps, normals).reshape((len(vs), len(us), 3))
+
     def normal(self, u, v):
         h = self.normal_delta
         p = self.evaluate(u, v)
@@ -15,6 +15,34 @@ from sverchok.utils.surface.data import *
 class UnsupportedSurfaceTypeException(TypeError):
     pass
 
+def detect_uv_grid(us, vs):
+    """
+    Check if arrays of parameters describe a regular grid, i.e. if they were
+    generated as
+
+        us, vs = np.meshgrid(grid_us, grid_vs)
+        us, vs = us.flatten(), vs.flatten()
+
+    Returns a tuple (grid_us, grid_vs), or None if parameters are not
+    ordered as a grid or are not finite.
+    """
+    us, vs = np.asarray(us), np.asarray(vs)
+    n = len(us)
+    if n == 0 or us.ndim != 1 or vs.shape != us.shape:
+        return None
+    if not (np.isfinite(us).all() and np.isfinite(vs).all()):
+        return None
+    changes = np.flatnonzero(vs != vs[0])
+    n_u = changes[0] if len(changes) else n
+    if n_u == 0 or n % n_u != 0:
+        return None
+    n_v = n // n_u
+    us_grid = us.reshape((n_v, n_u))
+    vs_grid = vs.reshape((n_v, n_u))
+    if not (us_grid == us_grid[0]).all() or not (vs_grid == vs_grid[:,:1]).all():
+        return None
+    return us_grid[0], vs_grid[:,0]
+
 class SvSurface(object):
     def __repr__(self):
         if hasattr(self, '__description__'):
@@ -56,6 +84,31 @@ class SvSurface(object):
         #self.info("Normals: %s", normal)
         return normal
 
+    def evaluate_uv_grid(self, us, vs):
+        """
+        Evaluate the surface at all combinations of U and V values.
+        inputs:
+        * us: np.array of shape (n,)
+        * vs: np.array of shape (m,)
+        output: np.array of shape (m, n, 3); item [j, i] is the point at
+        (us[i], vs[j]), i.e. points go in the same order as for
+        np.meshgrid(us, vs).
+
+        Subclasses, which can evaluate a grid faster than the same number of
+        arbitrary points, override this.
+        """
+        us_grid, vs_grid = np.meshgrid(us, vs)
+        points = self.evaluate_array(us_grid.flatten(), vs_grid.flatten())
+        return points.reshape((len(vs), len(us), 3))
+
+    def normal_uv_grid(self, us, vs):
+        """
+        Same as evaluate_uv_grid, but for normals.
+        """
+        us_grid, vs_grid = np.meshgrid(us, vs)
+        normals = self.normal_array(us_grid.flatten(), vs_grid.flatten())
+        return normals.reshape((len(vs), len(us), 3))
+
     def derivatives_data_array(self, us, vs):
         if hasattr(self, 'normal_delta'):
             h = self.normal_delta
@@ -182,6 +235,12 @@ class SvSurfaceSubdomain(SvSurface):
     def normal_array(self, us, vs):
         return self.surface.normal_array(us, vs)
 
+    def evaluate_uv_grid(self, us, vs):
+        return self.surface.evaluate_uv_grid(us, vs)
+
+    def normal_uv_grid(self, us, vs):
+        return self.surface.normal_uv_grid(us, vs)
+
     def get_u_min(self):
         return self.u_bounds[0]
 
@@ -243,6 +302,14 @@ class SvFlipSurface(SvSurface):
         us, vs = self.flip(us, vs)
         return self.surface.normal_array(us, vs)
 
+    def evaluate_uv_grid(self, us, vs):
+        us, vs = self.flip(us, vs)
+        return self.surface.evaluate_uv_grid(us, vs)
+
+    def normal_uv_grid(self, us, vs):
+        us, vs = self.flip(us, vs)
+        return self.surface.normal_uv_grid(us, vs)
+
 class SvSwapSurface(SvSurface):
     def __init__(self, surface):
         self.surface = surface
@@ -282,6 +349,12 @@ class SvSwapSurface(SvSurface):
     def normal_array(self, us, vs):
         return self.surface.normal_array(vs, us)
 
+    def evaluate_uv_grid(self, us, vs):
+        return self.surface.evaluate_uv_grid(vs, us).transpose((1, 0, 2))
+
+    def normal_uv_grid(self, us, vs):
+        return self.surface.normal_uv_grid(vs, us).transpose((1, 0, 2))
+
 class SvReparametrizedSurface(SvSurface):
     def __init__(self, surface, new_u_min, new_u_max, new_v_min, new_v_max):
         self.surface = surface
@@ -344,6 +417,14 @@ class SvReparametrizedSurface(SvSurface):
         us, vs = self.map_uv(us, vs)
         return self.surface.normal_array(us, vs)
 
+    def evaluate_uv_grid(self, us, vs):
+        us, vs = self.map_uv(us, vs)
+        return self.surface.evaluate_uv_grid(us, vs)
+
+    def normal_uv_grid(self, us, vs):
+        us, vs = self.map_uv(us, vs)
+        return self.surface.normal_uv_grid(us, vs)
+
     def derivatives_data_array(self, us, vs):
         us, vs = self.map_uv(us, vs)
         data = self.surface.derivatives_data_array(us, vs)
@@ -565,25 +565,34 @@ class SvNativeNurbsSurface(SvNurbsSurface):
     def evaluate(self, u, v):
         return self.evaluate_array(np.array([u]), np.array([v]))[0]
 
+    def fractions(self, deriv_orders, us, vs):
+        """
+        Numerators and denominators of partial derivatives of the surface.
+        deriv_orders: list of (deriv_order_u, deriv_order_v) pairs.
+        Returns list of (numerator, denominator) pairs in the same order.
+        Only (pu+1)*(pv+1) products of basis functions, which are not zero
+        at each point, are evaluated.
+        """
+        max_u = max(du for du, dv in deriv_orders)
+        max_v = max(dv for du, dv in deriv_orders)
+        iu, nsu = self.basis_u.span_derivatives(self.degree_u, us, max_u) # (n, pu+1), (du+1, n, pu+1)
+        iv, nsv = self.basis_v.span_derivatives(self.degree_v, vs, max_v) # (n, pv+1), (dv+1, n, pv+1)
+        iu = iu[:,:,np.newaxis]
+        iv = iv[:,np.newaxis,:]
+        weights = self.weights[iu, iv] # (n, pu+1, pv+1)
+        controls = self.control_points[iu, iv] # (n, pu+1, pv+1, 3)
+
+        result = []
+        for du, dv in deriv_orders:
+            ns = nsu[du][:,:,np.newaxis] * nsv[dv][:,np.newaxis,:] # (n, pu+1, pv+1)
+            coeffs = ns * weights # (n, pu+1, pv+1)
+            numerator = (coeffs[:,:,:,np.newaxis] * controls).sum(axis=(1,2)) # (n, 3)
+            denominator = coeffs.sum(axis=(1,2))[np.newaxis].T # (n, 1)
+            result.append((numerator, denominator))
+        return result
+
     def fraction(self, deriv_order_u, deriv_order_v, us, vs):
-        pu = self.degree_u
-        pv = self.degree_v
-        ku, kv, _ = self.control_points.shape
-        nsu = np.array([self.basis_u.derivative(i, pu, deriv_order_u)(us) for i in range(ku)]) # (ku, n)
-        nsv = np.array([self.basis_v.derivative(i, pv, deriv_order_v)(vs) for i in range(kv)]) # (kv, n)
-        nsu = np.transpose(nsu[np.newaxis], axes=(1,0,2)) # (ku, 1, n)
-        nsv = nsv[np.newaxis] # (1, kv, n)
-        ns = nsu * nsv # (ku, kv, n)
-        weights = np.transpose(self.weights[np.newaxis], axes=(1,2,0)) # (ku, kv, 1)
-        coeffs = ns * weights # (ku, kv, n)
-        coeffs = np.transpose(coeffs[np.newaxis], axes=(3,1,2,0)) # (n,ku,kv,1)
-        controls = self.control_points # (ku,kv,3)
-
-        numerator = coeffs * controls # (n,ku,kv,3)
-        numerator = numerator.sum(axis=1).sum(axis=1) # (n,3)
-        denominator = coeffs.sum(axis=1).sum(axis=1)
-
-        return numerator, denominator
+        return self.fractions([(deriv_order_u, deriv_order_v)], us, vs)[0]
 
     def evaluate_array(self, us, vs):
         numerator, denominator = self.fraction(0, 0, us, vs)
@@ -593,10 +602,11 @@ class SvNativeNurbsSurface(SvNurbsSurface):
         return self.normal_array(np.array([u]), np.array([v]))[0]
 
     def normal_array(self, us, vs):
-        numerator, denominator = self.fraction(0, 0, us, vs)
+        fractions = self.fractions([(0, 0), (1, 0), (0, 1)], us, vs)
+        numerator, denominator = fractions[0]
         surface = nurbs_divide(numerator, denominator)
-        numerator_u, denominator_u = self.fraction(1, 0, us, vs)
-        numerator_v, denominator_v = self.fraction(0, 1, us, vs)
+        numerator_u, denominator_u = fractions[1]
+        numerator_v, denominator_v = fractions[2]
         surface_u = nurbs_divide(numerator_u - surface*denominator_u, denominator)
         surface_v = nurbs_divide(numerator_v - surface*denominator_v, denominator)
         normal = np.cross(surface_u, surface_v)
@@ -640,20 +650,22 @@ class SvNativeNurbsSurface(SvNurbsSurface):
                 return curve
 
     def derivatives_data_array(self, us, vs):
-        numerator, denominator = self.fraction(0, 0, us, vs)
+        fractions = self.fractions([(0, 0), (1, 0), (0, 1)], us, vs)
+        numerator, denominator = fractions[0]
         surface = nurbs_divide(numerator, denominator)
-        numerator_u, denominator_u = self.fraction(1, 0, us, vs)
-        numerator_v, denominator_v = self.fraction(0, 1, us, vs)
+        numerator_u, denominator_u = fractions[1]
+        numerator_v, denominator_v = fractions[2]
         surface_u = (numerator_u - surface*denominator_u) / denominator
         surface_v = (numerator_v - surface*denominator_v) / denominator
         return SurfaceDerivativesData(surface, surface_u, surface_v)
 
     def curvature_calculator(self, us, vs, order=True):
     
-        numerator, denominator = self.fraction(0, 0, us, vs)
+        fractions = self.fractions([(0, 0), (1, 0), (0, 1), (2, 0), (0, 2), (1, 1)], us, vs)
+        numerator, denominator = fractions[0]
         surface = nurbs_divide(numerator, denominator)
-        numerator_u, denominator_u = self.fraction(1, 0, us, vs)
-        numerator_v, denominator_v = self.fraction(0, 1, us, vs)
+        numerator_u, denominator_u = fractions[1]
+        numerator_v, denominator_v = fractions[2]
         surface_u = (numerator_u - surface*denominator_u) / denominator
         surface_v = (numerator_v - surface*denominator_v) / denominator
 
@@ -661,12 +673,12 @@ class SvNativeNurbsSurface(SvNurbsSurface):
         n = np.linalg.norm(normal, axis=1, keepdims=True)
         normal = normal / n
 
-        numerator_uu, denominator_uu = self.fraction(2, 0, us, vs)
+        numerator_uu, denominator_uu = fractions[3]
         surface_uu = (numerator_uu - 2*surface_u*denominator_u - surface*denominator_uu) / denominator
-        numerator_vv, denominator_vv = self.fraction(0, 2, us, vs)
+        numerator_vv, denominator_vv = fractions[4]
         surface_vv = (numerator_vv - 2*surface_v*denominator_v - surface*denominator_vv) / denominator
 
-        numerator_uv, denominator_uv = self.fraction(1, 1, us, vs)
+        numerator_uv, denominator_uv = fractions[5]
         surface_uv = (numerator_uv - surface_v*denominator_u - surface_u*denominator_v - surface*denominator_uv) / denominator
 
         nuu = (surface_uu * normal).sum(axis=1)
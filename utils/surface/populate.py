@@ -8,37 +8,24 @@
 import numpy as np
 import random
 
-from mathutils.kdtree import KDTree
-
 from sverchok.utils.surface import SvSurface
 from sverchok.utils.field.scalar import SvScalarField
-from sverchok.utils.logging import error
+from sverchok.utils.spatial_hash import SpatialHash
+from sverchok.utils.field.compiler import compile_field
+from sverchok.utils.logging import error, info
 
 def random_point(min_x, max_x, min_y, max_y):
     x = random.uniform(min_x, max_x)
     y = random.uniform(min_y, max_y)
     return x,y
 
-def _check_all(v_new, vs_old, min_r):
-    kdt = KDTree(len(vs_old))
-    for i, v in enumerate(vs_old):
-        kdt.insert(v, i)
-    kdt.balance()
-    nearest, idx, dist = kdt.find(v_new)
-    if dist is None:
-        return True
-    return (dist >= min_r)
-
-#     for v_old in vs_old:
-#         distance = np.linalg.norm(v_new - v_old)
-#         if distance < min_r:
-#             return False
-#    return True
-
 BATCH_SIZE = 100
 MAX_ITERATIONS = 1000
+# In Poisson disk mode, stop after this number of batches
+# in a row did not give any new points.
+POISSON_MAX_FAILS = 10
 
-def populate_surface(surface, field, count, threshold, proportional=False, field_min=None, field_max=None, min_r=0, seed=0, predicate=None):
+def populate_surface(surface, field, count, threshold, proportional=False, field_min=None, field_max=None, min_r=0, seed=0, predicate=None, poisson=False):
     """
     Generate random points on the surface, with distribution controlled (optionally) by scalar field.
 
@@ -59,11 +46,16 @@ def populate_surface(surface, field, count, threshold, proportional=False, field
     * predicate: additional predicate to check if generated point is valid.
       Takes two arguments: point in UV space and the same point in 3D space.
       Optional.
+    * poisson: if True, generate Poisson disk (blue noise) distribution: keep
+      generating points until no more points can be placed at `min_r` distance
+      from other points. `count` is the maximum number of points in this case.
 
     outputs: tuple:
     * Coordinates of points in surface's UV space
     * Coordinates of points in 3D space.
     """
+    if field is not None:
+        field = compile_field(field)
     u_min, u_max = surface.get_u_min(), surface.get_u_max()
     v_min, v_max = surface.get_v_min(), surface.get_v_max()
 
@@ -74,6 +66,9 @@ def populate_surface(surface, field, count, threshold, proportional=False, field
     new_verts = []
     new_uv = []
     iterations = 0
+    fails = 0
+    if min_r != 0:
+        index = SpatialHash(min_r)
 
     while done < count:
         iterations += 1
@@ -120,19 +115,33 @@ def populate_surface(surface, field, count, threshold, proportional=False, field
             candidates = batch_verts
             candidate_uvs = batch_uvs
 
+        good_verts = []
         if len(candidates) > 0:
-            good_verts = []
             good_uvs = []
-            for candidate_uv, candidate in zip(candidate_uvs, candidates):
-                if min_r == 0 or _check_all(candidate, new_verts + good_verts, min_r):
-                    if predicate is not None:
-                        if not predicate(candidate_uv, candidate):
-                            continue
-                    good_verts.append(tuple(candidate))
-                    good_uvs.append(tuple(candidate_uv))
-                    done += 1
+            if min_r != 0:
+                is_far = index.is_far(candidates, min_r)
+            for i, (candidate_uv, candidate) in enumerate(zip(candidate_uvs, candidates)):
+                if min_r != 0:
+                    if not is_far[i]:
+                        continue
+                    if good_verts and np.linalg.norm(np.array(good_verts) - candidate, axis=1).min() < min_r:
+                        continue
+                if predicate is not None:
+                    if not predicate(candidate_uv, candidate):
+                        continue
+                good_verts.append(tuple(candidate))
+                good_uvs.append(tuple(candidate_uv))
+                done += 1
             new_verts.extend(good_verts)
             new_uv.extend(good_uvs)
+            if min_r != 0:
+                index.extend(good_verts)
+
+        if poisson and min_r != 0:
+            fails = 0 if good_verts else fails + 1
+            if fails >= POISSON_MAX_FAILS:
+                info("Poisson disk sampling: %s points generated, no more space", done)
+                break
 
     return new_uv, new_verts
 
@@ -5,8 +5,23 @@
 # SPDX-License-Identifier: GPL3
 # License-Filename: LICENSE
 
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
 from mathutils import kdtree
 from sverchok.data_structure import match_long_repeat as mlr
+from sverchok.dependencies import scipy
+
+if scipy is not None:
+    from scipy.spatial import cKDTree
+
+# number of threads used by scipy for bulk queries; -1 means all CPU cores
+kdtree_workers = -1
+# number of trees kept by get_kdtree
+kdtree_cache_size = 16
 
 # documentation/blender_python_api_2_70_release/mathutils.kdtree.html
 def create_kdt(verts):
@@ -20,16 +35,164 @@ def create_kdt(verts):
     return kd
 
 
-def kdt_closest_verts_range(verts, v_find, dists, out):
-    '''Find vertices in desired distance'''
-    kd = create_kdt(verts)
-    out.extend([kd.find_range(vert, dist) for vert, dist in zip(*mlr([v_find, dists]))])
+class SvKDTree(object):
+    """
+    KD-tree of 3D points, answering queries for whole arrays of points at once.
+    scipy.spatial.cKDTree is used when SciPy is available; otherwise queries
+    are answered point by point with mathutils.kdtree.
 
+    Use get_kdtree() to share trees between nodes which get the same vertices.
+    """
+    def __init__(self, points, use_scipy=True):
+        self.points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+        if use_scipy and scipy is not None:
+            self.tree = cKDTree(self.points)
+            self.kdt = None
+        else:
+            self.tree = None
+            self.kdt = create_kdt(self.points.tolist())
 
-def kdt_closest_verts_find_n(verts, v_find, nums, out):
-    '''Find  the N closest vertices ordered by distance'''
-    kd = create_kdt(verts)
-    out.extend([kd.find_n(vert, num) for vert, num in zip(*mlr([v_find, nums]))])
+    def __len__(self):
+        return len(self.points)
+
+    def _scipy_query(self, points, k, distance_upper_bound):
+        try:
+            return self.tree.query(points, k=k,
+                        distance_upper_bound=distance_upper_bound,
+                        workers=kdtree_workers)
+        except TypeError:
+            # SciPy < 1.6 does not know about workers parameter
+            return self.tree.query(points, k=k,
+                        distance_upper_bound=distance_upper_bound)
+
+    def query(self, points, k=1, distance_upper_bound=np.inf):
+        """
+        Find k nearest tree points for each of points.
+
+        inputs:
+        * points: np.array of shape (m, 3).
+        * k: number of neighbours; it is limited by the number of points in the tree.
+        * distance_upper_bound: only return neighbours not farther than this.
+
+        outputs: tuple of np.arrays (distances, indices), both of shape (m, k),
+        sorted by distance. Missing neighbours have infinite distance
+        and index equal to len(self).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+        n = len(self.points)
+        m = len(points)
+        k = max(1, min(k, n))
+        if n == 0 or m == 0:
+            return np.full((m, k), np.inf), np.full((m, k), n, dtype=np.int64)
+        if self.tree is not None:
+            distances, indices = self._scipy_query(points, k, distance_upper_bound)
+            return distances.reshape((m, k)), indices.reshape((m, k)).astype(np.int64)
+
+        distances = np.full((m, k), np.inf)
+        indices = np.full((m, k), n, dtype=np.int64)
+        for i, point in enumerate(points.tolist()):
+            for j, (co, index, distance) in enumerate(self.kdt.find_n(point, k)):
+                if distance <= distance_upper_bound:
+                    distances[i, j] = distance
+                    indices[i, j] = index
+        return distances, indices
+
+    def query_ball_point(self, points, radius):
+        """
+        Find all tree points within given distance from each of points.
+
+        inputs:
+        * points: np.array of shape (m, 3).
+        * radius: a number or np.array of shape (m,).
+
+        outputs: list of m tuples (indices, distances) of np.arrays,
+        sorted by distance, like results of mathutils KDTree.find_range.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), (len(points),))
+        if len(points) == 0 or len(self.points) == 0:
+            return [(np.empty(0, dtype=np.int64), np.empty(0)) for point in points]
+        if self.tree is not None:
+            try:
+                found = self.tree.query_ball_point(points, radius, workers=kdtree_workers)
+            except TypeError:
+                found = self.tree.query_ball_point(points, radius)
+            result = []
+            for point, idxs in zip(points, found):
+                idxs = np.array(idxs, dtype=np.int64)
+                distances = np.linalg.norm(self.points[idxs] - point, axis=1)
+                order = np.argsort(distances, kind='stable')
+                result.append((idxs[order], distances[order]))
+            return result
+
+        result = []
+        for point, r in zip(points.tolist(), radius.tolist()):
+            found = self.kdt.find_range(point, r)
+            result.append((np.array([item[1] for item in found], dtype=np.int64),
+                           np.array([item[2] for item in found])))
+        return result
+
+
+_kdtree_cache = OrderedDict()
+_kdtree_cache_lock = threading.Lock()
+
+def get_kdtree(verts):
+    """
+    Return SvKDTree for given vertices. Trees are cached by contents of
+    the vertex buffer, so nodes which get the same vertices share one tree.
+    """
+    points = np.ascontiguousarray(verts, dtype=np.float64).reshape((-1, 3))
+    key = (points.shape, hashlib.blake2b(points.view(np.uint8), digest_size=16).digest())
+    with _kdtree_cache_lock:
+        tree = _kdtree_cache.get(key)
+        if tree is not None:
+            _kdtree_cache.move_to_end(key)
+            return tree
+    tree = SvKDTree(points)
+    with _kdtree_cache_lock:
+        _kdtree_cache[key] = tree
+        while len(_kdtree_cache) > kdtree_cache_size:
+            _kdtree_cache.popitem(last=False)
+    return tree
+
+def clear_kdtree_cache():
+    with _kdtree_cache_lock:
+        _kdtree_cache.clear()
+
+
+def kdt_find_n(verts, v_find, nums):
+    '''
+    For each of v_find, find the N closest vertices ordered by distance.
+    Returns three lists of lists: coordinates, indices and distances.
+    '''
+    v_find, nums = mlr([v_find, nums])
+    tree = get_kdtree(verts)
+    nums = np.asarray(nums, dtype=np.int64)
+    if len(nums) == 0:
+        return [], [], []
+    distances, indices = tree.query(v_find, k=int(nums.max()))
+    counts = np.clip(nums, 0, len(tree)).tolist()
+    indices = [row[:count] for row, count in zip(indices.tolist(), counts)]
+    distances = [row[:count] for row, count in zip(distances.tolist(), counts)]
+    points = tree.points.tolist()
+    coords = [[points[i] for i in row] for row in indices]
+    return coords, indices, distances
+
+
+def kdt_find_range(verts, v_find, dists):
+    '''
+    For each of v_find, find vertices in desired distance ordered by distance.
+    Returns three lists of lists: coordinates, indices and distances.
+    '''
+    v_find, dists = mlr([v_find, dists])
+    tree = get_kdtree(verts)
+    points = tree.points
+    coords, indices, distances = [], [], []
+    for idxs, ds in tree.query_ball_point(v_find, dists):
+        coords.append(points[idxs].tolist())
+        indices.append(idxs.tolist())
+        distances.append(ds.tolist())
+    return coords, indices, distances
 
 
 def kdt_closest_path(verts, radius, start_index, result, cycle):
@@ -119,6 +119,12 @@ from sverchok.utils.logging import debug, info, error
 from sverchok.utils.geom import center, LineEquation2D, CircleEquation2D
 from sverchok.utils.math import weighted_center
 from sverchok.utils.sv_bmesh_utils import pydata_from_bmesh, bmesh_from_pydata
+from sverchok.dependencies import scipy
+
+if scipy is not None:
+    from scipy.spatial import Voronoi, Delaunay, cKDTree
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
 
 TOLERANCE = 1e-9
 BIG_FLOAT = 1e38
@@ -821,7 +827,12 @@ def computeDelaunayTriangulation(points):
 #     context.triangulate = true
 #     voronoi(siteList,context)
 #     return context.triangles
-    
+
+    if scipy is not None and len(points) >= 3:
+        triangles = delaunay_triangles_scipy([(p.x, p.y) for p in points])
+        if triangles is not None:
+            return triangles
+
     siteList = SiteList(points)
     context  = Context()
     context.triangulate = True
@@ -1112,6 +1123,11 @@ class CircleBounds(Bounds):
         return x,y,0
 
 def voronoi_bounded(sites, bound_mode='BOX', clip=True, draw_bounds=True, draw_hangs=False, make_faces=False, ordered_faces=False, max_sides=10):
+    if scipy is not None and len(sites) > 1:
+        return voronoi_bounded_scipy(sites, bound_mode=bound_mode, clip=clip,
+                    draw_bounds=draw_bounds, draw_hangs=draw_hangs,
+                    make_faces=make_faces, ordered_faces=ordered_faces,
+                    max_sides=max_sides)
 
     bounds = Bounds.new(bound_mode)
     bounds.init_from_sites(sites)
@@ -1301,6 +1317,9 @@ def unique_points(points, eps=1e-4):
     return mask, unique, repeating
 
 def lloyd2d(bound_mode, verts, n_iterations, clip=0.0, weight_field=None):
+    if scipy is not None and len(verts) > 1:
+        return lloyd2d_scipy(bound_mode, verts, n_iterations, weight_field=weight_field)
+
     bounds = Bounds.new(bound_mode)
     bounds.init_from_sites(verts)
 
@@ -1357,3 +1376,311 @@ def lloyd2d(bound_mode, verts, n_iterations, clip=0.0, weight_field=None):
         points = restrict(points)
     return points
 
+
+# Fast implementation based on scipy.spatial (Qhull).
+#
+# Voronoi cells are represented as "ragged" arrays: coordinates of all cells'
+# vertices in one (n, 2) array, and an array with index of cell for each vertex;
+# vertices of each cell go in a row, in counterclockwise order.
+# Cells are clipped by bounds with all cells at once.
+
+def delaunay_triangles_scipy(points):
+    """
+    Delaunay triangulation of 2D points with scipy.spatial.Delaunay.
+    Returns a list of 3-tuples with indices of points, or None if Qhull
+    could not triangulate the points. Triangles are oriented clockwise,
+    as ones produced by Fortune's algorithm.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    try:
+        triangles = Delaunay(points).simplices
+    except Exception as e:
+        debug("Delaunay triangulation failed: %s", e)
+        return None
+    p1, p2, p3 = points[triangles[:,0]], points[triangles[:,1]], points[triangles[:,2]]
+    cross = (p2[:,0] - p1[:,0]) * (p3[:,1] - p1[:,1]) - (p2[:,1] - p1[:,1]) * (p3[:,0] - p1[:,0])
+    flip = cross > 0
+    triangles[flip] = triangles[flip][:, ::-1]
+    return [tuple(triangle) for triangle in triangles.tolist()]
+
+def _next_in_cell(cell_idxs, n_cells):
+    """Index of the next vertex in the same cell, for each vertex"""
+    n = len(cell_idxs)
+    counts = np.bincount(cell_idxs, minlength=n_cells)
+    starts = np.cumsum(counts) - counts
+    nxt = np.arange(n) + 1
+    last = nxt == (starts + counts)[cell_idxs]
+    nxt[last] = starts[cell_idxs[last]]
+    return nxt
+
+def _emit_clipped(points, cell_idxs, emit_count, emit_point):
+    """
+    Build new ragged arrays of cells, where vertex i is replaced by emit_count[i]
+    vertices; emit_point(idxs, k) returns coordinates and "edge after this vertex
+    is boundary" flags for k-th vertex emitted instead of vertices idxs.
+    """
+    total = emit_count.sum()
+    idxs = np.repeat(np.arange(len(points)), emit_count)
+    ks = np.arange(total) - np.repeat(np.cumsum(emit_count) - emit_count, emit_count)
+    new_points, new_boundary = emit_point(idxs, ks)
+    return new_points, cell_idxs[idxs], new_boundary
+
+def _clip_cells_half_plane(points, cell_idxs, boundary, n_cells, normal, offset):
+    """
+    Clip cells by half-plane normal * p <= offset.
+    boundary: for each vertex, whether the edge going from it lies on the bounds.
+    """
+    nxt = _next_in_cell(cell_idxs, n_cells)
+    d = points.dot(normal) - offset
+    inside = d <= 0
+    cross = inside != inside[nxt]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(cross, d / (d - d[nxt]), 0.0)
+    intersections = points + t[:, np.newaxis] * (points[nxt] - points)
+
+    def emit(idxs, ks):
+        is_point = inside[idxs] & (ks == 0)
+        coords = np.where(is_point[:, np.newaxis], points[idxs], intersections[idxs])
+        # edge from the point where cell leaves the half-plane lies on its border
+        leaving = ~is_point & inside[idxs]
+        return coords, np.where(leaving, True, boundary[idxs])
+
+    emit_count = inside.astype(np.int64) + cross
+    return _emit_clipped(points, cell_idxs, emit_count, emit)
+
+def _clip_cells_circle(points, cell_idxs, boundary, n_cells, circle_center, radius):
+    """
+    Clip cells by circle; arcs of the circle are replaced by chords.
+    """
+    nxt = _next_in_cell(cell_idxs, n_cells)
+    rel = points - circle_center
+    direction = points[nxt] - points
+    a = (direction * direction).sum(axis=1)
+    b = 2 * (direction * rel).sum(axis=1)
+    c = (rel * rel).sum(axis=1) - radius * radius
+    inside = c <= 0
+    inside_next = inside[nxt]
+    disc = b*b - 4*a*c
+    sqrt_disc = np.sqrt(np.maximum(disc, 0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = np.clip((-b - sqrt_disc) / (2*a), 0, 1)
+        t2 = np.clip((-b + sqrt_disc) / (2*a), 0, 1)
+    t1[a == 0] = 0
+    t2[a == 0] = 0
+    # edge with both ends outside of the circle can still cross it twice
+    pass_through = ~inside & ~inside_next & (disc > 0) & (t1 > 0) & (t2 < 1) & (t1 < t2)
+    x1 = points + t1[:, np.newaxis] * direction
+    x2 = points + t2[:, np.newaxis] * direction
+
+    def emit(idxs, ks):
+        is_inside = inside[idxs]
+        is_point = is_inside & (ks == 0)
+        # outside vertex: first emitted point is the entry point (t1);
+        # the exit point (t2) is followed by the chord.
+        use_x1 = ~is_inside & (ks == 0)
+        coords = np.where(is_point[:, np.newaxis], points[idxs],
+                    np.where(use_x1[:, np.newaxis], x1[idxs], x2[idxs]))
+        leaving = ~is_point & ~use_x1
+        return coords, np.where(leaving, True, boundary[idxs])
+
+    emit_count = (inside.astype(np.int64)
+                    + (inside & ~inside_next)
+                    + (~inside & inside_next)
+                    + 2 * pass_through)
+    return _emit_clipped(points, cell_idxs, emit_count, emit)
+
+def _extend_bounds(bounds, delta):
+    bounds.x_max = bounds.x_max + delta
+    bounds.y_max = bounds.y_max + delta
+    bounds.x_min = bounds.x_min - delta
+    bounds.y_min = bounds.y_min - delta
+    bounds.r_max = bounds.r_max + delta
+
+def voronoi_cells_scipy(sites, bounds):
+    """
+    Voronoi cells of 2D sites, clipped by bounds (BoxBounds or CircleBounds).
+
+    inputs:
+    * sites: np.array of shape (n, 2).
+    * bounds: Bounds instance.
+
+    outputs: tuple:
+    * cell vertices coordinates: np.array of shape (m, 2);
+    * index of site for each vertex: np.array of shape (m,);
+    * for each vertex, whether the edge going from it lies on the bounds: np.array of shape (m,).
+    Vertices of each cell go in a row, in counterclockwise order.
+    """
+    n = len(sites)
+    extent = max(abs(bounds.x_max - bounds.x_min), abs(bounds.y_max - bounds.y_min), 2*bounds.r_max)
+    far = 10 * (extent + np.abs(sites).max() + 1.0)
+    # Far points make cells of all real sites finite.
+    far_points = np.array([[-far, 0], [far, 0], [0, -far], [0, far]])
+    diagram = Voronoi(np.concatenate((sites, far_points)))
+
+    regions = [diagram.regions[diagram.point_region[i]] for i in range(n)]
+    counts = np.array([len(region) for region in regions], dtype=np.int64)
+    cell_idxs = np.repeat(np.arange(n), counts)
+    vertex_idxs = np.array([i for region in regions for i in region], dtype=np.int64)
+    points = diagram.vertices[vertex_idxs]
+
+    # make all cells counterclockwise
+    nxt = _next_in_cell(cell_idxs, n)
+    cross = points[:,0] * points[nxt,1] - points[nxt,0] * points[:,1]
+    area = np.bincount(cell_idxs, weights=cross, minlength=n)
+    starts = np.cumsum(counts) - counts
+    flip = (area < 0)[cell_idxs]
+    local = np.arange(len(points)) - starts[cell_idxs]
+    order = np.where(flip, starts[cell_idxs] + counts[cell_idxs] - 1 - local, np.arange(len(points)))
+    points = points[order]
+
+    boundary = np.zeros(len(points), dtype=bool)
+    if isinstance(bounds, CircleBounds):
+        points, cell_idxs, boundary = _clip_cells_circle(points, cell_idxs, boundary, n,
+                                            np.array(bounds.center), bounds.r_max)
+    else:
+        half_planes = [((-1.0, 0.0), -bounds.x_min), ((1.0, 0.0), bounds.x_max),
+                       ((0.0, -1.0), -bounds.y_min), ((0.0, 1.0), bounds.y_max)]
+        for normal, offset in half_planes:
+            points, cell_idxs, boundary = _clip_cells_half_plane(points, cell_idxs, boundary, n,
+                                                np.array(normal), offset)
+    return points, cell_idxs, boundary
+
+def _merge_cell_vertices(points, cell_idxs, n_cells, eps):
+    """
+    Merge coincident vertices of neighbouring cells.
+    Returns merged vertices, index of merged vertex for each cell vertex,
+    and a mask of cell vertices which are not repeated in a row within a cell.
+    """
+    tree = cKDTree(points)
+    pairs = tree.query_pairs(eps, output_type='ndarray')
+    n = len(points)
+    graph = coo_matrix((np.ones(len(pairs)), (pairs[:,0], pairs[:,1])), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    # number merged vertices in order of their first appearance
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    new_index = np.empty_like(order)
+    new_index[order] = np.arange(len(order))
+    vert_idxs = new_index[inverse]
+    verts = points[first[order]]
+    nxt = _next_in_cell(cell_idxs, n_cells)
+    good = vert_idxs != vert_idxs[nxt]
+    return verts, vert_idxs, good
+
+def voronoi_bounded_scipy(sites, bound_mode='BOX', clip=True, draw_bounds=True, draw_hangs=False, make_faces=False, ordered_faces=False, max_sides=10):
+    """
+    The same as voronoi_bounded, but implemented with scipy.spatial.Voronoi.
+    Cells are clipped by the bounds exactly, so edges, which have both ends
+    outside of the bounds, are processed correctly. Faces are listed in the
+    order of sites.
+    """
+    bounds = Bounds.new(bound_mode)
+    bounds.init_from_sites(sites)
+    _extend_bounds(bounds, clip)
+
+    sites = np.asarray(sites, dtype=np.float64)[:, :2]
+    n = len(sites)
+    points, cell_idxs, boundary = voronoi_cells_scipy(sites, bounds)
+    eps = 1e-8 * max(1.0, np.abs(points).max()) if len(points) else 1e-8
+    verts, vert_idxs, good = _merge_cell_vertices(points, cell_idxs, n, eps)
+    vert_idxs, cell_idxs, boundary = vert_idxs[good], cell_idxs[good], boundary[good]
+    counts = np.bincount(cell_idxs, minlength=n)
+    good_cells = counts >= 3
+    good = good_cells[cell_idxs]
+    vert_idxs, cell_idxs, boundary = vert_idxs[good], cell_idxs[good], boundary[good]
+    counts[~good_cells] = 0
+
+    nxt = _next_in_cell(cell_idxs, n)
+    edges = np.sort(np.stack((vert_idxs, vert_idxs[nxt]), axis=-1), axis=1)
+    is_bound_vert = np.zeros(len(verts), dtype=bool)
+    is_bound_vert[vert_idxs[boundary]] = True
+    is_bound_vert[vert_idxs[nxt][boundary]] = True
+
+    if not draw_bounds:
+        edges = edges[~boundary]
+        if not draw_hangs:
+            edges = edges[~(is_bound_vert[edges[:,0]] | is_bound_vert[edges[:,1]])]
+    edges = np.unique(edges, axis=0)
+
+    if not draw_bounds and not draw_hangs:
+        used = ~is_bound_vert
+        new_index = np.cumsum(used) - 1
+        verts = verts[used]
+        edges = new_index[edges]
+        vert_idxs = np.where(used[vert_idxs], new_index[vert_idxs], -1)
+
+    new_vertices = [(x, y, 0) for x, y in verts.tolist()]
+    edges = [tuple(edge) for edge in edges.tolist()]
+
+    if make_faces:
+        has_face = (counts >= 3) & (counts <= max_sides)
+        if not draw_bounds:
+            has_face &= np.bincount(cell_idxs, weights=boundary, minlength=n) == 0
+        starts = np.cumsum(counts) - counts
+        vert_idxs = vert_idxs.tolist()
+        faces = [vert_idxs[starts[i] : starts[i] + counts[i]] if has_face[i] else None for i in range(n)]
+        if ordered_faces:
+            for i, face in enumerate(faces):
+                if face is None:
+                    raise Exception(f"Can't find a face for site #{i}")
+        new_faces = [face for face in faces if face is not None]
+    else:
+        new_faces = []
+
+    return new_vertices, edges, new_faces
+
+def lloyd2d_scipy(bound_mode, verts, n_iterations, weight_field=None):
+    """
+    The same as lloyd2d, but implemented with scipy.spatial.Voronoi.
+    Voronoi cells are clipped by the bounds exactly, so sites do not have to be mirrored
+    over the bounds.
+    """
+    bounds = Bounds.new(bound_mode)
+    bounds.init_from_sites(verts)
+    eps = 1e-4
+
+    def restrict(pts):
+        return np.array([bounds.restrict(pt) for pt in pts.tolist()])
+
+    def restrict_box(pts):
+        pts = pts.copy()
+        pts[:,0] = np.clip(pts[:,0], bounds.x_min, bounds.x_max)
+        pts[:,1] = np.clip(pts[:,1], bounds.y_min, bounds.y_max)
+        return pts
+
+    def iteration(pts):
+        # points which have a too close neighbour are not moved
+        distances, _ = cKDTree(pts[:,:2]).query(pts[:,:2], k=2)
+        mask = distances[:,1] > eps
+        sites = pts[mask][:,:2]
+        n = len(sites)
+        if n < 2:
+            return pts
+        points, cell_idxs, _ = voronoi_cells_scipy(sites, bounds)
+        # each cell vertex is to be counted once
+        nxt = _next_in_cell(cell_idxs, n)
+        good = np.linalg.norm(points - points[nxt], axis=1) > 1e-12
+        points, cell_idxs = points[good], cell_idxs[good]
+        if weight_field is None:
+            weights = np.ones(len(points))
+        else:
+            weights = weight_field.evaluate_grid(points[:,0], points[:,1], np.zeros(len(points)))
+        total = np.bincount(cell_idxs, weights=weights, minlength=n)
+        has_cell = total != 0
+        xs = np.bincount(cell_idxs, weights=weights * points[:,0], minlength=n)
+        ys = np.bincount(cell_idxs, weights=weights * points[:,1], minlength=n)
+        centers = pts[mask].copy()
+        centers[has_cell, 0] = xs[has_cell] / total[has_cell]
+        centers[has_cell, 1] = ys[has_cell] / total[has_cell]
+        centers[has_cell, 2] = 0
+        result = pts.copy()
+        result[mask] = centers
+        return result
+
+    if bound_mode == 'BOX':
+        restrict = restrict_box
+    points = restrict(np.array(verts, dtype=np.float64))
+    for i in range(n_iterations):
+        points = iteration(points)
+        points = restrict(points)
+    return [tuple(point) for point in points.tolist()]
@@ -18,6 +18,7 @@
 
 import numpy as np
 from collections import defaultdict
+from itertools import chain
 
 import bpy
 import bmesh
@@ -28,6 +29,7 @@ from sverchok.utils.sv_mesh_utils import mask_vertices, polygons_to_edges
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata, pydata_from_bmesh, bmesh_clip
 from sverchok.utils.geom import calc_bounds, bounding_sphere
 from sverchok.utils.math import project_to_sphere, weighted_center
+from sverchok.utils.sv_KDT_utils import SvKDTree
 from sverchok.dependencies import scipy, FreeCAD
 
 if scipy is not None:
@@ -37,6 +39,95 @@ if FreeCAD is not None:
     from FreeCAD import Base
     import Part
 
+def region_centers(diagram, sites, vertices=None, weight_field=None):
+    """
+    Centers of Voronoi regions of the first len(sites) sites of the diagram,
+    calculated for all regions at once. Center of a region is the mean of its
+    vertices, weighted by weight_field if provided (see weighted_center).
+
+    inputs:
+    * diagram: scipy.spatial.Voronoi.
+    * sites: np.array of shape (n, 3). Sites, which regions are unbounded or
+      empty, are returned as is.
+    * vertices: np.array to be used instead of diagram.vertices (for example,
+      vertices restricted by some bounds).
+
+    outputs: np.array of shape (n, 3).
+    """
+    if vertices is None:
+        vertices = diagram.vertices
+    n = len(sites)
+    regions = [diagram.regions[i] for i in diagram.point_region[:n].tolist()]
+    lengths = np.fromiter(map(len, regions), dtype=np.int64, count=n)
+    vertex_idxs = np.fromiter(chain.from_iterable(regions), dtype=np.int64, count=lengths.sum())
+    cell_idxs = np.repeat(np.arange(n), lengths)
+
+    is_open = np.bincount(cell_idxs[vertex_idxs < 0], minlength=n) > 0
+    good = ~is_open[cell_idxs]
+    vertex_idxs, cell_idxs = vertex_idxs[good], cell_idxs[good]
+
+    if weight_field is None:
+        weights = np.ones(len(vertex_idxs))
+    else:
+        used_idxs, inverse = np.unique(vertex_idxs, return_inverse=True)
+        used = vertices[used_idxs]
+        weights = weight_field.evaluate_grid(used[:,0], used[:,1], used[:,2])[inverse]
+    points = vertices[vertex_idxs]
+
+    total = np.bincount(cell_idxs, weights=weights, minlength=n)
+    has_cell = total != 0
+    centers = np.array(sites, dtype=np.float64)
+    for i in range(3):
+        coords = np.bincount(cell_idxs, weights=weights * points[:,i], minlength=n)
+        centers[has_cell, i] = coords[has_cell] / total[has_cell]
+    return centers
+
+def sample_centers(sites, samples, weights=None):
+    """
+    Approximate centers of Voronoi regions of sites: each of sample points is
+    assigned to the nearest site, and centers of samples assigned to each site
+    are calculated. Sites to which no samples were assigned are returned as is.
+
+    inputs:
+    * sites: np.array of shape (n, 3).
+    * samples: np.array of shape (m, 3); samples should be distributed uniformly
+      over the area where sites are to be distributed.
+    * weights: np.array of shape (m,), or None.
+
+    outputs: np.array of shape (n, 3).
+    """
+    n = len(sites)
+    _, idxs = SvKDTree(sites).query(samples)
+    idxs = idxs[:,0]
+    if weights is None:
+        weights = np.ones(len(samples))
+    total = np.bincount(idxs, weights=weights, minlength=n)
+    has_cell = total != 0
+    centers = np.array(sites, dtype=np.float64)
+    for i in range(3):
+        coords = np.bincount(idxs, weights=weights * samples[:,i], minlength=n)
+        centers[has_cell, i] = coords[has_cell] / total[has_cell]
+    return centers
+
+def _sample_weights(samples, weight_field):
+    if weight_field is None:
+        return None
+    return weight_field.evaluate_grid(samples[:,0], samples[:,1], samples[:,2])
+
+def sample_mesh_surface(verts, faces, count, random_state):
+    """
+    Random points distributed uniformly over the surface of a mesh.
+    Faces are triangulated as fans, so they are expected to be convex.
+    """
+    verts = np.asarray(verts, dtype=np.float64)
+    tris = np.array([(face[0], face[i], face[i+1]) for face in faces for i in range(1, len(face)-1)], dtype=np.int64)
+    v1, v2, v3 = verts[tris[:,0]], verts[tris[:,1]], verts[tris[:,2]]
+    areas = np.linalg.norm(np.cross(v2 - v1, v3 - v1), axis=1)
+    tri_idxs = random_state.choice(len(tris), size=count, p=areas / areas.sum())
+    r1 = np.sqrt(random_state.rand(count))[:,np.newaxis]
+    r2 = random_state.rand(count)[:,np.newaxis]
+    return (1 - r1) * v1[tri_idxs] + r1 * (1 - r2) * v2[tri_idxs] + r1 * r2 * v3[tri_idxs]
+
 def voronoi3d_layer(n_src_sites, all_sites, make_regions, do_clip, clipping, skip_added=True):
     diagram = Voronoi(all_sites)
     src_sites = all_sites[:n_src_sites]
@@ -47,7 +138,7 @@ def voronoi3d_layer(n_src_sites, all_sites, make_regions, do_clip, clipping, ski
     for site_idx in range(n_sites):
         region_idx = diagram.point_region[site_idx]
         region = diagram.regions[region_idx]
-        vertices = [tuple(diagram.vertices[i,:]) for i in region]
+        vertices = [tuple(v) for v in diagram.vertices[region].tolist()]
         region_verts[site_idx] = vertices
         region_verts_map[site_idx] = {vert_idx: i for i, vert_idx in enumerate(region)}
     
@@ -242,14 +333,7 @@ def lloyd_on_mesh(verts, faces, sites, thickness, n_iterations, weight_field=Non
         all_points = points.tolist() + plus_points.tolist() + minus_points.tolist()
 
         diagram = Voronoi(all_points)
-        centers = []
-        for site_idx in range(n):
-            region_idx = diagram.point_region[site_idx]
-            region = diagram.regions[region_idx]
-            region_verts = np.array([diagram.vertices[i] for i in region])
-            center = weighted_center(region_verts, weight_field)
-            centers.append(tuple(center))
-        return centers
+        return region_centers(diagram, points, weight_field=weight_field).tolist()
 
     points = calc_bvh_projections(bvh, sites)
     for i in range(n_iterations):
@@ -258,6 +342,25 @@ def lloyd_on_mesh(verts, faces, sites, thickness, n_iterations, weight_field=Non
 
     return points.tolist()
 
+def lloyd_on_mesh_approximate(verts, faces, sites, n_iterations, n_samples=None, weight_field=None, seed=0):
+    """
+    Approximate version of lloyd_on_mesh. Voronoi diagram is not built:
+    instead, at each iteration random points are sampled on the mesh surface
+    and assigned to the nearest sites (see sample_centers).
+    n_samples: number of sample points; by default, 50 points per site.
+    """
+    bvh = BVHTree.FromPolygons(verts, faces)
+    random_state = np.random.RandomState(seed)
+    points = calc_bvh_projections(bvh, sites)
+    if n_samples is None:
+        n_samples = 50 * len(points)
+    for i in range(n_iterations):
+        samples = sample_mesh_surface(verts, faces, n_samples, random_state)
+        points = sample_centers(points, samples, _sample_weights(samples, weight_field))
+        points = calc_bvh_projections(bvh, points)
+
+    return points.tolist()
+
 def lloyd_in_solid(solid, sites, n_iterations, tolerance=1e-4, weight_field=None):
     shell = solid.Shells[0]
 
@@ -276,14 +379,8 @@ def lloyd_in_solid(solid, sites, n_iterations, tolerance=1e-4, weight_field=None
                 all_pts.append(invert(pt))
 
         diagram = Voronoi(all_pts)
-        centers = []
-        for site_idx in range(n):
-            region_idx = diagram.point_region[site_idx]
-            region = diagram.regions[region_idx]
-            region_verts = np.array([diagram.vertices[i] for i in region])
-            center = weighted_center(region_verts, weight_field)
-            centers.append(tuple(center))
-        return centers
+        centers = region_centers(diagram, np.array(pts[:n]), weight_field=weight_field)
+        return [tuple(center) for center in centers.tolist()]
 
     def restrict(points):
         result = []
@@ -312,14 +409,8 @@ def lloyd_on_solid_surface(solid, sites, thickness, n_iterations, tolerance=1e-4
     def iteration(pts):
         all_pts = pts + project_solid_normals(shell, pts, thickness)
         diagram = Voronoi(all_pts)
-        centers = []
-        for site_idx in range(len(pts)):
-            region_idx = diagram.point_region[site_idx]
-            region = diagram.regions[region_idx]
-            region_verts = np.array([diagram.vertices[i] for i in region])
-            center = weighted_center(region_verts, weight_field)
-            centers.append(tuple(center))
-        return centers
+        centers = region_centers(diagram, np.array(pts), weight_field=weight_field)
+        return [tuple(center) for center in centers.tolist()]
 
     def restrict(points):
         result = []
@@ -345,14 +436,8 @@ def lloyd_on_fc_face(fc_face, sites, thickness, n_iterations, weight_field = Non
         n = len(pts)
         all_pts = pts + project_solid_normals(fc_face, pts, thickness)
         diagram = Voronoi(all_pts)
-        centers = []
-        for site_idx in range(n):
-            region_idx = diagram.point_region[site_idx]
-            region = diagram.regions[region_idx]
-            region_verts = np.array([diagram.vertices[i] for i in region])
-            center = weighted_center(region_verts, weight_field)
-            centers.append(tuple(center))
-        return centers
+        centers = region_centers(diagram, np.array(pts[:n]), weight_field=weight_field)
+        return [tuple(center) for center in centers.tolist()]
     
     def project(point):
         dist, vs, infos = fc_face.distToShape(Part.Vertex(Base.Vector(point)))
@@ -429,6 +514,29 @@ class Bounds(object):
     def make_mesh(self, diagram):
         raise Exception("not implemented")
 
+    def contains_array(self, points):
+        raise Exception("not implemented")
+
+    def restrict_array(self, points):
+        """
+        Move points which are outside of bounds to the boundary;
+        points which are inside are returned as is.
+        """
+        raise Exception("not implemented")
+
+    def invert_array(self, points):
+        """
+        Mirror points (which are supposed to be inside of bounds)
+        over the nearest part of the boundary.
+        """
+        raise Exception("not implemented")
+
+    def random_points(self, count, random_state):
+        """
+        Random points distributed uniformly inside bounds.
+        """
+        raise Exception("not implemented")
+
 class BoxBounds(Bounds):
     def __init__(self, points, clipping):
         points = np.array(points)
@@ -484,12 +592,36 @@ class BoxBounds(Bounds):
         return np.array([x1, y1, z1])
 
     def invert(self, point):
-        point = np.array(point)
-        projection = self.restrict(point)
-        result = projection + 2 * (projection - point)
-        #print(f"I: {point} => {projection} => {result}")
+        return self.invert_array(np.array([point]))[0]
+
+    @property
+    def min(self):
+        return np.array([self.min_x, self.min_y, self.min_z])
+
+    @property
+    def max(self):
+        return np.array([self.max_x, self.max_y, self.max_z])
+
+    def contains_array(self, points):
+        return np.all((points >= self.min) & (points <= self.max), axis=1)
+
+    def restrict_array(self, points):
+        return np.clip(points, self.min, self.max)
+
+    def invert_array(self, points):
+        # distances to six faces of the box: min x, min y, min z, max x, max y, max z
+        planes = np.concatenate((self.min, self.max))
+        distances = np.abs(np.concatenate((points, points), axis=1) - planes)
+        face = np.argmin(distances, axis=1)
+        axis = face % 3
+        result = np.array(points, dtype=np.float64)
+        idxs = np.arange(len(points))
+        result[idxs, axis] = 2 * planes[face] - result[idxs, axis]
         return result
 
+    def random_points(self, count, random_state):
+        return self.min + random_state.rand(count, 3) * (self.max - self.min)
+
 class SphereBounds(Bounds):
     def __init__(self, points, clipping):
         self.center, self.radius = bounding_sphere(points)
@@ -515,42 +647,60 @@ class SphereBounds(Bounds):
         projection = self.restrict(point)
         return point + 2*(projection - point)
 
-def lloyd3d_bounded(bounds, sites, n_iterations, weight_field=None):
-    def invert(points):
-        result = []
-        for pt in points:
-            if bounds.contains(pt):
-                r = bounds.invert(pt)
-                result.append(tuple(r))
+    def contains_array(self, points):
+        return np.linalg.norm(points - self.center, axis=1) <= self.radius
+
+    def restrict_array(self, points):
+        dvs = points - self.center
+        norms = np.linalg.norm(dvs, axis=1)
+        outside = norms > self.radius
+        result = np.array(points, dtype=np.float64)
+        result[outside] = self.center + self.radius * dvs[outside] / norms[outside][:,np.newaxis]
         return result
 
-    def restrict(points):
-        result = [tuple(point if bounds.contains(point) else bounds.restrict(point)) for point in points]
+    def invert_array(self, points):
+        dvs = points - self.center
+        norms = np.linalg.norm(dvs, axis=1)
+        nonzero = norms > 0
+        result = np.array(points, dtype=np.float64)
+        projections = self.center + self.radius * dvs[nonzero] / norms[nonzero][:,np.newaxis]
+        result[nonzero] = 2*projections - points[nonzero]
         return result
 
+    def random_points(self, count, random_state):
+        directions = random_state.normal(size=(count, 3))
+        directions /= np.linalg.norm(directions, axis=1)[:,np.newaxis]
+        radiuses = self.radius * np.cbrt(random_state.rand(count))
+        return self.center + radiuses[:,np.newaxis] * directions
+
+def lloyd3d_bounded(bounds, sites, n_iterations, weight_field=None):
     def iteration(pts):
-        n = len(pts)
-        all_pts = pts + invert(pts)
+        inside = bounds.contains_array(pts)
+        all_pts = np.concatenate((pts, bounds.invert_array(pts[inside])))
         diagram = Voronoi(all_pts)
-        vertices = restrict(diagram.vertices)
-        centers = []
-        for site_idx in range(n):
-            region_idx = diagram.point_region[site_idx]
-            region = diagram.regions[region_idx]
-
-            if -1 in region:
-                site = pts[site_idx]
-                centers.append(site)
-                continue
-
-            region_verts = np.array([vertices[i] for i in region])
-            center = weighted_center(region_verts, weight_field)
-            centers.append(tuple(center))
-        return centers
+        vertices = bounds.restrict_array(diagram.vertices)
+        return region_centers(diagram, pts, vertices=vertices, weight_field=weight_field)
 
-    points = restrict(sites)
+    points = bounds.restrict_array(np.array(sites, dtype=np.float64))
     for i in range(n_iterations):
         points = iteration(points)
-        points = restrict(points)
-    return points
-
+        points = bounds.restrict_array(points)
+    return [tuple(point) for point in points.tolist()]
+
+def lloyd3d_approximate(bounds, sites, n_iterations, n_samples=None, weight_field=None, seed=0):
+    """
+    Approximate version of lloyd3d_bounded. Voronoi diagram is not built:
+    instead, at each iteration random points are sampled inside the bounds
+    and assigned to the nearest sites (see sample_centers). This is much
+    cheaper for large numbers of sites.
+    n_samples: number of sample points; by default, 50 points per site.
+    """
+    random_state = np.random.RandomState(seed)
+    points = bounds.restrict_array(np.array(sites, dtype=np.float64))
+    if n_samples is None:
+        n_samples = 50 * len(points)
+    for i in range(n_iterations):
+        samples = bounds.random_points(n_samples, random_state)
+        points = sample_centers(points, samples, _sample_weights(samples, weight_field))
+        points = bounds.restrict_array(points)
+    return [tuple(point) for point in points.tolist()]